@@ -29,34 +29,23 @@ from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from functools import partial
 
-import pytest
 import click
 import click_completion
 from prettytable import PrettyTable
 
-from sdcm.results_analyze import PerformanceResultsAnalyzer
 from sdcm.sct_config import SCTConfiguration
-from sdcm.sct_runner import AwsSctRunner, GceSctRunner
-from sdcm.utils.cloud_monitor import cloud_report, cloud_qa_report
-from sdcm.utils.common import (list_instances_aws, list_instances_gce, list_resources_docker, clean_cloud_resources,
-                               all_aws_regions, get_scylla_ami_versions, get_s3_scylla_repos_mapping,
-                               list_logs_by_test_id, get_branched_ami, gce_meta_to_dict,
-                               aws_tags_to_dict, list_elastic_ips_aws, get_builder_by_test_id,
-                               clean_resources_according_post_behavior, clean_sct_runners,
-                               search_test_id_in_latest, get_testrun_dir, format_timestamp, list_clusters_gke,
-                               list_clusters_eks, get_all_gce_regions)
-from sdcm.utils.jepsen import JepsenResults
-from sdcm.monitorstack import (restore_monitoring_stack, get_monitoring_stack_services,
-                               kill_running_monitoring_stack_services)
-from sdcm.cluster import TestConfig
 from sdcm.utils.log import setup_stdout_logger
-from sdcm.utils.prepare_region import AwsRegion
-from sdcm.utils.get_username import get_username
-from sdcm.send_email import get_running_instances_for_email_report, read_email_data_from_file, build_reporter
-from utils.build_system.create_test_release_jobs import JenkinsPipelines
+
+# NOTE: only light-weight modules should be imported on the top level of this file: even `sct.py --help' pays for
+#       them.  Cloud SDKs, sdcm.cluster, sdcm.utils.common and alike are imported by commands which need them.
+#       Use `sct.py profile-imports <command>' to see what a command imports and how long it takes.
+# pylint: disable=import-outside-toplevel
 
 LOGGER = setup_stdout_logger()
 
+# Budget for `sct.py --help' cold start, checked by unit_tests/test_sct_cli.py
+CLI_COLD_START_BUDGET = 2.0  # seconds
+
 click_completion.init()
 
 
@@ -82,7 +71,36 @@ def install_package_from_dir(ctx, _, directories):
     return directories
 
 
+class LazyChoice(click.Choice):
+    """click.Choice which gets the list of choices only when it's needed, i.e., when the option is used."""
+
+    def __init__(self, get_choices, case_sensitive=True):  # pylint: disable=super-init-not-called
+        self._get_choices = get_choices
+        self._choices = None
+        self.case_sensitive = case_sensitive
+
+    @property
+    def choices(self):
+        if self._choices is None:
+            self._choices = self._get_choices()
+        return self._choices
+
+
+def aws_regions():
+    from sdcm.utils.common import all_aws_regions
+
+    return all_aws_regions(cached=True)
+
+
+def aws_and_gce_regions():
+    from sdcm.utils.common import all_aws_regions, get_all_gce_regions
+
+    return all_aws_regions(cached=True) + get_all_gce_regions()
+
+
 def add_file_logger(level: int = logging.DEBUG) -> None:
+    from sdcm.test_config import TestConfig
+
     cmd_path = "-".join(click.get_current_context().command_path.split()[1:])
     logdir = TestConfig().make_new_logdir(update_latest_symlink=False, postfix=f"-{cmd_path}")
     handler = logging.FileHandler(os.path.join(logdir, "hydra.log"))
@@ -151,6 +169,10 @@ def clean_resources(ctx, post_behavior, user, test_id, logdir, dry_run, backend)
 
     Also you can add --dry-run option to see what should be cleaned.
     """
+    from sdcm.test_config import TestConfig
+    from sdcm.utils.common import clean_cloud_resources, clean_resources_according_post_behavior, \
+        search_test_id_in_latest
+
     add_file_logger()
 
     user_param = {"RunByUser": user} if user else {}
@@ -206,6 +228,8 @@ def clean_resources(ctx, post_behavior, user, test_id, logdir, dry_run, backend)
 @click.pass_context
 def list_resources(ctx, user, test_id, get_all, get_all_running, verbose):
     # pylint: disable=too-many-locals,too-many-arguments,too-many-branches,too-many-statements
+    from sdcm.utils.common import list_instances_aws, list_instances_gce, list_resources_docker, gce_meta_to_dict, \
+        aws_tags_to_dict, list_elastic_ips_aws, list_clusters_gke, list_clusters_eks
 
     add_file_logger()
 
@@ -365,8 +389,10 @@ def list_resources(ctx, user, test_id, get_all, get_all_running, verbose):
 
 
 @cli.command('list-ami-versions', help='list Amazon Scylla formal AMI versions')
-@click.option('-r', '--region', type=click.Choice(all_aws_regions(cached=True)), default='eu-west-1')
+@click.option('-r', '--region', type=LazyChoice(aws_regions), default='eu-west-1')
 def list_ami_versions(region):
+    from sdcm.utils.common import get_scylla_ami_versions
+
     add_file_logger()
 
     amis = get_scylla_ami_versions(region)
@@ -382,9 +408,11 @@ def list_ami_versions(region):
 
 @cli.command('list-ami-branch', help="""list Amazon Scylla branched AMI versions
     \n\n[VERSION] is a branch version to look for, ex. 'branch-2019.1:latest', 'branch-3.1:all'""")
-@click.option('-r', '--region', type=click.Choice(all_aws_regions(cached=True)), default='eu-west-1')
+@click.option('-r', '--region', type=LazyChoice(aws_regions), default='eu-west-1')
 @click.argument('version', type=str, default='branch-3.1:all')
 def list_ami_branch(region, version):
+    from sdcm.utils.common import get_branched_ami
+
     add_file_logger()
 
     def get_tags(ami):
@@ -415,6 +443,8 @@ def list_ami_branch(region, version):
                                                          'jessie', 'stretch', 'buster']),       # Debian
               default=None, help='deb style versions')
 def list_repos(dist_type, dist_version):
+    from sdcm.utils.common import get_s3_scylla_repos_mapping
+
     add_file_logger()
 
     if not dist_type == 'centos' and dist_version is None:
@@ -448,6 +478,7 @@ def output_conf(config_files, backend):
 
 
 def _run_yaml_test(backend, full_path, env):
+    start_time = time.perf_counter()
     output = []
     error = False
     output.append(f'---- linting: {full_path} -----')
@@ -466,14 +497,18 @@ def _run_yaml_test(backend, full_path, env):
     except Exception as exc:  # pylint: disable=broad-except
         output.append(''.join(traceback.format_exception(type(exc), exc, exc.__traceback__)))
         error = True
-    return error, output
+    return error, output, time.perf_counter() - start_time
 
 
 @cli.command(help="Test yaml in test-cases directory")
 @click.option('-b', '--backend', type=click.Choice(SCTConfiguration.available_backends), default='aws')
 @click.option('-i', '--include', type=str, default='')
 @click.option('-e', '--exclude', type=str, default='')
-def lint_yamls(backend, exclude: str, include: str):  # pylint: disable=too-many-locals,too-many-branches
+@click.option('--offline', is_flag=True, default=False,
+              help="Resolve AMIs and repos only from the local resolution cache, without network lookups")
+@click.option('--slowest', type=int, default=10, help="Number of slowest files to show in the timing summary")
+def lint_yamls(backend, exclude: str, include: str, offline: bool,  # pylint: disable=too-many-locals,too-many-branches
+               slowest: int):
     if not include:
         raise ValueError('You did not provide include filters')
 
@@ -495,9 +530,12 @@ def lint_yamls(backend, exclude: str, include: str):  # pylint: disable=too-many
         except Exception as exc:  # pylint: disable=broad-except
             raise ValueError(f'Include filter "{flt}" compiling failed with: {exc}') from exc
 
+    if offline:
+        os.environ['SCT_OFFLINE_CONFIG_RESOLUTION'] = 'true'
     original_env = {**os.environ}
     process_pool = ProcessPoolExecutor(max_workers=5)  # pylint: disable=consider-using-with
 
+    start_time = time.perf_counter()
     features = []
     for root, _, files in os.walk('./test-cases'):
         for file in files:
@@ -506,17 +544,26 @@ def lint_yamls(backend, exclude: str, include: str):  # pylint: disable=too-many
                 continue
             if any((flt.search(file) or flt.search(full_path) for flt in exclude_filters)):
                 continue
-            features.append(process_pool.submit(_run_yaml_test, backend, full_path, original_env))
+            features.append((full_path, process_pool.submit(_run_yaml_test, backend, full_path, original_env)))
 
     failed = False
-    for pp_feature in features:
-        error, pp_output = pp_feature.result()
+    durations = {}
+    for full_path, pp_feature in features:
+        error, pp_output, durations[full_path] = pp_feature.result()
         if error:
             failed = True
             click.secho('\n'.join(pp_output), fg='red')
         else:
             click.secho('\n'.join(pp_output), fg='green')
     print()
+
+    timing_table = PrettyTable(["File", "Time, s"])
+    timing_table.align = "l"
+    for full_path, duration in sorted(durations.items(), key=lambda item: item[1], reverse=True)[:slowest]:
+        timing_table.add_row([full_path, f"{duration:.2f}"])
+    click.echo(timing_table.get_string(title=f"Slowest of {len(durations)} files"))
+    click.echo(f"Linted {len(durations)} files in {time.perf_counter() - start_time:.2f}s "
+               f"(sum of per-file times: {sum(durations.values()):.2f}s{', offline' if offline else ''})")
     sys.exit(1 if failed else 0)
 
 
@@ -562,6 +609,8 @@ def conf_docs(output_format):
 @click.option("-i", "--es-id", required=True, type=str, help="Id of the run in Elastic Search")
 @click.option("-e", "--emails", required=True, type=str, help="Comma separated list of emails. Example a@b.com,c@d.com")
 def perf_regression_report(es_id, emails):
+    from sdcm.results_analyze import PerformanceResultsAnalyzer
+
     add_file_logger()
 
     email_list = emails.split(",")
@@ -583,6 +632,8 @@ def investigate():
 @click.argument('test_id')
 @click.option('-o', '--output-format', type=click.Choice(["table", "markdown"]), default="table", help="type of the output")
 def show_log(test_id, output_format):
+    from sdcm.utils.common import list_logs_by_test_id
+
     add_file_logger()
 
     files = list_logs_by_test_id(test_id)
@@ -604,6 +655,9 @@ def show_log(test_id, output_format):
 @click.option("--date-time", type=str, required=False, help='Datetime of monitor-set archive is collected')
 @click.option("--kill", type=bool, required=False, help='Kill and remove containers')
 def show_monitor(test_id, date_time, kill):
+    from sdcm.monitorstack import restore_monitoring_stack, get_monitoring_stack_services, \
+        kill_running_monitoring_stack_services
+
     add_file_logger()
 
     click.echo('Search monitoring stack archive files for test id {} and restoring...'.format(test_id))
@@ -634,6 +688,8 @@ def show_monitor(test_id, date_time, kill):
 @investigate.command('show-jepsen-results', help="Run a server with Jepsen results")
 @click.argument('test_id')
 def show_jepsen_results(test_id):
+    from sdcm.utils.jepsen import JepsenResults
+
     add_file_logger()
 
     click.secho(message=f"\nSearch Jepsen results archive files for test id {test_id} and restoring...\n", fg="green")
@@ -650,6 +706,8 @@ def show_jepsen_results(test_id):
 @investigate.command('search-builder', help='Search builder where test run with test-id located')
 @click.argument('test-id')
 def search_builder(test_id):
+    from sdcm.utils.common import get_builder_by_test_id
+
     logging.getLogger("paramiko").setLevel(logging.CRITICAL)
     add_file_logger()
 
@@ -669,6 +727,8 @@ def search_builder(test_id):
 @click.option("--last-n", type=int, required=False, help="return last n lines from events.log file")
 @click.option("--save-to", type=str, required=False, help="Download events.log file and save to provided dir")
 def show_events(test_id: str, follow: bool = False, last_n: int = None, save_to: str = None):
+    from sdcm.utils.common import get_builder_by_test_id
+
     logging.getLogger("paramiko").setLevel(logging.CRITICAL)
     add_file_logger()
     builders = get_builder_by_test_id(test_id)
@@ -703,6 +763,8 @@ cli.add_command(investigate)
 @click.option("-t", "--test", required=False, default="",
               help="Run specific test file from unit-tests directory")
 def unit_tests(test):
+    import pytest
+
     sys.exit(pytest.main(['-v', '-p', 'no:warnings', 'unit_tests/{}'.format(test)]))
 
 
@@ -741,6 +803,8 @@ class OutputLogger():
 @click.option('-c', '--config', multiple=True, type=click.Path(exists=True), help="Test config .yaml to use, can have multiple of those")
 @click.option('-l', '--logdir', help="Directory to use for logs")
 def run_test(argv, backend, config, logdir):
+    from sdcm.test_config import TestConfig
+
     if config:
         os.environ['SCT_CONFIG_FILES'] = str(list(config))
     if backend:
@@ -763,6 +827,9 @@ def run_test(argv, backend, config, logdir):
 @click.option('-c', '--config', multiple=True, type=click.Path(exists=True), help="Test config .yaml to use, can have multiple of those")
 @click.option('-l', '--logdir', help="Directory to use for logs")
 def run_pytest(target, backend, config, logdir):
+    import pytest
+    from sdcm.test_config import TestConfig
+
     if config:
         os.environ['SCT_CONFIG_FILES'] = str(list(config))
     if backend:
@@ -783,6 +850,8 @@ def run_pytest(target, backend, config, logdir):
 @cli.command("cloud-usage-report", help="Generate and send Cloud usage report")
 @click.option("-e", "--emails", required=True, type=str, help="Comma separated list of emails. Example a@b.com,c@d.com")
 def cloud_usage_report(emails):
+    from sdcm.utils.cloud_monitor import cloud_report
+
     add_file_logger()
 
     email_list = emails.split(",")
@@ -795,6 +864,8 @@ def cloud_usage_report(emails):
 @click.option("-e", "--emails", required=True, type=str, help="Comma separated list of emails. Example a@b.com,c@d.com")
 @click.option("-u", "--user", required=False, type=str, help="User or instance owner")
 def cloud_usage_qa_report(emails, user=None):
+    from sdcm.utils.cloud_monitor import cloud_qa_report
+
     add_file_logger()
 
     email_list = emails.split(",")
@@ -809,9 +880,10 @@ def cloud_usage_qa_report(emails, user=None):
 @click.option('--backend', help='Cloud where search nodes', default=None)
 @click.option('--config-file', type=str, help='config test file path')
 def collect_logs(test_id=None, logdir=None, backend=None, config_file=None):
+    from sdcm.logcollector import Collector
+
     add_file_logger()
 
-    from sdcm.logcollector import Collector  # pylint: disable=import-outside-toplevel
     logging.getLogger("paramiko").setLevel(logging.CRITICAL)
     if backend is None:
         if os.environ.get('SCT_CLUSTER_BACKEND', None) is None:
@@ -848,6 +920,10 @@ def collect_logs(test_id=None, logdir=None, backend=None, config_file=None):
 @click.option('--logdir', help='Directory where to find testrun folder')
 def send_email(test_id=None, test_status=None, start_time=None, started_by=None, runner_ip=None,
                email_recipients=None, logdir=None):
+    from sdcm.utils.common import list_logs_by_test_id, get_testrun_dir, format_timestamp
+    from sdcm.utils.get_username import get_username
+    from sdcm.send_email import get_running_instances_for_email_report, read_email_data_from_file, build_reporter
+
     if started_by is None:
         started_by = get_username()
     add_file_logger()
@@ -922,6 +998,8 @@ def send_email(test_id=None, test_status=None, start_time=None, started_by=None,
 @click.option('--sct_branch', default='master', type=str)
 @click.option('--sct_repo', default='git@github.com:scylladb/scylla-cluster-tests.git', type=str)
 def create_operator_test_release_jobs(branch, username, password, sct_branch, sct_repo):
+    from utils.build_system.create_test_release_jobs import JenkinsPipelines
+
     add_file_logger()
 
     base_job_dir = "scylla-operator"
@@ -955,6 +1033,8 @@ def create_operator_test_release_jobs(branch, username, password, sct_branch, sc
 @click.option('--sct_branch', default='master', type=str)
 @click.option('--sct_repo', default='git@github.com:scylladb/scylla-cluster-tests.git', type=str)
 def create_test_release_jobs(branch, username, password, sct_branch, sct_repo):
+    from utils.build_system.create_test_release_jobs import JenkinsPipelines
+
     add_file_logger()
 
     base_job_dir = f'{branch}'
@@ -1003,6 +1083,8 @@ def create_test_release_jobs(branch, username, password, sct_branch, sct_repo):
 @click.option('--sct_branch', default='master', type=str)
 @click.option('--sct_repo', default='git@github.com:scylladb/scylla-cluster-tests.git', type=str)
 def create_test_release_jobs_enterprise(branch, username, password, sct_branch, sct_repo):
+    from utils.build_system.create_test_release_jobs import JenkinsPipelines
+
     add_file_logger()
 
     base_job_dir = f'{branch}'
@@ -1025,26 +1107,49 @@ def create_test_release_jobs_enterprise(branch, username, password, sct_branch,
         f'{server.base_sct_dir}/jenkins-pipelines/longevity-in-memory-36gb-1d.jenkinsfile', 'SCT_Enterprise_Features')
 
 
-@cli.command("prepare-aws-region", help="Create and configure VPC in selected AWS region")
-@click.option("-r", "--region", required=True, type=str, help="Name of the region")
-def prepare_aws_region(region):
+@cli.command("prepare-aws-region", help="Create and configure VPC in selected AWS regions (concurrently). "
+                                        "A failed run is resumed from the failed step by the next one.")
+@click.option("-r", "--region", "regions", multiple=True, type=str,
+              help="Name of the region, can be used multiple times")
+@click.option("--all-regions", is_flag=True, default=False, help="Prepare all supported AWS regions")
+@click.option("--dry-run", is_flag=True, default=False,
+              help="Only show which resources already exist and which are going to be created")
+@click.option("--fresh", is_flag=True, default=False,
+              help="Ignore the execution log of a previous failed run and check all steps again")
+def prepare_aws_region(regions, all_regions, dry_run, fresh):
+    from sdcm.utils.common import all_aws_regions
+    from sdcm.utils.prepare_region import plan_aws_regions, prepare_aws_regions
+
     add_file_logger()
-    aws_region = AwsRegion(region_name=region)
-    aws_region.configure()
+    if all_regions:
+        regions = all_aws_regions(cached=True)
+    if not regions:
+        raise click.UsageError("Use --region or --all-regions")
+    if dry_run:
+        plan_table = PrettyTable(["Region", "Resource", "Status", "Id"])
+        plan_table.align = "l"
+        for region, plan in plan_aws_regions(list(regions)).items():
+            for resource_name, resource_id in plan:
+                plan_table.add_row([region, resource_name, "exists" if resource_id else "to be created",
+                                    resource_id or ""])
+        click.echo(plan_table.get_string(title="AWS regions preparation plan"))
+        return
+    prepare_aws_regions(list(regions), fresh=fresh)
 
 
 @cli.command("create-runner-image", help="Create an SCT runner image in selected AWS or GCE region. "
-                                         f"If the requested region is not a source region "
-                                         f"(aws: {AwsSctRunner.SOURCE_IMAGE_REGION}, gce: {GceSctRunner.SOURCE_IMAGE_REGION})"
-                                         f" the image will be first created in the"
-                                         f" source region and then copied to the chosen one.")
+                                         "If the requested region is not a source region of the cloud provider"
+                                         " the image will be first created in the"
+                                         " source region and then copied to the chosen one.")
 @click.option("-c", "--cloud-provider", required=True, type=click.Choice(['aws', 'gce']), default="aws",
               help="Cloud provider, currently only AWS and GCE are supported")
-@click.option("-r", "--region", required=True, type=click.Choice(all_aws_regions(cached=True) + get_all_gce_regions()),
+@click.option("-r", "--region", required=True, type=LazyChoice(aws_and_gce_regions),
               help="Name of the region")
 @click.option("-z", "--availability-zone", required=False, default="", type=str,
               help="Name of availability zone, ex. 'a'")
 def create_runner_image(cloud_provider, region, availability_zone):
+    from sdcm.sct_runner import AwsSctRunner, GceSctRunner
+
     cloud_provider = cloud_provider.lower()
     if cloud_provider == 'aws' and availability_zone != "":
         assert len(availability_zone) == 1, f"Invalid AZ: {availability_zone}, availability-zone is one-letter a-z."
@@ -1059,16 +1164,49 @@ def create_runner_image(cloud_provider, region, availability_zone):
     sct_runner.create_image()
 
 
+@cli.command("validate-runner-image", help="Check layers of SCT runner prerequisites in a local container image. "
+                                           "Commands run in containers without network access.")
+@click.option("-i", "--docker-image", required=True, type=str, help="Name of the local image")
+@click.option("-c", "--cloud-provider", type=click.Choice(['aws', 'gce']), default="aws",
+              help="Cloud provider which runner image layers should be checked")
+@click.option("--public-key-file", type=click.Path(exists=True, dir_okay=False), default=None,
+              help="Public SSH key of SCT runners, fetched from the keystore if not set")
+def validate_runner_image(docker_image, cloud_provider, public_key_file):
+    from sdcm.sct_runner import AwsSctRunner, GceSctRunner
+    from sdcm.utils.runner_layers import DockerImageRunner, get_sct_runner_layers
+
+    runner_class = AwsSctRunner if cloud_provider == "aws" else GceSctRunner
+    if public_key_file:
+        public_key = Path(public_key_file).read_text().strip()
+    else:
+        public_key = runner_class.key_pair().public_key.decode()
+    layers = get_sct_runner_layers(login_user=runner_class.LOGIN_USER, public_key=public_key, sudo=False)
+    results = layers.validate(DockerImageRunner(docker_image))
+
+    layers_table = PrettyTable(["Layer", "Digest", "Status", "Duration"])
+    layers_table.align = "l"
+    for result in results:
+        layers_table.add_row([result.name, result.digest[:12], result.status, f"{result.duration:.1f}s"])
+    click.echo(layers_table.get_string(title=f"{docker_image} (expected layers digest: {layers.digest[:12]})"))
+    for result in results:
+        if result.status == "failed":
+            click.echo(f"{result.name}: {result.output}")
+    if any(result.status == "failed" for result in results):
+        sys.exit(1)
+
+
 @cli.command("create-runner-instance", help="Create an SCT runner instance in selected AWS or GCE region")
 @click.option("-c", "--cloud-provider", required=True, type=click.Choice(['aws', 'gce']), default="aws",
               help="Cloud provider, currently only AWS and GCE are supported")
-@click.option("-r", "--region", required=True, type=click.Choice(all_aws_regions(cached=True) + get_all_gce_regions()),
+@click.option("-r", "--region", required=True, type=LazyChoice(aws_and_gce_regions),
               help="Name of the region")
 @click.option("-z", "--availability-zone", required=False, default="", type=str,
               help="Name of availability zone, ex. 'a'")
 @click.option("-t", "--test-id", required=True, type=str, help="Test ID")
 @click.option("-d", "--duration", required=True, type=int, help="Test duration in MINUTES")
 def create_runner_instance(cloud_provider, region, availability_zone, test_id, duration):
+    from sdcm.sct_runner import AwsSctRunner, GceSctRunner
+
     cloud_provider = cloud_provider.lower()
     if cloud_provider == 'aws' and availability_zone != "":
         assert len(availability_zone) == 1, f"Invalid AZ: {availability_zone}, availability-zone is one-letter a-z."
@@ -1105,9 +1243,53 @@ def create_runner_instance(cloud_provider, region, availability_zone, test_id, d
 @click.option("-ts", "--test-status", required=False, type=str, default="FAILED")
 @click.option("-ip", "--runner-ip", required=False, type=str, default="")
 def clean_runner_instances(test_status: str = None, runner_ip: str = None):
+    from sdcm.utils.common import clean_sct_runners
+
     add_file_logger()
     clean_sct_runners(test_status=test_status, test_runner_ip=runner_ip)
 
 
+@cli.command('list-disrupt-methods', help="Dump disrupt methods of all nemeses with their flags as JSON")
+@click.option('--disruptive/--non-disruptive', default=None, help="Filter by `disruptive' flag of the nemesis")
+@click.option('--kubernetes/--no-kubernetes', default=None, help="Filter by `kubernetes' flag of the nemesis")
+@click.option('--limited', is_flag=True, default=None, help="Only nemeses of LimitedChaosMonkey")
+def list_disrupt_methods(disruptive, kubernetes, limited):
+    from sdcm.nemesis import get_disrupt_methods_registry
+
+    click.echo(get_disrupt_methods_registry().to_json(disruptive=disruptive, kubernetes=kubernetes, limited=limited))
+
+
+@cli.command('profile-imports', context_settings=dict(ignore_unknown_options=True),
+             help="Show the slowest imports of an sct.py command using `python -X importtime', "
+                  "e.g., `sct.py profile-imports -- list-resources --help'. "
+                  "NOTE: the command is really executed, use `--help' to profile its cold start only")
+@click.option('-n', '--top', type=int, default=30, help="Number of the slowest modules to show")
+@click.argument('command_args', nargs=-1, type=click.UNPROCESSED)
+def profile_imports(top, command_args):
+    command = [sys.executable, "-X", "importtime", __file__, *(command_args or ("--help", ))]
+    start_time = time.perf_counter()
+    result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=False)
+    wall_time = time.perf_counter() - start_time
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|", 2)
+        depth = (len(module) - len(module.lstrip()) - 1) // 2
+        imports.append((int(cumulative_us), int(self_us), depth, module.strip()))
+
+    table = PrettyTable(["Module", "Depth", "Self, ms", "Cumulative, ms"])
+    table.align = "l"
+    for cumulative_us, self_us, depth, module in sorted(imports, reverse=True)[:top]:
+        table.add_row([module, depth, round(self_us / 1000, 1), round(cumulative_us / 1000, 1)])
+    click.echo(table.get_string(title=f"Slowest imports of `{' '.join(command[3:])}'"))
+
+    total_import_time = sum(cumulative_us for cumulative_us, _, depth, _ in imports if depth == 0) / 1_000_000
+    click.echo(f"{len(imports)} modules imported in {total_import_time:.2f}s, "
+               f"wall time {wall_time:.2f}s (budget for `--help' is {CLI_COLD_START_BUDGET}s), "
+               f"exit code {result.returncode}")
+
+
 if __name__ == '__main__':
     cli()
@@ -27,12 +27,13 @@ import uuid
 import itertools
 import json
 import ipaddress
-from typing import List, Optional, Dict, Union, Set
+from typing import List, Optional, Dict, Union, Set, Sequence, Callable
 from datetime import datetime
 from textwrap import dedent
 from functools import cached_property, wraps
 from collections import defaultdict
 from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
 from dataclasses import dataclass
 
 import yaml
@@ -45,7 +46,7 @@ from cassandra.auth import PlainTextAuthProvider
 from cassandra.cluster import Cluster as ClusterDriver  # pylint: disable=no-name-in-module
 from cassandra.cluster import NoHostAvailable  # pylint: disable=no-name-in-module
 from cassandra.policies import RetryPolicy
-from cassandra.policies import WhiteListRoundRobinPolicy
+from cassandra.policies import TokenAwarePolicy, WhiteListRoundRobinPolicy
 
 from sdcm.collectd import ScyllaCollectdSetup
 from sdcm.mgmt import AnyManagerCluster, ScyllaManagerError
@@ -57,8 +58,6 @@ from sdcm import wait, mgmt
 from sdcm.utils import alternator, properties
 from sdcm.utils.common import (
     S3Storage,
-    ScyllaCQLSession,
-    PageFetcher,
     deprecation,
     get_data_dir_path,
     verify_scylla_repo_file,
@@ -91,6 +90,15 @@ from sdcm.sct_events.database import SYSTEM_ERROR_EVENTS_PATTERNS, BACKTRACE_RE,
 from sdcm.sct_events.nodetool import NodetoolEvent
 from sdcm.sct_events.decorators import raise_event_on_failure
 from sdcm.utils.auto_ssh import AutoSshContainerMixin
+from sdcm.utils.backtrace_decoder import BacktraceDecoder
+from sdcm.utils.log_watcher import LogIngestStats, get_log_watcher
+from sdcm.utils.cql_session_pool import CqlSessionKey, get_cql_session_pool
+from sdcm.utils.schema_inventory import SchemaInventory
+from sdcm.utils.node_lease import NodeLeaseManager
+from sdcm.utils.spans import span, traced
+from sdcm.utils.rolling import RollingExecutor, RollingStep
+from sdcm.utils.traffic_baseline import TrafficBaseline
+from sdcm.db_stats import PrometheusDBStats
 from sdcm.monitorstack.ui import AlternatorDashboard
 from sdcm.logcollector import GrafanaSnapshot, GrafanaScreenShot, PrometheusSnapshots, upload_archive_to_s3
 from sdcm.utils.ldap import LDAP_SSH_TUNNEL_LOCAL_PORT, LDAP_BASE_OBJECT, LDAP_PASSWORD, LDAP_USERS, LDAP_ROLE, \
@@ -220,7 +228,8 @@ class BaseNode(AutoSshContainerMixin, WebDriverContainerMixin):  # pylint: disab
         self.last_log_position = 0
         self._continuous_events_registry = ContinuousEventsRegistry()
         self._coredump_thread: Optional[CoredumpExportSystemdThread] = None
-        self._db_log_reader_thread = None
+        self._db_log_watched = False
+        self.db_log_ingest_stats: Optional[LogIngestStats] = None
         self._scylla_manager_journal_thread = None
         self._decoding_backtraces_thread = None
         self._init_system = None
@@ -827,29 +836,35 @@ class BaseNode(AutoSshContainerMixin, WebDriverContainerMixin):  # pylint: disab
                     message="Got no logging daemon by unknown reason"
                 ).publish_or_dump()
 
-    @raise_event_on_failure
-    def db_log_reader_thread(self):
+    def _read_new_db_log_lines(self, max_lines: int) -> bool:
         """
-        Keep reporting new events from db log, every 30 seconds.
+        Report new events from a batch of new lines of db log, return True if there are more lines to read.
         """
-        while not self.termination_event.isSet():
-            self.termination_event.wait(15)
-            try:
-                self._read_system_log_and_publish_events(start_from_beginning=False,
-                                                         exclude_from_logging=self._exclude_system_log_from_being_logged)
-            except Exception:  # pylint: disable=broad-except
-                self.log.exception("failed to read db log")
-            except (SystemExit, KeyboardInterrupt) as ex:
-                self.log.debug("db_log_reader_thread() stopped by %s", ex.__class__.__name__)
+        last_line_no = self.last_line_no
+        self._read_system_log_and_publish_events(start_from_beginning=False,
+                                                 exclude_from_logging=self._exclude_system_log_from_being_logged,
+                                                 max_lines=max_lines)
+        # A short batch means that the reader got to the end of the log or to a line which is still being written.
+        return self.last_line_no - last_line_no == max_lines \
+            and self.last_log_position < os.path.getsize(self.system_log)
 
     def start_coredump_thread(self):
         self._coredump_thread = CoredumpExportSystemdThread(self, self._maximum_number_of_cores_to_publish)
         self._coredump_thread.start()
 
     def start_db_log_reader_thread(self):
-        self._db_log_reader_thread = threading.Thread(
-            target=self.db_log_reader_thread, name='LogReaderThread', daemon=True)
-        self._db_log_reader_thread.start()
+        """
+        Report new events from db log as soon as lines are appended to it, using the shared log watcher.
+        """
+        get_log_watcher().watch(name=self.name, path=self.system_log, callback=self._read_new_db_log_lines)
+        self._db_log_watched = True
+
+    def stop_db_log_reader_thread(self):
+        if not self._db_log_watched:
+            return
+        self._db_log_watched = False
+        self.db_log_ingest_stats = get_log_watcher().unwatch(self.name)
+        self.log.info("DB log reader: %s", self.db_log_ingest_stats)
 
     def start_alert_manager_thread(self):
         self._alert_manager = PrometheusAlertManagerListener(self.external_address, stop_flag=self.termination_event)
@@ -972,6 +987,7 @@ class BaseNode(AutoSshContainerMixin, WebDriverContainerMixin):  # pylint: disab
             return
         self.log.info('Set termination_event')
         self.termination_event.set()
+        self.stop_db_log_reader_thread()
         if self._coredump_thread and self._coredump_thread.is_alive():
             self._coredump_thread.stop()
         if self._alert_manager and self._alert_manager.is_alive():
@@ -982,8 +998,6 @@ class BaseNode(AutoSshContainerMixin, WebDriverContainerMixin):  # pylint: disab
         await_bucket = []
         if self._spot_monitoring_thread:
             await_bucket.append(self._spot_monitoring_thread)
-        if self._db_log_reader_thread:
-            await_bucket.append(self._db_log_reader_thread)
         if self._alert_manager:
             await_bucket.append(self._alert_manager)
         if self._decoding_backtraces_thread:
@@ -1178,6 +1192,7 @@ class BaseNode(AutoSshContainerMixin, WebDriverContainerMixin):  # pylint: disab
             else:
                 self.remoter.sudo('touch %s' % mark_path, verbose=verbose, user='scylla')
 
+    @traced(category="node")
     def wait_db_up(self, verbose=True, timeout=3600):
         text = None
         if verbose:
@@ -1298,13 +1313,17 @@ class BaseNode(AutoSshContainerMixin, WebDriverContainerMixin):  # pylint: disab
 
     def _read_system_log_and_publish_events(self,
                                             start_from_beginning: bool = False,
-                                            exclude_from_logging: List[str] = None) -> None:
-        """Search for all known patterns listed in `sdcm.sct_events.database.SYSTEM_ERROR_EVENTS'."""
+                                            exclude_from_logging: List[str] = None,
+                                            max_lines: Optional[int] = None) -> None:
+        """Search for all known patterns listed in `sdcm.sct_events.database.SYSTEM_ERROR_EVENTS'.
+
+        If `max_lines' is set, read at most that number of lines, the rest will be read by next calls.
+        """
 
         # pylint: disable=too-many-branches,too-many-locals,too-many-statements
 
         backtraces = []
-        index = 0
+        partial_line = ''
 
         if not os.path.exists(self.system_log):
             return
@@ -1315,11 +1334,20 @@ class BaseNode(AutoSshContainerMixin, WebDriverContainerMixin):  # pylint: disab
         else:
             start_search_from_byte = self.last_log_position
             last_line_no = self.last_line_no
+        next_line_no = last_line_no
 
         with open(self.system_log, 'r') as db_file:
             if start_search_from_byte:
                 db_file.seek(start_search_from_byte)
-            for index, line in enumerate(db_file, start=last_line_no):
+            # Use readline() instead of the file iterator to be able to tell() the position after a partial read
+            lines = iter(db_file.readline, '')
+            if max_lines:
+                lines = itertools.islice(lines, max_lines)
+            for index, line in enumerate(lines, start=last_line_no):
+                if not start_from_beginning and not line.endswith('\n'):
+                    partial_line = line  # the line is still being written, read it next time
+                    break
+                next_line_no = index + 1
                 json_log = None
                 if line[0] == '{':
                     try:
@@ -1382,8 +1410,8 @@ class BaseNode(AutoSshContainerMixin, WebDriverContainerMixin):  # pylint: disab
                     backtraces[-1]['backtrace'] = one_line_backtrace
 
             if not start_from_beginning:
-                self.last_line_no = index if index else last_line_no
-                self.last_log_position = db_file.tell() + 1
+                self.last_line_no = next_line_no
+                self.last_log_position = db_file.tell() - len(partial_line.encode())
 
         traces_count = 0
         for backtrace in backtraces:
@@ -1413,13 +1441,17 @@ class BaseNode(AutoSshContainerMixin, WebDriverContainerMixin):  # pylint: disab
             filter_backtraces.last_error = None
             backtraces = list(filter(filter_backtraces, backtraces))
 
+        scylla_debug_info = build_id = None
         for backtrace in backtraces:
             if self.test_config.BACKTRACE_DECODING and backtrace["event"].raw_backtrace:
-                scylla_debug_info = self.get_scylla_debuginfo_file()
-                self.log.debug("Debug info file %s", scylla_debug_info)
+                if not scylla_debug_info:
+                    scylla_debug_info = self.get_scylla_debuginfo_file()
+                    build_id = self.get_scylla_build_id()
+                    self.log.debug("Debug info file %s (build-id %s)", scylla_debug_info, build_id)
                 self.test_config.DECODING_QUEUE.put({
                     "node": self,
                     "debug_file": scylla_debug_info,
+                    "build_id": build_id,
                     "event": backtrace["event"],
                 })
             else:
@@ -1432,33 +1464,11 @@ class BaseNode(AutoSshContainerMixin, WebDriverContainerMixin):  # pylint: disab
         self._decoding_backtraces_thread.start()
 
     def decode_backtrace(self):
-        scylla_debug_file = None
-        while True:
-            event = None
-            obj = None
-            try:
-                obj = self.test_config.DECODING_QUEUE.get(timeout=5)
-                if obj is None:
-                    self.test_config.DECODING_QUEUE.task_done()
-                    break
-                event = obj["event"]
-                if not scylla_debug_file:
-                    scylla_debug_file = self.copy_scylla_debug_info(obj["node"], obj["debug_file"])
-                output = self.decode_raw_backtrace(scylla_debug_file, " ".join(event.raw_backtrace.split('\n')))
-                event.backtrace = output.stdout
-                self.test_config.DECODING_QUEUE.task_done()
-            except queue.Empty:
-                pass
-            except Exception as details:  # pylint: disable=broad-except
-                self.log.error("failed to decode backtrace %s", details)
-            finally:
-                if event:
-                    event.publish()
-
-            if self.termination_event.isSet() and self.test_config.DECODING_QUEUE.empty():
-                break
+        BacktraceDecoder(monitor_node=self,
+                         decoding_queue=self.test_config.DECODING_QUEUE,
+                         termination_event=self.termination_event).run()
 
-    def copy_scylla_debug_info(self, node, debug_file):
+    def copy_scylla_debug_info(self, node, debug_file, build_id=None):
         """Copy scylla debug file from db-node to monitor-node
 
         Copy via builder
@@ -1466,10 +1476,13 @@ class BaseNode(AutoSshContainerMixin, WebDriverContainerMixin):  # pylint: disab
         :type node: BaseNode
         :param scylla_debug_file: path to scylla_debug_file on db-node
         :type scylla_debug_file: str
+        :param build_id: build-id of scylla binary, debug files of different builds are copied to different paths
+        :type build_id: str
         :returns: path on monitor node
         :rtype: {str}
         """
-        base_scylla_debug_file = os.path.basename(debug_file)
+        # The same path can be of other scylla build on other node (e.g., during upgrade), or if build-id is unknown
+        base_scylla_debug_file = f"{build_id or node.name}-{os.path.basename(debug_file)}"
         transit_scylla_debug_file = os.path.join(node.parent_cluster.logdir,
                                                  base_scylla_debug_file)
         final_scylla_debug_file = os.path.join("/tmp", base_scylla_debug_file)
@@ -1492,7 +1505,7 @@ class BaseNode(AutoSshContainerMixin, WebDriverContainerMixin):  # pylint: disab
         Decode backtrace on monitor node
         :param scylla_debug_file: file path on db-node
         :type scylla_debug_file: str
-        :param raw_backtrace: string with backtrace data
+        :param raw_backtrace: string with backtrace data, can contain addresses of several backtraces
         :type raw_backtrace: str
         :returns: result of bactrace
         :rtype: {str}
@@ -2659,7 +2672,8 @@ class BaseNode(AutoSshContainerMixin, WebDriverContainerMixin):  # pylint: disab
                            options=options,
                            publish_event=publish_event) as nodetool_event:
             try:
-                result = self.remoter.run(cmd, timeout=timeout, ignore_status=ignore_status, verbose=verbose)
+                with span(f"nodetool {sub_cmd}", category="node", node=self.name):
+                    result = self.remoter.run(cmd, timeout=timeout, ignore_status=ignore_status, verbose=verbose)
                 self.log.debug("Command '%s' duration -> %s s" % (result.command, result.duration))
 
                 nodetool_event.duration = result.duration
@@ -3209,6 +3223,8 @@ class BaseCluster:  # pylint: disable=too-many-instance-attributes,too-many-publ
 
         if node in self.nodes:
             self.nodes.remove(node)
+        get_cql_session_pool().invalidate(
+            [node.external_address, node.ip_address, node.public_ip_address, node.private_ip_address])
         node.destroy()
 
     def get_db_auth(self):
@@ -3254,52 +3270,57 @@ class BaseCluster:  # pylint: disable=too-many-instance-attributes,too-many-publ
                         protocol_version, load_balancing_policy=None,
                         port=None, ssl_opts=None, node_ips=None, connect_timeout=None,
                         verbose=True):
+        """Return a lease of a pooled session (see `sdcm.utils.cql_session_pool'.)
+
+        Unless `load_balancing_policy' is given, the driver cluster is whitelisted to `node_ips' and routes
+        statements with a routing key (e.g. bound prepared statements) to replicas.
+        """
         if not port:
             port = node.CQL_PORT
 
         if protocol_version is None:
             protocol_version = 3
 
-        credentials = self.get_db_auth()
-        user, password = credentials if credentials else (None, None)
-
-        if user is not None:
-            auth_provider = PlainTextAuthProvider(username=user, password=password)
-        else:
-            auth_provider = None
-
         if ssl_opts is None and self.params.get('client_encrypt'):
             ssl_opts = {'ca_certs': './data_dir/ssl_conf/client/catest.pem'}
-        self.log.debug(str(ssl_opts))
-        cluster_driver = ClusterDriver(node_ips, auth_provider=auth_provider,
-                                       compression=compression,
-                                       protocol_version=protocol_version,
-                                       load_balancing_policy=load_balancing_policy,
-                                       default_retry_policy=FlakyRetryPolicy(),
-                                       port=port, ssl_options=ssl_opts,
-                                       connect_timeout=connect_timeout)
-        session = cluster_driver.connect()
-
-        # temporarily increase client-side timeout to 1m to determine
-        # if the cluster is simply responding slowly to requests
-        session.default_timeout = 60.0
-
-        if keyspace is not None:
-            session.set_keyspace(keyspace)
 
-        # override driver default consistency level of LOCAL_QUORUM
-        session.default_consistency_level = ConsistencyLevel.ONE
+        key = CqlSessionKey.build(node_ips=node_ips, credentials=self.get_db_auth(), ssl_opts=ssl_opts,
+                                  keyspace=keyspace, protocol_version=protocol_version, port=port,
+                                  compression=compression)
+
+        def connect(key):
+            self.log.debug(str(ssl_opts))
+            auth_provider = PlainTextAuthProvider(username=key.user, password=key.password) if key.user else None
+            cluster_driver = ClusterDriver(list(key.node_ips), auth_provider=auth_provider,
+                                           compression=key.compression,
+                                           protocol_version=key.protocol_version,
+                                           load_balancing_policy=load_balancing_policy or
+                                           TokenAwarePolicy(WhiteListRoundRobinPolicy(list(key.node_ips))),
+                                           default_retry_policy=FlakyRetryPolicy(),
+                                           port=key.port, ssl_options=ssl_opts,
+                                           connect_timeout=connect_timeout)
+            session = cluster_driver.connect()
+
+            # temporarily increase client-side timeout to 1m to determine
+            # if the cluster is simply responding slowly to requests
+            session.default_timeout = 60.0
+
+            if key.keyspace is not None:
+                session.set_keyspace(key.keyspace)
+
+            # override driver default consistency level of LOCAL_QUORUM
+            session.default_consistency_level = ConsistencyLevel.ONE
+            return cluster_driver, session
 
-        return ScyllaCQLSession(session, cluster_driver, verbose)
+        return get_cql_session_pool().lease(key=key, connect=connect, verbose=verbose)
 
     def cql_connection(self, node, keyspace=None, user=None,  # pylint: disable=too-many-arguments
                        password=None, compression=True, protocol_version=None,
                        port=None, ssl_opts=None, connect_timeout=100, verbose=True):
         node_ips = self.get_node_external_ips()
-        wlrr = WhiteListRoundRobinPolicy(node_ips)
         return self._create_session(node=node, keyspace=keyspace, user=user, password=password,
                                     compression=compression, protocol_version=protocol_version,
-                                    load_balancing_policy=wlrr, port=port, ssl_opts=ssl_opts, node_ips=node_ips,
+                                    port=port, ssl_opts=ssl_opts, node_ips=node_ips,
                                     connect_timeout=connect_timeout, verbose=verbose)
 
     def cql_connection_exclusive(self, node, keyspace=None, user=None,  # pylint: disable=too-many-arguments
@@ -3307,10 +3328,9 @@ class BaseCluster:  # pylint: disable=too-many-instance-attributes,too-many-publ
                                  protocol_version=None, port=None,
                                  ssl_opts=None, connect_timeout=100, verbose=True):
         node_ips = [node.external_address]
-        wlrr = WhiteListRoundRobinPolicy(node_ips)
         return self._create_session(node=node, keyspace=keyspace, user=user, password=password,
                                     compression=compression, protocol_version=protocol_version,
-                                    load_balancing_policy=wlrr, port=port, ssl_opts=ssl_opts, node_ips=node_ips,
+                                    port=port, ssl_opts=ssl_opts, node_ips=node_ips,
                                     connect_timeout=connect_timeout, verbose=verbose)
 
     @retrying(n=8, sleep_time=15, allowed_exceptions=(NoHostAvailable,))
@@ -3354,68 +3374,19 @@ class BaseCluster:  # pylint: disable=too-many-instance-attributes,too-many-publ
     def get_any_ks_cf_list(self, db_node,  # pylint: disable=too-many-arguments
                            filter_out_table_with_counter=False, filter_out_mv=False, filter_empty_tables=True,
                            filter_out_system=False, filter_out_cdc_log_tables=False) -> List[str]:
-        regular_column_names = ["keyspace_name", "table_name"]
-        materialized_view_column_names = ["keyspace_name", "view_name"]
-        regular_table_names, materialized_view_table_names = set(), set()
-
-        def execute_cmd(cql_session, entity_type):
-            result = set()
-            is_column_type = entity_type == "column"
-            column_names = regular_column_names
-            if is_column_type:
-                cmd = f"SELECT {column_names[0]}, {column_names[1]}, type FROM system_schema.columns"
-            elif entity_type == "view":
-                column_names = materialized_view_column_names
-                cmd = f"SELECT {column_names[0]}, {column_names[1]} FROM system_schema.views"
-            else:
-                raise ValueError(f"The following value '{entity_type}' not supported")
-
-            session.default_fetch_size = 1000
-            session.default_consistency_level = ConsistencyLevel.ONE
-            execute_result = session.execute_async(cmd)
-            fetcher = PageFetcher(execute_result).request_all()
-            current_rows = fetcher.all_data()
-
-            # for row in cql_session.execute(cmd).current_rows:
-            for row in current_rows:
-                is_valid_table = True
-                table_name = f"{getattr(row, column_names[0])}.{getattr(row, column_names[1])}"
-
-                if filter_out_system and getattr(row, column_names[0]).startswith(("system", "alternator_usertable")):
-                    is_valid_table = False
-                elif is_column_type and (filter_out_table_with_counter and "counter" in row.type):
-                    is_valid_table = False
-                elif filter_out_cdc_log_tables and getattr(row, column_names[1]).endswith(cdc.options.CDC_LOGTABLE_SUFFIX):
-                    is_valid_table = False
-                elif is_column_type and filter_empty_tables:
-                    current_rows = 0
-                    # Scylls issue https://github.com/scylladb/scylla/issues/7186
-                    # Problem to read from system_schema.dropped_columns, column "dropped_time":
-                    # cassandra.DriverException: Failed decoding result column "dropped_time" of type timestamp:
-                    # date value out of range
-                    if table_name == 'system_schema.dropped_columns':
-                        continue
-
-                    try:
-                        current_rows = cql_session.execute(f"SELECT * FROM {table_name} LIMIT 1").current_rows
-                    except Exception as exc:  # pylint: disable=broad-except
-                        self.log.warning(f'Failed to get rows from {table_name} table. Error: {exc}')
-
-                    if not current_rows:
-                        is_valid_table = False
-
-                if is_valid_table:
-                    result.add(table_name)
-            return result
-
         with self.cql_connection_patient(db_node) as session:
-            regular_table_names = execute_cmd(cql_session=session, entity_type="column")
-            if regular_table_names and filter_out_mv:
-                materialized_view_table_names = execute_cmd(cql_session=session, entity_type="view")
-        if not regular_table_names:
-            return []
+            return self.schema_inventory.get_ks_cf_list(
+                session, filter_out_table_with_counter=filter_out_table_with_counter, filter_out_mv=filter_out_mv,
+                filter_empty_tables=filter_empty_tables, filter_out_system=filter_out_system,
+                filter_out_cdc_log_tables=filter_out_cdc_log_tables)
 
-        return list(regular_table_names - materialized_view_table_names)
+    @cached_property
+    def schema_inventory(self) -> SchemaInventory:
+        return SchemaInventory()
+
+    @cached_property
+    def node_leases(self) -> NodeLeaseManager:
+        return NodeLeaseManager()
 
     def get_all_tables_with_cdc(self, db_node: BaseNode) -> List[str]:
         """Return list of all tables with enabled cdc feature
@@ -3463,6 +3434,7 @@ def wait_for_init_wrap(method):
     Raise exception if setup failed or timeout expired.
     """
     @wraps(method)
+    @traced("wait_for_init", category="cluster")
     def wrapper(*args, **kwargs):
         cl_inst = args[0]
         LOGGER.debug('Class instance: %s', cl_inst)
@@ -3478,7 +3450,8 @@ def wait_for_init_wrap(method):
         def node_setup(_node):
             exception_details = None
             try:
-                cl_inst.node_setup(_node, **setup_kwargs)
+                with span("node_setup", category="node", node=_node.name):
+                    cl_inst.node_setup(_node, **setup_kwargs)
             except Exception as ex:  # pylint: disable=broad-except
                 exception_details = (str(ex), traceback.format_exc())
             _queue.put((_node, exception_details))
@@ -3542,6 +3515,7 @@ class ClusterNodesNotReady(Exception):
 
 class BaseScyllaCluster:  # pylint: disable=too-many-public-methods, too-many-instance-attributes
     node_setup_requires_scylla_restart = True
+    health_check_max_workers = 16
     name: str
     nodes: List[BaseNode]
     params: dict
@@ -3554,6 +3528,12 @@ class BaseScyllaCluster:  # pylint: disable=too-many-public-methods, too-many-in
         self.nemesis_count = 0
         self.test_config = TestConfig()
         self._node_cycle = None
+        self._node_health_checked_at = {}
+        self._node_health_checks = {}
+        self._health_check_executor = None
+        self._health_check_lock = threading.Lock()
+        self.traffic_baseline = None
+        self._traffic_baseline_lock = threading.Lock()
         super().__init__(*args, **kwargs)
 
     def get_node_ips_param(self, public_ip=True):
@@ -3900,7 +3880,7 @@ class BaseScyllaCluster:  # pylint: disable=too-many-public-methods, too-many-in
         info_res = yaml.safe_load(proper_yaml_output)
         return info_res
 
-    def check_cluster_health(self):
+    def check_cluster_health(self, budget: Optional[float] = None, first_nodes: Sequence[BaseNode] = ()):
         # Task 1443: ClusterHealthCheck is bottle neck in scale test and create a lot of noise in 5000 tables test.
         # Disable it
         if not self.params.get('cluster_health_check'):
@@ -3910,8 +3890,7 @@ class BaseScyllaCluster:  # pylint: disable=too-many-public-methods, too-many-in
         # Don't run health check in case parallel nemesis.
         # TODO: find how to recognize, that nemesis on the node is running
         if self.nemesis_count == 1:
-            for node in self.nodes:
-                node.check_node_health()
+            self.check_nodes_health(budget=budget, first_nodes=first_nodes)
         else:
             ClusterHealthValidatorEvent.Info(
                 message="Test runs with parallel nemesis. Nodes health checks are disabled.",
@@ -3920,6 +3899,50 @@ class BaseScyllaCluster:  # pylint: disable=too-many-public-methods, too-many-in
         self.check_nodes_running_nemesis_count()
         ClusterHealthValidatorEvent.Done(message="Cluster health check finished").publish()
 
+    def check_nodes_health(self, budget: Optional[float] = None, first_nodes: Sequence[BaseNode] = ()) -> List[BaseNode]:
+        """Check health of the nodes concurrently and return the nodes which weren't checked within `budget' seconds.
+
+        `first_nodes' are checked first, then the nodes which were checked least recently, so the nodes skipped
+        because of the budget are checked first next time.
+        """
+        nodes = sorted(self.nodes, key=lambda node: (node not in first_nodes,
+                                                     self._node_health_checked_at.get(node.name, 0)))
+        if not nodes:
+            return []
+
+        def check_node_health(node):
+            node.check_node_health()
+            self._node_health_checked_at[node.name] = time.monotonic()
+
+        # Checks which didn't finish within the budget keep running, so one executor is reused to keep the number of
+        # the threads bounded, and the nodes are skipped until their previous check is finished.
+        with self._health_check_lock:
+            if self._health_check_executor is None:
+                self._health_check_executor = ThreadPoolExecutor(max_workers=self.health_check_max_workers,
+                                                                 thread_name_prefix="NodeHealthCheck")
+            still_running = [node for node in nodes
+                             if (future := self._node_health_checks.get(node.name)) and not future.done()]
+            futures = {self._health_check_executor.submit(check_node_health, node): node
+                       for node in nodes if node not in still_running}
+            self._node_health_checks.update((node.name, future) for future, node in futures.items())
+        if still_running:
+            self.log.warning("Previous health check of the nodes is still running, skip them: %s",
+                             ", ".join(node.name for node in still_running))
+        _, not_done = wait_futures(futures, timeout=budget)
+        for future in not_done:
+            future.cancel()
+        for future, node in futures.items():
+            if future in not_done or future.exception() is None:
+                continue
+            self.log.error("Failed to check health of the node `%s': %s", node.name, future.exception())
+        skipped_nodes = still_running + [futures[future] for future in not_done]
+        if skipped_nodes:
+            ClusterHealthValidatorEvent.Info(
+                message=f"Health check of {len(skipped_nodes)} nodes didn't finish within {budget}s budget: "
+                        f"{', '.join(node.name for node in skipped_nodes)}",
+            ).publish()
+        return skipped_nodes
+
     def check_nodes_running_nemesis_count(self):
         nodes_running_nemesis = [node for node in self.nodes if node.running_nemesis]
 
@@ -3988,6 +4011,7 @@ class BaseScyllaCluster:  # pylint: disable=too-many-public-methods, too-many-in
 
     @retrying(n=60, sleep_time=3, allowed_exceptions=NETWORK_EXCEPTIONS + (ClusterNodesNotReady,),
               message="Waiting for nodes to join the cluster")
+    @traced(category="cluster")
     def wait_for_nodes_up_and_normal(self, nodes=None, verification_node=None):
         self.check_nodes_up_and_normal(nodes=nodes, verification_node=verification_node)
 
@@ -4084,6 +4108,30 @@ class BaseScyllaCluster:  # pylint: disable=too-many-public-methods, too-many-in
         for nemesis_thread in self.nemesis_threads:
             nemesis_thread.join(timeout)
         self.nemesis_threads = []
+        with self._traffic_baseline_lock:
+            if self.traffic_baseline is not None:
+                self.traffic_baseline.stop()
+                self.traffic_baseline = None
+        with self._health_check_lock:
+            if self._health_check_executor is not None:
+                self._health_check_executor.shutdown(wait=False, cancel_futures=True)
+                self._health_check_executor = None
+
+    def start_traffic_baseline(self, monitoring_set) -> Optional[TrafficBaseline]:
+        """Start tracking network bandwidth of the nodes and preparing them for traffic control, once."""
+        with self._traffic_baseline_lock:
+            if self.traffic_baseline is None and monitoring_set and monitoring_set.nodes:
+                self.traffic_baseline = TrafficBaseline(
+                    prometheus=PrometheusDBStats(host=monitoring_set.nodes[0].external_address),
+                    nodes=lambda: self.nodes,
+                    prepare_node=self._prepare_node_for_traffic_control)
+                self.traffic_baseline.start()
+            return self.traffic_baseline
+
+    @staticmethod
+    def _prepare_node_for_traffic_control(node):
+        if hasattr(node, "install_traffic_control"):
+            node.install_traffic_control()
 
     def node_config_setup(self, node, seed_address=None,  # pylint: disable=too-many-arguments,invalid-name
                           endpoint_snitch=None, murmur3_partitioner_ignore_msb_bits=None, client_encrypt=None):
@@ -4303,11 +4351,40 @@ class BaseScyllaCluster:  # pylint: disable=too-many-public-methods, too-many-in
         if random_order:
             random.shuffle(nodes_to_restart)
         self.log.info("Going to restart Scylla on %s", [n.name for n in nodes_to_restart])
-        for node in nodes_to_restart:
+
+        def restart(node):
             node.stop_scylla(verify_down=True)
             node.start_scylla(verify_up=True)
             self.log.debug("'%s' restarted.", node.name)
 
+        self.run_rolling_operation("restart_scylla", restart, nodes=nodes_to_restart)
+
+    def run_rolling_operation(self, name: str, operation: Callable, nodes=None,
+                              concurrency: Optional[int] = None) -> List[RollingStep]:
+        """Run `operation(node)' on the nodes rack by rack, `rolling_operation_concurrency' nodes of a rack at a time.
+
+        Nodes of a DC which has a single rack are processed one at a time.  Before each node the other nodes must be
+        UN, after it the node must be UN.  Raise RollingOperationFailed on the first failure.
+        """
+        if concurrency is None:
+            concurrency = self.params.get('rolling_operation_concurrency')
+        if concurrency is None:
+            concurrency = 1
+        return RollingExecutor(name=name, nodes=nodes or self.nodes, operation=operation, concurrency=concurrency,
+                               readiness_check=self.is_node_up_and_normal,
+                               health_check=self.are_nodes_up_and_normal_except).run()
+
+    def is_node_up_and_normal(self, node) -> bool:
+        self.check_nodes_up_and_normal(nodes=[node])
+        return True
+
+    def are_nodes_up_and_normal_except(self, busy_nodes) -> bool:
+        """Whether all nodes but `busy_nodes' are UN according to one of them."""
+        nodes = [node for node in self.nodes if node not in busy_nodes]
+        if nodes:
+            self.check_nodes_up_and_normal(nodes=nodes, verification_node=random.choice(nodes))
+        return True
+
     def get_seed_selected_by_reflector(self, node=None):
         """
         Check if reflector updated the scylla.yaml with selected seed IP
@@ -16,7 +16,6 @@
 import os
 import re
 import json
-import time
 import uuid
 import base64
 import random
@@ -24,7 +23,6 @@ import logging
 import tempfile
 from math import floor
 from typing import Dict, Optional
-from datetime import datetime
 from textwrap import dedent
 from functools import cached_property
 from contextlib import ExitStack
@@ -41,9 +39,12 @@ from sdcm.ec2_client import CreateSpotInstancesError
 from sdcm.utils.aws_utils import tags_as_ec2_tags, ec2_instance_wait_public_ip
 from sdcm.utils.common import list_instances_aws, get_ami_tags, MAX_SPOT_DURATION_TIME
 from sdcm.utils.decorators import retrying
-from sdcm.sct_events.system import SpotTerminationEvent
+from sdcm.utils.spot_watcher import (INSTANCE_ACTION, NOTICE_PREFIX, SpotInterruptionWatcher, SpotNotice,
+                                     parse_notice_line)
+from sdcm.sct_events.system import SpotTerminationEvent, SpotRebalanceRecommendationEvent
 from sdcm.sct_events.filters import DbEventsFilter
 from sdcm.sct_events.database import DatabaseLogEvent
+from sdcm.wait import WaitTimeoutError, wait_until
 
 LOGGER = logging.getLogger(__name__)
 
@@ -467,6 +468,7 @@ class AWSNode(cluster.BaseNode):
     """
 
     log = LOGGER
+    INSTANCE_WAIT_TIMEOUT = 1200  # the deadline of _instance_wait_safe() retries, including calls of AWS waiters
 
     def __init__(self, ec2_instance, ec2_service, credentials, parent_cluster,  # pylint: disable=too-many-arguments
                  node_prefix='node', node_index=1, ami_username='root',
@@ -475,6 +477,7 @@ class AWSNode(cluster.BaseNode):
         self._instance = ec2_instance
         self._ec2_service = ec2_service
         self._eth1_private_ip_address = None
+        self._traffic_control_ready = False
         self.eip_allocation_id = None
         ssh_login_info = {'hostname': None,
                           'user': ami_username,
@@ -555,14 +558,32 @@ class AWSNode(cluster.BaseNode):
         if '404 - Not Found' in status:
             return 0
 
-        self.log.warning('Got spot termination notification from AWS %s', status)
-        terminate_action = json.loads(status)
-        terminate_action_timestamp = time.mktime(datetime.strptime(
-            terminate_action['time'], "%Y-%m-%dT%H:%M:%SZ").timetuple())
-        next_check_delay = terminate_action['time-left'] = terminate_action_timestamp - time.time()
-        SpotTerminationEvent(node=self, message=terminate_action).publish()
+        notice = parse_notice_line(f"{NOTICE_PREFIX} {INSTANCE_ACTION} {status}")
+        self.handle_spot_notice(notice)
+        if notice.time_left is None:  # unexpected metadata, no termination time to wait for
+            return 0
+        return max(notice.time_left - SPOT_TERMINATION_CHECK_OVERHEAD, 0)
+
+    def handle_spot_notice(self, notice: SpotNotice) -> None:
+        if notice.kind == INSTANCE_ACTION:
+            self.log.warning('Got spot termination notification from AWS %s', notice.detail)
+            message = dict(notice.detail, **{'time-left': notice.time_left})
+            SpotTerminationEvent(node=self, message=message).publish()
+        else:
+            self.log.warning('Got rebalance recommendation from AWS %s', notice.detail)
+            SpotRebalanceRecommendationEvent(node=self, message=notice.detail).publish()
 
-        return max(next_check_delay - SPOT_TERMINATION_CHECK_OVERHEAD, 0)
+    def spot_monitoring_thread(self):
+        """Keep the spot watcher agent running on the node, it reports notices as soon as they appear."""
+        watcher = SpotInterruptionWatcher(callback=self.handle_spot_notice)
+        while not self.termination_event.is_set():
+            try:
+                self.wait_ssh_up(verbose=False)
+                watcher.watch(self.remoter)
+            except Exception as ex:  # pylint: disable=broad-except
+                self.log.warning("Unable to run spot watcher on '%s'. Probably the node was terminated or is still "
+                                 "booting. Error details: '%s'", self.name, ex)
+                self.termination_event.wait(cluster.SPOT_TERMINATION_CHECK_DELAY)
 
     @property
     def is_data_device_lost_after_reboot(self) -> bool:
@@ -625,19 +646,15 @@ class AWSNode(cluster.BaseNode):
         :see: [1] http://docs.aws.amazon.com/AWSEC2/latest/APIReference/query-api-troubleshooting.html#eventual-consistency
         :see: [2] http://docs.aws.amazon.com/general/latest/gr/api-retries.html
         """
-        threshold = 300
-        ok = False
-        retries = 0
-        max_retries = 9
-        while not ok and retries <= max_retries:
-            try:
-                instance_method(*args, **kwargs)
-                ok = True
-            except WaiterError:
-                time.sleep(min((2 ** retries) * 2, threshold))
-                retries += 1
+        def call_instance_method():
+            instance_method(*args, **kwargs)
+            return True
 
-        if not ok:
+        try:
+            wait_until(call_instance_method, timeout=self.INSTANCE_WAIT_TIMEOUT,
+                       text=f"{instance_method.__name__} of {self._instance.id}",
+                       initial_delay=2, max_delay=60, allowed_exceptions=(WaiterError, ))
+        except WaitTimeoutError:
             try:
                 self._instance.reload()
             except Exception as ex:  # pylint: disable=broad-except
@@ -811,11 +828,15 @@ class AWSNode(cluster.BaseNode):
             self.remoter.run('sudo bash -cxe "%s"' % tc_command)
 
     def install_traffic_control(self):
+        if self._traffic_control_ready:
+            return True
+
         if self.distro.is_amazon2:
             self.log.debug("Installing iproute-tc package for AMAZON2")
             self.remoter.run("sudo yum install -y iproute-tc", ignore_status=True)
 
-        return self.remoter.run("/sbin/tc -h", ignore_status=True).ok
+        self._traffic_control_ready = self.remoter.run("/sbin/tc -h", ignore_status=True).ok
+        return self._traffic_control_ready
 
     @property
     def image(self):
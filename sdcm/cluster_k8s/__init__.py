@@ -2217,10 +2217,10 @@ class ScyllaPodCluster(cluster.BaseScyllaCluster, PodCluster):  # pylint: disabl
                 )
             os.remove(tmp.name)
 
-    def check_cluster_health(self):
+    def check_cluster_health(self, *args, **kwargs):
         if self.params.get('k8s_deploy_monitoring'):
             self._check_kubernetes_monitoring_health()
-        super().check_cluster_health()
+        super().check_cluster_health(*args, **kwargs)
 
     def _check_kubernetes_monitoring_health(self):
         self.log.debug('Check kubernetes monitoring health')
@@ -14,6 +14,7 @@
 import os
 import re
 import time
+import tempfile
 from abc import abstractmethod
 from typing import List, Optional, Dict
 from datetime import datetime
@@ -23,9 +24,15 @@ from dataclasses import dataclass
 
 from sdcm.log import SDCMAdapter
 from sdcm.remote import NETWORK_EXCEPTIONS
+from sdcm.remote.remote_base import RemoteCmdRunnerBase
 from sdcm.utils.decorators import timeout
 from sdcm.sct_events.system import CoreDumpEvent
 from sdcm.sct_events.decorators import raise_event_on_failure
+from sdcm.test_config import TestConfig
+from sdcm.utils.stream_upload import S3StreamUploader, read_chunks
+
+# Extensions of cores which are compressed already, the first ones are used by systemd-coredump
+COMPRESSED_COREDUMP_EXTENSIONS = ('.lz4', '.xz', '.zst', '.zip', '.gz', '.gzip')
 
 
 # pylint: disable=too-many-instance-attributes
@@ -86,6 +93,8 @@ class CoredumpThreadBase(Thread):  # pylint: disable=too-many-instance-attribute
     lookup_period = 30
     upload_retry_limit = 3
     max_coredump_thread_exceptions = 10
+    streaming_upload_bucket = 'cloudius-jenkins-test'
+    streaming_upload_workers = 4
 
     def __init__(self, node: 'BaseNode', max_core_upload_limit: int):
         self.node = node
@@ -213,6 +222,73 @@ class CoredumpThreadBase(Thread):  # pylint: disable=too-many-instance-attribute
         download_instructions = 'gsutil cp gs://%s .\ngunzip %s' % (upload_url, coredump)
         core_info.download_url, core_info.download_instructions = download_url, download_instructions
 
+    @cached_property
+    def streaming_upload(self) -> bool:
+        parent_cluster = getattr(self.node, 'parent_cluster', None)
+        if not parent_cluster or not parent_cluster.params.get('coredump_streaming_upload'):
+            return False
+        # Streaming requires a binary stdout of a remote command, which is available for SSH remoters only
+        return isinstance(self.node.remoter, RemoteCmdRunnerBase)
+
+    def _get_dump_command(self, core_info: CoreDumpInfo) -> str:
+        """
+        Command which writes the core to stdout
+        """
+        return f'sudo cat {core_info.corefile}'
+
+    @staticmethod
+    def _is_dump_compressed(core_info: CoreDumpInfo) -> bool:
+        return core_info.corefile.endswith(COMPRESSED_COREDUMP_EXTENSIONS)
+
+    @classmethod
+    def _get_streamed_file_name(cls, core_info: CoreDumpInfo) -> str:
+        file_name = os.path.basename(core_info.corefile)
+        if cls._is_dump_compressed(core_info):
+            return file_name
+        # The dump is decompressed (e.g. by coredumpctl), so replace the original compression extension
+        for extension in COMPRESSED_COREDUMP_EXTENSIONS:
+            if file_name.endswith(extension):
+                file_name = file_name[:-len(extension)]
+                break
+        return file_name + '.gz'
+
+    def _stream_coredump(self, core_info: CoreDumpInfo):
+        """
+        Pipe the core through pigz directly to S3 multipart upload, without saving compressed core on node's disk
+        """
+        import boto3  # pylint: disable=import-outside-toplevel
+
+        if not self._is_pigz_installed:
+            self._install_pigz()
+        dump_command = self._get_dump_command(core_info)
+        file_name = self._get_streamed_file_name(core_info)
+        if not self._is_dump_compressed(core_info):
+            dump_command += ' | pigz --fast --stdout'
+        key = f'{TestConfig.test_id()}/coredumps/{self.node.name}/{file_name}'
+        uploader = S3StreamUploader(s3_client=boto3.client('s3'), bucket=self.streaming_upload_bucket, key=key,
+                                    workers=self.streaming_upload_workers)
+        self.log.info('Streaming coredump %s to %s', core_info, uploader.url)
+        with tempfile.TemporaryFile() as stderr:
+            process = self.node.remoter.popen(f'set -o pipefail; {dump_command}', stderr=stderr)
+
+            def read_dump():
+                yield from read_chunks(process.stdout, uploader.part_size)
+                if process.wait():
+                    stderr.seek(0)
+                    raise RuntimeError(f"Failed to dump {core_info} (exit code {process.returncode}): "
+                                       f"{stderr.read().decode(errors='replace')}")
+            try:
+                uploader.upload(read_dump())
+            finally:
+                if process.poll() is None:
+                    process.kill()
+                process.wait()
+        self.log.info("You can download it by %s (available for ScyllaDB employee)", uploader.url)
+        download_instructions = f'aws s3 cp s3://{self.streaming_upload_bucket}/{key} .'
+        if file_name.endswith('.gz'):
+            download_instructions += f'\ngunzip {file_name}'
+        core_info.download_url, core_info.download_instructions = uploader.url, download_instructions
+
     def upload_coredump(self, core_info: CoreDumpInfo):
         if core_info.download_url:
             return False
@@ -222,7 +298,10 @@ class CoredumpThreadBase(Thread):  # pylint: disable=too-many-instance-attribute
         try:
             self.log.debug(f'Start uploading file: {core_info.corefile}')
             core_info.download_instructions = 'Coredump upload in progress'
-            self._upload_coredump(core_info)
+            if self.streaming_upload:
+                self._stream_coredump(core_info)
+            else:
+                self._upload_coredump(core_info)
             return True
         except Exception as exc:  # pylint: disable=broad-except
             core_info.download_instructions = 'failed to upload core'
@@ -248,10 +327,8 @@ class CoredumpThreadBase(Thread):  # pylint: disable=too-many-instance-attribute
             raise RuntimeError("Distro is not supported")
 
     def _pack_coredump(self, coredump: str) -> str:
-        extensions = ['.lz4', '.zip', '.gz', '.gzip']
-        for extension in extensions:
-            if coredump.endswith(extension):
-                return coredump
+        if coredump.endswith(COMPRESSED_COREDUMP_EXTENSIONS):
+            return coredump
         if not self._is_pigz_installed:
             self._install_pigz()
         try:  # pylint: disable=unreachable
@@ -390,6 +467,14 @@ class CoredumpExportSystemdThread(CoredumpThreadBase):
         core_info.update(executable=executable, command_line=command_line, corefile=corefile, timestamp=timestamp,
                          coredump_info=coredump_info)
 
+    def _get_dump_command(self, core_info: CoreDumpInfo) -> str:
+        return f'sudo coredumpctl dump --no-pager {core_info.pid}'
+
+    @staticmethod
+    def _is_dump_compressed(core_info: CoreDumpInfo) -> bool:
+        # coredumpctl decompresses the core even if it's stored compressed
+        return False
+
     # @retrying(n=10, sleep_time=20, allowed_exceptions=NETWORK_EXCEPTIONS,
     #           message="Retrying on getting coredump backtrace")
     def _get_coredumpctl_info(self, core_info: CoreDumpInfo):
@@ -21,14 +21,14 @@ import logging
 import json
 from textwrap import dedent
 from math import sqrt
-from typing import Optional
+from typing import List, Optional
 from functools import cached_property
 from collections import defaultdict
 
 import yaml
 import requests
 
-from sdcm.es import ES
+from sdcm.es import ES, ESBulkWriter, get_bulk_writer
 from sdcm.test_config import TestConfig
 from sdcm.utils.common import get_job_name, normalize_ipv6_url
 from sdcm.utils.decorators import retrying
@@ -364,41 +364,61 @@ class Stats:
             ElasticsearchEvent(doc_id=self._test_id, error=str(exc)).publish()
             return None
 
-    def create(self) -> None:
+    @cached_property
+    def es_writer(self) -> Optional[ESBulkWriter]:
         if not self.elasticsearch:
+            return None
+        return get_bulk_writer(es_client=self.elasticsearch,
+                               retry_file=os.path.join(self.test_config.logdir(), "es_retry_queue.jsonl"))
+
+    def create(self) -> None:
+        if not self.es_writer:
             LOGGER.error("Failed to create test stats: ES connection is not created (doc_id=%s)", self._test_id)
             return
-        try:
-            self.elasticsearch.create_doc(
-                index=self._test_index,
-                doc_type=self._es_doc_type,
-                doc_id=self._test_id,
-                body=self._stats,
-            )
-        except Exception as exc:  # pylint: disable=broad-except
-            LOGGER.exception("Failed to create test stats (doc_id=%s)", self._test_id)
-            ElasticsearchEvent(doc_id=self._test_id, error=str(exc)).publish()
+        self.es_writer.update(
+            index=self._test_index,
+            doc_type=self._es_doc_type,
+            doc_id=self._test_id,
+            body=self._stats,
+            upsert=True,
+        )
 
     def update(self, data: dict) -> None:
-        if not self.elasticsearch:
+        if not self.es_writer:
             LOGGER.error("Failed to update test stats: ES connection is not created (doc_id=%s)", self._test_id)
             return
-        try:
-            self.elasticsearch.update_doc(
-                index=self._test_index,
-                doc_type=self._es_doc_type,
-                doc_id=self._test_id,
-                body=data,
-            )
-        except Exception as exc:  # pylint: disable=broad-except
-            LOGGER.exception("Failed to update test stats (doc_id=%s)", self._test_id)
-            ElasticsearchEvent(doc_id=self._test_id, error=str(exc)).publish()
+        self.es_writer.update(
+            index=self._test_index,
+            doc_type=self._es_doc_type,
+            doc_id=self._test_id,
+            body=data,
+        )
+
+    def append(self, path: List[str], item, counter: Optional[str] = None) -> None:
+        """Append an item to a list in the test stats document without resending the whole list."""
+        if not self.es_writer:
+            LOGGER.error("Failed to update test stats: ES connection is not created (doc_id=%s)", self._test_id)
+            return
+        self.es_writer.append(
+            index=self._test_index,
+            doc_type=self._es_doc_type,
+            doc_id=self._test_id,
+            path=path,
+            item=item,
+            counter=counter,
+        )
+
+    def flush(self, timeout: float = 60) -> None:
+        """Wait for all pending writes to the test stats document."""
+        if self.es_writer and not self.es_writer.flush(timeout=timeout):
+            LOGGER.warning("Not all test stats were sent to ES in %s seconds (doc_id=%s)", timeout, self._test_id)
 
     def exists(self) -> Optional[bool]:
         if not self.elasticsearch:
             LOGGER.error("Failed to check for test stats existence: ES connection is not created (doc_id=%s)",
                          self._test_id)
             return None
+        self.flush()
         try:
             return self.elasticsearch.exists(
                 index=self._test_index,
@@ -732,6 +752,7 @@ class TestStatsMixin(Stats):
             if not self.elasticsearch:
                 LOGGER.error("Failed to get test stats: ES connection is not created (doc_id=%s)", self._test_id)
                 return None
+            self.flush()
             try:
                 result = self.elasticsearch.get_doc(
                     index=self._test_index,
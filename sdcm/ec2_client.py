@@ -2,6 +2,12 @@ import logging
 import datetime
 import time
 import base64
+import random
+import threading
+from collections import Counter
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 
 import boto3
 from mypy_boto3_ec2 import EC2Client, EC2ServiceResource
@@ -18,6 +24,9 @@ FLEET_LIMIT_EXCEEDED_ERROR = 'spotInstanceCountLimitExceeded'
 SPOT_CAPACITY_NOT_AVAILABLE_ERROR = 'capacity-not-available'
 MAX_SPOT_EXCEEDED_ERROR = 'MaxSpotInstanceCountExceeded'
 REQUEST_TIMEOUT = 300
+SPOT_REQUEST_TRACKER_MARGIN = 60  # time to wait for a result of the tracker after the deadline of a request
+SPOT_REQUEST_FAIL_FAST_ERRORS = (SPOT_PRICE_TOO_LOW, SPOT_CAPACITY_NOT_AVAILABLE_ERROR, )
+FLEET_REQUEST_FAIL_FAST_ERRORS = (FLEET_LIMIT_EXCEEDED_ERROR, SPOT_CAPACITY_NOT_AVAILABLE_ERROR, )
 
 
 class GetSpotPriceHistoryError(Exception):
@@ -40,6 +49,181 @@ class CreateSpotFleetError(ClientError):
     pass
 
 
+@dataclass
+class SpotRequestWaiter:
+    request_ids: List[str]
+    fleet: bool
+    deadline: float
+    future: Future = field(default_factory=Future)
+    last_response: Optional[dict] = None
+
+
+class SpotRequestTracker(threading.Thread):
+    """Wait for all outstanding spot instance and spot fleet requests of a region together.
+
+    Each tick, state of all tracked requests is fetched by one describe call per request type (per
+    `describe_batch_size' requests), so the number of EC2 API calls doesn't depend on the number of provisioning
+    threads.  The interval between ticks grows exponentially with jitter while requests are pending and starts from
+    `min_interval' again when a new request is added.  Waiters get `(status, response)' of their requests through a
+    future, as soon as all requests are fulfilled, one of them failed with a capacity/price error, or on timeout.
+    """
+
+    min_interval = 2
+    max_interval = 30
+    describe_batch_size = 200  # max number of values of a filter
+
+    def __init__(self, client: EC2Client, region_name: Optional[str] = None):
+        super().__init__(name=f"SpotRequestTracker-{region_name}", daemon=True)
+        self._client = client
+        self._waiters: List[SpotRequestWaiter] = []
+        self._lock = threading.Lock()
+        self._new_waiter = threading.Event()
+        self._attempt = 0
+        self.api_calls = Counter()
+
+    def wait_for_spot_requests(self, request_ids: List[str], timeout: float) -> Future:
+        return self._add_waiter(SpotRequestWaiter(request_ids=list(request_ids), fleet=False,
+                                                  deadline=time.perf_counter() + timeout))
+
+    def wait_for_fleet_request(self, request_id: str, timeout: float) -> Future:
+        return self._add_waiter(SpotRequestWaiter(request_ids=[request_id], fleet=True,
+                                                  deadline=time.perf_counter() + timeout))
+
+    def _add_waiter(self, waiter: SpotRequestWaiter) -> Future:
+        with self._lock:
+            self._waiters.append(waiter)
+            self._attempt = 0
+        self._new_waiter.set()
+        return waiter.future
+
+    def _next_interval(self) -> float:
+        with self._lock:
+            interval = min(self.max_interval, self.min_interval * 2 ** self._attempt)
+            self._attempt += 1
+        return random.uniform(interval / 2, interval)
+
+    def run(self) -> None:
+        next_tick = None  # no requests to check
+        while True:
+            timeout = None if next_tick is None else max(0.0, next_tick - time.perf_counter())
+            if self._new_waiter.wait(timeout):
+                self._new_waiter.clear()
+                # Check a new request after the shortest interval, unless the next check is even sooner.
+                new_request_tick = time.perf_counter() + self._next_interval()
+                next_tick = new_request_tick if next_tick is None else min(next_tick, new_request_tick)
+                continue
+            try:
+                self._tick()
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception("Failed to check state of spot requests")
+            with self._lock:
+                has_waiters = bool(self._waiters)
+            next_tick = time.perf_counter() + self._next_interval() if has_waiters else None
+
+    def _tick(self) -> None:
+        with self._lock:
+            waiters = list(self._waiters)
+        spot_requests, fleet_requests = {}, {}
+        try:
+            spot_requests = self._describe_spot_requests(
+                [request_id for waiter in waiters if not waiter.fleet for request_id in waiter.request_ids])
+            fleet_requests = self._describe_fleet_requests(
+                [request_id for waiter in waiters if waiter.fleet for request_id in waiter.request_ids])
+        except ClientError as exc:
+            LOGGER.warning("Failed to describe spot requests, will retry: %s", exc)
+        for waiter in waiters:
+            try:
+                if waiter.fleet:
+                    status, resp = self._check_fleet_request(waiter.request_ids[0], fleet_requests)
+                else:
+                    status, resp = self._check_spot_requests(waiter.request_ids, spot_requests)
+            except Exception as exc:  # pylint: disable=broad-except
+                # Don't let one request stall the others, and keep its deadline.
+                LOGGER.warning("Failed to check state of spot requests %s, will retry: %s", waiter.request_ids, exc)
+                status, resp = None, None
+            if status is None:
+                if time.perf_counter() < waiter.deadline:
+                    waiter.last_response = resp or waiter.last_response
+                    continue
+                status, resp = False, resp or waiter.last_response
+            self._remove_waiter(waiter)
+            waiter.future.set_result((status, resp))
+
+    def _remove_waiter(self, waiter: SpotRequestWaiter) -> None:
+        with self._lock:
+            self._waiters.remove(waiter)
+
+    def _describe_spot_requests(self, request_ids: List[str]) -> Dict[str, dict]:
+        requests = {}
+        for idx in range(0, len(request_ids), self.describe_batch_size):
+            # Use a filter, since describe with SpotInstanceRequestIds fails if some of requests aren't visible yet.
+            self.api_calls["describe_spot_instance_requests"] += 1
+            resp = self._client.describe_spot_instance_requests(Filters=[{
+                "Name": "spot-instance-request-id",
+                "Values": request_ids[idx:idx + self.describe_batch_size],
+            }])
+            requests.update({req["SpotInstanceRequestId"]: req for req in resp["SpotInstanceRequests"]})
+        return requests
+
+    def _describe_fleet_requests(self, request_ids: List[str]) -> Dict[str, dict]:
+        requests = {}
+        for idx in range(0, len(request_ids), self.describe_batch_size):
+            self.api_calls["describe_spot_fleet_requests"] += 1
+            resp = self._client.describe_spot_fleet_requests(
+                SpotFleetRequestIds=request_ids[idx:idx + self.describe_batch_size])
+            requests.update({req["SpotFleetRequestId"]: req for req in resp["SpotFleetRequestConfigs"]})
+        return requests
+
+    @staticmethod
+    def _check_spot_requests(request_ids: List[str], requests: Dict[str, dict]) -> Tuple[Optional[bool], dict]:
+        """Return status of the requests: True if all are fulfilled, False if failed, None if still pending."""
+        reqs = [requests[request_id] for request_id in request_ids if request_id in requests]
+        resp = {"SpotInstanceRequests": reqs} if reqs else None
+        for req in reqs:
+            if req["Status"]["Code"] in SPOT_REQUEST_FAIL_FAST_ERRORS:
+                return False, req["Status"]["Code"]
+        if len(reqs) < len(request_ids) or \
+                any(req["Status"]["Code"] != STATUS_FULFILLED or req["State"] != "active" for req in reqs):
+            return None, resp
+        return True, resp
+
+    def _check_fleet_request(self, request_id: str, requests: Dict[str, dict]) -> Tuple[Optional[bool], dict]:
+        """Return status of the fleet request: True if fulfilled, False if failed, None if still pending."""
+        req = requests.get(request_id)
+        if req is None:
+            return None, None
+        resp = {"SpotFleetRequestConfigs": [req]}
+        if req["SpotFleetRequestState"] == "active" and req.get("ActivityStatus") == STATUS_FULFILLED:
+            return True, resp
+        if req.get("ActivityStatus") == SPOT_STATUS_UNEXPECTED_ERROR:
+            current_time = datetime.datetime.now().timetuple()
+            search_start_time = datetime.datetime(current_time.tm_year, current_time.tm_mon, current_time.tm_mday)
+            self.api_calls["describe_spot_fleet_request_history"] += 1
+            resp = self._client.describe_spot_fleet_request_history(SpotFleetRequestId=request_id,
+                                                                    StartTime=search_start_time,
+                                                                    MaxResults=10)
+            LOGGER.debug('Fleet request error history: %s', resp)
+            errors = [i['EventInformation']['EventSubType'] for i in resp['HistoryRecords']]
+            for error in FLEET_REQUEST_FAIL_FAST_ERRORS:
+                if error in errors:
+                    return False, error
+        return None, resp
+
+
+_SPOT_REQUEST_TRACKERS: Dict[Optional[str], SpotRequestTracker] = {}
+_SPOT_REQUEST_TRACKERS_LOCK = threading.Lock()
+
+
+def get_spot_request_tracker(region_name: Optional[str], client: EC2Client) -> SpotRequestTracker:
+    """Return the process-wide spot request tracker of the region, start it on first call."""
+    with _SPOT_REQUEST_TRACKERS_LOCK:
+        tracker = _SPOT_REQUEST_TRACKERS.get(region_name)
+        if tracker is None or not tracker.is_alive():
+            tracker = _SPOT_REQUEST_TRACKERS[region_name] = SpotRequestTracker(client=client, region_name=region_name)
+            tracker.start()
+        return tracker
+
+
 class EC2ClientWarpper():
 
     def __init__(self, timeout=REQUEST_TIMEOUT, region_name=None, spot_max_price_percentage=None):
@@ -48,7 +232,6 @@ class EC2ClientWarpper():
         self.region_name = region_name
         self._timeout = timeout  # request timeout in seconds
         self._price_index = 1.5
-        self._wait_interval = 5  # seconds
         self.spot_max_price_percentage = spot_max_price_percentage
 
     def _get_ec2_client(self, region_name=None) -> EC2Client:
@@ -147,17 +330,13 @@ class EC2ClientWarpper():
         LOGGER.info('Spot bid price: %s', price)
         return price
 
-    def _is_request_fulfilled(self, request_ids):
-        """
-        Check request status
-        """
-        resp = self._client.describe_spot_instance_requests(SpotInstanceRequestIds=request_ids)
-        for req in resp['SpotInstanceRequests']:
-            if req['Status']['Code'] != STATUS_FULFILLED or req['State'] != 'active':
-                if req['Status']['Code'] in [SPOT_PRICE_TOO_LOW, SPOT_CAPACITY_NOT_AVAILABLE_ERROR]:
-                    return False, req['Status']['Code']
-                return False, resp
-        return True, resp
+    def _wait_for_tracker(self, future: Future, request_ids: List[str]) -> Tuple[bool, Optional[dict]]:
+        """Return result of the spot request tracker, or failure if the tracker didn't give it after the deadline."""
+        try:
+            return future.result(timeout=self._timeout + SPOT_REQUEST_TRACKER_MARGIN)
+        except FutureTimeoutError:
+            LOGGER.error("Spot request tracker didn't report state of %s in %ss", request_ids, self._timeout)
+            return False, None
 
     def _wait_for_request_done(self, request_ids):
         """
@@ -166,43 +345,15 @@ class EC2ClientWarpper():
         :return: list of spot instance id-s
         """
         LOGGER.info('Waiting for spot instances...')
-        timeout = 0
-        status = False
-        while not status and timeout < self._timeout:
-            time.sleep(self._wait_interval)
-            status, resp = self._is_request_fulfilled(request_ids)
-            LOGGER.debug("%s: [%s] - %s", request_ids, status, resp)
-            if not status and resp in [SPOT_PRICE_TOO_LOW, SPOT_CAPACITY_NOT_AVAILABLE_ERROR]:
-                break
-            timeout += self._wait_interval
+        tracker = get_spot_request_tracker(self.region_name, self._client)
+        status, resp = self._wait_for_tracker(tracker.wait_for_spot_requests(request_ids, timeout=self._timeout),
+                                              request_ids)
+        LOGGER.debug("%s: [%s] - %s", request_ids, status, resp)
         if not status:
             self._client.cancel_spot_instance_requests(SpotInstanceRequestIds=request_ids)
             return [], resp
         return [req['InstanceId'] for req in resp['SpotInstanceRequests']], resp
 
-    def _is_fleet_request_fulfilled(self, request_id):
-        """
-        Check fleet request status
-        """
-        resp = self._client.describe_spot_fleet_requests(SpotFleetRequestIds=[request_id])
-        for req in resp['SpotFleetRequestConfigs']:
-            if req['SpotFleetRequestState'] != 'active' or 'ActivityStatus' not in req or\
-                    req['ActivityStatus'] != STATUS_FULFILLED:
-                if 'ActivityStatus' in req and req['ActivityStatus'] == SPOT_STATUS_UNEXPECTED_ERROR:
-                    current_time = datetime.datetime.now().timetuple()
-                    search_start_time = datetime.datetime(
-                        current_time.tm_year, current_time.tm_mon, current_time.tm_mday)
-                    resp = self._client.describe_spot_fleet_request_history(SpotFleetRequestId=request_id,
-                                                                            StartTime=search_start_time,
-                                                                            MaxResults=10)
-                    LOGGER.debug('Fleet request error history: %s', resp)
-                    errors = [i['EventInformation']['EventSubType'] for i in resp['HistoryRecords']]
-                    for error in [FLEET_LIMIT_EXCEEDED_ERROR, SPOT_CAPACITY_NOT_AVAILABLE_ERROR]:
-                        if error in errors:
-                            return False, error
-                return False, resp
-        return True, resp
-
     def _wait_for_fleet_request_done(self, request_id):
         """
         Wait for spot fleet request fulfilled
@@ -210,14 +361,9 @@ class EC2ClientWarpper():
         :return: list of spot instance id-s
         """
         LOGGER.info('Waiting for spot fleet...')
-        timeout = 0
-        status = False
-        while not status and timeout < self._timeout:
-            time.sleep(self._wait_interval)
-            status, resp = self._is_fleet_request_fulfilled(request_id)
-            if not status and resp in [FLEET_LIMIT_EXCEEDED_ERROR, SPOT_CAPACITY_NOT_AVAILABLE_ERROR]:
-                break
-            timeout += self._wait_interval
+        tracker = get_spot_request_tracker(self.region_name, self._client)
+        status, resp = self._wait_for_tracker(tracker.wait_for_fleet_request(request_id, timeout=self._timeout),
+                                              [request_id])
         if not status:
             self._client.cancel_spot_fleet_requests(SpotFleetRequestIds=[request_id], TerminateInstances=True)
             return [], resp
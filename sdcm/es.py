@@ -1,4 +1,11 @@
+import os
+import json
+import time
+import queue
 import logging
+import datetime
+import threading
+from typing import List, Optional
 
 import elasticsearch
 
@@ -69,3 +76,192 @@ class ES(elasticsearch.Elasticsearch):
         """
         if self.get_doc(index, doc_id, doc_type):
             self.delete(index=index, doc_type=doc_type, id=doc_id)
+
+
+class ESBulkWriter:
+    """
+    Send documents to Elasticsearch in background using the bulk API.
+
+    All writes are queued and flushed by a single daemon thread, so callers (test and nemesis threads) never wait
+    for Elasticsearch.  Actions which failed to be sent because of a connection problem or a transient error (429 and
+    5xx) are stored to a local JSON-lines file, up to `max_retry_file_size' bytes, and replayed in batches on the next
+    flush.  Actions rejected with other HTTP errors are dropped, they won't succeed on retry.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, es_client, retry_file: Optional[str] = None,
+                 flush_interval: float = 5, max_batch_size: int = 500, max_retry_file_size: int = 100 * 1024 ** 2):
+        self._es = es_client
+        self._retry_file = retry_file
+        self._flush_interval = flush_interval
+        self._max_batch_size = max_batch_size
+        self._max_retry_file_size = max_retry_file_size
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=self.__class__.__name__, daemon=True)
+        self._thread.start()
+
+    def index(self, index: str, doc_type: str, body: dict, doc_id: Optional[str] = None) -> None:
+        meta = dict(_index=index, _type=doc_type)
+        if doc_id:
+            meta["_id"] = doc_id
+        self._put({"index": meta}, body)
+
+    def update(self, index: str, doc_type: str, doc_id: str, body: dict, upsert: bool = False) -> None:
+        """
+        Partial update of a document, create it if `upsert' is set.
+        """
+        self._put({"update": dict(_index=index, _type=doc_type, _id=doc_id, retry_on_conflict=3)},
+                  {"doc": body, "doc_as_upsert": upsert})
+
+    # pylint: disable=too-many-arguments
+    def append(self, index: str, doc_type: str, doc_id: str, path: List[str], item,
+               counter: Optional[str] = None) -> None:
+        """
+        Append `item' to the list located by `path' in the document, intermediate objects are created if needed.
+
+        Only the new item is sent to Elasticsearch, not the whole list.  If `counter' is set, a sibling key of
+        the list with this name is incremented as well.
+        """
+        self._put({"update": dict(_index=index, _type=doc_type, _id=doc_id, retry_on_conflict=3)},
+                  {"script": {"source": APPEND_SCRIPT, "lang": "painless",
+                              "params": {"path": path, "item": item, "counter": counter}}})
+
+    def _put(self, meta: dict, source: dict) -> None:
+        # Serialize right away: the caller is free to change its objects after the call and
+        # non-JSON values (exceptions, datetime objects, etc) converted to strings.
+        self._queue.put(json.loads(json.dumps([meta, source], default=_json_default)))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all queued actions are handled (sent or stored to the retry file.)
+        """
+        end_time = time.time() + timeout if timeout else None
+        while self._queue.unfinished_tasks:
+            if end_time and time.time() > end_time:
+                return False
+            time.sleep(0.1)
+        with self._lock:  # wait for a flush in progress
+            return True
+
+    def stop(self, timeout: float = 60) -> None:
+        self.flush(timeout=timeout)
+        self._stop_event.set()
+        self._thread.join(timeout=timeout)
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                actions = [self._queue.get(timeout=self._flush_interval)]
+            except queue.Empty:
+                actions = []
+            while actions and len(actions) < self._max_batch_size:
+                try:
+                    actions.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            with self._lock:
+                try:
+                    self._send(actions)
+                except Exception:  # pylint: disable=broad-except
+                    LOGGER.exception("Failed to send %s actions to Elasticsearch", len(actions))
+                finally:
+                    for _ in actions:
+                        self._queue.task_done()
+
+    def _send(self, actions: list) -> None:
+        pending = self._load_retry_file() + actions
+        if not pending:
+            return
+        for idx in range(0, len(pending), self._max_batch_size):
+            batch = pending[idx:idx + self._max_batch_size]
+            try:
+                res = self._es.bulk(body=[line for action in batch for line in action])
+            except elasticsearch.TransportError as exc:
+                if _is_transient_error(exc):
+                    LOGGER.warning("Elasticsearch is not available, keep %s actions for retry: %s",
+                                   len(pending) - idx, exc)
+                    self._save_retry_file(pending[idx:])
+                    return
+                LOGGER.error("Elasticsearch rejected %s actions: %s", len(batch), exc)
+                continue
+            self._log_errors(res)
+        self._save_retry_file([])
+
+    @staticmethod
+    def _log_errors(res: dict) -> None:
+        if res.get("errors"):
+            for item in res["items"]:
+                (op_type, result), = item.items()
+                if result.get("error"):
+                    LOGGER.error("Elasticsearch failed to %s doc %s/%s: %s",
+                                 op_type, result.get("_index"), result.get("_id"), result["error"])
+
+    def _load_retry_file(self) -> list:
+        if not self._retry_file or not os.path.exists(self._retry_file):
+            return []
+        with open(self._retry_file, encoding="utf-8") as retry_file:
+            return [json.loads(line) for line in retry_file if line.strip()]
+
+    def _save_retry_file(self, actions: list) -> None:
+        if not self._retry_file:
+            if actions:
+                LOGGER.warning("No retry file configured, %s Elasticsearch actions are dropped", len(actions))
+            return
+        if not actions:
+            if os.path.exists(self._retry_file):
+                os.remove(self._retry_file)
+            return
+        size = 0
+        with open(self._retry_file, "w", encoding="utf-8") as retry_file:
+            for saved, action in enumerate(actions):
+                line = json.dumps(action, default=_json_default) + "\n"
+                size += len(line)
+                if size > self._max_retry_file_size:
+                    LOGGER.warning("Elasticsearch retry file %s is full, %s actions are dropped",
+                                   self._retry_file, len(actions) - saved)
+                    break
+                retry_file.write(line)
+
+
+def _is_transient_error(exc: elasticsearch.TransportError) -> bool:
+    """Connection problems (no HTTP status) and HTTP errors which can succeed on retry: 429 and 5xx."""
+    status_code = exc.status_code
+    return not isinstance(status_code, int) or status_code == 429 or status_code >= 500
+
+
+def _json_default(obj):
+    if isinstance(obj, (datetime.date, datetime.datetime)):
+        return obj.isoformat()
+    return str(obj)
+
+
+APPEND_SCRIPT = """
+def obj = ctx._source;
+for (int i = 0; i < params.path.size() - 1; ++i) {
+    if (obj[params.path[i]] == null) { obj[params.path[i]] = [:]; }
+    obj = obj[params.path[i]];
+}
+def key = params.path[params.path.size() - 1];
+if (obj[key] == null) { obj[key] = []; }
+obj[key].add(params.item);
+if (params.counter != null) {
+    obj[params.counter] = (obj[params.counter] == null ? 0 : obj[params.counter]) + 1;
+}
+"""
+
+
+_BULK_WRITER = None
+_BULK_WRITER_LOCK = threading.Lock()
+
+
+def get_bulk_writer(es_client, retry_file: Optional[str] = None) -> ESBulkWriter:
+    """
+    Return the ESBulkWriter shared by all threads of the process, create it on first call.
+    """
+    global _BULK_WRITER  # pylint: disable=global-statement
+    with _BULK_WRITER_LOCK:
+        if _BULK_WRITER is None:
+            _BULK_WRITER = ESBulkWriter(es_client=es_client, retry_file=retry_file)
+        return _BULK_WRITER
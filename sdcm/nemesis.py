@@ -16,21 +16,23 @@
 """
 Classes that introduce disruption in clusters.
 """
+import ast
 import copy
 import inspect
+import linecache
 import logging
 import random
 import time
 import datetime
 import threading
-import os
 import re
 import traceback
 import json
 from typing import List, Optional, Type, Callable, Tuple, Dict, Set, Union
-from functools import wraps, partial
+from dataclasses import dataclass, asdict
+from functools import wraps, partial, lru_cache
 from collections import defaultdict, Counter, namedtuple
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
 from elasticsearch.exceptions import ConnectionTimeout as ElasticSearchConnectionTimeout
 
 from invoke import UnexpectedExit
@@ -49,6 +51,10 @@ from sdcm.utils import cdc
 from sdcm.utils.decorators import retrying, latency_calculator_decorator
 from sdcm.utils.decorators import timeout as timeout_decor
 from sdcm.utils.docker_utils import ContainerManager
+from sdcm.utils.cql_concurrency import iter_concurrent
+from sdcm.utils.node_lease import LeaseClass, NodeLeaseTimeout
+from sdcm.utils.spans import span
+from sdcm.utils.sstable_inventory import SstableInventory
 from sdcm.log import SDCMAdapter
 from sdcm.keystore import KeyStore
 from sdcm.prometheus import nemesis_metrics_obj
@@ -61,7 +67,6 @@ from sdcm.sct_events.nemesis import DisruptionEvent
 from sdcm.sct_events.database import DatabaseLogEvent
 from sdcm.sct_events.decorators import raise_event_on_failure
 from sdcm.sct_events.group_common_events import ignore_alternator_client_errors, ignore_no_space_errors, ignore_scrub_invalid_errors
-from sdcm.db_stats import PrometheusDBStats
 from sdcm.utils.toppartition_util import NewApiTopPartitionCmd, OldApiTopPartitionCmd
 from sdcm.remote.libssh2_client.exceptions import UnexpectedExit as Libssh2UnexpectedExit
 from sdcm.cluster_k8s import PodCluster, ScyllaPodCluster
@@ -69,6 +74,8 @@ from sdcm.nemesis_publisher import NemesisElasticSearchPublisher
 from test_lib.compaction import CompactionStrategy, get_compaction_strategy, get_compaction_random_additional_params
 from test_lib.cql_types import CQLTypeBuilder
 
+LOGGER = logging.getLogger(__name__)
+
 
 class NoFilesFoundToDestroy(Exception):
     pass
@@ -113,6 +120,159 @@ class CdcStreamsWasNotUpdated(Exception):
     """
 
 
+# Disruptions which add or remove nodes, or restart the whole cluster.
+TOPOLOGY_CHANGE_DISRUPTIONS = {
+    "disrupt_add_remove_dc",
+    "disrupt_decommission_streaming_err",
+    "disrupt_disable_enable_ldap_authorization",
+    "disrupt_grow_shrink_cluster",
+    "disrupt_grow_shrink_new_rack",
+    "disrupt_nodetool_decommission",
+    "disrupt_nodetool_seed_decommission",
+    "disrupt_remove_node_then_add_node",
+    "disrupt_replace_node_kubernetes",
+    "disrupt_rolling_config_change_internode_compression",
+    "disrupt_rolling_restart_cluster",
+    "disrupt_run_unique_sequence",
+    "disrupt_switch_between_password_authenticator_and_saslauthd_authenticator_and_back",
+    "disrupt_terminate_and_replace_node",
+    "disrupt_terminate_and_replace_node_kubernetes",
+    "disrupt_terminate_decommission_add_node_kubernetes",
+}
+# Disruptions which change only schema or data and keep all nodes up.
+SCHEMA_ONLY_DISRUPTIONS = {
+    "disrupt_abort_repair",
+    "disrupt_add_drop_column",
+    "disrupt_delete_10_full_partitions",
+    "disrupt_delete_by_rows_range",
+    "disrupt_major_compaction",
+    "disrupt_mgmt_backup",
+    "disrupt_mgmt_backup_specific_keyspaces",
+    "disrupt_mgmt_repair_cli",
+    "disrupt_modify_table",
+    "disrupt_no_corrupt_repair",
+    "disrupt_nodetool_cleanup",
+    "disrupt_run_cdcstressor_tool",
+    "disrupt_show_toppartitions",
+    "disrupt_snapshot_operations",
+    "disrupt_toggle_cdc_feature_properties_on_table",
+    "disrupt_toggle_table_ics",
+    "disrupt_truncate",
+    "disrupt_truncate_large_partition",
+}
+
+
+def get_disruption_lease_class(method_name: str) -> LeaseClass:
+    if method_name in TOPOLOGY_CHANGE_DISRUPTIONS:
+        return LeaseClass.TOPOLOGY_CHANGE
+    if method_name in SCHEMA_ONLY_DISRUPTIONS:
+        return LeaseClass.SCHEMA_ONLY
+    return LeaseClass.LOCAL_RESTART
+
+
+NEMESIS_FLAGS = ("disruptive", "run_with_gemini", "networking", "kubernetes", "limited", )
+
+
+@dataclass(frozen=True)
+class DisruptMethodInfo:  # pylint: disable=too-many-instance-attributes
+    name: str
+    nemesis: str  # the Nemesis subclass which runs the method
+    disruptive: bool
+    run_with_gemini: bool
+    networking: bool
+    kubernetes: bool
+    limited: bool
+    lease_class: str
+
+    def matches(self, **flags) -> bool:
+        return all(getattr(self, flag) == value for flag, value in flags.items() if value is not None)
+
+
+class DisruptMethodsRegistry:
+    """Disrupt methods of the Nemesis subclasses with their flags, collected once.
+
+    Use `get_disrupt_methods_registry()' to get it: the registry is built on the first call and rebuilt only
+    after a new Nemesis subclass is defined.
+    """
+
+    def __init__(self, methods: Tuple[DisruptMethodInfo, ...]):
+        self.methods = methods
+        self._method_names_by_class = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls) -> 'DisruptMethodsRegistry':
+        methods = []
+        # pylint: disable=protected-access
+        for nemesis in Nemesis._get_subclasses_from_list(Nemesis._get_subclasses()):
+            if (source := cls._get_class_source(nemesis)) is None:
+                LOGGER.debug("Can't get source code of %s", nemesis)
+                continue
+            method_name = re.search(r'self\.(?P<method_name>disrupt_[A-Za-z_]+?)\(.*\)', source, flags=re.MULTILINE)
+            if method_name:
+                method_name = method_name.group('method_name')
+                methods.append(DisruptMethodInfo(name=method_name,
+                                                 nemesis=nemesis.__name__,
+                                                 lease_class=get_disruption_lease_class(method_name).value,
+                                                 **{flag: getattr(nemesis, flag) for flag in NEMESIS_FLAGS}))
+        return cls(methods=tuple(methods))
+
+    @staticmethod
+    def _get_class_source(nemesis: Type['Nemesis']) -> Optional[str]:
+        # `inspect.getsource()' parses the whole module for every class, parse each module only once instead.
+        try:
+            if source := _get_classes_sources(inspect.getsourcefile(nemesis)).get(nemesis.__name__):
+                return source
+            return inspect.getsource(nemesis)
+        except (OSError, TypeError, SyntaxError):
+            return None
+
+    def get_methods_by_flags(self, **flags) -> List[str]:
+        """Return names of the disrupt methods run by the nemeses which match all not None `flags'."""
+        return [method.name for method in self.methods if method.matches(**flags)]
+
+    def get_disrupt_method_names(self, nemesis_class: Type['Nemesis']) -> List[str]:
+        """Return names of all disrupt methods which `nemesis_class' has."""
+        with self._lock:
+            if nemesis_class not in self._method_names_by_class:
+                self._method_names_by_class[nemesis_class] = [
+                    name for name in dir(nemesis_class)
+                    if name.startswith(Nemesis.DISRUPT_NAME_PREF) and callable(getattr(nemesis_class, name))]
+            return list(self._method_names_by_class[nemesis_class])
+
+    def to_json(self, **flags) -> str:
+        return json.dumps([asdict(method) for method in self.methods if method.matches(**flags)], indent=2)
+
+
+@lru_cache(maxsize=None)
+def _get_classes_sources(filename: str) -> Dict[str, str]:
+    """Return source code of the classes defined in `filename' (the first one for repeated names.)"""
+    lines = linecache.getlines(filename)
+    classes = {}
+    for node in ast.walk(ast.parse("".join(lines))):
+        if isinstance(node, ast.ClassDef) and node.name not in classes:
+            classes[node.name] = "".join(lines[node.lineno - 1:node.end_lineno])
+    return classes
+
+
+_DISRUPT_METHODS_REGISTRY = None
+_DISRUPT_METHODS_REGISTRY_LOCK = threading.Lock()
+
+
+def get_disrupt_methods_registry() -> DisruptMethodsRegistry:
+    global _DISRUPT_METHODS_REGISTRY  # pylint: disable=global-statement
+    with _DISRUPT_METHODS_REGISTRY_LOCK:
+        if _DISRUPT_METHODS_REGISTRY is None:
+            _DISRUPT_METHODS_REGISTRY = DisruptMethodsRegistry.build()
+        return _DISRUPT_METHODS_REGISTRY
+
+
+def reset_disrupt_methods_registry() -> None:
+    global _DISRUPT_METHODS_REGISTRY  # pylint: disable=global-statement
+    with _DISRUPT_METHODS_REGISTRY_LOCK:
+        _DISRUPT_METHODS_REGISTRY = None
+
+
 class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-methods
 
     disruptive = False
@@ -126,11 +286,17 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
     has_steady_run = False
     DISRUPT_NAME_PREF = "disrupt_"
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        reset_disrupt_methods_registry()
+
     def __new__(cls, tester_obj, termination_event, *args):  # pylint: disable=unused-argument
-        for name, member in inspect.getmembers(cls, lambda x: inspect.isfunction(x) or inspect.ismethod(x)):
-            if name.startswith(cls.DISRUPT_NAME_PREF):
-                # add "disrupt_method_wrapper" decorator to all methods are started with "disrupt_"
-                setattr(cls, name, disrupt_method_wrapper(member))
+        if "_disrupt_methods_wrapped" not in cls.__dict__:
+            for name, member in inspect.getmembers(cls, lambda x: inspect.isfunction(x) or inspect.ismethod(x)):
+                if name.startswith(cls.DISRUPT_NAME_PREF) and not getattr(member, "is_disrupt_method_wrapper", False):
+                    # add "disrupt_method_wrapper" decorator to all methods are started with "disrupt_"
+                    setattr(cls, name, disrupt_method_wrapper(member))
+            cls._disrupt_methods_wrapped = True
         return object.__new__(cls)
 
     def __init__(self, tester_obj, termination_event, *args):  # pylint: disable=unused-argument
@@ -168,6 +334,12 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
             'cqlstress_lwt_example': '*'  # Ignore LWT user-profile tables
         }
         self.es_publisher = NemesisElasticSearchPublisher(self.tester)
+        self._checks_executor = None
+        self._pending_checks = []
+        self._data_validation_future = None
+        self._last_checks_time = None
+        self._target_node_lease = None
+        self._lease_class = LeaseClass.LOCAL_RESTART
 
     @classmethod
     def add_disrupt_method(cls, func=None):
@@ -208,10 +380,94 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
         self.stats[disrupt]['cnt'] += 1
         self.log.debug('Update nemesis info with: %s', data)
         if self.tester.create_stats:
-            self.tester.update({'nemesis': self.stats})
+            self.tester.append(path=['nemesis', disrupt, key[status]], item=data, counter='cnt')
         if self.es_publisher:
             self.es_publisher.publish(disrupt_name=disrupt, status=status, data=data)
 
+    def data_validation_prints(self):
+        try:
+            if hasattr(self.tester, 'data_validator') and self.tester.data_validator:
+                with self.cluster.cql_connection_patient(
+                        self.cluster.nodes[0], keyspace=self.tester.data_validator.keyspace_name) as session:
+                    self.tester.data_validator.validate_range_not_expected_to_change(session, during_nemesis=True)
+                    self.tester.data_validator.validate_range_expected_to_change(session, during_nemesis=True)
+                    self.tester.data_validator.validate_deleted_rows(session, during_nemesis=True)
+        except Exception as err:  # pylint: disable=broad-except
+            self.log.debug(f'Data validator error: {err}')
+
+    def run_disruption_checks(self, phase: str) -> dict:
+        """Run the cluster health check and the data validation concurrently, return timing of the phase.
+
+        The checks are waited for `cluster_health_check_budget' seconds at most, a data validation which is still
+        running at the next phase isn't started again.  Before a disruption the checks left running by the previous
+        one are waited for as well, so they don't overlap the disruption.  The checks before a disruption are skipped
+        if the previous ones finished less than `cluster_health_check_min_interval' seconds ago.
+        """
+        budget = self.cluster.params.get('cluster_health_check_budget') or None
+        if phase == "pre":
+            self._wait_for_pending_checks(timeout=budget)
+
+        min_interval = self.cluster.params.get('cluster_health_check_min_interval') or 0
+        if phase == "pre" and self._last_checks_time is not None \
+                and time.monotonic() - self._last_checks_time < min_interval:
+            return {"skipped": f"previous checks finished less than {min_interval}s ago"}
+
+        if self._checks_executor is None:
+            self._checks_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="DisruptionChecks")
+        timing = {}
+
+        def timed(name, func, *args, **kwargs):
+            def run():
+                start_time = time.perf_counter()
+                try:
+                    func(*args, **kwargs)
+                finally:
+                    timing[name] = round(time.perf_counter() - start_time, 1)
+            return run
+
+        start_time = time.perf_counter()
+        health_check = self._checks_executor.submit(timed(
+            "health_check", self.cluster.check_cluster_health, budget=budget, first_nodes=[self.target_node]))
+        futures = [health_check]
+        if self._data_validation_future is None or self._data_validation_future.done():
+            self._data_validation_future = self._checks_executor.submit(timed("data_validation",
+                                                                              self.data_validation_prints))
+            futures.append(self._data_validation_future)
+        else:
+            timing["data_validation"] = "skipped, previous one is still running"
+        _, not_done = wait_futures(futures, timeout=budget)
+        self._pending_checks = [future for future in (*self._pending_checks, *not_done) if not future.done()]
+        result = dict(timing, duration=round(time.perf_counter() - start_time, 1))
+        if not_done:
+            result["over_budget"] = sorted({"health_check", "data_validation"} - set(timing))
+            self.log.warning("%s-disruption checks didn't finish within %ss: %s",
+                             phase, budget, ", ".join(result["over_budget"]))
+        self._last_checks_time = time.monotonic()
+        if health_check not in not_done and (exc := health_check.exception()):
+            self.log.error("Cluster health check failed: %s", exc)
+            if phase == "pre":
+                raise exc
+        return result
+
+    def _wait_for_pending_checks(self, timeout: Optional[float]) -> None:
+        """Wait for the checks left running by the previous disruption, cancel the ones which haven't started."""
+        if not (pending := [future for future in self._pending_checks if not future.done()]):
+            return
+        self.log.info("Waiting for %s checks of the previous disruption to finish", len(pending))
+        _, not_done = wait_futures(pending, timeout=timeout)
+        for future in not_done:
+            future.cancel()
+        self._pending_checks = [future for future in not_done if not future.done()]
+        if self._pending_checks:
+            self.log.warning("%s checks of the previous disruption are still running after %ss",
+                             len(self._pending_checks), timeout)
+
+    def stop_disruption_checks(self) -> None:
+        if self._checks_executor is not None:
+            self._checks_executor.shutdown(wait=False, cancel_futures=True)
+            self._checks_executor = None
+        self._pending_checks = []
+
     def publish_event(self, disrupt, status=True, data=None):
         if not data:
             data = {}
@@ -254,9 +510,15 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
             nodes = [node for node in nodes if node.rack == rack]
         return nodes
 
+    def release_target_node(self):
+        self.cluster.node_leases.release(self._target_node_lease)
+        self._target_node_lease = None
+        self.unset_current_running_nemesis(self.target_node)
+
+    # pylint: disable=too-many-arguments
     def set_target_node(self, dc_idx: Optional[int] = None, rack: Optional[int] = None,
                         is_seed: Union[bool, DefaultValue, None] = DefaultValue,
-                        allow_only_last_node_in_rack: bool = False):
+                        allow_only_last_node_in_rack: bool = False, lease_class: Optional[LeaseClass] = None):
         """Set a Scylla node as target node.
 
         if is_seed is None - it will ignore seed status of the nodes
@@ -264,38 +526,55 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
         if is_seed is False - it will pick only non-seed nodes
         if is_seed is DefaultValue - if self.filter_seed is True it act as if is_seed=False,
           otherwise it will act as if is_seed is None
+
+        The node is leased from `cluster.node_leases' for `lease_class' (the one of the current disruption if None),
+        waiting up to `nemesis_target_node_lease_timeout' seconds while no node can be granted.
         """
-        self.unset_current_running_nemesis(self.target_node)
-        nodes = self._get_target_nodes(is_seed=is_seed, dc_idx=dc_idx, rack=rack)
-        if not nodes:
+        self.release_target_node()
+        if lease_class is not None:
+            self._lease_class = lease_class
+        try:
+            self._target_node_lease = self.cluster.node_leases.acquire(
+                owner=self.current_disruption or self.get_class_name(),
+                candidates=partial(self._get_target_nodes, is_seed=is_seed, dc_idx=dc_idx, rack=rack),
+                lease_class=self._lease_class,
+                timeout=self.cluster.params.get('nemesis_target_node_lease_timeout') or 0,
+                choose=(lambda nodes: nodes[-1]) if allow_only_last_node_in_rack else random.choice,
+                stop_event=self.termination_event)
+        except NodeLeaseTimeout as exc:
             dc_str = '' if dc_idx is None else f'dc {dc_idx} '
             rack_str = '' if rack is None else f'rack {rack} '
             raise UnsupportedNemesis(
-                f"Can't allocate node from {dc_str}{rack_str}to run nemesis on")
-        if allow_only_last_node_in_rack:
-            self.target_node = nodes[-1]
-        else:
-            self.target_node = random.choice(nodes)
+                f"Can't allocate node from {dc_str}{rack_str}to run nemesis on: {exc}") from exc
+        self.target_node = self._target_node_lease.node
 
-        self.set_current_running_nemesis(node=self.target_node)
         self.log.info('Current Target: %s with running nemesis: %s',
                       self.target_node, self.target_node.running_nemesis)
 
     @raise_event_on_failure
     def run(self, interval=None):
         self.es_publisher.create_es_connection()
+        if self.cluster.extra_network_interface:
+            # Network disruptions get the rate limit and traffic control readiness from the baseline
+            try:
+                self.cluster.start_traffic_baseline(self.monitoring_set)
+            except Exception as exc:  # pylint: disable=broad-except
+                self.log.warning("Failed to start network traffic baseline: %s", exc)
         if interval:
             self.interval = interval * 60
         self.log.info('Interval: %s s', self.interval)
-        while not self.termination_event.is_set():
-            cur_interval = self.interval
-            try:
-                self.disrupt()
-            except UnsupportedNemesis:
-                cur_interval = 0
-            finally:
-                self.unset_current_running_nemesis(self.target_node)
-                self.termination_event.wait(timeout=cur_interval)
+        try:
+            while not self.termination_event.is_set():
+                cur_interval = self.interval
+                try:
+                    self.disrupt()
+                except UnsupportedNemesis:
+                    cur_interval = 0
+                finally:
+                    self.release_target_node()
+                    self.termination_event.wait(timeout=cur_interval)
+        finally:
+            self.stop_disruption_checks()
 
     def report(self):
         if self.duration_list:
@@ -310,6 +589,7 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
         self.log.info('Total execution time: %s s', int(time.time() - self.start_time))
         self.log.info('Times executed: %s', len(self.duration_list))
         self.log.info('Unexpected errors: %s', len(self.error_list))
+        self.log.info('Node leases: %s', self.cluster.node_leases.summary())
         self.log.info('Operation log:')
         for operation in self.operation_log:
             self.log.info(operation)
@@ -342,13 +622,7 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
         attributes = locals()
         flags = {flag_name: attributes[flag_name] for flag_name in
                  ['disruptive', 'run_with_gemini', 'networking', 'kubernetes', 'limited'] if attributes[flag_name] is not None}
-        subclasses_list = self._get_subclasses(**flags)
-        disrupt_methods_list = []
-        for subclass in subclasses_list:
-            method_name = re.search(
-                r'self\.(?P<method_name>disrupt_[A-Za-z_]+?)\(.*\)', inspect.getsource(subclass), flags=re.MULTILINE)
-            if method_name:
-                disrupt_methods_list.append(method_name.group('method_name'))
+        disrupt_methods_list = get_disrupt_methods_registry().get_methods_by_flags(**flags)
         self.log.debug("Gathered subclass methods: {}".format(disrupt_methods_list))
         return disrupt_methods_list
 
@@ -564,13 +838,16 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
         with self.target_node.remote_scylla_yaml() as scylla_yaml:
             current = scylla_yaml.get(key, 'dummy_value_no_internode_compression_key_and_value')
         new_value = get_internode_compression_new_value_randomly(current)
-        for node in self.cluster.nodes:
+
+        def change_internode_compression(node):
             self.log.debug(f"Changing {node} inter node compression to {new_value}")
             with node.remote_scylla_yaml() as scylla_yaml:
                 scylla_yaml[key] = new_value
             self.log.info(f"Restarting node {node}")
             node.restart_scylla_server()
 
+        self.cluster.run_rolling_operation("change_internode_compression", change_internode_compression)
+
     def disrupt_restart_with_resharding(self):
         murmur3_partitioner_ignore_msb_bits = 15  # pylint: disable=invalid-name
         self.log.info(f'Restart node with resharding. New murmur3_partitioner_ignore_msb_bits value: '
@@ -589,47 +866,15 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
         self.log.info('Set back murmur3_partitioner_ignore_msb_bits value to 12')
         self.target_node.restart_node_with_resharding()
 
-    @retrying(n=10, allowed_exceptions=(NoKeyspaceFound, NoFilesFoundToDestroy))
-    def _choose_file_for_destroy(self, ks_cfs):
-        file_for_destroy = ''
-
-        ks_cf_for_destroy = random.choice(ks_cfs)  # expected value as: 'keyspace1.standard1'
-
-        ks_cf_for_destroy = ks_cf_for_destroy.replace('.', '/')
-        files = self.target_node.remoter.sudo("find /var/lib/scylla/data/%s-* -maxdepth 1 -type f"
-                                              % ks_cf_for_destroy, verbose=False)
-        if files.stderr:
-            raise NoFilesFoundToDestroy(
-                'Failed to get data files for destroy in {}. Error: {}'.format(ks_cf_for_destroy,
-                                                                               files.stderr))
-
-        for one_file in files.stdout.split():
-            if not one_file or '/' not in one_file:
-                continue
-            file_name = os.path.basename(one_file)
-            # The file name like: /var/lib/scylla/data/scylla_bench/test-f60e4f30c98f11e98d46000000000002/mc-220-big-Data.db
-            # For corruption we need to remove all files that their names are started from "mc-220-" (MC format)
-            # Old format: "system-truncated-ka-" (system-truncated-ka-7-Data.db)
-            # Search for "<digit>-" substring
-
-            try:
-                file_name_template = re.search(r"(.*-\d+)-", file_name).group(1)
-            except Exception as error:  # pylint: disable=broad-except
-                self.log.debug('File name "{file_name}" is not as expected for Scylla data files. '
-                               'Search files for "{ks_cf_for_destroy}" table'.format(file_name=file_name,
-                                                                                     ks_cf_for_destroy=ks_cf_for_destroy))
-                self.log.debug('Error: {}'.format(error))
-                continue
-
-            file_for_destroy = one_file.replace(file_name, file_name_template + '-*')
-            self.log.debug('Selected files for destroy: {}'.format(file_for_destroy))
-            if file_for_destroy:
-                break
-
-        if not file_for_destroy:
-            raise NoFilesFoundToDestroy('Data file for destroy is not found in {}'.format(ks_cf_for_destroy))
-
-        return file_for_destroy
+    def _choose_sstables_for_destroy(self, ks_cfs, count=1, with_data_file=False):
+        """List sstables of `ks_cfs' tables on the target node once and randomly choose `count' of them."""
+        sstable_inventory = SstableInventory(self.target_node)
+        sstable_inventory.load(ks_cfs)
+        sstables = sstable_inventory.choose(count=count, with_data_file=with_data_file)
+        if not sstables:
+            raise NoFilesFoundToDestroy('Data files for destroy are not found in {}'.format(', '.join(ks_cfs)))
+        self.log.debug('Selected files for destroy: {}'.format(', '.join(sstable.pattern for sstable in sstables)))
+        return sstable_inventory, sstables
 
     def _destroy_data_and_restart_scylla(self):
 
@@ -642,15 +887,13 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
         self.target_node.stop_scylla_server(verify_up=False, verify_down=True)
 
         try:
-            # Remove 5 data files
-            for _ in range(5):
-                file_for_destroy = self._choose_file_for_destroy(ks_cfs)
-
-                result = self.target_node.remoter.sudo('rm -f %s' % file_for_destroy)
-                if result.stderr:
-                    raise FilesNotCorrupted('Files were not corrupted. CorruptThenRepair nemesis can\'t be run. '
-                                            'Error: {}'.format(result))
-                self.log.debug('Files {} were destroyed'.format(file_for_destroy))
+            # Remove 5 sstables
+            sstable_inventory, sstables = self._choose_sstables_for_destroy(ks_cfs, count=5)
+            result = sstable_inventory.remove(sstables)
+            if result.stderr:
+                raise FilesNotCorrupted('Files were not corrupted. CorruptThenRepair nemesis can\'t be run. '
+                                        'Error: {}'.format(result))
+            self.log.debug('Files {} were destroyed'.format(', '.join(sstable.pattern for sstable in sstables)))
 
         finally:
             self.target_node.start_scylla_server(verify_up=True, verify_down=False)
@@ -757,8 +1000,9 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
         """When old_node_private_ip is not None replacement node procedure is initiated"""
         self.log.info("Adding new node to cluster...")
         InfoEvent(message='StartEvent - Adding new node to cluster').publish()
-        new_node = self.cluster.add_nodes(
-            count=1, dc_idx=self.target_node.dc_idx, enable_auto_bootstrap=True, rack=rack)[0]
+        with span("add_nodes", category="cluster", rack=rack):
+            new_node = self.cluster.add_nodes(
+                count=1, dc_idx=self.target_node.dc_idx, enable_auto_bootstrap=True, rack=rack)[0]
         self.monitoring_set.reconfigure_scylla_monitoring()
         self.set_current_running_nemesis(node=new_node)  # prevent to run nemesis on new node when running in parallel
         new_node.replacement_node_ip = old_node_ip
@@ -781,7 +1025,8 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
                                  f"does not support node termination")
 
     def _terminate_cluster_node(self, node):
-        with DbEventsFilter(db_event=DatabaseLogEvent.POWER_OFF, node=node):
+        with DbEventsFilter(db_event=DatabaseLogEvent.POWER_OFF, node=node), \
+                span("terminate_node", category="cluster", node=node.name):
             self.cluster.terminate_node(node)
         self.monitoring_set.reconfigure_scylla_monitoring()
 
@@ -1004,8 +1249,8 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
                     f'tar xvfz {sstable_file} -C /var/lib/scylla/data/keyspace1/{upload_dir}/upload/', user='scylla')
 
             # Scylla Enterprise 2019.1 doesn't support to load schema.cql and manifest.json, let's remove them
-            node.remoter.sudo(f'rm -f /var/lib/scylla/data/keyspace1/{upload_dir}/upload/schema.cql')
-            node.remoter.sudo(f'rm -f /var/lib/scylla/data/keyspace1/{upload_dir}/upload/manifest.json')
+            SstableInventory(node).remove_files(f'/var/lib/scylla/data/keyspace1/{upload_dir}/upload/{file_name}'
+                                                for file_name in ('schema.cql', 'manifest.json'))
             self.log.debug(f'Loading {keys_num} keys to {node.name} by refresh')
 
             # Resharding of the loaded sstable files is performed before they are moved from upload to the main folder.
@@ -1101,14 +1346,11 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
     def call_random_disrupt_method(self, disrupt_methods=None, predefined_sequence=False):
         # pylint: disable=too-many-branches
 
+        all_disrupt_methods = get_disrupt_methods_registry().get_disrupt_method_names(type(self))
         if disrupt_methods is None:
-            disrupt_methods = [attr[1] for attr in inspect.getmembers(self) if
-                               attr[0].startswith('disrupt_') and
-                               callable(attr[1])]
+            disrupt_methods = [getattr(self, name) for name in all_disrupt_methods]
         else:
-            disrupt_methods = [attr[1] for attr in inspect.getmembers(self) if
-                               attr[0] in disrupt_methods and
-                               callable(attr[1])]
+            disrupt_methods = [getattr(self, name) for name in all_disrupt_methods if name in disrupt_methods]
         if not disrupt_methods:
             self.log.warning("No monkey to run")
             return
@@ -1155,8 +1397,8 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
             self.metrics_srv.event_stop(disrupt_method_name)
 
     def get_all_disrupt_methods(self):
-        all_disruptions = [attr[1] for attr in inspect.getmembers(self)
-                           if attr[0].startswith('disrupt_') and callable(attr[1])]
+        all_disruptions = [getattr(self, name)
+                           for name in get_disrupt_methods_registry().get_disrupt_method_names(type(self))]
         self.disruptions_list.extend(all_disruptions)
 
     def shuffle_list_of_disruptions(self):
@@ -1219,6 +1461,7 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
         self.target_node.run_nodetool("flush")
         # do the actual truncation
         self.target_node.run_cqlsh(cmd='TRUNCATE {}.{}'.format(keyspace_truncate, table), timeout=120)
+        self.cluster.schema_inventory.invalidate(schema=False)
 
     def disrupt_truncate_large_partition(self):
         """
@@ -1240,6 +1483,7 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
         self.target_node.run_nodetool("flush")
         # do the actual truncation
         self.target_node.run_cqlsh(cmd='TRUNCATE {}.{}'.format(ks_name, table), timeout=120)
+        self.cluster.schema_inventory.invalidate(schema=False)
 
     def _modify_table_property(self, name, val, filter_out_table_with_counter=False):
         disruption_name = "".join([p.strip().capitalize() for p in name.split("_")])
@@ -1444,26 +1688,24 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
             exclude_partitions.extend(i for i in range(start_range, end_range))
 
         partitions_for_delete = defaultdict(list)
+        exclude_partitions = set(exclude_partitions)
+        candidates = ((partition_key, ) for partition_key in (i * 2 + 50 for i in range(max_partitions_in_test_table))
+                      if partition_key not in exclude_partitions)
         with self.cluster.cql_connection_patient(self.target_node, connect_timeout=300) as session:
             session.default_consistency_level = ConsistencyLevel.ONE
+            # The scylla_bench.test table is created WITH CLUSTERING ORDER BY (ck DESC).
+            # So first returned value is max cl value in the partition
+            select_statement = session.prepare(f"select ck from {ks_cf} where pk = ? limit 1")
 
-            for partition_key in [i * 2 + 50 for i in range(max_partitions_in_test_table)]:
+            for (partition_key, ), result in iter_concurrent(session, select_statement, candidates, timeout=300):
                 if len(partitions_for_delete) == partitions_amount:
                     break
 
-                if exclude_partitions and partition_key in exclude_partitions:
+                if isinstance(result, Exception):
+                    self.log.error(str(result))
                     continue
 
-                # The scylla_bench.test table is created WITH CLUSTERING ORDER BY (ck DESC).
-                # So first returned value is max cl value in the partition
-                cmd = f"select ck from {ks_cf} where pk={partition_key} limit 1"
-                try:
-                    result = session.execute(cmd, timeout=300)
-                except Exception as exc:  # pylint: disable=broad-except
-                    self.log.error(str(exc))
-                    continue
-
-                if not result:
+                if not (row := result.one()):
                     continue
 
                 if not with_clustering_key_data:
@@ -1471,7 +1713,7 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
                     continue
 
                 # Suppose that min ck value is 0 in the partition
-                partitions_for_delete[partition_key].extend([0, result[0].ck])
+                partitions_for_delete[partition_key].extend([0, row.ck])
 
                 if None in partitions_for_delete[partition_key]:
                     partitions_for_delete.pop(partition_key)
@@ -1479,13 +1721,17 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
         self.log.debug(f'Partitions for delete: {partitions_for_delete}')
         return partitions_for_delete
 
-    def run_deletions(self, queries, ks_cf):
-        for cmd in queries:
-            self.log.debug(f'delete query: {cmd}')
-            with self.cluster.cql_connection_patient(self.target_node, connect_timeout=300) as session:
-                session.execute(cmd, timeout=3600)
+    def run_deletions(self, query, parameters, ks_cf):
+        """Run a DELETE `query' (with `?' placeholders) for each item of `parameters' concurrently and flush."""
+        with self.cluster.cql_connection_patient(self.target_node, connect_timeout=300) as session:
+            delete_statement = session.prepare(query)
+            for params, result in iter_concurrent(session, delete_statement, parameters, timeout=3600):
+                self.log.debug(f'delete query: {query} {params}')
+                if isinstance(result, Exception):
+                    raise result
 
         self.target_node.run_nodetool('flush', args=ks_cf.replace('.', ' '))
+        self.cluster.schema_inventory.invalidate(schema=False, tables=[ks_cf])
 
     def delete_half_partition(self, ks_cf):
         self.log.debug('Delete by range - half of partition')
@@ -1495,10 +1741,9 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
             self.log.error('Not found partitions for delete')
             return partitions_for_delete
 
-        queries = []
-        for pkey, ckey in partitions_for_delete.items():
-            queries.append(f"delete from {ks_cf} where pk = {pkey} and ck > {int(ckey[1] / 2)}")
-        self.run_deletions(queries=queries, ks_cf=ks_cf)
+        self.run_deletions(query=f"delete from {ks_cf} where pk = ? and ck > ?",
+                           parameters=[(pkey, int(ckey[1] / 2)) for pkey, ckey in partitions_for_delete.items()],
+                           ks_cf=ks_cf)
 
         return partitions_for_delete
 
@@ -1525,12 +1770,10 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
         if not clustering_keys:
             clustering_keys = range(min_clustering_key, max_clustering_key)
 
-        queries = []
-        for pkey in partitions_for_delete.keys():
-            queries.append(f"delete from {ks_cf} where pk = {pkey} and ck >= {clustering_keys[0]} "
-                           f"and ck <= {clustering_keys[-1]}")
-
-        self.run_deletions(queries=queries, ks_cf=ks_cf)
+        self.run_deletions(query=f"delete from {ks_cf} where pk = ? and ck >= ? and ck <= ?",
+                           parameters=[(pkey, clustering_keys[0], clustering_keys[-1])
+                                       for pkey in partitions_for_delete.keys()],
+                           ks_cf=ks_cf)
 
         return list(partitions_for_delete.keys()) + partitions_for_exclude
 
@@ -1547,11 +1790,9 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
             self.log.error('Not found partitions for delete')
             return
 
-        queries = []
-        for partition_key in partitions_for_delete.keys():
-            queries.append(f"delete from {ks_cf} where pk = {partition_key}")
-
-        self.run_deletions(queries=queries, ks_cf=ks_cf)
+        self.run_deletions(query=f"delete from {ks_cf} where pk = ?",
+                           parameters=[(partition_key, ) for partition_key in partitions_for_delete.keys()],
+                           ks_cf=ks_cf)
 
     def disrupt_delete_by_rows_range(self):
         """
@@ -2085,14 +2326,12 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
         if not self.monitoring_set.nodes:
             return None
 
-        # get the last 10min avg network bandwidth used, and limit  30% to 70% of it
-        prometheus_stats = PrometheusDBStats(host=self.monitoring_set.nodes[0].external_address)
-        query = 'avg(node_network_receive_bytes_total{instance=~".*?%s.*?", device="eth0"})' % \
-                self.target_node.ip_address
-        now = time.time()
-        results = prometheus_stats.query(query=query, start=now - 600, end=now)
-        assert results, "no results for node_network_receive_bytes_total metric in Prometheus "
-        avg_bitrate_per_node = max([float(avg_rate) for _, avg_rate in results[0]["values"]])
+        # get the last 10min max network bandwidth used, and limit  30% to 70% of it
+        traffic_baseline = self.cluster.start_traffic_baseline(self.monitoring_set)
+        if (avg_bitrate_per_node := traffic_baseline.bandwidth(self.target_node)) is None:
+            traffic_baseline.refresh()
+            avg_bitrate_per_node = traffic_baseline.bandwidth(self.target_node)
+        assert avg_bitrate_per_node is not None, "no results for node_network_receive_bytes_total metric in Prometheus"
         avg_mpbs_per_node = avg_bitrate_per_node / 1024 / 1024
 
         if avg_mpbs_per_node > 10:
@@ -2562,11 +2801,9 @@ class Nemesis:  # pylint: disable=too-many-instance-attributes,too-many-public-m
                 'Non-system keyspace and table are not found. Nemesis can\'t be run')
 
         # Corrupt data file
-        data_file_pattern = self._choose_file_for_destroy(ks_cfs)
-        res = self.target_node.remoter.run('sudo find {}-Data.db'.format(data_file_pattern))
-        for sstable_file in res.stdout.split():
-            self.target_node.remoter.run('sudo dd if=/dev/urandom of={} count=1024'.format(sstable_file))
-            self.log.debug('File {} was corrupted by dd'.format(sstable_file))
+        sstable_inventory, sstables = self._choose_sstables_for_destroy(ks_cfs, with_data_file=True)
+        sstable_inventory.corrupt(sstables)
+        self.log.debug('Files {} were corrupted by dd'.format(', '.join(sstables[0].data_files)))
 
     def disrupt_corrupt_then_scrub(self):
         """
@@ -2859,24 +3096,14 @@ def disrupt_method_wrapper(method):  # pylint: disable=too-many-statements
     :return: Wrapped method.
     """
 
-    def data_validation_prints(args):
-        try:
-            if hasattr(args[0].tester, 'data_validator') and args[0].tester.data_validator:
-                with args[0].cluster.cql_connection_patient(
-                        args[0].cluster.nodes[0], keyspace=args[0].tester.data_validator.keyspace_name) as session:
-                    args[0].tester.data_validator.validate_range_not_expected_to_change(session, during_nemesis=True)
-                    args[0].tester.data_validator.validate_range_expected_to_change(session, during_nemesis=True)
-                    args[0].tester.data_validator.validate_deleted_rows(session, during_nemesis=True)
-        except Exception as err:  # pylint: disable=broad-except
-            args[0].log.debug(f'Data validator error: {err}')
-
     @wraps(method)
     def wrapper(*args, **kwargs):  # pylint: disable=too-many-statements
         # pylint: disable=too-many-locals
-        args[0].set_target_node()
         method_name = method.__name__
         args[0].current_disruption = "".join(p.capitalize() for p in method_name.replace("disrupt_", "").split("_"))
-        args[0].cluster.check_cluster_health()
+        args[0].set_target_node(lease_class=get_disruption_lease_class(method_name))
+        with span("pre_checks", category="nemesis", disruption=method_name):
+            pre_checks = args[0].run_disruption_checks(phase="pre")
         num_nodes_before = len(args[0].cluster.nodes)
         start_time = time.time()
         args[0].log.debug('Start disruption at `%s`', datetime.datetime.fromtimestamp(start_time))
@@ -2896,13 +3123,12 @@ def disrupt_method_wrapper(method):  # pylint: disable=too-many-statements
             'node': str(args[0].target_node),
             'subtype': 'end',
         }
-        # TODO: Temporary print. Will be removed later
-        data_validation_prints(args=args)
 
         with DisruptionEvent(nemesis_name=args[0].get_disrupt_name(),
                              node=args[0].target_node, publish_event=True) as nemesis_event:
             try:
-                result = method(*args, **kwargs)
+                with span(method_name, category="nemesis", node=args[0].target_node):
+                    result = method(*args, **kwargs)
             except UnsupportedNemesis as exp:
                 skip_reason = str(exp)
                 log_info.update({'subtype': 'skipped', 'skip_reason': skip_reason})
@@ -2924,6 +3150,13 @@ def disrupt_method_wrapper(method):  # pylint: disable=too-many-statements
                     'end': int(end_time),
                     'duration': time_elapsed,
                 })
+                with span("post_checks", category="nemesis", disruption=method_name):
+                    post_checks = args[0].run_disruption_checks(phase="post")
+                log_info['phases'] = {
+                    'pre_checks': pre_checks,
+                    'disruption': round(end_time - start_time, 1),
+                    'post_checks': post_checks,
+                }
                 args[0].duration_list.append(time_elapsed)
                 args[0].operation_log.append(copy.deepcopy(log_info))
                 args[0].log.debug('%s duration -> %s s', args[0].current_disruption, time_elapsed)
@@ -2943,15 +3176,13 @@ def disrupt_method_wrapper(method):  # pylint: disable=too-many-statements
                                         f"{err}")
                 args[0].log.info(f"log_info: {log_info}")
                 nemesis_event.duration = time_elapsed
-                args[0].cluster.check_cluster_health()
                 num_nodes_after = len(args[0].cluster.nodes)
                 if num_nodes_before != num_nodes_after:
                     args[0].log.error('num nodes before %s and nodes after %s does not match' %
                                       (num_nodes_before, num_nodes_after))
-                # TODO: Temporary print. Will be removed later
-                data_validation_prints(args=args)
         return result
 
+    wrapper.is_disrupt_method_wrapper = True
     return wrapper
 
 
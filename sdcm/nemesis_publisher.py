@@ -11,6 +11,7 @@
 #
 # Copyright (c) 2020 ScyllaDB
 
+import os
 import logging
 from datetime import datetime
 from functools import cached_property
@@ -18,7 +19,9 @@ import sys
 
 from elasticsearch import Elasticsearch
 
+from sdcm.es import ESBulkWriter, get_bulk_writer
 from sdcm.keystore import KeyStore
+from sdcm.test_config import TestConfig
 
 LOGGER = logging.getLogger(__name__)
 
@@ -26,6 +29,7 @@ LOGGER = logging.getLogger(__name__)
 class NemesisElasticSearchPublisher:
     index_name = 'nemesis_data'
     es: Elasticsearch
+    es_writer: ESBulkWriter
     error_message_size_limit_mb = 100
 
     def __init__(self, tester):
@@ -36,6 +40,8 @@ class NemesisElasticSearchPublisher:
         es_conf = ks.get_elasticsearch_credentials()
         self.es = Elasticsearch(hosts=[es_conf["es_url"]], verify_certs=False,  # pylint: disable=invalid-name
                                 http_auth=(es_conf["es_user"], es_conf["es_password"]))
+        self.es_writer = get_bulk_writer(es_client=self.es,
+                                         retry_file=os.path.join(TestConfig().logdir(), "es_retry_queue.jsonl"))
 
     @cached_property
     def stats(self):
@@ -99,5 +105,4 @@ class NemesisElasticSearchPublisher:
                 failure_message=data['error']
             ))
 
-        res = self.es.index(index=self.index_name, doc_type='nemesis', body=new_nemesis_data)
-        LOGGER.debug(res)
+        self.es_writer.index(index=self.index_name, doc_type='nemesis', body=new_nemesis_data)
@@ -18,6 +18,7 @@ import glob
 import os
 import shutil
 import tempfile
+import subprocess
 import time
 import threading
 
@@ -513,6 +514,17 @@ class RemoteCmdRunnerBase(CommandRunner):  # pylint: disable=too-many-instance-a
         return command % (symlink_flag, delete_flag, timeout, ssh_cmd,
                           " ".join(src), dst)
 
+    def popen(self, cmd: str, **kwargs) -> subprocess.Popen:
+        """
+        Run the command on the remote host using OpenSSH client and return the local process, so its stdout can be
+        read as a binary stream (e.g., to pipe large outputs to somewhere without saving them on remote host's disk.)
+        """
+        ssh_cmd = self._make_ssh_command(user=self.user, port=self.port, hosts_file=self.known_hosts_file,
+                                         key_file=self.key_file,
+                                         extra_ssh_options=self.extra_ssh_options.replace('-tt', '-T'))
+        kwargs.setdefault("stdout", subprocess.PIPE)
+        return subprocess.Popen(f"{ssh_cmd} {self.hostname} {quote(cmd)}", shell=True, **kwargs)  # pylint: disable=consider-using-with
+
     def _run_execute(self, cmd: str, timeout: Optional[float] = None,  # pylint: disable=too-many-arguments
                      ignore_status: bool = False, verbose: bool = True, new_session: bool = False,
                      watchers: Optional[List[StreamWatcher]] = None):
@@ -21,7 +21,7 @@ import ast
 import logging
 import getpass
 import pathlib
-from typing import List, Union, Set
+from typing import List, Optional, Union, Set
 
 from distutils.util import strtobool
 
@@ -29,11 +29,15 @@ import anyconfig
 
 from sdcm import sct_abs_path
 from sdcm.utils import alternator
-from sdcm.utils.common import find_scylla_repo, get_scylla_ami_versions, get_branched_ami, get_ami_tags, \
-    ami_built_by_scylla, MAX_SPOT_DURATION_TIME
-from sdcm.utils.version_utils import get_branch_version, get_branch_version_for_multiple_repositories, \
-    get_scylla_docker_repo_from_version, resolve_latest_repo_symlink
 from sdcm.sct_events.base import add_severity_limit_rules, print_critical_events
+from sdcm.utils.resolution_cache import ResolutionCache, OfflineResolutionError
+
+# NOTE: sdcm.utils.common and sdcm.utils.version_utils are slow to import (cloud SDKs, etc.) and are needed only
+#       when a configuration is resolved, so import them inside the methods: `sct.py --help' shouldn't pay for them.
+# pylint: disable=import-outside-toplevel
+
+RESOLUTION_TTL = 3600
+AMI_TAGS_TTL = 7 * 24 * 3600
 
 
 def str_or_list(value: Union[str, List[str]]) -> List[str]:
@@ -74,6 +78,17 @@ def int_or_list(value):
     raise ValueError("{} isn't int or list".format(value))
 
 
+def get_scylla_ami_tags(ami_id: str, region_name: str) -> Optional[dict]:
+    """
+    Return tags of AMI if it was built by Scylla, otherwise None
+    """
+    from sdcm.utils.common import get_ami_tags, ami_built_by_scylla
+
+    if not ami_built_by_scylla(ami_id, region_name):
+        return None
+    return get_ami_tags(ami_id, region_name)
+
+
 def boolean(value):
     if isinstance(value, bool):
         return value
@@ -83,6 +98,27 @@ def boolean(value):
         raise ValueError("{} isn't a boolean".format(type(value)))
 
 
+def resolution_ttl(scylla_version: str) -> float:
+    """Branches (e.g. 'master:latest') and `latest' get new builds all the time, so they are always looked up."""
+    return 0 if ":" in scylla_version or scylla_version in ("latest", "nightly") else RESOLUTION_TTL
+
+
+def find_scylla_ami(scylla_version: str, region_name: str, name_substring: str) -> str:
+    """
+    Find id of Scylla AMI in a region, either by branch version (e.g., 'master:latest') or by a substring of AMI name
+
+    :raises ValueError: if AMI wasn't found
+    """
+    from sdcm.utils.common import get_scylla_ami_versions, get_branched_ami
+
+    if ':' in scylla_version:
+        return get_branched_ami(scylla_version, region_name=region_name)[0].id
+    for ami in get_scylla_ami_versions(region_name):
+        if name_substring in ami['Name']:
+            return ami['ImageId']
+    raise ValueError("AMI for scylla version {} wasn't found".format(scylla_version))
+
+
 class SCTConfiguration(dict):
     """
     Class the hold the SCT configuration
@@ -102,6 +138,10 @@ class SCTConfiguration(dict):
         dict(name="cluster_backend", env="SCT_CLUSTER_BACKEND", type=str,
              help="backend that will be used, aws/gce/docker"),
 
+        dict(name="offline_config_resolution", env="SCT_OFFLINE_CONFIG_RESOLUTION", type=boolean,
+             help="""If True, AMIs and repos are resolved only from the local resolution cache and
+                     no network lookups are done while the configuration is loaded and verified"""),
+
         dict(name="test_duration", env="SCT_TEST_DURATION", type=int,
              help="""
                   Test duration (min). Parameter used to keep instances produced by tests
@@ -310,6 +350,10 @@ class SCTConfiguration(dict):
         dict(name="backtrace_decoding", env="SCT_BACKTRACE_DECODING", type=boolean,
              help="""If True, all backtraces found in db nodes would be decoded automatically"""),
 
+        dict(name="coredump_streaming_upload", env="SCT_COREDUMP_STREAMING_UPLOAD", type=boolean,
+             help="""If True, coredumps are piped through pigz directly to S3 multipart upload,
+                     without saving compressed coredump on the db node's disk"""),
+
         dict(name="instance_provision", env="SCT_INSTANCE_PROVISION", type=str,
              help="instance_provision: spot|on_demand|spot_fleet"),
 
@@ -801,6 +845,25 @@ class SCTConfiguration(dict):
         dict(name="cluster_health_check", env="SCT_CLUSTER_HEALTH_CHECK", type=boolean,
              help="When true, start cluster health checker for all nodes"),
 
+        dict(name="cluster_health_check_budget", env="SCT_CLUSTER_HEALTH_CHECK_BUDGET", type=int,
+             help="""Time budget in seconds for the cluster health check and data validation which run before and
+                     after each disruption. Nodes which weren't checked within the budget are checked first next time.
+                     0 means no limit"""),
+
+        dict(name="cluster_health_check_min_interval", env="SCT_CLUSTER_HEALTH_CHECK_MIN_INTERVAL", type=int,
+             help="""Skip the cluster health check and data validation before a disruption if the previous ones
+                     finished less than this number of seconds ago. 0 means they run before every disruption"""),
+
+        dict(name="nemesis_target_node_lease_timeout", env="SCT_NEMESIS_TARGET_NODE_LEASE_TIMEOUT", type=int,
+             help="""How many seconds a nemesis waits for a target node which can be leased to it (e.g. while
+                     other parallel nemeses run a topology change or restart a node in the same rack)"""),
+
+        dict(name="rolling_operation_concurrency", env="SCT_ROLLING_OPERATION_CONCURRENCY", type=int,
+             help="""Number of nodes of a rack processed at the same time by rolling operations (e.g. rolling
+                     restart), racks are processed one by one. 0 means the whole rack at a time. Use it only with
+                     rack-aware replication over at least as many racks as the replication factor. Nodes of a DC
+                     with a single rack are always processed one at a time"""),
+
         dict(name="validate_partitions", env="SCT_VALIDATE_PARTITIONS", type=boolean,
              help="when true, log of the partitions before and after the nemesis run is compacted"),
         dict(name="table_name", env="SCT_TABLE_NAME", type=str,
@@ -1296,6 +1359,10 @@ class SCTConfiguration(dict):
 
     def __init__(self):
         # pylint: disable=too-many-locals,too-many-branches,too-many-statements
+        from sdcm.utils.common import find_scylla_repo, MAX_SPOT_DURATION_TIME
+        from sdcm.utils.version_utils import (
+            get_scylla_docker_repo_from_version, resolve_latest_repo_symlink, LATEST_SYMLINK_NAME)
+
         super().__init__()
         self.log = logging.getLogger(__name__)
         env = self._load_environment_variables()
@@ -1338,6 +1405,8 @@ class SCTConfiguration(dict):
         # 3) overwrite with environment variables
         anyconfig.merge(self, env)
 
+        resolution_cache = ResolutionCache(offline=self.get('offline_config_resolution'))
+
         # 4) update events max severities
         add_severity_limit_rules(self.get("max_events_severities"))
         print_critical_events()
@@ -1366,24 +1435,16 @@ class SCTConfiguration(dict):
             if self.get("cluster_backend") in ["docker", "k8s-gce-minikube", "k8s-gke"]:
                 self.log.info("Assume that Scylla Docker image has repo file pre-installed.")
             elif not self.get('ami_id_db_scylla') and self.get('cluster_backend') == 'aws':
-                ami_list = []
-                for region in region_names:
-                    if ':' in scylla_version:
-                        amis = get_branched_ami(scylla_version, region_name=region)
-                        ami_list.append(amis[0].id)
-                        continue
-
-                    amis = get_scylla_ami_versions(region)
-                    for ami in amis:
-                        # ami['Name'] format example: ScyllaDB 4.4.0
-                        if f" {scylla_version}" in ami['Name']:
-                            ami_list.append(ami['ImageId'])
-                            break
-                    else:
-                        raise ValueError("AMI for scylla version {} wasn't found".format(scylla_version))
+                # ami['Name'] format example: ScyllaDB 4.4.0
+                ami_list = resolution_cache.resolve_many(
+                    "scylla_ami", find_scylla_ami,
+                    ((scylla_version, region, f" {scylla_version}") for region in region_names),
+                    ttl=resolution_ttl(scylla_version))
                 self['ami_id_db_scylla'] = " ".join(ami_list)
             elif not self.get('scylla_repo'):
-                self['scylla_repo'] = find_scylla_repo(scylla_version, dist_type, dist_version)
+                self['scylla_repo'] = resolution_cache.resolve(
+                    "scylla_repo", find_scylla_repo, scylla_version, dist_type, dist_version,
+                    ttl=resolution_ttl(scylla_version))
             else:
                 raise ValueError("'scylla_version' can't used together with  'ami_id_db_scylla' or with 'scylla_repo'")
 
@@ -1394,27 +1455,18 @@ class SCTConfiguration(dict):
 
                 scylla_version_for_loader = "nightly" if scylla_version == "latest" else scylla_version
 
-                self['scylla_repo_loader'] = find_scylla_repo(scylla_version_for_loader,
-                                                              dist_type_loader, dist_version_loader)
+                self['scylla_repo_loader'] = resolution_cache.resolve(
+                    "scylla_repo", find_scylla_repo, scylla_version_for_loader, dist_type_loader, dist_version_loader,
+                    ttl=resolution_ttl(scylla_version_for_loader))
 
         # 6.1) handle oracle scylla_version if exists
         oracle_scylla_version = self.get('oracle_scylla_version')
         if oracle_scylla_version:
             if not self.get('ami_id_db_oracle') and self.get('cluster_backend') == 'aws':
-                ami_list = []
-                for region in region_names:
-                    if ':' in oracle_scylla_version:
-                        amis = get_branched_ami(oracle_scylla_version, region_name=region)
-                        ami_list.append(amis[0].id)
-                        continue
-
-                    amis = get_scylla_ami_versions(region)
-                    for ami in amis:
-                        if oracle_scylla_version in ami['Name']:
-                            ami_list.append(ami['ImageId'])
-                            break
-                    else:
-                        raise ValueError("AMI for scylla version {} wasn't found".format(scylla_version))
+                ami_list = resolution_cache.resolve_many(
+                    "scylla_ami", find_scylla_ami,
+                    ((oracle_scylla_version, region, oracle_scylla_version) for region in region_names),
+                    ttl=resolution_ttl(oracle_scylla_version))
                 self['ami_id_db_oracle'] = " ".join(ami_list)
             else:
                 raise ValueError("oracle_scylla_version and ami_id_db_oracle can't used together")
@@ -1426,12 +1478,16 @@ class SCTConfiguration(dict):
                 raise ValueError("'new_version' isn't supported for AWS AMIs")
 
             elif not self.get('new_scylla_repo'):
-                self['new_scylla_repo'] = find_scylla_repo(new_scylla_version, dist_type, dist_version)
+                self['new_scylla_repo'] = resolution_cache.resolve(
+                    "scylla_repo", find_scylla_repo, new_scylla_version, dist_type, dist_version,
+                    ttl=resolution_ttl(new_scylla_version))
 
-        # 8) resolve repo symlinks
-        for repo_key in ("scylla_repo", "scylla_repo_loader", "new_scylla_repo", ):
-            if self.get(repo_key):
-                self[repo_key] = resolve_latest_repo_symlink(self[repo_key])
+        # 8) resolve repo symlinks (other URLs are used as is, no need to look them up, even in offline mode)
+        repo_keys = [repo_key for repo_key in ("scylla_repo", "scylla_repo_loader", "new_scylla_repo", )
+                     if LATEST_SYMLINK_NAME in (self.get(repo_key) or "")]
+        repo_urls = resolution_cache.resolve_many(
+            "repo_symlink", resolve_latest_repo_symlink, ((self[repo_key], ) for repo_key in repo_keys), ttl=0)
+        self.update(zip(repo_keys, repo_urls))
 
         # 9) append username or ami_id_db_scylla_desc to the user_prefix
         version_tag = self.get('ami_id_db_scylla_desc')
@@ -1606,11 +1662,15 @@ class SCTConfiguration(dict):
             raise ValueError("extra_network_interface isn't supported for multi region use cases")
         self._check_partition_range_with_data_validation_correctness()
 
-    def _get_target_upgrade_version(self):
+    def _get_target_upgrade_version(self, resolution_cache: Optional[ResolutionCache] = None):
+        from sdcm.utils.version_utils import get_branch_version
+
+        resolution_cache = resolution_cache or ResolutionCache(offline=self.get('offline_config_resolution'))
         # 10) update target_upgrade_version automatically
         new_scylla_repo = self.get('new_scylla_repo')
         if new_scylla_repo and not self.get('target_upgrade_version'):
-            self['target_upgrade_version'] = get_branch_version(new_scylla_repo)
+            self['target_upgrade_version'], = self._resolve_if_cached(
+                resolution_cache, "branch_version", get_branch_version, [(new_scylla_repo, )], ttl=RESOLUTION_TTL)
 
     def _check_unexpected_sct_variables(self):
         # check if there are SCT_* environment variable which aren't documented
@@ -1690,27 +1750,47 @@ class SCTConfiguration(dict):
         """
         Check if ami_id and repo urls are valid
         """
-        self._get_target_upgrade_version()
+        from sdcm.utils.version_utils import get_branch_version
+
+        resolution_cache = ResolutionCache(offline=self.get('offline_config_resolution'))
+
+        self._get_target_upgrade_version(resolution_cache)
         # verify that the AMIs used all have 'user_data_format_version' tag
         if 'aws' in self.get('cluster_backend'):
-            ami_id_db_scylla = self.get('ami_id_db_scylla').split()
             region_names = self.region_names
-            ami_id_db_oracle = self.get('ami_id_db_oracle').split()
-
-            for ami_list in [ami_id_db_scylla, ami_id_db_oracle]:
-                if ami_list:
-                    for ami_id, region_name in zip(ami_list, region_names):
-                        if not ami_built_by_scylla(ami_id, region_name):
-                            continue
-                        tags = get_ami_tags(ami_id, region_name)
-                        assert 'user_data_format_version' in tags.keys(), \
-                            f"\n\t'user_data_format_version' tag missing from [{ami_id}] on {region_name}\n\texisting " \
-                            f"tags: {tags}"
+            amis = [(ami_id, region_name)
+                    for ami_list in (self.get('ami_id_db_scylla').split(), self.get('ami_id_db_oracle').split())
+                    for ami_id, region_name in zip(ami_list, region_names)]
+            amis = list(dict.fromkeys(amis))
+            for (ami_id, region_name), tags in zip(amis, self._resolve_if_cached(
+                    resolution_cache, "scylla_ami_tags", get_scylla_ami_tags, amis, ttl=AMI_TAGS_TTL)):
+                if tags is None:  # not built by Scylla or not cached in offline mode
+                    continue
+                assert 'user_data_format_version' in tags.keys(), \
+                    f"\n\t'user_data_format_version' tag missing from [{ami_id}] on {region_name}\n\texisting " \
+                    f"tags: {tags}"
         # For each Scylla repo file we will check that there is at least one valid URL through which to download a
         # version of SCYLLA, otherwise we will get an error.
-        get_branch_version_for_multiple_repositories(urls=(self.get(url) for url in [
+        urls = dict.fromkeys(self.get(url) for url in [
             'new_scylla_repo', 'scylla_repo_m', 'scylla_repo_loader', 'scylla_mgmt_repo', 'scylla_mgmt_agent_repo',
-            'scylla_mgmt_agent_repo'] if self.get(url)))
+        ] if self.get(url))
+        self._resolve_if_cached(
+            resolution_cache, "branch_version", get_branch_version, ((url, ) for url in urls), ttl=RESOLUTION_TTL)
+
+    def _resolve_if_cached(self, resolution_cache: ResolutionCache, name, func, args_list, ttl):
+        """
+        Resolve all lookups concurrently, in offline mode skip lookups which aren't cached (return None for them)
+        """
+        if not resolution_cache.offline:
+            return resolution_cache.resolve_many(name, func, args_list, ttl=ttl)
+        results = []
+        for args in args_list:
+            try:
+                results.append(resolution_cache.resolve(name, func, *args, ttl=ttl))
+            except OfflineResolutionError as exc:
+                self.log.warning("Skip verification: %s", exc)
+                results.append(None)
+        return results
 
     def dump_config(self):
         """
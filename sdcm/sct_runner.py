@@ -2,12 +2,10 @@ import logging
 import random
 import sys
 import tempfile
-import time
 import datetime
 from enum import Enum
 from functools import lru_cache, cached_property
 from math import ceil
-from textwrap import dedent
 from typing import Optional
 from abc import ABC, abstractmethod
 import pytz
@@ -21,6 +19,8 @@ from sdcm.utils.aws_utils import ec2_instance_wait_public_ip, ec2_ami_get_root_d
 from sdcm.utils.get_username import get_username
 from sdcm.utils.prepare_region import AwsRegion
 from sdcm.utils.gce_utils import get_gce_service
+from sdcm.utils.runner_layers import LayerStack, get_sct_runner_layers
+from sdcm.wait import wait_until
 
 
 LOGGER = logging.getLogger(__name__)
@@ -75,57 +75,23 @@ class SctRunner(ABC):
         return RemoteCmdRunnerBase.create_remoter(hostname=host, user=self.LOGIN_USER,
                                                   key_file=self._ssh_pkey_file.name, connect_timeout=connect_timeout)
 
+    @cached_property
+    def layers(self) -> LayerStack:
+        return get_sct_runner_layers(login_user=self.LOGIN_USER, public_key=self.key_pair().public_key.decode())
+
     def install_prereqs(self, public_ip: str, connect_timeout: Optional[int] = None) -> None:
-        prereqs_script = dedent(f"""
-            echo "fs.aio-max-nr = 65536" >> /etc/sysctl.conf
-            echo "ubuntu soft nofile 4096" >> /etc/security/limits.conf
-            echo "jenkins soft nofile 4096" >> /etc/security/limits.conf
-            echo "root soft nofile 4096" >> /etc/security/limits.conf
-            sudo -u ubuntu mkdir -p /home/ubuntu/.ssh || true
-            echo "{self.key_pair().public_key.decode()}" >> /home/ubuntu/.ssh/authorized_keys
-            chmod 600 /home/ubuntu/.ssh/authorized_keys
-            mkdir -p -m 777 /home/ubuntu/sct-results
-            echo "cd ~/sct-results" >> /home/ubuntu/.bashrc
-            chown -R ubuntu:ubuntu /home/ubuntu/
-            apt clean
-            apt update
-            apt install -y python3-pip htop screen tree
-            pip3 install awscli
-            # docker
-            apt-get install -y apt-transport-https ca-certificates curl gnupg-agent software-properties-common
-            curl -fsSL https://download.docker.com/linux/ubuntu/gpg | sudo apt-key add -
-            apt-key fingerprint 0EBFCD88
-            add-apt-repository "deb [arch=amd64] https://download.docker.com/linux/ubuntu $(lsb_release -cs) stable"
-            apt update
-            apt install -y docker-ce docker-ce-cli containerd.io
-            usermod -aG docker {self.LOGIN_USER}
-            # add kubectl
-            curl -LO "https://dl.k8s.io/release/$(curl -L -s https://dl.k8s.io/release/stable.txt)/bin/linux/amd64/kubectl"
-            sudo install -o root -g root -m 0755 kubectl /usr/local/bin/kubectl
-            usermod -aG docker ubuntu || true
-            # configure Jenkins user
-            apt install -y openjdk-14-jre-headless
-            adduser --disabled-password --gecos "" jenkins || true
-            usermod -aG docker jenkins
-            mkdir -p /home/jenkins/.ssh
-            echo "{self.key_pair().public_key.decode()}" >> /home/jenkins/.ssh/authorized_keys
-            chmod 600 /home/jenkins/.ssh/authorized_keys
-            chown -R jenkins:jenkins /home/jenkins
-            echo "jenkins ALL=(ALL) NOPASSWD: ALL" > /etc/sudoers.d/jenkins
-            # Jenkins pipelines run /bin/sh for some reason
-            unlink /bin/sh
-            ln -s /bin/bash /bin/sh
-        """)
+        """Install the layers of prerequisites which are missing or changed on the instance."""
         LOGGER.info("Connecting instance...")
         remoter = self.get_remoter(host=public_ip, connect_timeout=connect_timeout)
         LOGGER.info("Installing required packages...")
-        result = remoter.run(f"sudo bash -cxe '{prereqs_script}'", ignore_status=True)
-
-        remoter.stop()
-        if result.exit_status == 0:
-            LOGGER.info("All packages successfully installed.")
-        else:
-            raise Exception("Unable to install required packages:\n%s" % (result.stdout + result.stderr))
+        try:
+            results = self.layers.apply(remoter)
+        finally:
+            remoter.stop()
+        if results and results[-1].status == "failed":
+            raise Exception("Unable to install required packages (layer '%s'):\n%s" %
+                            (results[-1].name, results[-1].output))
+        LOGGER.info("All packages successfully installed.")
 
     @abstractmethod
     def _image(self, image_type=ImageType.SOURCE):
@@ -139,6 +105,15 @@ class SctRunner(ABC):
     def image(self):
         return self._image(image_type=ImageType.GENERAL)
 
+    @abstractmethod
+    def _latest_image(self, image_type=ImageType.SOURCE):
+        """Return the most recent SCT runner image of the VERSION, even if it was built with other layers."""
+        ...
+
+    @abstractmethod
+    def _instance_public_ip(self, instance) -> str:
+        ...
+
     @abstractmethod
     # pylint: disable=too-many-arguments
     def _create_instance(self, instance_type, base_image, tags_list, instance_name=None, region_az="", test_duration=None):
@@ -158,15 +133,23 @@ class SctRunner(ABC):
         """
         LOGGER.info("Creating SCT Runner instance...")
         image = self.image
+        missing_layers = False
         if not image:
-            LOGGER.error("SCT Runner image was not found in %s! "
-                         "Use hydra create-runner-image --cloud-privider %s --region %s",
-                         self.region_name, self.cloud_provider, self.region_name)
-            sys.exit(1)
+            image = self._latest_image(image_type=ImageType.GENERAL)
+            if not image:
+                LOGGER.error("SCT Runner image was not found in %s! "
+                             "Use hydra create-runner-image --cloud-privider %s --region %s",
+                             self.region_name, self.cloud_provider, self.region_name)
+                sys.exit(1)
+            LOGGER.warning("SCT Runner image %s was not found in %s, use an older image and install missing layers "
+                           "of prerequisites on the instance.  Use hydra create-runner-image --cloud-privider %s "
+                           "--region %s to save time.",
+                           self.image_name, self.region_name, self.cloud_provider, self.region_name)
+            missing_layers = True
         lt_datetime = datetime.datetime.now(tz=pytz.utc)
-        return self._create_instance(
+        instance = self._create_instance(
             instance_type=self.instance_type(test_duration=test_duration),
-            base_image=self._get_base_image(self.image),
+            base_image=self._get_base_image(image),
             tags_list=[
                 {"Key": "Name", "Value": self.RUNNER_NAME},
                 {"Key": "TestId", "Value": test_id},
@@ -180,6 +163,9 @@ class SctRunner(ABC):
             region_az=region_az,
             test_duration=test_duration,
         )
+        if missing_layers:
+            self.install_prereqs(public_ip=self._instance_public_ip(instance), connect_timeout=120)
+        return instance
 
 
 class AwsSctRunner(SctRunner):
@@ -197,7 +183,7 @@ class AwsSctRunner(SctRunner):
 
     @cached_property
     def image_name(self) -> str:
-        return f"sct-runner-{self.VERSION}"
+        return f"sct-runner-{self.VERSION}-{self.layers.digest[:12]}"
 
     @staticmethod
     def instance_type(test_duration) -> str:
@@ -230,6 +216,23 @@ class AwsSctRunner(SctRunner):
             f"found in {self.region_name}: {existing_amis}"
         return self.ec2_resource.Image(existing_amis[0]["ImageId"])  # pylint: disable=no-member
 
+    def _latest_image(self, image_type=ImageType.SOURCE):
+        if image_type == ImageType.SOURCE:
+            client, ec2_resource = self.ec2_client_source, self.ec2_resource_source
+        else:
+            client, ec2_resource = self.ec2_client, self.ec2_resource
+        amis = client.describe_images(Owners=["self"],
+                                      Filters=[{"Name": "name", "Values": [f"sct-runner-{self.VERSION}*"]},
+                                               {"Name": "tag:Version", "Values": [str(self.VERSION)]}])
+        existing_amis = sorted(amis.get("Images", []), key=lambda ami: ami["CreationDate"])
+        if not existing_amis:
+            return None
+        LOGGER.debug("The latest SCT Runner AMI: %s", existing_amis[-1])
+        return ec2_resource.Image(existing_amis[-1]["ImageId"])  # pylint: disable=no-member
+
+    def _instance_public_ip(self, instance) -> str:
+        return instance.public_ip_address
+
     # pylint: disable=too-many-arguments
     def _create_instance(self, instance_type, base_image, tags_list, instance_name=None, region_az="", test_duration=None):
         region = region_az[:-1]
@@ -278,6 +281,7 @@ class AwsSctRunner(SctRunner):
         image_tags = [
             {"Key": "Name", "Value": self.image_name},
             {"Key": "Version", "Value": str(self.VERSION)},
+            {"Key": "LayersDigest", "Value": self.layers.digest},
         ]
         runer_image = ec2_resource.Image(image_id)
         runer_image.wait_until_exists()
@@ -296,9 +300,13 @@ class AwsSctRunner(SctRunner):
         source_image = self.source_image
         if not source_image:
             LOGGER.info("Source SCT Runner Image not found. Creating...")
+            base_image = self._latest_image(image_type=ImageType.SOURCE)
+            if base_image:
+                LOGGER.info("Build on top of the latest SCT Runner Image %s, only changed layers will be installed.",
+                            base_image.image_id)
             instance = self._create_instance(
                 instance_type="t3.small",
-                base_image=self.BASE_IMAGE,
+                base_image=base_image.image_id if base_image else self.BASE_IMAGE,
                 tags_list=[{"Key": "Name", "Value": "sct-image-builder"},
                            {"Key": "keep", "Value": "1"},
                            {"Key": "keep_action", "Value": "terminate"},
@@ -367,7 +375,7 @@ class GceSctRunner(SctRunner):
 
     @cached_property
     def image_name(self) -> str:
-        return f"sct-runner-{str(self.VERSION).replace('.', '-')}"
+        return f"sct-runner-{str(self.VERSION).replace('.', '-')}-{self.layers.digest[:12]}"
 
     @staticmethod
     def instance_type(test_duration) -> str:
@@ -401,9 +409,13 @@ class GceSctRunner(SctRunner):
             else:
                 region_az = self.SOURCE_IMAGE_REGION
             lt_datetime = datetime.datetime.now(tz=pytz.utc)
+            base_image = self._latest_image(image_type=ImageType.SOURCE)
+            if base_image:
+                LOGGER.info("Build on top of the latest SCT Runner Image %s, only changed layers will be installed.",
+                            base_image.name)
             instance = self._create_instance(
                 instance_type="e2-standard-2",
-                base_image=self.BASE_IMAGE,
+                base_image=self._get_base_image(base_image) if base_image else self.BASE_IMAGE,
                 tags_list=[{"Key": "Name", "Value": "sct-image-builder"},
                            {"Key": "keep", "Value": "1"},
                            {"Key": "keep_action", "Value": "terminate"},
@@ -413,8 +425,7 @@ class GceSctRunner(SctRunner):
                 instance_name=instance_name,
                 region_az=region_az
             )
-            time.sleep(30)  # wait until the public ips are available.
-            self.install_prereqs(public_ip=instance.public_ips[0], connect_timeout=120)
+            self.install_prereqs(public_ip=self._instance_public_ip(instance), connect_timeout=120)
 
             LOGGER.info("Stopping the SCT Image Builder instance...")
             self.gce_service_source.ex_stop_node(instance)
@@ -425,7 +436,8 @@ class GceSctRunner(SctRunner):
                                                                 description=self.IMAGE_DESCRIPTION,
                                                                 family=self.FAMILY,
                                                                 ex_labels={"name": self.image_name,
-                                                                           "version": str(self.VERSION).replace('.', '_')})
+                                                                           "version": str(self.VERSION).replace('.', '_'),
+                                                                           "layers_digest": self.layers.digest[:63]})
             try:
                 LOGGER.info("Terminating image builder instance '%s'...", instance.id)
                 self.gce_service_source.destroy_node(instance)
@@ -500,6 +512,26 @@ class GceSctRunner(SctRunner):
         except ResourceNotFoundError as ex:  # pylint: disable=unused-variable
             return None
 
+    def _latest_image(self, image_type=ImageType.SOURCE):
+        driver = self.gce_service_source if image_type == ImageType.SOURCE else self.gce_service
+        try:
+            image = driver.ex_get_image_from_family(self.FAMILY)
+        except ResourceNotFoundError:
+            return None
+        if image is None or image.extra.get("labels", {}).get("version") != str(self.VERSION).replace('.', '_'):
+            return None
+        return image
+
+    def _instance_public_ip(self, instance) -> str:
+        """Wait until the public IP of the instance is available."""
+        def get_public_ip():
+            node = self.gce_service_source.ex_get_node(instance.name, zone=instance.extra["zone"])
+            return node.public_ips[0] if node.public_ips else None
+
+        if instance.public_ips:
+            return instance.public_ips[0]
+        return wait_until(get_public_ip, timeout=300, text=f"Waiting for public IP of {instance.name}", max_delay=5)
+
 
 if __name__ == "__main__":
     TEST_REGION = "eu-west-2"
@@ -84,6 +84,9 @@ from sdcm.remote import RemoteCmdRunnerBase
 from sdcm.utils.gce_utils import get_gce_services
 from sdcm.keystore import KeyStore
 from sdcm.utils.latency import calculate_latency
+from sdcm.wait import WAIT_STATS
+from sdcm.utils.cql_session_pool import get_cql_session_pool
+from sdcm.utils.spans import get_span_recorder
 
 try:
     import cluster_cloud
@@ -410,6 +413,7 @@ class ClusterTester(db_stats.TestStatsMixin, unittest.TestCase):  # pylint: disa
     def _init_logging(self):
         self.log = logging.getLogger(self.__class__.__name__)
         self.logdir = self.test_config.logdir()
+        get_span_recorder().set_path(os.path.join(self.logdir, "spans.jsonl"))
 
     def run(self, result=None):
         self.result = self.defaultTestResult() if result is None else result
@@ -2254,6 +2258,7 @@ class ClusterTester(db_stats.TestStatsMixin, unittest.TestCase):  # pylint: disa
         self.stop_timeout_thread()
         self.stop_event_analyzer()
         self.stop_resources()
+        self.close_cql_sessions()
         self.get_test_failures()
 
         # NOTE: running on K8S we need to gather logs otherwise a lot of
@@ -2268,17 +2273,39 @@ class ClusterTester(db_stats.TestStatsMixin, unittest.TestCase):  # pylint: disa
             self.update_test_with_errors()
         self.tag_ami_with_result()
         time.sleep(1)  # Sleep is needed to let final event being saved into files
+        self.report_slowest_waits()
+        self.export_spans_trace()
         self.save_email_data()
         self.destroy_localhost()
         self.send_email()
         self.stop_event_device()
         if self.params.get('collect_logs'):
             self.collect_sct_logs()
+        self.flush_test_stats()
         self.finalize_teardown()
         self.log.info('Test ID: {}'.format(self.test_config.test_id()))
         self._check_alive_routines_and_report_them()
         self.remove_python_exit_hooks()
 
+    @silence()
+    def close_cql_sessions(self):
+        cql_session_pool = get_cql_session_pool()
+        self.log.info("CQL session pool: %s", cql_session_pool.stats)
+        cql_session_pool.close_all()
+
+    @silence()
+    def report_slowest_waits(self):
+        slowest_waits = WAIT_STATS.slowest()
+        if slowest_waits:
+            self.log.info("Slowest waits of the test:\n%s", "\n".join(f"  {record}" for record in slowest_waits))
+
+    @silence()
+    def export_spans_trace(self):
+        trace_path = os.path.join(self.logdir, "spans_trace.json")
+        spans_count = get_span_recorder().export_chrome_trace(trace_path)
+        self.log.info("%s spans exported to %s (open with chrome://tracing or https://ui.perfetto.dev)",
+                      spans_count, trace_path)
+
     @silence()
     def remove_python_exit_hooks(self):  # pylint: disable=no-self-use
         clear_out_all_exit_hooks()
@@ -2338,6 +2365,11 @@ class ClusterTester(db_stats.TestStatsMixin, unittest.TestCase):  # pylint: disa
             if self.create_stats:
                 self.update({'test_details': {'log_files': {'job_log': s3_link}}})
 
+    @silence()
+    def flush_test_stats(self):
+        if self.create_stats:
+            self.flush(timeout=120)
+
     @silence()
     def stop_event_device(self):  # pylint: disable=no-self-use
         stop_events_device(_registry=self.events_processes_registry)
@@ -2914,6 +2946,7 @@ class ClusterTester(db_stats.TestStatsMixin, unittest.TestCase):  # pylint: disa
                 "region_name": region_name,
                 "scylla_instance_type": scylla_instance_type,
                 "scylla_version": scylla_version,
+                "slowest_waits": [str(record) for record in WAIT_STATS.slowest()],
                 "live_nodes_shards": nodes_shards.get('live_nodes'),
                 "dead_nodes_shards": nodes_shards.get('dead_nodes'),
                 "kernel_version": kernel_version,
@@ -1,4 +1,12 @@
-from sdcm.utils.alternator import api
+import importlib
+
 from sdcm.utils.alternator import consts
 from sdcm.utils.alternator import enums
 from sdcm.utils.alternator import schemas
+
+
+def __getattr__(name):
+    # `api' needs boto3 and sdcm.utils.common which are slow to import, load it on first access only.
+    if name == "api":
+        return importlib.import_module(f"{__name__}.api")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,228 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import time
+import random
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from collections import defaultdict
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from botocore.exceptions import ClientError
+from mypy_boto3_ec2 import EC2Client
+from prettytable import PrettyTable
+
+LOGGER = logging.getLogger(__name__)
+
+THROTTLING_ERROR_CODES = ("RequestLimitExceeded", "Throttling", "ThrottlingException", "TooManyRequestsException", )
+TERMINATE_INSTANCES_BATCH_SIZE = 1000  # maximum number of instance IDs AWS accepts in one TerminateInstances call
+
+
+def tags_to_filters(tags_dict: Optional[dict]) -> List[dict]:
+    return [{"Name": f"tag:{key}", "Values": [value]} for key, value in (tags_dict or {}).items()]
+
+
+def is_throttling_error(exc: Exception) -> bool:
+    return isinstance(exc, ClientError) and exc.response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+
+
+@dataclass
+class OperationTiming:
+    calls: int = 0
+    throttled: int = 0
+    duration: float = 0.0
+
+
+class AdaptiveBackoff:
+    """Per-region delay between API calls, which grows on throttling errors and decays on successful calls."""
+
+    initial_delay = 0.5
+    max_delay = 30.0
+
+    def __init__(self):
+        self.delay = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            delay = self.delay
+        if delay:
+            time.sleep(random.uniform(delay / 2, delay))
+
+    def on_throttling(self) -> None:
+        with self._lock:
+            self.delay = min(self.max_delay, max(self.initial_delay, self.delay * 2))
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.delay = self.delay / 2 if self.delay > self.initial_delay else 0.0
+
+
+class AwsInventory:
+    """List and clean EC2 resources of many regions in parallel.
+
+    Paginated `describe_*' calls are followed through all pages, so nothing is truncated.  Regions are handled
+    concurrently, but at most `per_region_concurrency' API calls run in a region at once, and calls throttled by AWS
+    are retried with an adaptive per-region backoff.  Time spent in each region/operation is collected and can be
+    shown by `timing_report()'.
+    """
+
+    max_regions_concurrency = 20
+    per_region_concurrency = 4
+    max_attempts = 8
+    page_size = 1000
+
+    def __init__(self, regions: Iterable[str], client_factory: Callable[[str], EC2Client] = None):
+        self.regions = list(regions)
+        self._client_factory = client_factory or (lambda region: boto3.client("ec2", region_name=region))
+        self._clients: Dict[str, EC2Client] = {}
+        self._clients_lock = threading.Lock()
+        self._region_semaphores = defaultdict(lambda: threading.BoundedSemaphore(self.per_region_concurrency))
+        self._backoffs = defaultdict(AdaptiveBackoff)
+        self._timings: Dict[tuple, OperationTiming] = defaultdict(OperationTiming)
+        self._timings_lock = threading.Lock()
+
+    def client(self, region: str) -> EC2Client:
+        with self._clients_lock:
+            if region not in self._clients:
+                self._clients[region] = self._client_factory(region)
+                # Create the semaphore and backoff for the region under the lock, so all threads share the same ones.
+                _ = self._region_semaphores[region], self._backoffs[region]
+            return self._clients[region]
+
+    def call(self, region: str, operation: str, **kwargs) -> Any:
+        """Call an EC2 API operation in the region, retry it if it's throttled."""
+        client = self.client(region)
+        return self._with_retries(region, operation, lambda: getattr(client, operation)(**kwargs))
+
+    def paginate(self, region: str, operation: str, result_key: str, **kwargs) -> List[dict]:
+        """Return items of all pages of a paginated EC2 API operation in the region.
+
+        Each page is requested separately, so a throttled page is retried alone.
+        """
+        items = []
+        next_token = None
+        while True:
+            if next_token:
+                kwargs["NextToken"] = next_token
+            page = self.call(region, operation, MaxResults=self.page_size, **kwargs)
+            items.extend(page.get(result_key, []))
+            next_token = page.get("NextToken")
+            if not next_token:
+                return items
+
+    def _with_retries(self, region: str, operation: str, func: Callable[[], Any]) -> Any:
+        backoff = self._backoffs[region]
+        attempt = 1
+        while True:
+            backoff.wait()
+            start_time = time.perf_counter()
+            with self._region_semaphores[region]:
+                try:
+                    result = func()
+                except ClientError as exc:
+                    throttled = is_throttling_error(exc)
+                    self._add_timing(region, operation, time.perf_counter() - start_time, throttled=throttled)
+                    if not throttled or attempt == self.max_attempts:
+                        raise
+                else:
+                    self._add_timing(region, operation, time.perf_counter() - start_time)
+                    backoff.on_success()
+                    return result
+            backoff.on_throttling()
+            LOGGER.debug("%s: %s is throttled (attempt %s/%s), slow down to %.1fs between calls",
+                         region, operation, attempt, self.max_attempts, backoff.delay)
+            attempt += 1
+
+    def _add_timing(self, region: str, operation: str, duration: float, throttled: bool = False) -> None:
+        with self._timings_lock:
+            timing = self._timings[(region, operation)]
+            timing.calls += 1
+            timing.duration += duration
+            timing.throttled += int(throttled)
+
+    def for_each_region(self, func: Callable[[str], Any], regions: Iterable[str] = None) -> Dict[str, Any]:
+        """Run func(region) for all regions in parallel, return results of regions where it succeeded."""
+        regions = list(self.regions if regions is None else regions)
+        results = {}
+        if not regions:
+            return results
+        with ThreadPoolExecutor(max_workers=min(len(regions), self.max_regions_concurrency),
+                                thread_name_prefix="AwsInventory") as executor:
+            futures = {region: executor.submit(func, region) for region in regions}
+            for region, future in futures.items():
+                try:
+                    results[region] = future.result()
+                except Exception as exc:  # pylint: disable=broad-except
+                    LOGGER.error("%s: %s", region, exc)
+        return results
+
+    def list_instances(self, tags_dict: Optional[dict] = None) -> Dict[str, List[dict]]:
+        def list_region(region):
+            reservations = self.paginate(region, "describe_instances", "Reservations", Filters=tags_to_filters(tags_dict))
+            return [instance for reservation in reservations for instance in reservation["Instances"]]
+        return self.for_each_region(list_region)
+
+    def list_elastic_ips(self, tags_dict: Optional[dict] = None) -> Dict[str, List[dict]]:
+        # DescribeAddresses isn't paginated and always returns all addresses.
+        return self.for_each_region(
+            lambda region: self.call(region, "describe_addresses", Filters=tags_to_filters(tags_dict))["Addresses"])
+
+    def _terminate_batch(self, region: str, batch: List[str]) -> List[dict]:
+        """Terminate a batch of instances.
+
+        One bad instance (e.g. termination-protected or already gone) fails the whole call, so the failed batch is
+        split in halves which are retried separately, till the bad instances are found.
+        """
+        try:
+            return self.call(region, "terminate_instances", InstanceIds=batch)["TerminatingInstances"]
+        except ClientError as exc:
+            if len(batch) == 1:
+                LOGGER.error("%s: failed to terminate %s: %s", region, batch[0], exc)
+                return []
+            LOGGER.warning("%s: failed to terminate a batch of %s instances, split it: %s", region, len(batch), exc)
+        middle = len(batch) // 2
+        return self._terminate_batch(region, batch[:middle]) + self._terminate_batch(region, batch[middle:])
+
+    def terminate_instances(self, instance_ids: Dict[str, List[str]]) -> Dict[str, List[dict]]:
+        """Terminate instances using as few TerminateInstances calls as possible, return terminating instances."""
+        def terminate_region(region):
+            ids = instance_ids[region]
+            batches = [ids[idx:idx + TERMINATE_INSTANCES_BATCH_SIZE]
+                       for idx in range(0, len(ids), TERMINATE_INSTANCES_BATCH_SIZE)]
+            with ThreadPoolExecutor(max_workers=self.per_region_concurrency) as executor:
+                responses = executor.map(lambda batch: self._terminate_batch(region, batch), batches)
+                return [instance for response in responses for instance in response]
+        return self.for_each_region(terminate_region, regions=[region for region, ids in instance_ids.items() if ids])
+
+    def release_elastic_ips(self, elastic_ips: Dict[str, List[dict]]) -> None:
+        def release_region(region):
+            def release(eip):
+                if eip.get("AssociationId"):
+                    self.call(region, "disassociate_address", AssociationId=eip["AssociationId"])
+                self.call(region, "release_address", AllocationId=eip["AllocationId"])
+            with ThreadPoolExecutor(max_workers=self.per_region_concurrency) as executor:
+                list(executor.map(release, elastic_ips[region]))
+        self.for_each_region(release_region, regions=[region for region, eips in elastic_ips.items() if eips])
+
+    def timing_report(self) -> str:
+        table = PrettyTable(["Region", "Operation", "Calls", "Throttled", "Time, s"])
+        table.align = "l"
+        with self._timings_lock:
+            timings = sorted(self._timings.items(), key=lambda item: item[1].duration, reverse=True)
+        for (region, operation), timing in timings:
+            table.add_row([region, operation, timing.calls, timing.throttled, f"{timing.duration:.2f}"])
+        return table.get_string()
@@ -7,9 +7,8 @@ import boto3
 
 from botocore.exceptions import ClientError
 
-from sdcm.utils.decorators import retrying
 from sdcm.utils.prepare_region import AwsRegion
-from sdcm.wait import wait_for
+from sdcm.wait import wait_for, wait_until
 
 
 LOGGER = logging.getLogger(__name__)
@@ -314,12 +313,15 @@ class PublicIpNotReady(Exception):
     pass
 
 
-@retrying(n=90, sleep_time=10, allowed_exceptions=(PublicIpNotReady,),
-          message="Waiting for instance to get public ip")
-def ec2_instance_wait_public_ip(instance):
-    instance.reload()
-    if instance.public_ip_address is None:
-        raise PublicIpNotReady(instance)
+def ec2_instance_wait_public_ip(instance, timeout=900):
+    def public_ip_address():
+        instance.reload()
+        if instance.public_ip_address is None:
+            raise PublicIpNotReady(instance)
+        return instance.public_ip_address
+
+    wait_until(public_ip_address, timeout=timeout, text=f"Waiting for {instance} to get public ip",
+               max_delay=10, allowed_exceptions=(PublicIpNotReady, ))
     LOGGER.debug("[%s] Got public ip: %s", instance, instance.public_ip_address)
 
 
@@ -0,0 +1,201 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import os
+import json
+import queue
+import logging
+import threading
+from typing import Dict, Hashable, Iterable, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+
+LOGGER = logging.getLogger(__name__)
+
+BACKTRACE_CACHE_DIR = os.path.expanduser("~/.cache/sct/backtraces")
+INLINED_PREFIX = " (inlined by) "
+
+
+class BacktraceSymbolsCache:
+    """Mapping of (build-id, address) to the addr2line output for this address.
+
+    Symbols of each build-id are stored in a separate JSON file in `cache_dir', so they are reused by next test runs
+    on the same machine.  Symbols of binaries with unknown build-id are kept in memory only, by any other key
+    (see `BacktraceDecoder.symbols_key()'.)
+    """
+
+    def __init__(self, cache_dir: Optional[str] = BACKTRACE_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._symbols: Dict[Hashable, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def _cache_file(self, build_id: str) -> str:
+        return os.path.join(self.cache_dir, f"{build_id}.json")
+
+    def _is_persistent(self, build_id: Hashable) -> bool:
+        return bool(self.cache_dir) and isinstance(build_id, str) and bool(build_id)
+
+    def _load(self, build_id: Hashable) -> Dict[str, str]:
+        if build_id not in self._symbols:
+            symbols = {}
+            if self._is_persistent(build_id) and os.path.exists(self._cache_file(build_id)):
+                try:
+                    with open(self._cache_file(build_id), encoding="utf-8") as cache_file:
+                        symbols = json.load(cache_file)
+                except (OSError, ValueError) as exc:
+                    LOGGER.warning("Failed to load cached symbols for build-id %s: %s", build_id, exc)
+            self._symbols[build_id] = symbols
+        return self._symbols[build_id]
+
+    def get(self, build_id: Hashable, address: str) -> Optional[str]:
+        with self._lock:
+            return self._load(build_id).get(address)
+
+    def missing(self, build_id: Hashable, addresses: Iterable[str]) -> List[str]:
+        with self._lock:
+            symbols = self._load(build_id)
+            return sorted({address for address in addresses if address not in symbols})
+
+    def update(self, build_id: Hashable, symbols: Dict[str, str]) -> None:
+        with self._lock:
+            cached = self._load(build_id)
+            cached.update(symbols)
+            if not self._is_persistent(build_id):
+                return
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp_file = f"{self._cache_file(build_id)}.{os.getpid()}.tmp"
+                with open(tmp_file, "w", encoding="utf-8") as cache_file:
+                    json.dump(cached, cache_file)
+                os.replace(tmp_file, self._cache_file(build_id))
+            except OSError as exc:
+                LOGGER.warning("Failed to save cached symbols for build-id %s: %s", build_id, exc)
+
+
+def split_addr2line_output(output: str) -> List[str]:
+    """Split output of `addr2line -Cpife' for many addresses into a per-address list.
+
+    With `-i' an address can be decoded into several lines: the function itself and the functions it's inlined to.
+    """
+    symbols = []
+    for line in output.splitlines():
+        if line.startswith(INLINED_PREFIX) and symbols:
+            symbols[-1] += "\n" + line
+        elif line.strip():
+            symbols.append(line)
+    return symbols
+
+
+class BacktraceDecoder:  # pylint: disable=too-many-instance-attributes
+    """Decode backtraces of DB nodes' events using addr2line on the monitor node.
+
+    Events are taken from the decoding queue by batches.  All addresses of a batch which aren't in the symbols cache
+    are decoded by a few addr2line invocations running in parallel, and identical stacks are decoded only once.
+    Events are published in the order they were queued, so events of each node stay in order.
+    """
+
+    addresses_per_call = 500  # keep addr2line command line reasonably short
+    batch_size = 200
+
+    def __init__(self, monitor_node, decoding_queue: queue.Queue, termination_event: threading.Event,  # pylint: disable=too-many-arguments
+                 workers: int = 4, cache: Optional[BacktraceSymbolsCache] = None):
+        self.monitor_node = monitor_node
+        self.decoding_queue = decoding_queue
+        self.termination_event = termination_event
+        self.workers = workers
+        self.cache = cache or BacktraceSymbolsCache()
+        self._debug_files = {}
+        self._debug_files_lock = threading.Lock()
+        self.log = LOGGER
+
+    def run(self) -> None:
+        while True:
+            batch = self._get_batch()
+            try:
+                self.decode_and_publish([item for item in batch if item is not None])
+            finally:
+                for _ in batch:
+                    self.decoding_queue.task_done()
+            if None in batch or (self.termination_event.is_set() and self.decoding_queue.empty()):
+                break
+
+    def _get_batch(self) -> list:
+        try:
+            batch = [self.decoding_queue.get(timeout=5)]
+        except queue.Empty:
+            return []
+        while batch[-1] is not None and len(batch) < self.batch_size:
+            try:
+                batch.append(self.decoding_queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def decode_and_publish(self, items: List[dict]) -> None:
+        try:
+            self.decode(items)
+        except Exception as details:  # pylint: disable=broad-except
+            self.log.error("failed to decode backtraces: %s", details)
+        finally:
+            for item in items:
+                item["event"].publish()
+
+    @staticmethod
+    def symbols_key(item: dict) -> Hashable:
+        """Key of the item's binary: its build-id, or the node and debug file if the build-id is unknown."""
+        return item.get("build_id") or (getattr(item["node"], "name", str(item["node"])), item["debug_file"])
+
+    def decode(self, items: List[dict]) -> None:
+        addresses_to_decode = {}
+        for item in items:
+            addresses = addresses_to_decode.setdefault(self.symbols_key(item), set())
+            addresses.update(item["event"].raw_backtrace.split())
+        item_for_build_id = {self.symbols_key(item): item for item in items}
+
+        calls = []
+        for build_id, addresses in addresses_to_decode.items():
+            missing = self.cache.missing(build_id, addresses)
+            for idx in range(0, len(missing), self.addresses_per_call):
+                calls.append((item_for_build_id[build_id], missing[idx:idx + self.addresses_per_call]))
+        if calls:
+            self.log.debug("Decode %s addresses using %s addr2line calls", sum(len(call[1]) for call in calls), len(calls))
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="BacktraceDecoder") as executor:
+                for future in [executor.submit(self._decode_addresses, *call) for call in calls]:
+                    try:
+                        future.result()
+                    except Exception as details:  # pylint: disable=broad-except
+                        self.log.error("failed to decode backtrace %s", details)
+
+        decoded_stacks = {}
+        for item in items:
+            build_id = self.symbols_key(item)
+            raw_backtrace = item["event"].raw_backtrace
+            if (build_id, raw_backtrace) not in decoded_stacks:
+                symbols = [self.cache.get(build_id, address) for address in raw_backtrace.split()]
+                decoded_stacks[(build_id, raw_backtrace)] = None if None in symbols else "\n".join(symbols)
+            if decoded_stacks[(build_id, raw_backtrace)] is not None:
+                item["event"].backtrace = decoded_stacks[(build_id, raw_backtrace)]
+
+    def _get_debug_file(self, item: dict) -> str:
+        key = self.symbols_key(item)
+        with self._debug_files_lock:
+            if key not in self._debug_files:
+                self._debug_files[key] = self.monitor_node.copy_scylla_debug_info(
+                    item["node"], item["debug_file"], build_id=item.get("build_id"))
+            return self._debug_files[key]
+
+    def _decode_addresses(self, item: dict, addresses: List[str]) -> None:
+        output = self.monitor_node.decode_raw_backtrace(self._get_debug_file(item), " ".join(addresses))
+        symbols = split_addr2line_output(output.stdout)
+        if len(symbols) != len(addresses):
+            raise ValueError(f"addr2line returned {len(symbols)} symbols for {len(addresses)} addresses")
+        self.cache.update(self.symbols_key(item), dict(zip(addresses, symbols)))
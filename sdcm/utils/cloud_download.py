@@ -0,0 +1,262 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import os
+import re
+import time
+import hashlib
+import logging
+import threading
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from mypy_boto3_s3 import S3Client
+
+from sdcm.utils.stream_upload import MB
+
+LOGGER = logging.getLogger(__name__)
+
+MD5_ETAG_RE = re.compile(r"^[0-9a-f]{32}$")  # ETag of an object which wasn't uploaded by multipart upload
+ETAG_XATTR = "user.sct.etag"
+
+
+@dataclass
+class RemoteObject:
+    key: str
+    size: int
+    etag: str
+    handle: Any = None  # backend specific object
+
+
+@dataclass
+class DownloadStats:
+    files: int = 0
+    skipped: int = 0
+    parts: int = 0
+    size: int = 0
+    duration: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Download throughput in MB/s."""
+        return self.size / MB / self.duration if self.duration else 0.0
+
+    def __str__(self):
+        return f"{self.files} files ({self.parts} parts, {self.size / MB:.1f}MB) in {self.duration:.1f}s " \
+               f"({self.throughput:.1f}MB/s), {self.skipped} files are up to date"
+
+
+def file_md5(path: str) -> str:
+    md5 = hashlib.md5()  # deepcode ignore insecureHash: compared with ETag of S3 objects
+    with open(path, "rb") as local_file:
+        for chunk in iter(lambda: local_file.read(MB), b""):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def get_local_etag(path: str) -> Optional[str]:
+    try:
+        return os.getxattr(path, ETAG_XATTR).decode()
+    except OSError:  # no such attribute or xattrs aren't supported by the filesystem
+        return None
+
+
+def set_local_etag(path: str, etag: str) -> None:
+    try:
+        os.setxattr(path, ETAG_XATTR, etag.encode())
+    except OSError as exc:
+        LOGGER.debug("Can't save ETag of %s: %s", path, exc)
+
+
+class ParallelDownloader:
+    """Download many objects of a cloud storage using a bounded pool of threads.
+
+    Objects bigger than `multipart_threshold' are downloaded by ranged GETs of `part_size' bytes in parallel (if the
+    backend supports it.)  Files which have the same size and ETag as remote objects are skipped, and MD5 of a
+    downloaded file is compared with object's ETag when the ETag is MD5 of the content.  A file appears on its final
+    path only when it's completely downloaded.
+    """
+
+    max_workers = 8
+    part_size = 64 * MB
+    multipart_threshold = 128 * MB
+    part_retries = 3
+    chunk_size = MB
+    supports_ranges = True
+
+    def __init__(self, max_workers: Optional[int] = None):
+        if max_workers:
+            self.max_workers = max_workers
+        self._lock = threading.Lock()
+
+    def list_objects(self, prefix: str) -> Iterable[RemoteObject]:
+        raise NotImplementedError()
+
+    def read(self, obj: RemoteObject, start: Optional[int] = None, end: Optional[int] = None) -> Iterator[bytes]:
+        """Read the object or its byte range (`end' is inclusive) by chunks."""
+        raise NotImplementedError()
+
+    def download_dir(self, prefix: str, target: str) -> DownloadStats:
+        prefix = prefix.lstrip("/")
+        if prefix and not prefix.endswith("/"):
+            prefix += "/"
+        return self.download([(obj, os.path.join(target, obj.key[len(prefix):]))
+                              for obj in self.list_objects(prefix) if not obj.key.endswith("/")])
+
+    def download(self, objects: List[Tuple[RemoteObject, str]]) -> DownloadStats:
+        """Download objects to local paths, return statistics of the download."""
+        stats = DownloadStats()
+        start_time = time.perf_counter()
+        parts = []
+        parts_left = {}
+        for obj, path in objects:
+            if self.is_up_to_date(obj, path):
+                LOGGER.debug("%s is up to date, skip download of %s", path, obj.key)
+                stats.skipped += 1
+                continue
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(f"{path}.part", "wb") as part_file:
+                part_file.truncate(obj.size)
+            ranges = self._split(obj)
+            parts_left[path] = len(ranges)
+            parts.extend((obj, path, start, end) for start, end in ranges)
+        LOGGER.info("Downloading %s files (%s parts) with %s threads",
+                    len(parts_left), len(parts), min(self.max_workers, len(parts)) if parts else 0)
+
+        def download_part(obj, path, start, end):
+            downloaded = self._download_part(obj, f"{path}.part", start, end)
+            with self._lock:
+                stats.parts += 1
+                stats.size += downloaded
+                parts_left[path] -= 1
+                last_part = parts_left[path] == 0
+            if last_part:
+                self._finalize(obj, path)
+                with self._lock:
+                    stats.files += 1
+
+        try:
+            if parts:
+                with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ParallelDownloader") as pool:
+                    futures = [pool.submit(download_part, *part) for part in parts]
+                    try:
+                        for future in futures:
+                            future.result()
+                    except Exception:
+                        for future in futures:
+                            future.cancel()
+                        raise
+        finally:
+            for path in parts_left:
+                if os.path.exists(f"{path}.part"):
+                    os.remove(f"{path}.part")
+            stats.duration = time.perf_counter() - start_time
+        LOGGER.info("Downloaded %s", stats)
+        return stats
+
+    @staticmethod
+    def is_up_to_date(obj: RemoteObject, path: str) -> bool:
+        if not os.path.isfile(path) or os.path.getsize(path) != obj.size:
+            return False
+        if get_local_etag(path) == obj.etag:
+            return True
+        return bool(MD5_ETAG_RE.match(obj.etag)) and file_md5(path) == obj.etag
+
+    def _split(self, obj: RemoteObject) -> List[Tuple[Optional[int], Optional[int]]]:
+        if not self.supports_ranges or obj.size <= self.multipart_threshold:
+            return [(None, None)]
+        return [(start, min(start + self.part_size, obj.size) - 1) for start in range(0, obj.size, self.part_size)]
+
+    def _download_part(self, obj: RemoteObject, part_path: str, start: Optional[int], end: Optional[int]) -> int:
+        attempt = 1
+        while True:
+            size = 0
+            try:
+                with open(part_path, "r+b") as part_file:
+                    part_file.seek(start or 0)
+                    for chunk in self.read(obj, start, end):
+                        part_file.write(chunk)
+                        size += len(chunk)
+                return size
+            except Exception as exc:  # pylint: disable=broad-except
+                if attempt == self.part_retries:
+                    raise
+                LOGGER.warning("Failed to download %s (bytes %s-%s), attempt %s/%s: %s",
+                               obj.key, start, end, attempt, self.part_retries, exc)
+            attempt += 1
+
+    @staticmethod
+    def _finalize(obj: RemoteObject, path: str) -> None:
+        part_path = f"{path}.part"
+        if os.path.getsize(part_path) != obj.size:
+            raise IOError(f"{obj.key}: downloaded {os.path.getsize(part_path)} bytes instead of {obj.size}")
+        if MD5_ETAG_RE.match(obj.etag) and (md5 := file_md5(part_path)) != obj.etag:
+            raise IOError(f"{obj.key}: MD5 of downloaded file ({md5}) doesn't match ETag ({obj.etag})")
+        set_local_etag(part_path, obj.etag)
+        os.replace(part_path, path)
+
+
+class S3Downloader(ParallelDownloader):
+    page_size = 1000
+
+    def __init__(self, bucket: str, client: Optional[S3Client] = None, region_name: Optional[str] = None,
+                 max_workers: Optional[int] = None):
+        super().__init__(max_workers=max_workers)
+        self.bucket = bucket
+        self.client: S3Client = client or boto3.client("s3", region_name=region_name)
+
+    def list_objects(self, prefix: str) -> Iterable[RemoteObject]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix,
+                                       PaginationConfig={"PageSize": self.page_size}):
+            for item in page.get("Contents", []):
+                yield RemoteObject(key=item["Key"], size=item["Size"], etag=item["ETag"].strip('"'))
+
+    def get_object(self, key: str) -> RemoteObject:
+        head = self.client.head_object(Bucket=self.bucket, Key=key)
+        return RemoteObject(key=key, size=head["ContentLength"], etag=head["ETag"].strip('"'))
+
+    def download_file(self, key: str, path: str) -> DownloadStats:
+        return self.download([(self.get_object(key), path)])
+
+    def read(self, obj: RemoteObject, start: Optional[int] = None, end: Optional[int] = None) -> Iterator[bytes]:
+        kwargs = {} if start is None else {"Range": f"bytes={start}-{end}"}
+        body = self.client.get_object(Bucket=self.bucket, Key=obj.key, **kwargs)["Body"]
+        try:
+            yield from body.iter_chunks(chunk_size=self.chunk_size)
+        finally:
+            body.close()
+
+
+class GceDownloader(ParallelDownloader):
+    """Download objects of a Google Storage container using libcloud storage driver.
+
+    libcloud 2.x can't read a byte range of an object, so each object is downloaded by one thread.
+    """
+
+    supports_ranges = False
+
+    def __init__(self, driver, bucket: str, max_workers: Optional[int] = None):
+        super().__init__(max_workers=max_workers)
+        self.driver = driver
+        self.container = driver.get_container(container_name=bucket)
+
+    def list_objects(self, prefix: str) -> Iterable[RemoteObject]:
+        # libcloud follows all pages of the listing by itself.
+        for obj in self.driver.list_container_objects(self.container, ex_prefix=prefix):
+            yield RemoteObject(key=obj.name, size=int(obj.size), etag=(obj.hash or "").strip('"'), handle=obj)
+
+    def read(self, obj: RemoteObject, start: Optional[int] = None, end: Optional[int] = None) -> Iterator[bytes]:
+        return self.driver.download_object_as_stream(obj.handle, chunk_size=self.chunk_size)
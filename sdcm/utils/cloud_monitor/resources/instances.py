@@ -1,5 +1,7 @@
 from logging import getLogger
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 from boto3 import client as boto3_client
 from sdcm.utils.cloud_monitor.common import InstanceLifecycle, NA
 from sdcm.utils.cloud_monitor.resources import CloudInstance, CloudResources
@@ -10,12 +12,79 @@ from sdcm.utils.pricing import AWSPricing, GCEPricing
 LOGGER = getLogger(__name__)
 
 
+def aws_instance_tagged_owner(instance: dict) -> Optional[str]:
+    tags = aws_tags_to_dict(instance.get('Tags'))
+    return tags.get("RunByUser", tags.get("Owner"))
+
+
+def aws_instance_creation_time(instance: dict) -> datetime:
+    """Return when the instance was created.
+
+    `LaunchTime' is reset on every start of a stopped instance, but attachments of the root volume and of the primary
+    network interface are made on creation and kept on stop/start.
+    """
+    attach_times = [mapping["Ebs"]["AttachTime"] for mapping in instance.get("BlockDeviceMappings", [])
+                    if mapping.get("DeviceName") == instance.get("RootDeviceName") and "Ebs" in mapping]
+    attach_times += [interface["Attachment"]["AttachTime"] for interface in instance.get("NetworkInterfaces", [])
+                     if interface.get("Attachment", {}).get("DeviceIndex") == 0]
+    return min(attach_times + [instance["LaunchTime"]])
+
+
+class CloudTrailOwners:
+    """Owners of AWS instances according to CloudTrail `RunInstances' events.
+
+    Instead of a lookup per instance, read all `RunInstances' events of a region since the oldest instance was
+    created, in one paginated sweep per region, and join them with the instances locally.
+    """
+
+    max_workers = 8
+
+    def __init__(self, instances: List[dict]):
+        self._owners: Dict[str, str] = {}
+        instances_by_region = {}
+        for instance in instances:
+            instances_by_region.setdefault(instance["Placement"]["AvailabilityZone"][:-1], []).append(instance)
+        if not instances_by_region:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(instances_by_region))) as executor:
+            for owners in executor.map(self._get_region_owners, *zip(*instances_by_region.items())):
+                self._owners.update(owners)
+
+    @staticmethod
+    def _get_region_owners(region: str, instances: List[dict]) -> Dict[str, str]:
+        instance_ids = {instance["InstanceId"] for instance in instances}
+        # CloudTrail keeps events of the last 90 days only
+        start_time = max(min(aws_instance_creation_time(instance) for instance in instances) - timedelta(minutes=5),
+                         datetime.now(timezone.utc) - timedelta(days=90))
+        owners = {}
+        try:
+            paginator = boto3_client('cloudtrail', region_name=region).get_paginator('lookup_events')
+            for page in paginator.paginate(
+                    LookupAttributes=[{'AttributeKey': 'EventName', 'AttributeValue': 'RunInstances'}],
+                    StartTime=start_time):
+                for event in page["Events"]:
+                    for resource in event.get("Resources", []):
+                        if resource.get("ResourceName") in instance_ids and event.get("Username"):
+                            owners[resource["ResourceName"]] = event["Username"]
+                if len(owners) == len(instance_ids):
+                    break
+        except Exception as exc:  # pylint: disable=broad-except
+            LOGGER.warning("Error occurred when trying to find owners of instances in %s in CloudTrail: %s",
+                           region, exc)
+        LOGGER.info("Found owners of %s/%s untagged instances in %s CloudTrail", len(owners), len(instance_ids), region)
+        return owners
+
+    def get(self, instance_id: str) -> Optional[str]:
+        return self._owners.get(instance_id)
+
+
 class AWSInstance(CloudInstance):
     pricing = AWSPricing()
 
-    def __init__(self, instance):
+    def __init__(self, instance, cloud_trail_owners: Optional[CloudTrailOwners] = None):
         self._instance = instance
         self._tags = aws_tags_to_dict(instance.get('Tags'))
+        self._cloud_trail_owners = cloud_trail_owners
         super().__init__(
             cloud="aws",
             name=self._tags.get("Name", NA),
@@ -48,10 +117,14 @@ class AWSInstance(CloudInstance):
 
     def get_owner(self):
         # try to get the owner using tags
-        if owner := self._tags.get("RunByUser", self._tags.get("Owner")):
+        if owner := aws_instance_tagged_owner(self._instance):
             return owner
         # get the owner from the Cloud Trail
-        if owner := self.get_owner_from_cloud_trail():
+        if self._cloud_trail_owners is not None:
+            owner = self._cloud_trail_owners.get(self._instance['InstanceId'])
+        else:
+            owner = self.get_owner_from_cloud_trail()
+        if owner:
             return owner
         return NA
 
@@ -97,7 +170,13 @@ class CloudInstances(CloudResources):
 
     def get_aws_instances(self):
         aws_instances = list_instances_aws(verbose=True)
-        self["aws"] = [AWSInstance(instance) for instance in aws_instances]
+        cloud_trail_owners = CloudTrailOwners(
+            [instance for instance in aws_instances if not aws_instance_tagged_owner(instance)])
+        AWSInstance.pricing.prefetch(
+            (instance["Placement"]["AvailabilityZone"][:-1], instance["InstanceType"],
+             InstanceLifecycle.SPOT if instance.get("SpotInstanceRequestId") else InstanceLifecycle.ON_DEMAND)
+            for instance in aws_instances if instance["State"]["Name"] == "running")
+        self["aws"] = [AWSInstance(instance, cloud_trail_owners=cloud_trail_owners) for instance in aws_instances]
         self.all.extend(self["aws"])
 
     def get_gce_instances(self):
@@ -53,6 +53,7 @@ import requests
 import pytz
 
 import boto3
+from botocore.exceptions import ClientError
 from mypy_boto3_s3 import S3Client, S3ServiceResource
 from mypy_boto3_ec2 import EC2Client, EC2ServiceResource
 import docker  # pylint: disable=wrong-import-order; false warning because of docker import (local file vs. package)
@@ -65,6 +66,9 @@ import yaml
 from packaging.version import Version
 
 from sdcm.utils.aws_utils import EksClusterCleanupMixin
+from sdcm.utils.aws_inventory import AwsInventory
+from sdcm.utils.cloud_download import S3Downloader, GceDownloader
+from sdcm.utils.resolution_cache import ResolutionCache
 from sdcm.utils.ssh_agent import SSHAgent
 from sdcm.utils.decorators import retrying
 from sdcm import wait
@@ -255,9 +259,7 @@ class S3Storage():
         file_name = os.path.basename(key_name)
         try:
             LOGGER.info("Downloading {0} from {1}".format(key_name, self.bucket_name))
-            self._bucket.download_file(Key=key_name,
-                                       Filename=os.path.join(dst_dir, file_name),
-                                       Config=self.transfer_config)
+            S3Downloader(self.bucket_name).download_file(key=key_name, path=os.path.join(dst_dir, file_name))
             LOGGER.info("Downloaded finished")
             return os.path.join(os.path.abspath(dst_dir), file_name)
 
@@ -652,25 +654,14 @@ def list_instances_aws(tags_dict=None, region_name=None, running=False, group_as
 
     :return: instances dict where region is a key
     """
-    instances = {}
     aws_regions = [region_name] if region_name else all_aws_regions()
-
-    def get_instances(region):
-        if verbose:
-            LOGGER.info('Going to list aws region "%s"', region)
-        time.sleep(random.random())
-        client: EC2Client = boto3.client('ec2', region_name=region)
-        custom_filter = []
-        if tags_dict:
-            custom_filter = [{'Name': 'tag:{}'.format(key), 'Values': [value]} for key, value in tags_dict.items()]
-        response = client.describe_instances(Filters=custom_filter)
-        instances[region] = [instance for reservation in response['Reservations'] for instance in reservation[
-            'Instances']]
-
-        if verbose:
-            LOGGER.info("%s: done [%s/%s]", region, len(list(instances.keys())), len(aws_regions))
-
-    ParallelObject(aws_regions, timeout=100).run(get_instances, ignore_exceptions=True)
+    if verbose:
+        LOGGER.info("Going to list instances in %s aws regions", len(aws_regions))
+    inventory = AwsInventory(regions=aws_regions)
+    instances = inventory.list_instances(tags_dict=tags_dict)
+    if verbose:
+        LOGGER.info("Listed instances in %s/%s aws regions:\n%s",
+                    len(instances), len(aws_regions), inventory.timing_report())
 
     for curr_region_name in instances:
         if running:
@@ -696,11 +687,12 @@ def clean_instances_aws(tags_dict, dry_run=False):
     assert tags_dict, "tags_dict not provided (can't clean all instances)"
     aws_instances = list_instances_aws(tags_dict=tags_dict, group_as_region=True)
 
+    instances_to_terminate = {}
     for region, instance_list in aws_instances.items():
         if not instance_list:
             LOGGER.info("There are no instances to remove in AWS region %s", region)
             continue
-        client: EC2Client = boto3.client('ec2', region_name=region)
+        instances_to_terminate[region] = []
         for instance in instance_list:
             tags = aws_tags_to_dict(instance.get('Tags'))
             name = tags.get("Name", "N/A")
@@ -710,9 +702,11 @@ def clean_instances_aws(tags_dict, dry_run=False):
                 LOGGER.info("Skipping Sct Runner instance '%s'", instance_id)
                 continue
             LOGGER.info("Going to delete '{instance_id}' [name={name}] ".format(instance_id=instance_id, name=name))
-            if not dry_run:
-                response = client.terminate_instances(InstanceIds=[instance_id])
-                LOGGER.debug("Done. Result: %s\n", response['TerminatingInstances'])
+            instances_to_terminate[region].append(instance_id)
+    if not dry_run:
+        inventory = AwsInventory(regions=instances_to_terminate)
+        response = inventory.terminate_instances(instances_to_terminate)
+        LOGGER.debug("Done. Result: %s\n%s", response, inventory.timing_report())
 
 
 # pylint: disable=too-many-locals,too-many-branches,too-many-statements
@@ -824,23 +818,14 @@ def list_elastic_ips_aws(tags_dict=None, region_name=None, group_as_region=False
 
     :return: instances dict where region is a key
     """
-    elastic_ips = {}
     aws_regions = [region_name] if region_name else all_aws_regions()
-
-    def get_elastic_ips(region):
-        if verbose:
-            LOGGER.info('Going to list aws region "%s"', region)
-        time.sleep(random.random())
-        client: EC2Client = boto3.client('ec2', region_name=region)
-        custom_filter = []
-        if tags_dict:
-            custom_filter = [{'Name': 'tag:{}'.format(key), 'Values': [value]} for key, value in tags_dict.items()]
-        response = client.describe_addresses(Filters=custom_filter)
-        elastic_ips[region] = response['Addresses']
-        if verbose:
-            LOGGER.info("%s: done [%s/%s]", region, len(list(elastic_ips.keys())), len(aws_regions))
-
-    ParallelObject(aws_regions, timeout=100).run(get_elastic_ips, ignore_exceptions=True)
+    if verbose:
+        LOGGER.info("Going to list elastic ips in %s aws regions", len(aws_regions))
+    inventory = AwsInventory(regions=aws_regions)
+    elastic_ips = inventory.list_elastic_ips(tags_dict=tags_dict)
+    if verbose:
+        LOGGER.info("Listed elastic ips in %s/%s aws regions:\n%s",
+                    len(elastic_ips), len(aws_regions), inventory.timing_report())
 
     if not group_as_region:
         elastic_ips = list(itertools.chain(*list(elastic_ips.values())))  # flatten the list of lists
@@ -866,17 +851,12 @@ def clean_elastic_ips_aws(tags_dict, dry_run=False):
         if not eip_list:
             LOGGER.info("There are no EIPs to remove in AWS region %s", region)
             continue
-        client: EC2Client = boto3.client('ec2', region_name=region)
         for eip in eip_list:
-            association_id = eip.get('AssociationId')
-            if association_id and not dry_run:
-                response = client.disassociate_address(AssociationId=association_id)
-                LOGGER.debug("disassociate_address. Result: %s\n", response)
-            allocation_id = eip['AllocationId']
-            LOGGER.info("Going to release '%s' [public_ip={%s}]", allocation_id, eip['PublicIp'])
-            if not dry_run:
-                response = client.release_address(AllocationId=allocation_id)
-                LOGGER.debug("Done. Result: %s\n", response)
+            LOGGER.info("Going to release '%s' [public_ip={%s}]", eip['AllocationId'], eip['PublicIp'])
+    if not dry_run:
+        inventory = AwsInventory(regions=aws_instances)
+        inventory.release_elastic_ips(aws_instances)
+        LOGGER.debug("Done.\n%s", inventory.timing_report())
 
 
 def get_gce_driver():
@@ -1171,24 +1151,33 @@ def get_scylla_ami_versions(region):
     return _SCYLLA_AMI_CACHE[region]
 
 
-_S3_SCYLLA_REPOS_CACHE = defaultdict(dict)
+_S3_SCYLLA_REPOS_CACHE = {}
+S3_SCYLLA_REPOS_MAPPING_TTL = 3600
 
 
 def get_s3_scylla_repos_mapping(dist_type='centos', dist_version=None):
     """
     get the mapping from version prefixes to rpm .repo or deb .list files locations
 
+    The mapping is kept in the resolution cache on disk, so it's shared by processes on the same machine.
+
     :param dist_type: which distro to look up centos/ubuntu/debian
     :param dist_version: famaily name of the distro version
 
     :return: a mapping of versions prefixes to repos
     :rtype: dict
     """
-    if (dist_type, dist_version) in _S3_SCYLLA_REPOS_CACHE:
-        return _S3_SCYLLA_REPOS_CACHE[(dist_type, dist_version)]
+    if (dist_type, dist_version) not in _S3_SCYLLA_REPOS_CACHE:
+        _S3_SCYLLA_REPOS_CACHE[(dist_type, dist_version)] = ResolutionCache().resolve(
+            "s3_scylla_repos_mapping", _list_s3_scylla_repos, dist_type, dist_version,
+            ttl=S3_SCYLLA_REPOS_MAPPING_TTL)
+    return _S3_SCYLLA_REPOS_CACHE[(dist_type, dist_version)]
 
+
+def _list_s3_scylla_repos(dist_type, dist_version):
     s3_client: S3Client = boto3.client('s3', region_name=DEFAULT_AWS_REGION)
     bucket = 'downloads.scylladb.com'
+    repos = {}
 
     if dist_type == 'centos':
         response = s3_client.list_objects(Bucket=bucket, Prefix='rpm/centos/', Delimiter='/')
@@ -1198,9 +1187,8 @@ def get_s3_scylla_repos_mapping(dist_type='centos', dist_version=None):
             # only if path look like 'rpm/centos/scylla-1.3.repo', we deem it formal one
             if filename.startswith('scylla-') and filename.endswith('.repo'):
                 version_prefix = filename.replace('.repo', '').split('-')[-1]
-                _S3_SCYLLA_REPOS_CACHE[(
-                    dist_type, dist_version)][version_prefix] = "https://s3.amazonaws.com/{bucket}/{path}".format(bucket=bucket,
-                                                                                                                  path=repo_file['Key'])
+                repos[version_prefix] = "https://s3.amazonaws.com/{bucket}/{path}".format(bucket=bucket,
+                                                                                          path=repo_file['Key'])
 
     elif dist_type in ('ubuntu', 'debian'):
         response = s3_client.list_objects(Bucket=bucket, Prefix='deb/{}/'.format(dist_type), Delimiter='/')
@@ -1211,13 +1199,12 @@ def get_s3_scylla_repos_mapping(dist_type='centos', dist_version=None):
             if filename.startswith('scylla-') and filename.endswith('-{}.list'.format(dist_version)):
 
                 version_prefix = filename.replace('-{}.list'.format(dist_version), '').split('-')[-1]
-                _S3_SCYLLA_REPOS_CACHE[(
-                    dist_type, dist_version)][version_prefix] = "https://s3.amazonaws.com/{bucket}/{path}".format(bucket=bucket,
-                                                                                                                  path=repo_file['Key'])
+                repos[version_prefix] = "https://s3.amazonaws.com/{bucket}/{path}".format(bucket=bucket,
+                                                                                          path=repo_file['Key'])
 
     else:
         raise NotImplementedError("[{}] is not yet supported".format(dist_type))
-    return _S3_SCYLLA_REPOS_CACHE[(dist_type, dist_version)]
+    return repos
 
 
 def pid_exists(pid):
@@ -1583,12 +1570,15 @@ def wait_ami_available(client, ami_id):
         client {boto3.EC2.Client} -- client of EC2 service
         ami_id {str} -- ami id to check availability
     """
-    waiter = client.get_waiter('image_available')
-    waiter.wait(ImageIds=[ami_id],
-                WaiterConfig={
-                    'Delay': 30,
-                    'MaxAttempts': 20}
-                )
+    def is_available():
+        # A new AMI may be unknown to DescribeImages for a while (eventual consistency.)
+        images = client.describe_images(ImageIds=[ami_id])["Images"]
+        if images and images[0]["State"] == "failed":
+            raise ValueError(f"AMI {ami_id} is failed: {images[0].get('StateReason')}")
+        return bool(images) and images[0]["State"] == "available"
+
+    wait.wait_until(is_available, timeout=600, text=f"Waiting for {ami_id} to become available",
+                    initial_delay=5, max_delay=30, allowed_exceptions=(ClientError, ))
 
 
 def update_certificates(db_csr='data_dir/ssl_conf/example/db.csr', cadb_pem='data_dir/ssl_conf/cadb.pem',
@@ -1607,39 +1597,15 @@ def update_certificates(db_csr='data_dir/ssl_conf/example/db.csr', cadb_pem='dat
     return new_crt
 
 
-# Make it mockable.
-def _s3_download_file(client, bucket, key, local_file_path):
-    return client.download_file(bucket, key, local_file_path)
-
-
 def s3_download_dir(bucket, path, target):
     """
     Downloads recursively the given S3 path to the target directory.
     :param bucket: the name of the bucket to download from
     :param path: The S3 directory to download.
     :param target: the local directory to download the files to.
+    :return: statistics of the download
     """
-
-    client: S3Client = boto3.client('s3', region_name=DEFAULT_AWS_REGION)
-
-    # Handle missing / at end of prefix
-    if not path.endswith('/'):
-        path += '/'
-    if path.startswith('/'):
-        path = path[1:]
-    result = client.list_objects_v2(Bucket=bucket, Prefix=path)
-    # Download each file individually
-    for key in result['Contents']:
-        # Calculate relative path
-        rel_path = key['Key'][len(path):]
-        # Skip paths ending in /
-        if not key['Key'].endswith('/'):
-            local_file_path = os.path.join(target, rel_path)
-            # Make sure directories exist
-            local_file_dir = os.path.dirname(local_file_path)
-            os.makedirs(local_file_dir, exist_ok=True)
-            LOGGER.info("Downloading %s from s3 to %s", key['Key'], local_file_path)
-            _s3_download_file(client, bucket, key['Key'], local_file_path)
+    return S3Downloader(bucket, region_name=DEFAULT_AWS_REGION).download_dir(path, target)
 
 
 def gce_download_dir(bucket, path, target):
@@ -1648,6 +1614,7 @@ def gce_download_dir(bucket, path, target):
     :param bucket: the name of the bucket to download from
     :param path: The google storage directory to download.
     :param target: the local directory to download the files to.
+    :return: statistics of the download
     """
 
     gcp_credentials = KeyStore().get_gcp_credentials()
@@ -1656,22 +1623,7 @@ def gce_download_dir(bucket, path, target):
     driver = gce_driver(gcp_credentials["project_id"] + "@appspot.gserviceaccount.com",
                         gcp_credentials["private_key"],
                         project=gcp_credentials["project_id"])
-
-    if not path.endswith('/'):
-        path += '/'
-    if path.startswith('/'):
-        path = path[1:]
-
-    container = driver.get_container(container_name=bucket)
-    dir_listing = driver.list_container_objects(container, ex_prefix=path)
-    for obj in dir_listing:
-        rel_path = obj.name[len(path):]
-        local_file_path = os.path.join(target, rel_path)
-
-        local_file_dir = os.path.dirname(local_file_path)
-        os.makedirs(local_file_dir, exist_ok=True)
-        LOGGER.info("Downloading %s from gcp to %s", obj.name, local_file_path)
-        obj.download(destination_path=local_file_path, overwrite_existing=True)
+    return GceDownloader(driver, bucket).download_dir(path, target)
 
 
 def download_dir_from_cloud(url):
@@ -1689,17 +1641,15 @@ def download_dir_from_cloud(url):
     tmp_dir = os.path.join('/tmp/download_from_cloud', md5.hexdigest())
     parsed = urlparse(url)
     LOGGER.info("Downloading [%s] to [%s]", url, tmp_dir)
-    if os.path.isdir(tmp_dir) and os.listdir(tmp_dir):
-        LOGGER.warning("[{}] already exists, skipping download".format(tmp_dir))
+    # Files which are already downloaded (same size and ETag) are skipped by the downloader.
+    if url.startswith('s3://'):
+        s3_download_dir(parsed.hostname, parsed.path, tmp_dir)
+    elif url.startswith('gs://'):
+        gce_download_dir(parsed.hostname, parsed.path, tmp_dir)
+    elif os.path.isdir(url):
+        tmp_dir = url
     else:
-        if url.startswith('s3://'):
-            s3_download_dir(parsed.hostname, parsed.path, tmp_dir)
-        elif url.startswith('gs://'):
-            gce_download_dir(parsed.hostname, parsed.path, tmp_dir)
-        elif os.path.isdir(url):
-            tmp_dir = url
-        else:
-            raise ValueError("Unsupported url schema or non-existing directory [{}]".format(url))
+        raise ValueError("Unsupported url schema or non-existing directory [{}]".format(url))
     if not tmp_dir.endswith('/'):
         tmp_dir += '/'
     LOGGER.info("Finished downloading [%s]", url)
@@ -0,0 +1,47 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+from collections import deque
+from typing import Any, Iterable, Iterator, Tuple
+
+DEFAULT_CONCURRENCY = 64
+
+
+def iter_concurrent(session, statement, parameters: Iterable[tuple], concurrency: int = DEFAULT_CONCURRENCY,
+                    timeout: float = 300) -> Iterator[Tuple[tuple, Any]]:
+    """Execute `statement' with each item of `parameters', keeping at most `concurrency' requests in flight.
+
+    Yield `(params, result)' pairs in the order of `parameters'; `result' is an exception if the request failed.
+    No new requests are sent after the consumer stops iterating, which makes early stopping cheap even for a huge
+    (or infinite) `parameters' iterator.  Use a prepared statement, so the driver can route each request to a
+    replica of its partition.
+    """
+    parameters = iter(parameters)
+    in_flight = deque()
+
+    def submit_next() -> bool:
+        for params in parameters:
+            in_flight.append((params, session.execute_async(statement, params, timeout=timeout)))
+            return True
+        return False
+
+    while len(in_flight) < concurrency and submit_next():
+        pass
+    while in_flight:
+        params, future = in_flight.popleft()
+        try:
+            result = future.result()
+        except Exception as exc:  # pylint: disable=broad-except
+            result = exc
+        submit_next()
+        yield params, result
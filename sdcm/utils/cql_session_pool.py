@@ -0,0 +1,353 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+"""Pool of long-lived CQL driver sessions shared by test and nemesis code.
+
+Connecting a driver cluster (control connection, topology and schema discovery, warm-up of connection pools) takes
+seconds on big TLS-enabled clusters, so sessions are kept open and shared by all callers with the same whitelist,
+credentials, TLS options, protocol and keyspace.  A caller gets a `ScopedSession' which keeps its own defaults for
+timeout, consistency and fetch size, and moves to another pooled session on `set_keyspace()' or `USE', so one caller
+never changes the settings of the session for the others.
+"""
+
+import re
+import copy
+import time
+import logging
+import threading
+import dataclasses
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from cassandra import ConsistencyLevel
+from cassandra.cluster import NoHostAvailable, _NOT_SET  # pylint: disable=no-name-in-module
+from cassandra.query import (  # pylint: disable=no-name-in-module
+    FETCH_SIZE_UNSET, PreparedStatement, Statement, SimpleStatement)
+
+LOGGER = logging.getLogger(__name__)
+
+USE_KEYSPACE_RE = re.compile(r'^\s*USE\s+(?:"(?P<quoted>\w+)"|(?P<keyspace>\w+))\s*;?\s*$', re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class CqlSessionKey:
+    node_ips: Tuple[str, ...]
+    keyspace: Optional[str] = None
+    user: Optional[str] = None
+    password: Optional[str] = field(default=None, repr=False)
+    ssl_opts: Tuple[Tuple[str, str], ...] = ()
+    protocol_version: int = 3
+    port: int = 9042
+    compression: bool = True
+
+    @classmethod
+    def build(cls, node_ips: Iterable[str], credentials: Optional[Tuple[str, str]] = None,
+              ssl_opts: Optional[dict] = None, **kwargs) -> "CqlSessionKey":
+        user, password = credentials if credentials else (None, None)
+        return cls(node_ips=tuple(sorted(node_ips)), user=user, password=password,
+                   ssl_opts=tuple(sorted((key, repr(value)) for key, value in (ssl_opts or {}).items())), **kwargs)
+
+    def __str__(self):
+        return f"{','.join(self.node_ips)}/{self.keyspace or '-'}" + (f" as {self.user}" if self.user else "")
+
+
+@dataclass
+class PooledSession:  # pylint: disable=too-many-instance-attributes
+    key: CqlSessionKey
+    cluster: Any
+    session: Any
+    connect_time: float
+    private: bool = False
+    leases: int = 0
+    uses: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+    retired: bool = False
+
+    @property
+    def healthy(self) -> bool:
+        if self.retired or self.session.is_shutdown or self.cluster.is_shutdown:
+            return False
+        return any(host.is_up for host in self.cluster.metadata.all_hosts())
+
+
+@dataclass
+class CqlSessionPoolStats:
+    connects: int = 0
+    reuses: int = 0
+    closed: int = 0
+    connect_time_total: float = 0.0
+    connect_time_max: float = 0.0
+
+    def __str__(self):
+        return (f"{self.connects} connects ({self.connect_time_total:.1f}s total, {self.connect_time_max:.1f}s max), "
+                f"{self.reuses} reuses, {self.closed} closed")
+
+
+class ScopedSession:
+    """Proxy of a pooled driver session with its own defaults.
+
+    Settings from `SCOPED_SETTINGS' are applied to each statement executed through the proxy instead of changing
+    the shared session.  Other attributes are taken from the shared session.
+    """
+
+    SCOPED_SETTINGS = ("default_timeout", "default_consistency_level", "default_serial_consistency_level",
+                       "default_fetch_size")
+
+    def __init__(self, lease: "CqlSessionLease", verbose: bool = True):
+        object.__setattr__(self, "_lease", lease)
+        object.__setattr__(self, "verbose", verbose)
+        # Defaults of the sessions created by `BaseCluster.cql_connection()'.
+        object.__setattr__(self, "default_timeout", 60.0)
+        object.__setattr__(self, "default_consistency_level", ConsistencyLevel.ONE)
+        object.__setattr__(self, "default_serial_consistency_level", None)
+        object.__setattr__(self, "default_fetch_size", lease.current.session.default_fetch_size)
+
+    def __getattr__(self, name):
+        return getattr(self._lease.current.session, name)
+
+    def __setattr__(self, name, value):
+        if name in self.SCOPED_SETTINGS or name == "verbose":
+            object.__setattr__(self, name, value)
+        else:
+            # Can't be scoped: switch this lease to a session of its own, so the shared one isn't changed.
+            self._lease.make_private()
+            setattr(self._lease.current.session, name, value)
+
+    @property
+    def keyspace(self) -> Optional[str]:
+        return self._lease.current.session.keyspace
+
+    def set_keyspace(self, keyspace: str) -> None:
+        self._lease.switch_keyspace(keyspace)
+
+    def _statement(self, query, parameters=None) -> Tuple[Any, Any]:
+        """Return the statement to execute with the scoped defaults applied, and its parameters."""
+        if isinstance(query, str):
+            return SimpleStatement(query, consistency_level=self.default_consistency_level,
+                                   serial_consistency_level=self.default_serial_consistency_level,
+                                   fetch_size=self.default_fetch_size), parameters
+        if isinstance(query, PreparedStatement):  # not a Statement, bind it to get one with its own settings
+            query, parameters = query.bind(parameters), None
+        if isinstance(query, Statement):
+            query = copy.copy(query)
+            if query.consistency_level is None:
+                query.consistency_level = self.default_consistency_level
+            if query.serial_consistency_level is None and self.default_serial_consistency_level is not None:
+                query.serial_consistency_level = self.default_serial_consistency_level
+            if query.fetch_size is FETCH_SIZE_UNSET:
+                query.fetch_size = self.default_fetch_size
+        return query, parameters
+
+    def _run(self, method: str, query, parameters=None, timeout=_NOT_SET, *args, **kwargs):
+        query_string = query if isinstance(query, str) else getattr(query, "query_string", query)
+        if self.verbose:
+            LOGGER.debug("Executing CQL '%s' ...", query_string)
+        if isinstance(query_string, str) and (match := USE_KEYSPACE_RE.match(query_string)):
+            self.set_keyspace(match.group("quoted") or match.group("keyspace").lower())
+        if timeout is _NOT_SET:
+            timeout = self.default_timeout
+        statement, parameters = self._statement(query, parameters)
+        try:
+            return getattr(self._lease.current.session, method)(statement, parameters, timeout, *args, **kwargs)
+        except NoHostAvailable:
+            self._lease.retire()
+            raise
+
+    def execute(self, query, parameters=None, timeout=_NOT_SET, *args, **kwargs):
+        return self._run("execute", query, parameters, timeout, *args, **kwargs)
+
+    def execute_async(self, query, parameters=None, timeout=_NOT_SET, *args, **kwargs):
+        return self._run("execute_async", query, parameters, timeout, *args, **kwargs)
+
+
+class CqlSessionLease:
+    """Context manager which gives a `ScopedSession' over a pooled session and returns it to the pool on exit.
+
+    `session' and `cluster' attributes used outside of a `with' block give a private session which isn't shared
+    and should be shut down by the caller, as sessions were before the pool.
+    """
+
+    def __init__(self, pool: "CqlSessionPool", key: CqlSessionKey, connect: Callable[[CqlSessionKey], tuple],
+                 verbose: bool = True):
+        self.pool = pool
+        self.key = key
+        self.connect = connect
+        self.verbose = verbose
+        self._entry: Optional[PooledSession] = None
+
+    def _acquire(self, private: bool = False) -> PooledSession:
+        if self._entry is None:
+            self._entry = self.pool.acquire(self.key, self.connect, private=private)
+        return self._entry
+
+    @property
+    def current(self) -> PooledSession:
+        if self._entry is None:
+            raise RuntimeError("CQL session is used outside of its `with' block")
+        return self._entry
+
+    @property
+    def session(self):
+        return self._acquire(private=True).session
+
+    @property
+    def cluster(self):
+        return self._acquire(private=True).cluster
+
+    def make_private(self) -> None:
+        """Replace the pooled session of this lease with a newly connected one which isn't shared."""
+        if self.current.private:
+            return
+        entry, self._entry = self._entry, self.pool.acquire(self.key, self.connect, private=True)
+        self.pool.release(entry)
+
+    def retire(self) -> None:
+        self.pool.retire(self._entry)
+
+    def switch_keyspace(self, keyspace: str) -> None:
+        if self._entry.private:
+            self._entry.session.set_keyspace(keyspace)
+            return
+        if keyspace == self.key.keyspace:
+            return
+        self.key = dataclasses.replace(self.key, keyspace=keyspace)
+        entry, self._entry = self._entry, self.pool.acquire(self.key, self.connect)
+        self.pool.release(entry)
+
+    def __enter__(self) -> ScopedSession:
+        self._acquire()
+        return ScopedSession(self, verbose=self.verbose)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        entry, self._entry = self._entry, None
+        self.pool.release(entry)
+
+
+class CqlSessionPool:
+    """Shared driver sessions by `CqlSessionKey'.
+
+    A session is replaced when it's shut down or has no live hosts, and is closed after `idle_timeout' seconds
+    without leases or when some of its nodes is gone (see `invalidate()'.)
+    """
+
+    idle_timeout = 600
+
+    def __init__(self):
+        self.stats = CqlSessionPoolStats()
+        self._entries: Dict[CqlSessionKey, PooledSession] = {}
+        self._key_locks: Dict[CqlSessionKey, threading.Lock] = {}
+        self._lock = threading.RLock()
+
+    def lease(self, key: CqlSessionKey, connect: Callable[[CqlSessionKey], tuple],
+              verbose: bool = True) -> CqlSessionLease:
+        return CqlSessionLease(pool=self, key=key, connect=connect, verbose=verbose)
+
+    def _connect(self, key: CqlSessionKey, connect: Callable[[CqlSessionKey], tuple], private: bool) -> PooledSession:
+        start_time = time.perf_counter()
+        cluster, session = connect(key)
+        connect_time = time.perf_counter() - start_time
+        LOGGER.debug("Connected CQL session to %s in %.1fs", key, connect_time)
+        with self._lock:
+            self.stats.connects += 1
+            self.stats.connect_time_total += connect_time
+            self.stats.connect_time_max = max(self.stats.connect_time_max, connect_time)
+        return PooledSession(key=key, cluster=cluster, session=session, connect_time=connect_time, private=private,
+                             leases=1, uses=1, retired=private)
+
+    def acquire(self, key: CqlSessionKey, connect: Callable[[CqlSessionKey], tuple],
+                private: bool = False) -> PooledSession:
+        self._close_idle()
+        if private:
+            return self._connect(key, connect, private=True)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:  # don't connect the same session concurrently
+            with self._lock:
+                if (entry := self._entries.get(key)) is not None:
+                    if entry.healthy:
+                        entry.leases += 1
+                        entry.uses += 1
+                        self.stats.reuses += 1
+                        return entry
+                    self.retire(entry)
+            entry = self._connect(key, connect, private=False)
+            with self._lock:
+                self._entries[key] = entry
+            return entry
+
+    def release(self, entry: Optional[PooledSession]) -> None:
+        if entry is None:
+            return
+        with self._lock:
+            entry.leases -= 1
+            entry.last_used = time.monotonic()
+            to_close = entry.retired and entry.leases <= 0
+        if to_close:
+            self._close(entry)
+
+    def retire(self, entry: Optional[PooledSession]) -> None:
+        """Stop giving the session to new leases and close it when the current ones are released."""
+        if entry is None:
+            return
+        with self._lock:
+            entry.retired = True
+            if self._entries.get(entry.key) is entry:
+                del self._entries[entry.key]
+            to_close = entry.leases <= 0
+        if to_close:
+            self._close(entry)
+
+    def invalidate(self, node_ips: Iterable[str]) -> None:
+        """Retire sessions which use any of `node_ips' (e.g. the nodes were terminated.)"""
+        node_ips = set(node_ips)
+        with self._lock:
+            entries = [entry for entry in self._entries.values() if node_ips.intersection(entry.key.node_ips)]
+        for entry in entries:
+            LOGGER.debug("Retire CQL session to %s", entry.key)
+            self.retire(entry)
+
+    def _close_idle(self) -> None:
+        deadline = time.monotonic() - self.idle_timeout
+        with self._lock:
+            entries = [entry for entry in self._entries.values() if entry.leases <= 0 and entry.last_used < deadline]
+        for entry in entries:
+            self.retire(entry)
+
+    def _close(self, entry: PooledSession) -> None:
+        with self._lock:
+            self.stats.closed += 1
+        try:
+            entry.cluster.shutdown()
+        except Exception as exc:  # pylint: disable=broad-except
+            LOGGER.warning("Failed to shut down CQL session to %s: %s", entry.key, exc)
+
+    @property
+    def sessions(self) -> List[PooledSession]:
+        with self._lock:
+            return list(self._entries.values())
+
+    def close_all(self) -> None:
+        for entry in self.sessions:
+            self.retire(entry)
+
+
+_CQL_SESSION_POOL: Optional[CqlSessionPool] = None
+_CQL_SESSION_POOL_LOCK = threading.Lock()
+
+
+def get_cql_session_pool() -> CqlSessionPool:
+    global _CQL_SESSION_POOL  # pylint: disable=global-statement
+    with _CQL_SESSION_POOL_LOCK:
+        if _CQL_SESSION_POOL is None:
+            _CQL_SESSION_POOL = CqlSessionPool()
+        return _CQL_SESSION_POOL
@@ -0,0 +1,141 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import os
+import json
+import time
+import fcntl
+import hashlib
+import logging
+import threading
+from typing import Dict, Iterable, Optional
+from contextlib import contextmanager
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+LOGGER = logging.getLogger(__name__)
+
+HTTP_CACHE_DIR = os.path.expanduser("~/.cache/sct/http")
+
+
+class HttpMetadataCache:
+    """Cache of small HTTP resources (repo files, Packages, repomd.xml, primary.xml.gz, etc.) in a local directory.
+
+    The cache is shared by all processes on the machine.  A cached response younger than `max_age' seconds is used
+    as is; an older one is revalidated by a conditional GET (If-None-Match/If-Modified-Since), so unchanged metadata
+    isn't downloaded again.  Only one process at a time fetches the same URL, others wait and use its result.
+    """
+
+    max_age = 60
+    max_workers = 8
+    timeout = 30
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or HTTP_CACHE_DIR
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+        self._session = requests.Session()
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode()).hexdigest())
+
+    def _count(self, event: str) -> None:
+        with self._stats_lock:
+            self.stats[event] += 1
+
+    @contextmanager
+    def _url_lock(self, path: str):
+        with open(f"{path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _load_meta(path: str) -> Optional[dict]:
+        try:
+            with open(f"{path}.json", encoding="utf-8") as meta_file:
+                meta = json.load(meta_file)
+            if os.path.exists(f"{path}.body"):
+                return meta
+        except (OSError, ValueError):
+            pass
+        return None
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes) -> None:
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_path, path)
+
+    def _save_meta(self, path: str, meta: dict) -> None:
+        self._write_atomic(f"{path}.json", json.dumps(meta).encode())
+
+    def get(self, url: str) -> bytes:
+        """Return content of the URL, raise ValueError if it can't be fetched."""
+        path = self._path(url)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with self._url_lock(path):
+            meta = self._load_meta(path)
+            if meta and time.time() - meta["fetched_at"] < self.max_age:
+                self._count("hits")
+                with open(f"{path}.body", "rb") as body_file:
+                    return body_file.read()
+
+            headers = {}
+            if meta and meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta and meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+            response = self._session.get(url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304 and meta:
+                self._count("revalidated")
+                meta["fetched_at"] = time.time()
+                self._save_meta(path, meta)
+                with open(f"{path}.body", "rb") as body_file:
+                    return body_file.read()
+            if response.status_code != 200:
+                raise ValueError(f"The following repository URL '{url}' is incorrect")
+            self._count("downloads")
+            self._write_atomic(f"{path}.body", response.content)
+            self._save_meta(path, {"url": url,
+                                   "etag": response.headers.get("ETag"),
+                                   "last_modified": response.headers.get("Last-Modified"),
+                                   "fetched_at": time.time()})
+            return response.content
+
+    def get_many(self, urls: Iterable[str]) -> Dict[str, bytes]:
+        """Fetch URLs concurrently, return their content by URL."""
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(len(urls), self.max_workers),
+                                thread_name_prefix="HttpMetadataCache") as executor:
+            return dict(zip(urls, executor.map(self.get, urls)))
+
+
+_HTTP_CACHE: Optional[HttpMetadataCache] = None
+_HTTP_CACHE_LOCK = threading.Lock()
+
+
+def get_http_cache() -> HttpMetadataCache:
+    """Return the process-wide HTTP metadata cache."""
+    global _HTTP_CACHE  # pylint: disable=global-statement
+    with _HTTP_CACHE_LOCK:
+        if _HTTP_CACHE is None:
+            _HTTP_CACHE = HttpMetadataCache()
+        return _HTTP_CACHE
@@ -0,0 +1,294 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import os
+import time
+import errno
+import ctypes
+import ctypes.util
+import struct
+import select
+import logging
+import threading
+from copy import copy
+from typing import Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+
+LOGGER = logging.getLogger(__name__)
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+IN_EVENT_HEADER = struct.Struct("iIII")
+
+# Callback which reads up to `max_lines' new lines of a log file and returns True if there are more unread lines.
+LogReaderCallback = Callable[[int], bool]
+
+
+class Inotify:
+    """Minimal inotify(7) binding, which watches directories for changes of files in them."""
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+
+    def add_watch(self, path: str, mask: int = IN_WATCH_MASK) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()), path)
+        return wd
+
+    def read_events(self) -> List[Tuple[int, int, str]]:
+        """Return list of (wd, mask, name) for all pending events."""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, name_len = IN_EVENT_HEADER.unpack_from(data, offset)
+                offset += IN_EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + name_len].rstrip(b"\0"))
+                offset += name_len
+                events.append((wd, mask, name))
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+@dataclass
+class LogIngestStats:
+    """Ingest lag of a watched log: time between write of new lines and the moment all of them were processed."""
+
+    batches: int = 0
+    catch_ups: int = 0
+    last_lag: float = 0.0
+    max_lag: float = 0.0
+    total_lag: float = 0.0
+
+    @property
+    def avg_lag(self) -> float:
+        return self.total_lag / self.catch_ups if self.catch_ups else 0.0
+
+    def add_lag(self, lag: float) -> None:
+        self.catch_ups += 1
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.total_lag += lag
+
+    def __str__(self):
+        return f"{self.batches} batches, ingest lag avg={self.avg_lag:.3f}s max={self.max_lag:.3f}s"
+
+
+@dataclass
+class WatchedLog:
+    name: str
+    path: str
+    callback: LogReaderCallback
+    pending_since: Optional[float] = None
+    size: int = 0
+    mtime: float = 0.0
+    stats: LogIngestStats = field(default_factory=LogIngestStats)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class LogWatcher(threading.Thread):  # pylint: disable=too-many-instance-attributes
+    """Watch many log files and call their reader callbacks as soon as new lines are appended.
+
+    All logs are served by one thread.  Changes are detected by inotify on logs' directories, and if inotify isn't
+    available, by polling of files' sizes every `poll_interval' seconds.  Callbacks read at most `batch_lines' lines
+    per call, so one busy log doesn't delay the others.
+    """
+
+    poll_interval = 1
+    rescan_interval = 15  # stat all files even if inotify is used, in case some events were missed
+    coalesce_delay = 0.1  # let a writer finish multi-line records (e.g., backtraces) before reading them
+    batch_lines = 10_000
+
+    def __init__(self, use_inotify: bool = True, **kwargs):
+        super().__init__(name="LogWatcher", daemon=True)
+        for attr, value in kwargs.items():
+            if not hasattr(self, attr):
+                raise TypeError(f"unknown argument: {attr}")
+            setattr(self, attr, value)
+        self._logs: Dict[str, WatchedLog] = {}
+        self._logs_lock = threading.Lock()
+        self._dir_watches: Dict[str, int] = {}
+        self._stop_event = threading.Event()
+        self._wakeup_read_fd, self._wakeup_write_fd = os.pipe()
+        os.set_blocking(self._wakeup_write_fd, False)
+        self._inotify = None
+        if use_inotify:
+            try:
+                self._inotify = Inotify()
+            except (OSError, AttributeError) as exc:
+                LOGGER.warning("inotify isn't available, poll log files every %ss: %s", self.poll_interval, exc)
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._inotify is not None
+
+    def watch(self, name: str, path: str, callback: LogReaderCallback) -> None:
+        with self._logs_lock:
+            self._logs[name] = WatchedLog(name=name, path=os.path.abspath(path), callback=callback,
+                                          pending_since=time.time())
+        self._wakeup()
+
+    def unwatch(self, name: str, flush: bool = True) -> Optional[LogIngestStats]:
+        """Stop watching a log.  If `flush', call the reader callback till all lines of the log are read."""
+        with self._logs_lock:
+            watched_log = self._logs.pop(name, None)
+        if watched_log is None:
+            return None
+        if flush:
+            watched_log.pending_since = watched_log.pending_since or time.time()
+            while self._process(watched_log):
+                pass
+        LOGGER.debug("%s: %s", name, watched_log.stats)
+        return copy(watched_log.stats)
+
+    def stats(self) -> Dict[str, LogIngestStats]:
+        with self._logs_lock:
+            return {name: copy(watched_log.stats) for name, watched_log in self._logs.items()}
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop_event.set()
+        self._wakeup()
+        self.join(timeout)
+
+    def _wakeup(self) -> None:
+        try:
+            os.write(self._wakeup_write_fd, b"x")
+        except BlockingIOError:  # the watcher is already woken up
+            pass
+
+    def run(self) -> None:
+        last_rescan = 0
+        try:
+            while not self._stop_event.is_set():
+                all_watched = self._add_dir_watches()
+                interval = self.rescan_interval if self.uses_inotify and all_watched else self.poll_interval
+                timeout = max(0, last_rescan + interval - time.perf_counter())
+                if any(watched_log.pending_since for watched_log in self._get_logs()):
+                    timeout = 0
+                self._wait_for_events(timeout)
+                if time.perf_counter() - last_rescan >= interval:
+                    last_rescan = time.perf_counter()
+                    self._rescan()
+                for watched_log in self._get_logs():
+                    if watched_log.pending_since:
+                        self._process(watched_log)
+        finally:
+            if self._inotify:
+                self._inotify.close()
+            os.close(self._wakeup_read_fd)
+            os.close(self._wakeup_write_fd)
+
+    def _get_logs(self) -> List[WatchedLog]:
+        with self._logs_lock:
+            return list(self._logs.values())
+
+    def _add_dir_watches(self) -> bool:
+        """Watch directories of all logs, return False if some of them don't exist yet."""
+        if not self.uses_inotify:
+            return False
+        all_watched = True
+        for watched_log in self._get_logs():
+            log_dir = os.path.dirname(watched_log.path)
+            if log_dir in self._dir_watches:
+                continue
+            if not os.path.isdir(log_dir):
+                all_watched = False
+                continue
+            try:
+                self._dir_watches[log_dir] = self._inotify.add_watch(log_dir)
+            except OSError as exc:
+                if exc.errno != errno.ENOSPC:
+                    raise
+                LOGGER.warning("Out of inotify watches, poll log files every %ss", self.poll_interval)
+                self._inotify.close()
+                self._inotify = None
+                return False
+        return all_watched
+
+    def _wait_for_events(self, timeout: float) -> None:
+        fds = [self._wakeup_read_fd]
+        if self._inotify:
+            fds.append(self._inotify.fd)
+        ready, _, _ = select.select(fds, [], [], timeout)
+        if self._wakeup_read_fd in ready:
+            os.read(self._wakeup_read_fd, 1024)
+        if self._inotify and self._inotify.fd in ready:
+            now = time.time()
+            dirs = {wd: log_dir for log_dir, wd in self._dir_watches.items()}
+            changed = set()
+            for wd, mask, name in self._inotify.read_events():
+                if mask & IN_Q_OVERFLOW:
+                    self._rescan()
+                elif wd in dirs:
+                    changed.add(os.path.join(dirs[wd], name))
+            for watched_log in self._get_logs():
+                if watched_log.path in changed and not watched_log.pending_since:
+                    watched_log.pending_since = now
+            if changed and self.coalesce_delay:
+                self._stop_event.wait(self.coalesce_delay)
+
+    def _rescan(self) -> None:
+        for watched_log in self._get_logs():
+            try:
+                stat = os.stat(watched_log.path)
+            except FileNotFoundError:
+                continue
+            if (stat.st_size, stat.st_mtime) != (watched_log.size, watched_log.mtime):
+                watched_log.size, watched_log.mtime = stat.st_size, stat.st_mtime
+                if not watched_log.pending_since:
+                    watched_log.pending_since = min(stat.st_mtime, time.time())
+
+    def _process(self, watched_log: WatchedLog) -> bool:
+        with watched_log.lock:
+            try:
+                more = watched_log.callback(self.batch_lines)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception("%s: failed to read log %s", watched_log.name, watched_log.path)
+                more = False
+            watched_log.stats.batches += 1
+            if not more and watched_log.pending_since:
+                watched_log.stats.add_lag(time.time() - watched_log.pending_since)
+                watched_log.pending_since = None
+                try:
+                    stat = os.stat(watched_log.path)
+                    watched_log.size, watched_log.mtime = stat.st_size, stat.st_mtime
+                except FileNotFoundError:
+                    pass
+            return more
+
+
+_LOG_WATCHER: Optional[LogWatcher] = None
+_LOG_WATCHER_LOCK = threading.Lock()
+
+
+def get_log_watcher() -> LogWatcher:
+    """Return the process-wide log watcher, start it on first call."""
+    global _LOG_WATCHER  # pylint: disable=global-statement
+    with _LOG_WATCHER_LOCK:
+        if _LOG_WATCHER is None or not _LOG_WATCHER.is_alive():
+            _LOG_WATCHER = LogWatcher()
+            _LOG_WATCHER.start()
+        return _LOG_WATCHER
@@ -0,0 +1,163 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+"""Leases of cluster nodes for parallel nemeses.
+
+A node is granted to one nemesis at a time.  In addition, leases of some classes exclude each other within a scope
+(the whole cluster, a DC or a rack), e.g. only one topology change runs in the cluster and nodes of the same rack
+aren't restarted at the same time.  The rack scope applies only to DCs which have more than one rack: nodes of a
+single-rack DC (the default layout) would be restarted one at a time otherwise.  Choosing a node and marking it as
+leased is done under one lock, so parallel nemeses can't pick the same node.
+"""
+
+import time
+import random
+import logging
+import threading
+from enum import Enum
+from dataclasses import dataclass, field
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Sequence, Set
+
+from sdcm.wait import WAIT_STATS, WaitRecord
+
+LOGGER = logging.getLogger(__name__)
+
+
+class LeaseClass(Enum):
+    TOPOLOGY_CHANGE = "topology_change"  # adds/removes nodes or restarts the whole cluster
+    LOCAL_RESTART = "local_restart"  # stops, restarts or breaks the target node
+    SCHEMA_ONLY = "schema_only"  # changes schema or data, all nodes stay up
+
+
+class LeaseScope(Enum):
+    CLUSTER = "cluster"
+    DC = "dc"
+    RACK = "rack"
+
+
+# Pairs of lease classes which can't be held at the same time within a scope.
+LEASE_CONFLICTS = {
+    frozenset({LeaseClass.TOPOLOGY_CHANGE}): LeaseScope.CLUSTER,
+    frozenset({LeaseClass.TOPOLOGY_CHANGE, LeaseClass.LOCAL_RESTART}): LeaseScope.CLUSTER,
+    frozenset({LeaseClass.LOCAL_RESTART}): LeaseScope.RACK,
+}
+
+
+class NodeLeaseTimeout(Exception):
+    pass
+
+
+@dataclass
+class NodeLease:
+    node: object
+    owner: str
+    lease_class: LeaseClass
+    wait_time: float = 0.0
+    granted_at: float = field(default_factory=time.time)
+
+    def __str__(self):
+        return f"{self.owner} on {getattr(self.node, 'name', self.node)} ({self.lease_class.value})"
+
+
+class NodeLeaseManager:
+    poll_interval = 5  # how often a waiting `acquire()' checks `stop_event'
+
+    def __init__(self, conflicts: Optional[dict] = None):
+        self.conflicts = LEASE_CONFLICTS if conflicts is None else conflicts
+        self._condition = threading.Condition()
+        self._leases: Dict[object, NodeLease] = {}
+        self._racks: Dict[object, Set] = defaultdict(set)  # racks of the candidate nodes seen in each DC
+        self.wait_times: Dict[LeaseClass, List[float]] = {lease_class: [] for lease_class in LeaseClass}
+
+    @property
+    def leases(self) -> List[NodeLease]:
+        with self._condition:
+            return list(self._leases.values())
+
+    def _in_scope(self, scope: LeaseScope, node, other) -> bool:
+        if scope is LeaseScope.CLUSTER:
+            return True
+        if (dc_idx := getattr(node, "dc_idx", None)) != getattr(other, "dc_idx", None):
+            return False
+        if scope is LeaseScope.DC:
+            return True
+        return len(self._racks[dc_idx]) > 1 and getattr(node, "rack", None) == getattr(other, "rack", None)
+
+    def conflicting_lease(self, node, lease_class: LeaseClass) -> Optional[NodeLease]:
+        """Return a lease which prevents granting `node' for `lease_class', if any."""
+        with self._condition:
+            if lease := self._leases.get(node):
+                return lease
+            for lease in self._leases.values():
+                scope = self.conflicts.get(frozenset({lease_class, lease.lease_class}))
+                if scope is not None and self._in_scope(scope, node, lease.node):
+                    return lease
+            return None
+
+    # pylint: disable=too-many-arguments
+    def acquire(self, owner: str, candidates: Callable[[], Sequence],
+                lease_class: LeaseClass = LeaseClass.LOCAL_RESTART, timeout: float = 0,
+                choose: Callable[[Sequence], object] = random.choice,
+                stop_event: Optional[threading.Event] = None) -> NodeLease:
+        """Lease one of the `candidates()' nodes, waiting up to `timeout' seconds for one to be grantable.
+
+        `candidates' is called on every attempt, so it sees the current nodes of the cluster; `choose' picks one of
+        the grantable nodes.  NodeLeaseTimeout is raised if no node was granted in time (or `stop_event' is set.)
+        """
+        start_time = time.perf_counter()
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                nodes = candidates()
+                for node in nodes:
+                    self._racks[getattr(node, "dc_idx", None)].add(getattr(node, "rack", None))
+                nodes = [node for node in nodes if self.conflicting_lease(node, lease_class) is None]
+                if nodes:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or (stop_event is not None and stop_event.is_set()):
+                    self._record_wait(owner, lease_class, time.perf_counter() - start_time, succeeded=False)
+                    raise NodeLeaseTimeout(
+                        f"No node can be leased to {owner} ({lease_class.value}) within {timeout}s, current leases: "
+                        f"{', '.join(str(lease) for lease in self._leases.values()) or 'none'}")
+                self._condition.wait(timeout=min(remaining, self.poll_interval))
+            node = choose(nodes)
+            lease = NodeLease(node=node, owner=owner, lease_class=lease_class,
+                              wait_time=time.perf_counter() - start_time)
+            self._leases[node] = lease
+            node.running_nemesis = owner
+        self._record_wait(owner, lease_class, lease.wait_time, succeeded=True)
+        LOGGER.debug("Granted lease %s after %.1fs", lease, lease.wait_time)
+        return lease
+
+    def release(self, lease: Optional[NodeLease]) -> None:
+        if lease is None:
+            return
+        with self._condition:
+            if self._leases.get(lease.node) is lease:
+                del self._leases[lease.node]
+                lease.node.running_nemesis = None
+                self._condition.notify_all()
+
+    def _record_wait(self, owner: str, lease_class: LeaseClass, wait_time: float, succeeded: bool) -> None:
+        with self._condition:
+            self.wait_times[lease_class].append(wait_time)
+        WAIT_STATS.add(WaitRecord(name=f"node lease for {owner} ({lease_class.value})", duration=wait_time, polls=1,
+                                  succeeded=succeeded))
+
+    def summary(self) -> str:
+        with self._condition:
+            return "; ".join(
+                f"{lease_class.value}: {len(waits)} leases, {sum(waits):.1f}s total wait, {max(waits):.1f}s max"
+                for lease_class, waits in self.wait_times.items() if waits) or "no leases"
@@ -1,6 +1,13 @@
+import os
+import json
+import time
 import logging
+import threading
 from ipaddress import ip_network
-from functools import cached_property
+from functools import cached_property, partial
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
 import boto3
 import botocore
@@ -11,8 +18,92 @@ from sdcm.keystore import KeyStore
 
 LOGGER = logging.getLogger(__name__)
 
+PREPARE_REGION_LOG_DIR = os.path.expanduser("~/.cache/sct/prepare_region")
 
-class AwsRegion:
+
+class RegionPreparationError(Exception):
+    pass
+
+
+@dataclass
+class RegionStep:
+    """Idempotent step of region preparation.
+
+    `find' returns id of the resource if it already exists, `apply' creates the resource if needed and returns its id.
+    """
+
+    name: str
+    find: Callable[[], Optional[str]]
+    apply: Callable[[], str]
+    depends_on: Tuple[str, ...] = ()
+
+
+class RegionPreparationLog:
+    """Execution log of region preparation stored as a JSON file.
+
+    Steps which were done by a failed or interrupted run are skipped by the next one if their resources are still found.
+    When all steps are done the log is marked as completed and the next run starts from scratch (all steps are
+    idempotent anyway.)
+    """
+
+    def __init__(self, region_name: str, path: Optional[str] = None):
+        self.path = path or os.path.join(PREPARE_REGION_LOG_DIR, f"aws-{region_name}.json")
+        self.region_name = region_name
+        self._lock = threading.Lock()
+        self._data = self._load()
+        if self._data.get("status") == "completed":
+            self.reset()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as log_file:
+                return json.load(log_file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as tmp_file:
+            json.dump(self._data, tmp_file, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def reset(self) -> None:
+        self._data = {}
+
+    @property
+    def status(self) -> Optional[str]:
+        return self._data.get("status")
+
+    def done_steps(self) -> Dict[str, str]:
+        return {name: step["resource_id"] for name, step in self._data.get("steps", {}).items()
+                if step["status"] == "done"}
+
+    def _update(self, **fields) -> None:
+        with self._lock:
+            self._data.update(fields, updated_at=time.time())
+            self._save()
+
+    def _update_step(self, name: str, **fields) -> None:
+        with self._lock:
+            self._data.setdefault("steps", {})[name] = dict(fields, finished_at=time.time())
+            self._data["updated_at"] = time.time()
+            self._save()
+
+    def start(self) -> None:
+        self._update(region=self.region_name, status="in_progress")
+
+    def step_done(self, name: str, resource_id: str) -> None:
+        self._update_step(name, status="done", resource_id=resource_id)
+
+    def step_failed(self, name: str, error: Exception) -> None:
+        self._update_step(name, status="failed", error=str(error))
+
+    def finish(self, success: bool) -> None:
+        self._update(status="completed" if success else "failed")
+
+
+class AwsRegion:  # pylint: disable=too-many-public-methods
     VPC_NAME = "SCT-vpc"
     VPC_CIDR = ip_network("10.0.0.0/16")
     SECURITY_GROUP_NAME = "SCT-sg"
@@ -21,21 +112,43 @@ class AwsRegion:
     ROUTE_TABLE_NAME = "SCT-rt"
     KEY_PAIR_NAME = "scylla-qa-ec2"  # TODO: change legacy name to sct-keypair-aws
 
+    max_workers = 8
+
     def __init__(self, region_name):
         self.region_name = region_name
         self.client: EC2Client = boto3.client("ec2", region_name=region_name)
-        self.resource: EC2ServiceResource = boto3.resource("ec2", region_name=region_name)
+        self._local = threading.local()
+        self._resource_ids: Dict[str, str] = {}
 
     @property
-    def sct_vpc(self) -> EC2ServiceResource.Vpc:
-        vpcs = self.client.describe_vpcs(Filters=[{"Name": "tag:Name", "Values": [self.VPC_NAME]}])
-        LOGGER.debug("Found VPCs: %s", vpcs)
-        existing_vpcs = vpcs.get("Vpcs", [])
-        if len(existing_vpcs) == 0:
+    def resource(self) -> EC2ServiceResource:
+        # boto3 resources aren't thread-safe, so each thread uses its own one.
+        if (resource := getattr(self._local, "resource", None)) is None:
+            resource = self._local.resource = boto3.session.Session().resource("ec2", region_name=self.region_name)
+        return resource
+
+    def _lookup(self, name: str, find: Callable[[], Optional[str]]) -> Optional[str]:
+        """Return id of a resource by its name, query EC2 only if the resource wasn't found before."""
+        if (resource_id := self._resource_ids.get(name)) is None:
+            resource_id = find()
+            if resource_id is not None:
+                self._resource_ids[name] = resource_id
+        return resource_id
+
+    def _find_tagged(self, describe: Callable, list_key: str, id_key: str, name: str) -> Optional[str]:
+        response = describe(Filters=[{"Name": "tag:Name", "Values": [name]}])
+        LOGGER.debug("Found %s: %s", list_key, response)
+        existing = response.get(list_key, [])
+        if len(existing) == 0:
             return None
-        assert len(existing_vpcs) == 1, \
-            f"More than 1 VPC with {self.VPC_NAME} found in {self.region_name}: {existing_vpcs}"
-        return self.resource.Vpc(existing_vpcs[0]["VpcId"])  # pylint: disable=no-member
+        assert len(existing) == 1, f"More than 1 of {list_key} with {name} found in {self.region_name}: {existing}!"
+        return existing[0][id_key]
+
+    @property
+    def sct_vpc(self) -> EC2ServiceResource.Vpc:
+        vpc_id = self._lookup(self.VPC_NAME, partial(
+            self._find_tagged, self.client.describe_vpcs, "Vpcs", "VpcId", self.VPC_NAME))
+        return self.resource.Vpc(vpc_id) if vpc_id else None  # pylint: disable=no-member
 
     def create_vpc(self):
         LOGGER.info("Going to create VPC...")
@@ -49,6 +162,7 @@ class AwsRegion:
             vpc.create_tags(Tags=[{"Key": "Name", "Value": self.VPC_NAME}])
             LOGGER.info("'%s' with id '%s' created. Waiting until it becomes available...", self.VPC_NAME, vpc_id)
             vpc.wait_until_available()
+            self._resource_ids[self.VPC_NAME] = vpc_id
             return vpc_id
 
     @cached_property
@@ -65,14 +179,13 @@ class AwsRegion:
 
     def sct_subnet(self, region_az) -> EC2ServiceResource.Subnet:
         subnet_name = self.az_subnet_name(region_az)
-        subnets = self.client.describe_subnets(Filters=[{"Name": "tag:Name", "Values": [subnet_name]}])
-        LOGGER.debug("Found Subnets: %s", subnets)
-        existing_subnets = subnets.get("Subnets", [])
-        if len(existing_subnets) == 0:
-            return None
-        assert len(existing_subnets) == 1, \
-            f"More than 1 Subnet with {subnet_name} found in {self.region_name}: {existing_subnets}!"
-        return self.resource.Subnet(existing_subnets[0]["SubnetId"])  # pylint: disable=no-member
+        subnet_id = self._lookup(subnet_name, partial(
+            self._find_tagged, self.client.describe_subnets, "Subnets", "SubnetId", subnet_name))
+        return self.resource.Subnet(subnet_id) if subnet_id else None  # pylint: disable=no-member
+
+    def sct_subnet_id(self, region_az) -> Optional[str]:
+        subnet = self.sct_subnet(region_az)
+        return subnet.subnet_id if subnet else None
 
     def create_subnet(self, region_az, ipv4_cidr, ipv6_cidr):
         LOGGER.info("Creating subnet for %s...", region_az)
@@ -97,33 +210,28 @@ class AwsRegion:
                 AssignIpv6AddressOnCreation={"Value": True},
                 SubnetId=subnet_id
             )
+            self._resource_ids[subnet_name] = subnet_id
             LOGGER.info("'%s' with id '%s' created.", subnet_name, subnet_id)
+        return subnet_id
 
-    def create_subnets(self):
-        num_subnets = len(self.availability_zones)
-        ipv4_cidrs = list(self.VPC_CIDR.subnets(6))[:num_subnets]
-        ipv6_cidrs = list(self.vpc_ipv6_cidr.subnets(8))[:num_subnets]
-        for i, az_name in enumerate(self.availability_zones):
-            self.create_subnet(region_az=az_name, ipv4_cidr=ipv4_cidrs[i], ipv6_cidr=ipv6_cidrs[i])
+    def create_az_subnet(self, az_index):
+        """Create a subnet in N-th availability zone, each AZ gets its own N-th block of the VPC CIDRs."""
+        return self.create_subnet(region_az=self.availability_zones[az_index],
+                                  ipv4_cidr=list(self.VPC_CIDR.subnets(6))[az_index],
+                                  ipv6_cidr=list(self.vpc_ipv6_cidr.subnets(8))[az_index])
 
     @property
     def sct_internet_gateway(self) -> EC2ServiceResource.InternetGateway:
-        igws = self.client.describe_internet_gateways(Filters=[{"Name": "tag:Name",
-                                                                "Values": [self.INTERNET_GATEWAY_NAME]}])
-        LOGGER.debug("Found Internet gateways: %s", igws)
-        existing_igws = igws.get("InternetGateways", [])
-        if len(existing_igws) == 0:
-            return None
-        assert len(existing_igws) == 1, \
-            f"More than 1 Internet Gateway with {self.INTERNET_GATEWAY_NAME} found " \
-            f"in {self.region_name}: {existing_igws}!"
-        return self.resource.InternetGateway(existing_igws[0]["InternetGatewayId"])  # pylint: disable=no-member
+        igw_id = self._lookup(self.INTERNET_GATEWAY_NAME, partial(
+            self._find_tagged, self.client.describe_internet_gateways, "InternetGateways", "InternetGatewayId",
+            self.INTERNET_GATEWAY_NAME))
+        return self.resource.InternetGateway(igw_id) if igw_id else None  # pylint: disable=no-member
 
     def create_internet_gateway(self):
         LOGGER.info("Creating Internet Gateway..")
         if self.sct_internet_gateway:
-            LOGGER.warning("Internet Gateway '%s' already exists! Id: '%s'.",
-                           self.INTERNET_GATEWAY_NAME, self.sct_internet_gateway.internet_gateway_id)
+            igw_id = self.sct_internet_gateway.internet_gateway_id
+            LOGGER.warning("Internet Gateway '%s' already exists! Id: '%s'.", self.INTERNET_GATEWAY_NAME, igw_id)
         else:
             result = self.client.create_internet_gateway()
             igw_id = result["InternetGateway"]["InternetGatewayId"]
@@ -132,55 +240,67 @@ class AwsRegion:
             LOGGER.info("'%s' with id '%s' created. Attaching to '%s'",
                         self.INTERNET_GATEWAY_NAME, igw_id, self.sct_vpc.vpc_id)
             igw.attach_to_vpc(VpcId=self.sct_vpc.vpc_id)
+            self._resource_ids[self.INTERNET_GATEWAY_NAME] = igw_id
+        return igw_id
 
-    @cached_property
+    @property
     def sct_route_table(self) -> EC2ServiceResource.RouteTable:
-        route_tables = self.client.describe_route_tables(Filters=[{"Name": "tag:Name",
-                                                                   "Values": [self.ROUTE_TABLE_NAME]}])
-        LOGGER.debug("Found Route Tables: %s", route_tables)
-        existing_rts = route_tables.get("RouteTables", [])
-        if len(existing_rts) == 0:
+        route_table_id = self._lookup(self.ROUTE_TABLE_NAME, partial(
+            self._find_tagged, self.client.describe_route_tables, "RouteTables", "RouteTableId",
+            self.ROUTE_TABLE_NAME))
+        return self.resource.RouteTable(route_table_id) if route_table_id else None  # pylint: disable=no-member
+
+    def _missing_routes(self, route_table: EC2ServiceResource.RouteTable) -> List[dict]:
+        igw = self.sct_internet_gateway
+        gateway_id = igw.internet_gateway_id if igw else None
+        existing = {(route.get("DestinationCidrBlock") or route.get("DestinationIpv6CidrBlock"), route.get("GatewayId"))
+                    for route in route_table.routes_attribute}
+        return [route for route in ({"DestinationCidrBlock": "0.0.0.0/0"}, {"DestinationIpv6CidrBlock": "::/0"})
+                if (*route.values(), gateway_id) not in existing]
+
+    def _unassociated_subnet_ids(self, route_table: EC2ServiceResource.RouteTable) -> List[Optional[str]]:
+        associated = {assoc["SubnetId"] for assoc in route_table.associations_attribute if "SubnetId" in assoc}
+        return [subnet_id for subnet_id in (self.sct_subnet_id(az_name) for az_name in self.availability_zones)
+                if subnet_id not in associated]
+
+    def sct_route_table_id(self) -> Optional[str]:
+        """Return id of the Route Table only if it routes to the Internet Gateway and all subnets are associated."""
+        route_table = self.sct_route_table
+        if route_table is None or self._missing_routes(route_table) or self._unassociated_subnet_ids(route_table):
             return None
-        assert len(existing_rts) == 1, \
-            f"More than 1 Route Table with {self.ROUTE_TABLE_NAME} found " \
-            f"in {self.region_name}: {existing_rts}!"
-        return self.resource.RouteTable(existing_rts[0]["RouteTableId"])  # pylint: disable=no-member
+        return route_table.route_table_id
 
     def configure_route_table(self):
         # add route to Internet: 0.0.0.0/0 -> igw
         LOGGER.info("Configuring main Route Table...")
-        if self.sct_route_table:
+        if route_table := self.sct_route_table:
             LOGGER.warning("Route Table '%s' already exists! Id: '%s'.",
-                           self.ROUTE_TABLE_NAME, self.sct_route_table.route_table_id)
+                           self.ROUTE_TABLE_NAME, route_table.route_table_id)
         else:
             route_tables = list(self.sct_vpc.route_tables.all())
             assert len(route_tables) == 1, f"Only one main route table should exist for {self.VPC_NAME}. " \
                                            f"Found {len(route_tables)}!"
             route_table: EC2ServiceResource.RouteTable = route_tables[0]
             route_table.create_tags(Tags=[{"Key": "Name", "Value": self.ROUTE_TABLE_NAME}])
+            self._resource_ids[self.ROUTE_TABLE_NAME] = route_table.route_table_id
+        # A previous run could fail after tagging the table, so check the routes and the associations anyway.
+        if missing_routes := self._missing_routes(route_table):
             LOGGER.info("Setting routing of all outbound traffic via Internet Gateway...")
-            route_table.create_route(DestinationCidrBlock="0.0.0.0/0",
-                                     GatewayId=self.sct_internet_gateway.internet_gateway_id)
-            route_table.create_route(DestinationIpv6CidrBlock="::/0",
-                                     GatewayId=self.sct_internet_gateway.internet_gateway_id)
+            for route in missing_routes:
+                route_table.create_route(GatewayId=self.sct_internet_gateway.internet_gateway_id, **route)
+        if subnet_ids := self._unassociated_subnet_ids(route_table):
             LOGGER.info("Going to associate all Subnets with the Route Table...")
-            for az_name in self.availability_zones:
-                subnet_id = self.sct_subnet(az_name).subnet_id
-                LOGGER.info("Associating Route Table with '%s' [%s]...", self.az_subnet_name(az_name), subnet_id)
+            for subnet_id in subnet_ids:
+                LOGGER.info("Associating Route Table with '%s'...", subnet_id)
                 route_table.associate_with_subnet(SubnetId=subnet_id)
+        return route_table.route_table_id
 
     @property
     def sct_security_group(self) -> EC2ServiceResource.SecurityGroup:
-        security_groups = self.client.describe_security_groups(Filters=[{"Name": "tag:Name",
-                                                                         "Values": [self.SECURITY_GROUP_NAME]}])
-        LOGGER.debug("Found Security Groups: %s", security_groups)
-        existing_sgs = security_groups.get("SecurityGroups", [])
-        if len(existing_sgs) == 0:
-            return None
-        assert len(existing_sgs) == 1, \
-            f"More than 1 Security group with {self.SECURITY_GROUP_NAME} found " \
-            f"in {self.region_name}: {existing_sgs}!"
-        return self.resource.SecurityGroup(existing_sgs[0]["GroupId"])  # pylint: disable=no-member
+        sg_id = self._lookup(self.SECURITY_GROUP_NAME, partial(
+            self._find_tagged, self.client.describe_security_groups, "SecurityGroups", "GroupId",
+            self.SECURITY_GROUP_NAME))
+        return self.resource.SecurityGroup(sg_id) if sg_id else None  # pylint: disable=no-member
 
     def create_security_group(self):
         """
@@ -191,8 +311,8 @@ class AwsRegion:
         """
         LOGGER.info("Creating Security Group...")
         if self.sct_security_group:
-            LOGGER.warning("Security Group '%s' already exists! Id: '%s'.",
-                           self.SECURITY_GROUP_NAME, self.sct_security_group.group_id)
+            sg_id = self.sct_security_group.group_id
+            LOGGER.warning("Security Group '%s' already exists! Id: '%s'.", self.SECURITY_GROUP_NAME, sg_id)
         else:
             result = self.client.create_security_group(Description='Security group that is used by SCT',
                                                        GroupName=self.SECURITY_GROUP_NAME,
@@ -200,7 +320,7 @@ class AwsRegion:
             sg_id = result["GroupId"]
             security_group = self.resource.SecurityGroup(sg_id)  # pylint: disable=no-member
             security_group.create_tags(Tags=[{"Key": "Name", "Value": self.SECURITY_GROUP_NAME}])
-            LOGGER.info("'%s' with id '%s' created. ", self.SECURITY_GROUP_NAME, self.sct_security_group.group_id)
+            LOGGER.info("'%s' with id '%s' created. ", self.SECURITY_GROUP_NAME, sg_id)
             LOGGER.info("Creating common ingress rules...")
             security_group.authorize_ingress(
                 IpPermissions=[
@@ -363,9 +483,10 @@ class AwsRegion:
                     }
                 ]
             )
+            self._resource_ids[self.SECURITY_GROUP_NAME] = sg_id
+        return sg_id
 
-    @property
-    def sct_keypair(self):
+    def _find_key_pair_name(self) -> Optional[str]:
         try:
             key_pairs = self.client.describe_key_pairs(KeyNames=[self.KEY_PAIR_NAME])
         except botocore.exceptions.ClientError as ex:
@@ -378,7 +499,12 @@ class AwsRegion:
         assert len(existing_key_pairs) == 1, \
             f"More than 1 Key Pair with {self.KEY_PAIR_NAME} found " \
             f"in {self.region_name}: {existing_key_pairs}!"
-        return self.resource.KeyPair(existing_key_pairs[0]["KeyName"])  # pylint: disable=no-member
+        return existing_key_pairs[0]["KeyName"]
+
+    @property
+    def sct_keypair(self):
+        key_name = self._lookup(self.KEY_PAIR_NAME, self._find_key_pair_name)
+        return self.resource.KeyPair(key_name) if key_name else None  # pylint: disable=no-member
 
     def create_key_pair(self):
         LOGGER.info("Creating SCT Key Pair...")
@@ -389,19 +515,133 @@ class AwsRegion:
             sct_key_pair = ks.get_ec2_ssh_key_pair()
             self.resource.import_key_pair(KeyName=self.KEY_PAIR_NAME,  # pylint: disable=no-member
                                           PublicKeyMaterial=sct_key_pair.public_key)
+            self._resource_ids[self.KEY_PAIR_NAME] = self.KEY_PAIR_NAME
             LOGGER.info("SCT Key Pair created.")
+        return self.KEY_PAIR_NAME
 
-    def configure(self):
+    def steps(self) -> List[RegionStep]:
+        """Return the steps of region preparation, steps which don't depend on each other are done in parallel."""
+        subnet_names = [self.az_subnet_name(az_name) for az_name in self.availability_zones]
+        steps = [RegionStep(name=self.VPC_NAME, find=lambda: self.sct_vpc and self.sct_vpc.vpc_id,
+                            apply=self.create_vpc)]
+        steps.extend(RegionStep(name=subnet_name,
+                                find=partial(self.sct_subnet_id, az_name),
+                                apply=partial(self.create_az_subnet, az_index),
+                                depends_on=(self.VPC_NAME, ))
+                     for az_index, (az_name, subnet_name) in enumerate(zip(self.availability_zones, subnet_names)))
+        steps.extend([
+            RegionStep(name=self.INTERNET_GATEWAY_NAME,
+                       find=lambda: self.sct_internet_gateway and self.sct_internet_gateway.internet_gateway_id,
+                       apply=self.create_internet_gateway,
+                       depends_on=(self.VPC_NAME, )),
+            RegionStep(name=self.ROUTE_TABLE_NAME,
+                       find=self.sct_route_table_id,
+                       apply=self.configure_route_table,
+                       depends_on=(self.INTERNET_GATEWAY_NAME, *subnet_names)),
+            RegionStep(name=self.SECURITY_GROUP_NAME,
+                       find=lambda: self.sct_security_group and self.sct_security_group.group_id,
+                       apply=self.create_security_group,
+                       depends_on=(self.VPC_NAME, )),
+            RegionStep(name=self.KEY_PAIR_NAME,
+                       find=lambda: self.sct_keypair and self.KEY_PAIR_NAME,
+                       apply=self.create_key_pair),
+        ])
+        return steps
+
+    def plan(self) -> List[Tuple[str, Optional[str]]]:
+        """Return names of the steps with ids of already existing resources (None for steps to be done.)"""
+        steps = self.steps()
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix=f"AwsRegion-{self.region_name}") as executor:
+            return list(zip([step.name for step in steps], executor.map(lambda step: step.find(), steps)))
+
+    def configure(self, execution_log: Optional[RegionPreparationLog] = None):
         LOGGER.info("Configuring '%s' region...", self.region_name)
-        self.create_vpc()
-        self.create_subnets()
-        self.create_internet_gateway()
-        self.configure_route_table()
-        self.create_security_group()
-        self.create_key_pair()
+        if execution_log is None:
+            execution_log = RegionPreparationLog(self.region_name)
+        steps = {step.name: step for step in self.steps()}
+        done = set()
+        # Resources could be deleted or changed since the previous run, so check the steps it did again.
+        logged = [name for name in execution_log.done_steps() if name in steps]
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix=f"AwsRegion-{self.region_name}") as executor:
+            for name, resource_id in zip(logged, executor.map(lambda name: steps[name].find(), logged)):
+                if resource_id is None:
+                    LOGGER.warning("Step '%s' of '%s' region preparation was done by the previous run, "
+                                   "but its resource isn't found, doing it again", name, self.region_name)
+                else:
+                    done.add(name)
+        if done:
+            LOGGER.info("Resuming configuration of '%s' region, already done: %s", self.region_name, sorted(done))
+        execution_log.start()
+
+        pending = {name: step for name, step in steps.items() if name not in done}
+        running = {}
+        error = None
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix=f"AwsRegion-{self.region_name}") as executor:
+            while True:
+                # Steps which depend on a failed step are never ready, but all others are still done.
+                for name, step in list(pending.items()):
+                    if done.issuperset(step.depends_on):
+                        running[executor.submit(step.apply)] = pending.pop(name)
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    step = running.pop(future)
+                    try:
+                        resource_id = future.result()
+                    except Exception as exc:  # pylint: disable=broad-except
+                        LOGGER.error("Step '%s' of '%s' region preparation failed: %s",
+                                     step.name, self.region_name, exc)
+                        execution_log.step_failed(step.name, exc)
+                        error = error or exc
+                        continue
+                    LOGGER.debug("Step '%s' of '%s' region preparation is done: %s",
+                                 step.name, self.region_name, resource_id)
+                    execution_log.step_done(step.name, resource_id)
+                    done.add(step.name)
+        if error is None and pending:
+            error = RegionPreparationError(f"Steps with unsatisfied dependencies: {sorted(pending)}")
+        execution_log.finish(success=error is None)
+        if error is not None:
+            raise RegionPreparationError(f"Failed to configure '{self.region_name}' region, "
+                                         f"run it again to resume from the failed step: {error}") from error
         LOGGER.info("Region configured successfully.")
 
 
+def _for_regions(func: Callable, region_names: List[str]) -> Dict[str, object]:
+    """Run `func(region_name)' for all regions concurrently, raise if it failed for any of them."""
+    results, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=max(len(region_names), 1), thread_name_prefix="AwsRegions") as executor:
+        futures = {region_name: executor.submit(func, region_name) for region_name in region_names}
+        for region_name, future in futures.items():
+            try:
+                results[region_name] = future.result()
+            except Exception as exc:  # pylint: disable=broad-except
+                errors[region_name] = exc
+    if errors:
+        raise RegionPreparationError("\n".join(f"{region_name}: {exc}" for region_name, exc in errors.items()))
+    return results
+
+
+def plan_aws_regions(region_names: List[str]) -> Dict[str, List[Tuple[str, Optional[str]]]]:
+    """Check which SCT resources already exist in the regions, without changing anything."""
+    return _for_regions(lambda region_name: AwsRegion(region_name=region_name).plan(), region_names)
+
+
+def prepare_aws_regions(region_names: List[str], fresh: bool = False) -> None:
+    """Prepare the regions concurrently, resuming from the execution log of a previous failed run unless `fresh'."""
+    def prepare(region_name):
+        execution_log = RegionPreparationLog(region_name)
+        if fresh:
+            execution_log.reset()
+        AwsRegion(region_name=region_name).configure(execution_log=execution_log)
+
+    _for_regions(prepare, region_names)
+
+
 if __name__ == "__main__":
     AWS_REGION = AwsRegion(region_name="eu-west-2")
     AWS_REGION.configure()
@@ -1,7 +1,10 @@
+import os
 import json
+import time
+import threading
 from datetime import datetime, timedelta
-from functools import lru_cache
 from logging import getLogger
+from typing import Dict, Iterable, Optional, Tuple
 import boto3
 from mypy_boto3_pricing import PricingClient
 from sdcm.utils.cloud_monitor.common import InstanceLifecycle
@@ -9,15 +12,70 @@ from sdcm.utils.cloud_monitor.common import InstanceLifecycle
 
 LOGGER = getLogger(__name__)
 
+PRICE_CACHE_FILE = os.path.expanduser("~/.cache/sct/prices.json")
+
+
+class PriceCache:
+    """Prices stored in a JSON file, so they are shared by all runs on the same machine till they expire."""
+
+    def __init__(self, path: Optional[str] = PRICE_CACHE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._prices = None
+
+    def _load(self) -> Dict[str, dict]:
+        if self._prices is None:
+            self._prices = {}
+            if self.path and os.path.exists(self.path):
+                try:
+                    with open(self.path, encoding="utf-8") as cache_file:
+                        self._prices = json.load(cache_file)
+                except (OSError, ValueError) as exc:
+                    LOGGER.warning("Failed to load prices cache %s: %s", self.path, exc)
+        return self._prices
+
+    def get(self, key: str, ttl: float) -> Optional[float]:
+        with self._lock:
+            entry = self._load().get(key)
+        if entry and time.time() - entry["timestamp"] < ttl:
+            return entry["price"]
+        return None
+
+    def set_many(self, prices: Dict[str, float]) -> None:
+        with self._lock:
+            cached = self._load()
+            cached.update({key: {"price": price, "timestamp": time.time()} for key, price in prices.items()})
+            if not self.path:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_file = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_file, "w", encoding="utf-8") as cache_file:
+                    json.dump(cached, cache_file)
+                os.replace(tmp_file, self.path)
+            except OSError as exc:
+                LOGGER.warning("Failed to save prices cache %s: %s", self.path, exc)
+
+    def set(self, key: str, price: float) -> None:
+        self.set_many({key: price})
+
 
-# TODO: get all prices in __init__
 class AWSPricing:
+    on_demand_price_ttl = 7 * 24 * 3600
+    spot_price_ttl = 3600
 
-    def __init__(self):
+    def __init__(self, cache: Optional[PriceCache] = None):
         self.pricing_client: PricingClient = boto3.client('pricing', region_name='us-east-1')
+        self.cache = cache or PriceCache()
 
-    @lru_cache(maxsize=None)
     def get_on_demand_instance_price(self, region_name, instance_type):
+        key = f"aws:on_demand:{region_name}:{instance_type}"
+        if (price := self.cache.get(key, ttl=self.on_demand_price_ttl)) is None:
+            price = self._get_on_demand_instance_price(region_name, instance_type)
+            self.cache.set(key, price)
+        return price
+
+    def _get_on_demand_instance_price(self, region_name, instance_type):
         regions_names_map = {
             'us-east-2': 'US East (Ohio)',
             'us-east-1': 'US East (N. Virginia)',
@@ -57,23 +115,56 @@ class AWSPricing:
         instance_price = next(iter(price_dimensions.values()))['pricePerUnit']['USD']
         return float(instance_price)
 
-    @staticmethod
-    @lru_cache(maxsize=None)
-    def get_spot_instance_price(region_name, instance_type):
+    def get_spot_instance_price(self, region_name, instance_type):
         """currently doesn't take AZ into consideration"""
+        key = f"aws:spot:{region_name}:{instance_type}"
+        if (price := self.cache.get(key, ttl=self.spot_price_ttl)) is None:
+            self.prefetch_spot_prices(region_name, [instance_type])
+            price = self.cache.get(key, ttl=self.spot_price_ttl)
+        return price
+
+    def prefetch_spot_prices(self, region_name: str, instance_types: Iterable[str]) -> None:
+        """Get spot prices of all instance types of a region, which aren't cached, in one paginated sweep."""
+        instance_types = sorted({instance_type for instance_type in instance_types
+                                 if self.cache.get(f"aws:spot:{region_name}:{instance_type}",
+                                                   ttl=self.spot_price_ttl) is None})
+        if not instance_types:
+            return
         client = boto3.client('ec2', region_name=region_name)
-        result = client.describe_spot_price_history(InstanceTypes=[instance_type],
-                                                    ProductDescriptions=['Linux/UNIX (Amazon VPC)', 'Linux/UNIX'],
-                                                    StartTime=datetime.now() - timedelta(hours=3),
-                                                    EndTime=datetime.now())
-        prices = result['SpotPriceHistory']
-        if prices:
-            # average between different AZs
-            all_prices = [float(p['SpotPrice']) for p in prices]
-            return sum(all_prices) / len(all_prices)
-        else:
-            LOGGER.warning("Spot price not found for '%s' in '%s':\n%s", instance_type, region_name, result)
-            return 0
+        paginator = client.get_paginator('describe_spot_price_history')
+        all_prices = {instance_type: [] for instance_type in instance_types}
+        for page in paginator.paginate(InstanceTypes=instance_types,
+                                       ProductDescriptions=['Linux/UNIX (Amazon VPC)', 'Linux/UNIX'],
+                                       StartTime=datetime.now() - timedelta(hours=3),
+                                       EndTime=datetime.now()):
+            for price in page['SpotPriceHistory']:
+                all_prices[price['InstanceType']].append(float(price['SpotPrice']))
+        prices = {}
+        for instance_type, type_prices in all_prices.items():
+            if type_prices:
+                # average between different AZs
+                prices[f"aws:spot:{region_name}:{instance_type}"] = sum(type_prices) / len(type_prices)
+            else:
+                LOGGER.warning("Spot price not found for '%s' in '%s'", instance_type, region_name)
+                prices[f"aws:spot:{region_name}:{instance_type}"] = 0
+        self.cache.set_many(prices)
+
+    def prefetch(self, instances: Iterable[Tuple[str, str, str]]) -> None:
+        """Get prices for (region, instance_type, lifecycle) tuples of running instances with minimum API calls."""
+        spot_instance_types = {}
+        for region, instance_type, lifecycle in instances:
+            if lifecycle == InstanceLifecycle.SPOT:
+                spot_instance_types.setdefault(region, set()).add(instance_type)
+            else:
+                try:
+                    self.get_on_demand_instance_price(region_name=region, instance_type=instance_type)
+                except Exception as exc:  # pylint: disable=broad-except
+                    LOGGER.warning("Failed to get on-demand price of %s in %s: %s", instance_type, region, exc)
+        for region, instance_types in spot_instance_types.items():
+            try:
+                self.prefetch_spot_prices(region, instance_types)
+            except Exception as exc:  # pylint: disable=broad-except
+                LOGGER.warning("Failed to get spot prices for %s: %s", region, exc)
 
     def get_instance_price(self, region, instance_type, state, lifecycle):
         if state == "running":
@@ -0,0 +1,110 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import os
+import json
+import time
+import fcntl
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+LOGGER = logging.getLogger(__name__)
+
+CONFIG_RESOLUTION_CACHE_FILE = os.path.expanduser("~/.cache/sct/config_resolution.json")
+
+
+class OfflineResolutionError(ValueError):
+    pass
+
+
+class ResolutionCache:
+    """Results of network lookups (AMI ids, repo URLs, etc.) stored in a JSON file and keyed by lookup's arguments.
+
+    Results are shared by all runs on the same machine (including parallel processes of `sct.py lint-yamls') till
+    they expire; lookups of moving targets (e.g. `latest' builds) use ttl=0, so they are always done, and their
+    results are stored only for offline mode.  In offline mode nothing is looked up: cached results are used even if
+    expired, and a lookup which isn't cached raises OfflineResolutionError.
+    """
+
+    max_workers = 8
+
+    def __init__(self, path: Optional[str] = None, offline: bool = False):
+        self.path = path or CONFIG_RESOLUTION_CACHE_FILE
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = None
+
+    @staticmethod
+    def make_key(name: str, args: Sequence) -> str:
+        return json.dumps([name, *args])
+
+    def _load_file(self) -> Dict[str, dict]:
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, encoding="utf-8") as cache_file:
+                    return json.load(cache_file)
+            except (OSError, ValueError) as exc:
+                LOGGER.warning("Failed to load config resolution cache %s: %s", self.path, exc)
+        return {}
+
+    def _load(self) -> Dict[str, dict]:
+        if self._entries is None:
+            self._entries = self._load_file()
+        return self._entries
+
+    def _save(self, key: str, value: Any) -> None:
+        entry = {"value": value, "timestamp": time.time()}
+        with self._lock:
+            self._load()[key] = entry
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                # Other processes update the file as well: re-read it under the lock to keep their entries.
+                with open(f"{self.path}.lock", "w", encoding="utf-8") as lock_file:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                    self._entries = {**self._entries, **self._load_file(), key: entry}
+                    tmp_file = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                    with open(tmp_file, "w", encoding="utf-8") as cache_file:
+                        json.dump(self._entries, cache_file)
+                    os.replace(tmp_file, self.path)
+            except OSError as exc:
+                LOGGER.warning("Failed to save config resolution cache %s: %s", self.path, exc)
+
+    def resolve(self, name: str, func: Callable, *args, ttl: float) -> Any:
+        """Return cached result of `func(*args)', call it and cache the result if it isn't cached or expired."""
+        key = self.make_key(name, args)
+        with self._lock:
+            entry = self._load().get(key)
+            if entry and (self.offline or time.time() - entry["timestamp"] < ttl):
+                self.hits += 1
+                return entry["value"]
+            if not self.offline:
+                self.misses += 1
+        if self.offline:
+            raise OfflineResolutionError(f"{name}{tuple(args)} isn't cached and can't be resolved in offline mode")
+        value = func(*args)
+        self._save(key, value)
+        return value
+
+    def resolve_many(self, name: str, func: Callable, args_list: Iterable[Sequence], ttl: float) -> List[Any]:
+        """Resolve `func' for each tuple of arguments concurrently, return results in the same order."""
+        args_list = [tuple(args) for args in args_list]
+        if len(args_list) <= 1:
+            return [self.resolve(name, func, *args, ttl=ttl) for args in args_list]
+        with ThreadPoolExecutor(max_workers=min(len(args_list), self.max_workers),
+                                thread_name_prefix="ResolutionCache") as executor:
+            futures = [executor.submit(self.resolve, name, func, *args, ttl=ttl) for args in args_list]
+            return [future.result() for future in futures]
@@ -0,0 +1,178 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+"""Rolling operations (e.g. restart) over the nodes of a cluster, with a concurrency window.
+
+Racks are processed one by one.  Within a rack up to `concurrency' nodes are processed at the same time (all nodes
+of the rack if `concurrency' is 0), which keeps the replicas of other racks up when the keyspaces use rack-aware
+replication over at least as many racks as their replication factor.  It's up to the caller to make sure they do.
+If all nodes of a DC are in a single rack (e.g. racks aren't configured), a rack doesn't tell anything about
+the replicas, so the nodes of that DC are processed one at a time whatever `concurrency' is.
+Before an operation on a node is started, the cluster must pass the health check (which is given the nodes under
+operation, to ignore them), and after it the node must pass the readiness check.  On the first failure no new
+operations are started, the running ones are waited for and RollingOperationFailed is raised.
+"""
+
+import time
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait as wait_futures
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, List, Optional, Sequence
+
+from sdcm.utils.spans import span
+from sdcm.wait import Clock, WaitTimeoutError, wait_until
+
+LOGGER = logging.getLogger(__name__)
+
+
+class RollingOperationFailed(Exception):
+    def __init__(self, message: str, steps: List["RollingStep"]):
+        super().__init__(message)
+        self.steps = steps
+
+
+@dataclass
+class RollingStep:
+    node: str
+    rack: str
+    start: float = 0.0  # seconds since the start of the rolling operation
+    health_wait: float = 0.0
+    operation: float = 0.0
+    readiness_wait: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        return self.health_wait + self.operation + self.readiness_wait
+
+    def __str__(self):
+        return (f"{self.node} ({self.rack}): started at +{self.start:.1f}s, health wait {self.health_wait:.1f}s, "
+                f"operation {self.operation:.1f}s, readiness wait {self.readiness_wait:.1f}s"
+                + (f", FAILED: {self.error}" if self.error else ""))
+
+
+class RollingExecutor:  # pylint: disable=too-many-instance-attributes
+    # pylint: disable=too-many-arguments
+    def __init__(self, name: str, nodes: Sequence, operation: Callable, concurrency: int = 1,
+                 readiness_check: Optional[Callable] = None, health_check: Optional[Callable[[list], bool]] = None,
+                 readiness_timeout: float = 600, health_check_timeout: float = 600, clock: Clock = Clock):
+        self.name = name
+        self.nodes = list(nodes)
+        self.operation = operation
+        self.concurrency = concurrency
+        self.readiness_check = readiness_check
+        self.health_check = health_check
+        self.readiness_timeout = readiness_timeout
+        self.health_check_timeout = health_check_timeout
+        self.clock = clock
+        self.steps: List[RollingStep] = []
+        self._start_time = None
+
+    @staticmethod
+    def rack_of(node) -> str:
+        return f"dc {getattr(node, 'dc_idx', 0)} rack {getattr(node, 'rack', 0)}"
+
+    def racks(self) -> "OrderedDict[str, list]":
+        racks = OrderedDict()
+        for node in self.nodes:
+            racks.setdefault(self.rack_of(node), []).append(node)
+        return racks
+
+    def window(self, nodes: list) -> int:
+        """Number of `nodes' of a rack to process at the same time."""
+        if self.concurrency == 1:
+            return 1
+        dc_idx = getattr(nodes[0], "dc_idx", 0)
+        if len({getattr(node, "rack", 0) for node in self.nodes if getattr(node, "dc_idx", 0) == dc_idx}) < 2:
+            LOGGER.warning("%s: all nodes of dc %s are in one rack, process them one at a time instead of %s",
+                           self.name, dc_idx, self.concurrency or "the whole rack")
+            return 1
+        return self.concurrency or len(nodes)
+
+    def _wait_for_cluster_health(self, step: RollingStep, busy_nodes: list) -> None:
+        if self.health_check is None:
+            return
+        start_time = time.perf_counter()
+        try:
+            wait_until(partial(self.health_check, busy_nodes), timeout=self.health_check_timeout,
+                       text=f"{self.name}: cluster is healthy before {step.node}", clock=self.clock)
+        finally:
+            step.health_wait = time.perf_counter() - start_time
+
+    def _run_step(self, node, step: RollingStep) -> RollingStep:
+        with span(self.name, category="rolling", node=step.node, rack=step.rack):
+            start_time = time.perf_counter()
+            try:
+                self.operation(node)
+            finally:
+                step.operation = time.perf_counter() - start_time
+            if self.readiness_check is not None:
+                start_time = time.perf_counter()
+                try:
+                    wait_until(partial(self.readiness_check, node), timeout=self.readiness_timeout,
+                               text=f"{self.name}: {step.node} is ready", clock=self.clock)
+                finally:
+                    step.readiness_wait = time.perf_counter() - start_time
+        LOGGER.info("%s: %s", self.name, step)
+        return step
+
+    def _new_step(self, node) -> RollingStep:
+        step = RollingStep(node=getattr(node, "name", str(node)), rack=self.rack_of(node),
+                           start=time.perf_counter() - self._start_time)
+        self.steps.append(step)
+        return step
+
+    def _run_rack(self, rack: str, nodes: list) -> Optional[RollingStep]:
+        """Run the operation on the nodes of the rack, return the first failed step if any."""
+        window = self.window(nodes)
+        LOGGER.info("%s: processing %s nodes of %s, %s at a time", self.name, len(nodes), rack, window)
+        pending = list(nodes)
+        running = {}
+        failed = None
+        with ThreadPoolExecutor(max_workers=window, thread_name_prefix=f"Rolling-{self.name}") as executor:
+            while running or (pending and failed is None):
+                while pending and len(running) < window and failed is None:
+                    node = pending.pop(0)
+                    step = self._new_step(node)
+                    try:
+                        self._wait_for_cluster_health(step, busy_nodes=[node for node, _ in running.values()])
+                    except WaitTimeoutError as exc:
+                        step.error = str(exc)
+                        failed = step
+                        break
+                    running[executor.submit(self._run_step, node, step)] = (node, step)
+                if not running:
+                    break
+                done, _ = wait_futures(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    _, step = running.pop(future)
+                    if (exc := future.exception()) is not None:
+                        step.error = f"{type(exc).__name__}: {exc}"
+                        failed = failed or step
+        return failed
+
+    def run(self) -> List[RollingStep]:
+        """Run the operation on all nodes, raise RollingOperationFailed on the first failure."""
+        self._start_time = time.perf_counter()
+        self.steps = []
+        for rack, nodes in self.racks().items():
+            if (failed := self._run_rack(rack, nodes)) is not None:
+                LOGGER.error("%s aborted after %s failed:\n%s", self.name, failed.node, self.report())
+                raise RollingOperationFailed(f"{self.name} failed on {failed.node}: {failed.error}", steps=self.steps)
+        LOGGER.info("%s finished in %.1fs:\n%s", self.name, time.perf_counter() - self._start_time, self.report())
+        return self.steps
+
+    def report(self) -> str:
+        return "\n".join(f"  {step}" for step in self.steps)
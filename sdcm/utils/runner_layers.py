@@ -0,0 +1,235 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+"""Installation of SCT runner prerequisites split into content-hashed layers.
+
+Each layer is a shell script.  Digest of a layer covers its script and digests of all previous layers, like layers of
+a container image.  After a layer is installed, its digest is stored on the host in `LAYERS_STATE_DIR', so a host (or
+an image created from it) which has some layers installed already gets only the changed and the following ones.
+"""
+
+import time
+import shlex
+import hashlib
+import logging
+from textwrap import dedent
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from sdcm.remote import LocalCmdRunner
+
+LOGGER = logging.getLogger(__name__)
+
+LAYERS_STATE_DIR = "/var/lib/sct-runner/layers"
+
+
+@dataclass(frozen=True)
+class RunnerLayer:
+    name: str
+    script: str
+    check: str = "true"  # verifies that the layer is installed, shouldn't need root or network access
+
+
+@dataclass
+class LayerResult:
+    name: str
+    digest: str
+    status: str  # "cached", "installed" or "failed" for `apply'; "ok", "stale" or "failed" for `validate'
+    duration: float = 0.0
+    output: str = ""
+
+
+SCT_RUNNER_LAYERS = (
+    RunnerLayer(
+        name="system-limits",
+        script="""
+            grep -qxF "fs.aio-max-nr = 65536" /etc/sysctl.conf || echo "fs.aio-max-nr = 65536" >> /etc/sysctl.conf
+            for user in ubuntu jenkins root; do
+                grep -qxF "$user soft nofile 4096" /etc/security/limits.conf \\
+                    || echo "$user soft nofile 4096" >> /etc/security/limits.conf
+            done
+        """,
+        check="grep -qxF 'fs.aio-max-nr = 65536' /etc/sysctl.conf",
+    ),
+    RunnerLayer(
+        name="ubuntu-user",
+        script="""
+            sudo -u ubuntu mkdir -p /home/ubuntu/.ssh || true
+            grep -qxF "{public_key}" /home/ubuntu/.ssh/authorized_keys \\
+                || echo "{public_key}" >> /home/ubuntu/.ssh/authorized_keys
+            chmod 600 /home/ubuntu/.ssh/authorized_keys
+            mkdir -p -m 777 /home/ubuntu/sct-results
+            grep -qxF "cd ~/sct-results" /home/ubuntu/.bashrc || echo "cd ~/sct-results" >> /home/ubuntu/.bashrc
+            chown -R ubuntu:ubuntu /home/ubuntu/
+        """,
+        check="test -d /home/ubuntu/sct-results",
+    ),
+    RunnerLayer(
+        name="base-packages",
+        script="""
+            apt clean
+            apt update
+            apt install -y python3-pip htop screen tree
+            pip3 install awscli
+        """,
+        check="aws --version && tree --version",
+    ),
+    RunnerLayer(
+        name="docker",
+        script="""
+            apt-get install -y apt-transport-https ca-certificates curl gnupg-agent software-properties-common
+            curl -fsSL https://download.docker.com/linux/ubuntu/gpg | sudo apt-key add -
+            apt-key fingerprint 0EBFCD88
+            add-apt-repository "deb [arch=amd64] https://download.docker.com/linux/ubuntu $(lsb_release -cs) stable"
+            apt update
+            apt install -y docker-ce docker-ce-cli containerd.io
+            usermod -aG docker {login_user}
+            usermod -aG docker ubuntu || true
+        """,
+        check="docker --version",
+    ),
+    RunnerLayer(
+        name="kubectl",
+        script="""
+            curl -LO "https://dl.k8s.io/release/$(curl -L -s https://dl.k8s.io/release/stable.txt)/bin/linux/amd64/kubectl"
+            install -o root -g root -m 0755 kubectl /usr/local/bin/kubectl
+            rm -f kubectl
+        """,
+        check="kubectl version --client",
+    ),
+    RunnerLayer(
+        name="jenkins-user",
+        script="""
+            apt install -y openjdk-14-jre-headless
+            adduser --disabled-password --gecos "" jenkins || true
+            usermod -aG docker jenkins
+            mkdir -p /home/jenkins/.ssh
+            grep -qxF "{public_key}" /home/jenkins/.ssh/authorized_keys \\
+                || echo "{public_key}" >> /home/jenkins/.ssh/authorized_keys
+            chmod 600 /home/jenkins/.ssh/authorized_keys
+            chown -R jenkins:jenkins /home/jenkins
+            echo "jenkins ALL=(ALL) NOPASSWD: ALL" > /etc/sudoers.d/jenkins
+        """,
+        check="id jenkins && java -version",
+    ),
+    RunnerLayer(
+        name="bin-sh-is-bash",
+        # Jenkins pipelines run /bin/sh for some reason
+        script="""
+            ln -sf /bin/bash /bin/sh
+        """,
+        check='test "$(readlink /bin/sh)" = /bin/bash',
+    ),
+)
+
+
+class LayerStack:
+    """Layers with their scripts rendered using `params' and chained digests."""
+
+    def __init__(self, layers: Sequence[RunnerLayer], state_dir: str = LAYERS_STATE_DIR, sudo: bool = True,
+                 **params):
+        self.state_dir = state_dir
+        self.sudo = sudo
+        self.layers = []
+        self.digests = []
+        digest = ""
+        for layer in layers:
+            script = dedent(layer.script.format(**params)).strip()
+            digest = hashlib.sha256(f"{digest}\n{layer.name}\n{script}".encode()).hexdigest()
+            self.layers.append(RunnerLayer(name=layer.name, script=script, check=layer.check))
+            self.digests.append(digest)
+
+    @property
+    def digest(self) -> str:
+        """Digest of the whole stack, changes when any layer is changed."""
+        return self.digests[-1] if self.digests else ""
+
+    def _root_cmd(self, cmd: str) -> str:
+        cmd = f"bash -ce {shlex.quote(cmd)}"
+        return f"sudo {cmd}" if self.sudo else cmd
+
+    def installed_digests(self, runner) -> Dict[str, str]:
+        """Return digests of the layers installed on a host by layer name."""
+        result = runner.run(f"cat {self.state_dir}/* 2>/dev/null || true", ignore_status=True, verbose=False)
+        installed = {}
+        for line in result.stdout.splitlines():
+            if len(fields := line.split()) >= 2:
+                installed[fields[0]] = fields[1]
+        return installed
+
+    def first_stale_layer(self, installed: Dict[str, str]) -> int:
+        """Return index of the first layer which should be installed (all following layers should be too.)"""
+        for idx, (layer, digest) in enumerate(zip(self.layers, self.digests)):
+            if installed.get(layer.name) != digest:
+                return idx
+        return len(self.layers)
+
+    def apply(self, runner) -> List[LayerResult]:
+        """Install the missing and changed layers using a command runner, stop on the first failure."""
+        start = self.first_stale_layer(self.installed_digests(runner))
+        results = [LayerResult(name=layer.name, digest=digest, status="cached")
+                   for layer, digest in zip(self.layers[:start], self.digests[:start])]
+        for layer, digest in zip(self.layers[start:], self.digests[start:]):
+            LOGGER.info("Installing layer '%s' (%s)...", layer.name, digest[:12])
+            start_time = time.perf_counter()
+            marker = f"{layer.name} {digest} {int(time.time())}"
+            result = runner.run(self._root_cmd(
+                f"{layer.script}\n"
+                f"mkdir -p {self.state_dir}\n"
+                f"echo {shlex.quote(marker)} > {self.state_dir}/{layer.name}"), ignore_status=True)
+            duration = time.perf_counter() - start_time
+            if result.exit_status != 0:
+                results.append(LayerResult(name=layer.name, digest=digest, status="failed", duration=duration,
+                                           output=result.stdout + result.stderr))
+                break
+            results.append(LayerResult(name=layer.name, digest=digest, status="installed", duration=duration))
+        for result in results:
+            LOGGER.info("Layer %-16s %-10s %7.1fs", result.name, result.status, result.duration)
+        return results
+
+    def validate(self, runner) -> List[LayerResult]:
+        """Check the layers on a host without changing anything.
+
+        A layer is `ok' if its check passes and the installed digest is the expected one, `stale' if the check passes
+        but the layer was installed with a different script (or not by a LayerStack at all), and `failed' otherwise.
+        """
+        installed = self.installed_digests(runner)
+        start = self.first_stale_layer(installed)
+        results = []
+        for idx, (layer, digest) in enumerate(zip(self.layers, self.digests)):
+            start_time = time.perf_counter()
+            result = runner.run(f"bash -c {shlex.quote(layer.check)}", ignore_status=True, verbose=False)
+            if result.exit_status != 0:
+                status = "failed"
+            else:
+                status = "ok" if idx < start else "stale"
+            results.append(LayerResult(name=layer.name, digest=digest, status=status,
+                                       duration=time.perf_counter() - start_time,
+                                       output=result.stdout + result.stderr))
+        return results
+
+
+def get_sct_runner_layers(login_user: str, public_key: str, **kwargs) -> LayerStack:
+    return LayerStack(SCT_RUNNER_LAYERS, login_user=login_user, public_key=public_key, **kwargs)
+
+
+class DockerImageRunner:  # pylint: disable=too-few-public-methods
+    """Run commands in new containers of a local image, without network access."""
+
+    def __init__(self, image: str, runner: Optional[LocalCmdRunner] = None):
+        self.image = image
+        self.runner = runner or LocalCmdRunner()
+
+    def run(self, cmd: str, ignore_status: bool = False, verbose: bool = True):
+        return self.runner.run(f"docker run --rm --network none --entrypoint /bin/bash {shlex.quote(self.image)} "
+                               f"-c {shlex.quote(cmd)}", ignore_status=ignore_status, verbose=verbose)
@@ -0,0 +1,162 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+"""Tables of a cluster, discovered once per schema version.
+
+Tables and views are read from `system_schema.tables' and `system_schema.views' (one row per table), and each table
+is probed for emptiness once, concurrently.  The inventory is dropped when the schema version reported by the node
+changes; found non-empty tables stay non-empty for `non_empty_ttl' seconds, until the schema changes or until
+`invalidate()' is called (e.g. after TRUNCATE or DELETE), empty ones are probed again on every call.
+"""
+
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set
+
+from cassandra.query import SimpleStatement  # pylint: disable=no-name-in-module
+
+from sdcm.utils.cdc.options import CDC_LOGTABLE_SUFFIX
+
+LOGGER = logging.getLogger(__name__)
+
+SYSTEM_KEYSPACE_PREFIXES = ("system", "alternator_usertable")
+
+# Scylla issue https://github.com/scylladb/scylla/issues/7186
+# Problem to read from system_schema.dropped_columns, column "dropped_time":
+# cassandra.DriverException: Failed decoding result column "dropped_time" of type timestamp: date value out of range
+UNREADABLE_TABLES = ("system_schema.dropped_columns", )
+
+
+@dataclass(frozen=True)
+class TableInfo:
+    keyspace: str
+    name: str
+    is_view: bool = False
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.keyspace}.{self.name}"
+
+    @property
+    def cql_name(self) -> str:
+        return f'"{self.keyspace}"."{self.name}"'
+
+
+class SchemaInventory:
+    probe_concurrency = 32
+    fetch_size = 1000
+    non_empty_ttl = 600  # seconds
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._schema_version = None
+        self._tables: Optional[List[TableInfo]] = None
+        self._counter_tables: Optional[Set[str]] = None
+        self._non_empty_tables: Dict[str, float] = {}  # full name -> time when found non-empty
+
+    def invalidate(self, schema: bool = True, tables: Optional[Iterable[str]] = None) -> None:
+        """Forget found non-empty tables (only the given ones if `tables' is set) and, if `schema' is set, the tables
+        themselves.
+        """
+        with self._lock:
+            if schema:
+                self._schema_version = None
+                self._tables = None
+                self._counter_tables = None
+            if tables is None:
+                self._non_empty_tables.clear()
+            else:
+                for full_name in tables:
+                    self._non_empty_tables.pop(full_name, None)
+
+    def _query(self, session, cmd: str):
+        return session.execute(SimpleStatement(cmd, fetch_size=self.fetch_size))
+
+    def _check_schema_version(self, session) -> None:
+        row = session.execute("SELECT schema_version FROM system.local").one()
+        schema_version = row.schema_version if row else None
+        if schema_version is None or schema_version != self._schema_version:
+            if self._schema_version is not None:
+                LOGGER.debug("Schema version changed: %s -> %s", self._schema_version, schema_version)
+            self.invalidate()
+            self._schema_version = schema_version
+
+    def _get_tables(self, session) -> List[TableInfo]:
+        if self._tables is None:
+            tables = [TableInfo(keyspace=row.keyspace_name, name=row.table_name)
+                      for row in self._query(session, "SELECT keyspace_name, table_name FROM system_schema.tables")]
+            tables += [TableInfo(keyspace=row.keyspace_name, name=row.view_name, is_view=True)
+                       for row in self._query(session, "SELECT keyspace_name, view_name FROM system_schema.views")]
+            self._tables = tables
+        return self._tables
+
+    def _get_counter_tables(self, session) -> Set[str]:
+        if self._counter_tables is None:
+            self._counter_tables = {
+                f"{row.keyspace_name}.{row.table_name}"
+                for row in self._query(session, "SELECT keyspace_name, table_name, type FROM system_schema.columns")
+                if "counter" in row.type
+            }
+        return self._counter_tables
+
+    def tables(self, session) -> List[TableInfo]:
+        """Return all tables and materialized views."""
+        with self._lock:
+            self._check_schema_version(session)
+            return self._get_tables(session)
+
+    def counter_tables(self, session) -> Set[str]:
+        """Return full names of the tables which have counter columns."""
+        with self._lock:
+            self._check_schema_version(session)
+            return self._get_counter_tables(session)
+
+    def non_empty_tables(self, session, tables: Iterable[TableInfo]) -> Set[str]:
+        """Return full names of the tables which have at least one row, probing only the not known ones."""
+        with self._lock:
+            expired_at = time.monotonic() - self.non_empty_ttl
+            self._non_empty_tables = {full_name: found_at for full_name, found_at in self._non_empty_tables.items()
+                                      if found_at > expired_at}
+            to_probe = [table for table in tables
+                        if table.full_name not in self._non_empty_tables and table.full_name not in UNREADABLE_TABLES]
+            for idx in range(0, len(to_probe), self.probe_concurrency):
+                chunk = to_probe[idx:idx + self.probe_concurrency]
+                futures = [session.execute_async(f"SELECT * FROM {table.cql_name} LIMIT 1") for table in chunk]
+                for table, future in zip(chunk, futures):
+                    try:
+                        if future.result().current_rows:
+                            self._non_empty_tables[table.full_name] = time.monotonic()
+                    except Exception as exc:  # pylint: disable=broad-except
+                        LOGGER.warning("Failed to get rows from %s table. Error: %s", table.full_name, exc)
+            return set(self._non_empty_tables)
+
+    # pylint: disable=too-many-arguments
+    def get_ks_cf_list(self, session, filter_out_table_with_counter=False, filter_out_mv=False,
+                       filter_empty_tables=True, filter_out_system=False, filter_out_cdc_log_tables=False) -> List[str]:
+        with self._lock:
+            tables = self.tables(session)
+            if filter_out_mv:
+                tables = [table for table in tables if not table.is_view]
+            if filter_out_system:
+                tables = [table for table in tables if not table.keyspace.startswith(SYSTEM_KEYSPACE_PREFIXES)]
+            if filter_out_cdc_log_tables:
+                tables = [table for table in tables if not table.name.endswith(CDC_LOGTABLE_SUFFIX)]
+            if filter_out_table_with_counter:
+                counter_tables = self._get_counter_tables(session)
+                tables = [table for table in tables if table.full_name not in counter_tables]
+            if filter_empty_tables:
+                non_empty_tables = self.non_empty_tables(session, tables)
+                tables = [table for table in tables if table.full_name in non_empty_tables]
+            return sorted(table.full_name for table in tables)
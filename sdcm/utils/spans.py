@@ -0,0 +1,147 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+"""Timeline of the phases of nemeses and of long cluster operations.
+
+Wrap a phase with `span()' (or a function with `@traced()'), e.g.:
+
+    with span("bootstrap", node=new_node.name):
+        self.cluster.wait_for_init(node_list=[new_node])
+
+Every finished span is appended as one JSON line to the spans file (if set), so nothing is lost if the test is
+killed, and the file can be exported as a Chrome trace, which can be opened with chrome://tracing or
+https://ui.perfetto.dev.  Spans of one thread nest by time, so phases of a disruption are shown under it.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from functools import wraps
+from typing import Dict, Iterator, List, Optional
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class Span:  # pylint: disable=too-many-instance-attributes
+    name: str
+    category: str
+    start: float  # epoch time, in seconds
+    duration: float = 0.0
+    thread_id: int = 0
+    thread_name: str = ""
+    status: str = "ok"
+    args: Dict[str, str] = field(default_factory=dict)
+
+    def to_trace_event(self, pid: int = 1) -> dict:
+        return {
+            "name": self.name,
+            "cat": self.category,
+            "ph": "X",
+            "ts": int(self.start * 1_000_000),
+            "dur": int(self.duration * 1_000_000),
+            "pid": pid,
+            "tid": self.thread_id,
+            "args": dict(self.args, status=self.status),
+        }
+
+
+class SpanRecorder:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def set_path(self, path: Optional[str]) -> None:
+        with self._lock:
+            self.path = path
+
+    def record(self, span_: Span) -> None:
+        if not self.path:
+            return
+        line = json.dumps(asdict(span_), default=str)
+        with self._lock:
+            try:
+                with open(self.path, "a", encoding="utf-8") as spans_file:
+                    spans_file.write(line + "\n")
+            except OSError as exc:
+                LOGGER.warning("Failed to write span %s to %s: %s", span_.name, self.path, exc)
+
+    @contextmanager
+    def span(self, name: str, category: str = "sct", **args) -> Iterator[Span]:
+        thread = threading.current_thread()
+        span_ = Span(name=name, category=category, start=time.time(), thread_id=thread.ident or 0,
+                     thread_name=thread.name, args={key: str(value) for key, value in args.items()})
+        start_time = time.perf_counter()
+        try:
+            yield span_
+        except BaseException as exc:
+            span_.status = f"failed: {type(exc).__name__}"
+            raise
+        finally:
+            span_.duration = time.perf_counter() - start_time
+            self.record(span_)
+
+    def load(self) -> List[Span]:
+        if not self.path or not os.path.exists(self.path):
+            return []
+        spans = []
+        with open(self.path, encoding="utf-8") as spans_file:
+            for line in spans_file:
+                try:
+                    spans.append(Span(**json.loads(line)))
+                except (ValueError, TypeError):
+                    LOGGER.debug("Skip broken span line: %r", line)
+        return spans
+
+    def export_chrome_trace(self, trace_path: str) -> int:
+        """Write all recorded spans as a Chrome trace JSON file and return the number of the spans."""
+        spans = self.load()
+        thread_names = {span_.thread_id: span_.thread_name for span_ in spans}
+        events = [{"name": "thread_name", "ph": "M", "pid": 1, "tid": thread_id, "args": {"name": thread_name}}
+                  for thread_id, thread_name in thread_names.items()]
+        events += [span_.to_trace_event() for span_ in sorted(spans, key=lambda span_: span_.start)]
+        with open(trace_path, "w", encoding="utf-8") as trace_file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, trace_file)
+        return len(spans)
+
+
+_SPAN_RECORDER = SpanRecorder()
+
+
+def get_span_recorder() -> SpanRecorder:
+    return _SPAN_RECORDER
+
+
+def span(name: str, category: str = "sct", **args):
+    """Record the time spent in a `with' block as a span of the current thread."""
+    return _SPAN_RECORDER.span(name, category=category, **args)
+
+
+def traced(name: Optional[str] = None, category: str = "sct"):
+    """Decorator which records every call as a span; the `name' attribute of the instance (if any) is added to it."""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            span_args = {}
+            if args and isinstance(getattr(args[0], "name", None), str):
+                span_args["target"] = args[0].name
+            with span(span_name, category=category, **span_args):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,193 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+"""Watch spot interruption notices and rebalance recommendations of AWS instances.
+
+A small shell agent runs on the node over one long-lived SSH channel.  It polls the local instance metadata
+endpoint a few times per second and prints a line only when a notice appears or changes, so the runner learns about
+the notice as soon as the line is received, without an SSH round-trip per check.
+"""
+
+import json
+import time
+import shlex
+import logging
+import calendar
+from textwrap import dedent
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from invoke.watchers import StreamWatcher
+
+LOGGER = logging.getLogger(__name__)
+
+AWS_METADATA_URL = "http://169.254.169.254"
+NOTICE_PREFIX = "SCT-SPOT-NOTICE"
+
+INSTANCE_ACTION = "instance-action"
+REBALANCE_RECOMMENDATION = "rebalance-recommendation"
+METADATA_PATHS = {
+    INSTANCE_ACTION: "spot/instance-action",
+    REBALANCE_RECOMMENDATION: "events/recommendations/rebalance",
+}
+# `detail-type' of the same notices delivered by EventBridge.
+EVENTBRIDGE_DETAIL_TYPES = {
+    INSTANCE_ACTION: "EC2 Spot Instance Interruption Warning",
+    REBALANCE_RECOMMENDATION: "EC2 Instance Rebalance Recommendation",
+}
+METADATA_TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+@dataclass
+class SpotNotice:
+    kind: str
+    detail: dict
+    received_at: float = field(default_factory=time.time)
+
+    @property
+    def notice_time(self) -> Optional[float]:
+        """Time of the instance action (or of the recommendation) as a UNIX timestamp."""
+        value = self.detail.get("time") or self.detail.get("noticeTime")
+        if not value:
+            return None
+        return calendar.timegm(time.strptime(value, METADATA_TIME_FORMAT))
+
+    @property
+    def time_left(self) -> Optional[float]:
+        if self.kind != INSTANCE_ACTION or (notice_time := self.notice_time) is None:
+            return None
+        return notice_time - self.received_at
+
+    def to_eventbridge(self, instance_id: str, region_name: str) -> dict:
+        detail = {"instance-id": instance_id}
+        if self.kind == INSTANCE_ACTION:
+            detail["instance-action"] = self.detail.get("action")
+        return {
+            "version": "0",
+            "detail-type": EVENTBRIDGE_DETAIL_TYPES[self.kind],
+            "source": "aws.ec2",
+            "time": time.strftime(METADATA_TIME_FORMAT, time.gmtime(self.notice_time or self.received_at)),
+            "region": region_name,
+            "resources": [instance_id],
+            "detail": detail,
+        }
+
+    @classmethod
+    def from_eventbridge(cls, event: dict) -> Optional["SpotNotice"]:
+        """Build a notice from an EventBridge event, return None for events of other types."""
+        for kind, detail_type in EVENTBRIDGE_DETAIL_TYPES.items():
+            if event.get("detail-type") == detail_type:
+                detail = {"noticeTime": event["time"]}
+                if kind == INSTANCE_ACTION:
+                    detail = {"action": event["detail"].get("instance-action"), "time": event["time"]}
+                return cls(kind=kind, detail=detail)
+        return None
+
+
+def parse_notice_line(line: str) -> Optional[SpotNotice]:
+    if not line.startswith(NOTICE_PREFIX + " "):
+        return None
+    _, kind, body = (line.rstrip("\n").split(" ", 2) + [""])[:3]
+    if kind not in METADATA_PATHS:
+        return None
+    try:
+        detail = json.loads(body)
+    except ValueError:
+        detail = {"raw": body}
+    return SpotNotice(kind=kind, detail=detail if isinstance(detail, dict) else {"raw": body})
+
+
+def spot_watcher_script(metadata_url: str = AWS_METADATA_URL, interval: float = 0.5, duration: int = 60) -> str:
+    """Shell agent which prints a line for every new or changed notice during `duration' seconds.
+
+    IMDSv2 token is refreshed every 5 minutes; when it can't be got the agent falls back to IMDSv1 requests.
+    """
+    script = dedent(f"""\
+        url={shlex.quote(metadata_url)}
+        token=""
+        token_time=-300
+        check() {{
+            local body last_var="last_${{1//-/_}}"
+            body=$(curl -sf -m 1 -H "X-aws-ec2-metadata-token: $token" "$url/latest/meta-data/$2") || return 0
+            body=$(printf '%s' "$body" | tr -d '\\n')
+            if [ "$body" != "${{!last_var}}" ]; then
+                printf -v "$last_var" '%s' "$body"
+                echo "{NOTICE_PREFIX} $1 $body"
+            fi
+        }}
+        echo "SCT-SPOT-WATCHER started"
+        while [ $SECONDS -lt {duration} ]; do
+            if [ $((SECONDS - token_time)) -ge 300 ]; then
+                token=$(curl -sf -m 1 -X PUT -H "X-aws-ec2-metadata-token-ttl-seconds: 600" "$url/latest/api/token")
+                token_time=$SECONDS
+            fi
+            CHECKS
+            sleep {interval}
+        done
+    """)
+    checks = "".join(f"    check {kind} {path}\n" for kind, path in METADATA_PATHS.items())
+    return script.replace("    CHECKS\n", checks)
+
+
+class SpotNoticeWatcher(StreamWatcher):  # pylint: disable=too-few-public-methods
+    """Call `callback' for each notice line of the agent output, as soon as the line is received."""
+
+    def __init__(self, callback: Callable[[SpotNotice], None]):
+        super().__init__()
+        self.len = 0
+        self.callback = callback
+
+    def submit(self, stream: str) -> list:
+        stream_buffer = stream[self.len:]
+        while "\n" in stream_buffer:
+            line, stream_buffer = stream_buffer.split("\n", 1)
+            self.submit_line(line)
+        self.len = len(stream) - len(stream_buffer)
+        return []
+
+    def submit_line(self, line: str):
+        if notice := parse_notice_line(line):
+            try:
+                self.callback(notice)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception("Failed to handle %s", notice)
+
+
+class SpotInterruptionWatcher:
+    """Run the agent on a node and forward its notices to `callback'.
+
+    Each `watch()' call keeps one SSH channel open for `session_duration' seconds; the caller runs it in a loop,
+    which gives a chance to stop and to reconnect after reboots.  A notice is passed to `callback' only once, even
+    if it's seen by several agent sessions.
+    """
+
+    session_duration = 60
+    interval = 0.5
+
+    def __init__(self, callback: Callable[[SpotNotice], None], metadata_url: str = AWS_METADATA_URL):
+        self.callback = callback
+        self.metadata_url = metadata_url
+        self._reported = {}
+
+    def _on_notice(self, notice: SpotNotice) -> None:
+        # Each new agent session reports active notices again, pass only the new ones.
+        if self._reported.get(notice.kind) == notice.detail:
+            return
+        self._reported[notice.kind] = notice.detail
+        self.callback(notice)
+
+    def watch(self, remoter) -> None:
+        script = spot_watcher_script(metadata_url=self.metadata_url, interval=self.interval,
+                                     duration=self.session_duration)
+        remoter.run(f"bash -c {shlex.quote(script)}", timeout=self.session_duration + 30, ignore_status=True,
+                    verbose=False, watchers=[SpotNoticeWatcher(callback=self._on_notice)])
@@ -0,0 +1,127 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+"""SSTables of a node, listed with one remote command.
+
+The data directories of all requested tables are listed by a single `find', file names are parsed locally into
+sstables (generation and components) and selected files are removed or corrupted by a single command too.
+"""
+
+import os
+import re
+import random
+import logging
+import shlex
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+SCYLLA_DATA_DIR = "/var/lib/scylla/data"
+
+# File names like: mc-220-big-Data.db (MC format) or system-truncated-ka-7-Data.db (old format)
+SSTABLE_FILE_RE = re.compile(r"^(?P<prefix>(?:.*-)?(?P<version>[a-z]{2})-(?P<generation>\d+))-(?P<component>.+)$")
+
+
+@dataclass(frozen=True)
+class SSTable:
+    ks_cf: str
+    table_dir: str
+    prefix: str  # the common part of the names of all components, e.g. "mc-220"
+    version: str
+    generation: int
+    components: Tuple[str, ...] = ()
+
+    @property
+    def files(self) -> List[str]:
+        return [os.path.join(self.table_dir, f"{self.prefix}-{component}") for component in self.components]
+
+    @property
+    def data_files(self) -> List[str]:
+        return [os.path.join(self.table_dir, f"{self.prefix}-{component}")
+                for component in self.components if component.endswith("Data.db")]
+
+    @property
+    def pattern(self) -> str:
+        return os.path.join(self.table_dir, f"{self.prefix}-*")
+
+
+def parse_sstable_files(ks_cf: str, paths: Iterable[str]) -> List[SSTable]:
+    """Group the file paths of `ks_cf' table into sstables, sorted by generation."""
+    components = defaultdict(list)
+    versions = {}
+    for path in paths:
+        table_dir, file_name = os.path.split(path.strip())
+        if not (match := SSTABLE_FILE_RE.match(file_name)):
+            LOGGER.debug("File name %r is not as expected for Scylla data files of %s table", file_name, ks_cf)
+            continue
+        key = (table_dir, match.group("prefix"))
+        components[key].append(match.group("component"))
+        versions[key] = (match.group("version"), int(match.group("generation")))
+    sstables = [SSTable(ks_cf=ks_cf, table_dir=table_dir, prefix=prefix, version=versions[(table_dir, prefix)][0],
+                        generation=versions[(table_dir, prefix)][1], components=tuple(sorted(table_components)))
+                for (table_dir, prefix), table_components in components.items()]
+    return sorted(sstables, key=lambda sstable: (sstable.table_dir, sstable.generation))
+
+
+class SstableInventory:
+    """Listing of the sstables of some tables on a node, done once by `load()'."""
+
+    def __init__(self, node, data_dir: str = SCYLLA_DATA_DIR):
+        self.node = node
+        self.data_dir = data_dir
+        self.sstables: Dict[str, List[SSTable]] = {}
+
+    def table_dir_pattern(self, ks_cf: str) -> str:
+        keyspace, table = ks_cf.split(".", 1)
+        return os.path.join(self.data_dir, keyspace, f"{table}-*")
+
+    def load(self, ks_cfs: Iterable[str]) -> Dict[str, List[SSTable]]:
+        """List the data directories of all `ks_cfs' tables ('keyspace.table' names) with one remote command."""
+        ks_cfs = list(ks_cfs)
+        dirs = {ks_cf: self.table_dir_pattern(ks_cf) for ks_cf in ks_cfs}
+        result = self.node.remoter.sudo(
+            f"find {' '.join(dirs.values())} -maxdepth 1 -type f", ignore_status=True, verbose=False)
+        if result.stderr:
+            LOGGER.debug("Errors while listing data files on %s: %s", self.node, result.stderr)
+        paths = defaultdict(list)
+        for path in result.stdout.split():
+            for ks_cf, table_dir in dirs.items():
+                if os.path.dirname(path).startswith(table_dir[:-1]):
+                    paths[ks_cf].append(path)
+                    break
+        self.sstables = {ks_cf: parse_sstable_files(ks_cf, paths[ks_cf]) for ks_cf in ks_cfs}
+        return self.sstables
+
+    @property
+    def all_sstables(self) -> List[SSTable]:
+        return [sstable for sstables in self.sstables.values() for sstable in sstables]
+
+    def choose(self, count: int = 1, with_data_file: bool = False) -> List[SSTable]:
+        """Randomly choose up to `count' different sstables of the loaded tables."""
+        sstables = [sstable for sstable in self.all_sstables if not with_data_file or sstable.data_files]
+        return random.sample(sstables, min(count, len(sstables)))
+
+    def remove(self, sstables: Iterable[SSTable]):
+        return self.remove_files(path for sstable in sstables for path in sstable.files)
+
+    def remove_files(self, paths: Iterable[str]):
+        """Remove all `paths' with one remote command."""
+        return self.node.remoter.sudo(f"rm -f {' '.join(shlex.quote(path) for path in paths)}")
+
+    def corrupt(self, sstables: Iterable[SSTable], count: int = 1024):
+        """Overwrite the Data files of `sstables' with random data, with one remote command."""
+        paths = " ".join(shlex.quote(path) for sstable in sstables for path in sstable.data_files)
+        script = f"for data_file in {paths}; do dd if=/dev/urandom of=$data_file count={count}; done"
+        return self.node.remoter.sudo(f"bash -c {shlex.quote(script)}")
@@ -0,0 +1,158 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import time
+import logging
+import threading
+from typing import BinaryIO, Iterable, Iterator, List, Optional
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, Future
+
+LOGGER = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+def read_chunks(stream: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    """Read a binary stream (e.g., stdout of a subprocess) by chunks of `chunk_size' bytes (last one can be shorter.)
+    """
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+@dataclass
+class StreamUploadStats:
+    key: str
+    parts: int = 0
+    size: int = 0
+    retries: int = 0
+    duration: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Upload throughput in MB/s."""
+        return self.size / MB / self.duration if self.duration else 0.0
+
+    def __str__(self):
+        return f"{self.key}: {self.size / MB:.1f}MB in {self.parts} parts, {self.duration:.1f}s " \
+               f"({self.throughput:.1f}MB/s), {self.retries} part retries"
+
+
+class S3StreamUploader:  # pylint: disable=too-many-instance-attributes
+    """Upload a stream of unknown length to S3 using multipart upload.
+
+    Parts are uploaded by a pool of threads while next parts are still being produced, and only a bounded number of
+    parts is kept in memory.  If upload of a part fails, only this part is uploaded again.  If a part can't be
+    uploaded after `part_retries' attempts, or the source of chunks raises an error, the multipart upload is aborted,
+    so no partial object left in the bucket.
+    """
+
+    part_size = 64 * MB  # S3 requires at least 5MB for all parts except the last one
+    part_retries = 5
+    retry_sleep = 5
+    progress_interval = 30
+
+    def __init__(self, s3_client, bucket: str, key: str,  # pylint: disable=too-many-arguments
+                 workers: int = 4, part_size: Optional[int] = None):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.workers = workers
+        if part_size is not None:
+            self.part_size = part_size
+        self.stats = StreamUploadStats(key=key)
+        self._stats_lock = threading.Lock()
+        self._in_flight = threading.BoundedSemaphore(workers * 2)
+
+    @property
+    def url(self) -> str:
+        return f"https://{self.bucket}.s3.amazonaws.com/{self.key}"
+
+    def upload_stream(self, stream: BinaryIO) -> StreamUploadStats:
+        return self.upload(read_chunks(stream, self.part_size))
+
+    def upload(self, chunks: Iterable[bytes]) -> StreamUploadStats:
+        upload_id = self.s3_client.create_multipart_upload(Bucket=self.bucket, Key=self.key)["UploadId"]
+        LOGGER.info("Start streaming upload to s3://%s/%s", self.bucket, self.key)
+        start_time = last_report = time.perf_counter()
+        futures: List[Future] = []
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="S3StreamUploader") as executor:
+                for part_number, chunk in enumerate(self._buffered(chunks), start=1):
+                    self._in_flight.acquire()  # pylint: disable=consider-using-with
+                    futures.append(executor.submit(self._upload_part, upload_id, part_number, chunk))
+                    if any(future.done() and future.exception() for future in futures):
+                        break
+                    if time.perf_counter() - last_report > self.progress_interval:
+                        last_report = time.perf_counter()
+                        self._report_progress(start_time)
+                parts = [future.result() for future in futures]
+            self.s3_client.complete_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=upload_id,
+                                                     MultipartUpload={"Parts": parts})
+        except BaseException:
+            LOGGER.error("Streaming upload to s3://%s/%s failed, abort it", self.bucket, self.key)
+            for future in futures:
+                future.cancel()
+            self.s3_client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=upload_id)
+            raise
+        self.stats.duration = time.perf_counter() - start_time
+        LOGGER.info("Uploaded %s", self.stats)
+        return self.stats
+
+    def _buffered(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Join chunks to parts of `part_size' bytes, since all parts except the last one should be large enough.
+
+        Always yield at least one part, because S3 can't complete a multipart upload without parts.
+        """
+        buffer = bytearray()
+        yielded = False
+        for chunk in chunks:
+            buffer += chunk
+            while len(buffer) >= self.part_size:
+                yield bytes(buffer[:self.part_size])
+                del buffer[:self.part_size]
+                yielded = True
+        if buffer or not yielded:
+            yield bytes(buffer)
+
+    def _upload_part(self, upload_id: str, part_number: int, data: bytes) -> dict:
+        try:
+            for attempt in range(1, self.part_retries + 1):
+                try:
+                    response = self.s3_client.upload_part(Bucket=self.bucket, Key=self.key, UploadId=upload_id,
+                                                          PartNumber=part_number, Body=data)
+                    break
+                except Exception as exc:  # pylint: disable=broad-except
+                    if attempt == self.part_retries:
+                        raise
+                    LOGGER.warning("Failed to upload part #%s of %s (attempt %s/%s): %s",
+                                   part_number, self.key, attempt, self.part_retries, exc)
+                    with self._stats_lock:
+                        self.stats.retries += 1
+                    time.sleep(self.retry_sleep * attempt)
+            with self._stats_lock:
+                self.stats.parts += 1
+                self.stats.size += len(data)
+            return {"PartNumber": part_number, "ETag": response["ETag"]}
+        finally:
+            self._in_flight.release()
+
+    def _report_progress(self, start_time: float) -> None:
+        with self._stats_lock:
+            size, parts = self.stats.size, self.stats.parts
+        duration = time.perf_counter() - start_time
+        LOGGER.info("Streaming upload of %s: %.1fMB in %s parts uploaded, %.1fMB/s",
+                    self.key, size / MB, parts, size / MB / duration if duration else 0.0)
@@ -0,0 +1,130 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+"""Rolling network bandwidth of the DB nodes, for the network-shaping nemeses.
+
+A background thread runs one Prometheus query for all nodes every `poll_interval' seconds and keeps the received
+bytes rate of each node for the last `window' seconds, so a rate limit can be computed without querying Prometheus
+when a disruption starts.  The thread also prepares new nodes once (e.g. installs traffic control tools.)
+"""
+
+import time
+import logging
+import threading
+from collections import defaultdict, deque
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+
+def instance_host(instance: str) -> str:
+    """Return the host part of a Prometheus `instance' label, e.g. '10.0.0.1:9100' -> '10.0.0.1'."""
+    if instance.startswith("["):  # IPv6 address with a port
+        return instance[1:].split("]", 1)[0]
+    if instance.count(":") == 1:
+        return instance.split(":", 1)[0]
+    return instance
+
+
+class TrafficBaseline:  # pylint: disable=too-many-instance-attributes
+    poll_interval = 60
+    window = 600
+    query = 'rate(node_network_receive_bytes_total{device="eth0"}[1m])'
+
+    def __init__(self, prometheus, nodes: Callable[[], list], prepare_node: Optional[Callable] = None,
+                 clock: Callable[[], float] = time.time):
+        self.prometheus = prometheus  # PrometheusDBStats
+        self.nodes = nodes
+        self.prepare_node = prepare_node
+        self.clock = clock
+        self._samples: Dict[str, Deque[Tuple[float, float]]] = defaultdict(deque)
+        self._prepared_nodes = set()
+        self._last_refresh = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="TrafficBaselineThread", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as exc:  # pylint: disable=broad-except
+                LOGGER.warning("Failed to get network bandwidth of the nodes: %s", exc)
+            self.prepare_nodes()
+            self._stop_event.wait(self.poll_interval)
+
+    def refresh(self) -> None:
+        """Get the samples since the previous refresh of all nodes with one query.
+
+        The whole window is queried if there is a node without samples (e.g. a new one, or the previous query missed
+        it), samples which are already known for other nodes are skipped.
+        """
+        now = self.clock()
+        start = now - self.window
+        node_ips = {node.ip_address for node in self.nodes()}
+        with self._lock:
+            for host in list(self._samples):
+                if host in node_ips:
+                    self._trim(self._samples[host], start)
+                else:  # the node is gone
+                    del self._samples[host]
+            has_samples = all(self._samples.get(node_ip) for node_ip in node_ips)
+        if has_samples and self._last_refresh is not None:
+            start = max(self._last_refresh, start)
+        results = self.prometheus.query(query=self.query, start=start, end=now, scrap_metrics_step=self.poll_interval)
+        with self._lock:
+            for series in results:
+                if (host := instance_host(series["metric"].get("instance", ""))) not in node_ips:
+                    continue
+                samples = self._samples[host]
+                for timestamp, value in series["values"]:
+                    if not samples or float(timestamp) > samples[-1][0]:
+                        samples.append((float(timestamp), float(value)))
+            self._last_refresh = now
+
+    @staticmethod
+    def _trim(samples: Deque[Tuple[float, float]], start: float) -> None:
+        while samples and samples[0][0] < start:
+            samples.popleft()
+
+    def prepare_nodes(self) -> None:
+        if self.prepare_node is None:
+            return
+        for node in self.nodes():
+            if node in self._prepared_nodes or self._stop_event.is_set():
+                continue
+            try:
+                self.prepare_node(node)
+                self._prepared_nodes.add(node)
+            except Exception as exc:  # pylint: disable=broad-except
+                LOGGER.warning("Failed to prepare %s for network disruptions: %s", node, exc)
+
+    def bandwidth(self, node) -> Optional[float]:
+        """Return the max received bytes rate of the node over the window, None if there are no samples."""
+        with self._lock:
+            samples = self._samples.get(node.ip_address)
+            if not samples:
+                return None
+            self._trim(samples, self.clock() - self.window)
+            return max((value for _, value in samples), default=None)
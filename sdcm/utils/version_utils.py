@@ -12,26 +12,26 @@
 # Copyright (c) 2020 ScyllaDB
 
 import re
+import gzip
 import logging
 from enum import Enum, auto
 from string import Template
 from typing import List, Optional
 from collections import namedtuple
 from urllib.parse import urlparse
-from functools import lru_cache
+from xml.etree import ElementTree
 
 import boto3
-import requests
 import dateutil.parser
 from mypy_boto3_s3 import S3Client
 from botocore import UNSIGNED
 from botocore.client import Config
 from pkg_resources import parse_version
-from repodataParser.RepoParser import Parser
 
 from sdcm.utils.common import ParallelObject, DEFAULT_AWS_REGION
 from sdcm.sct_events.system import ScyllaRepoEvent
 from sdcm.utils.decorators import retrying
+from sdcm.utils.http_cache import get_http_cache
 
 
 # Examples of ScyllaDB version strings:
@@ -46,6 +46,7 @@ REPO_VERSIONS_REGEX = re.compile(r'Version: (.*?)\n', re.DOTALL)
 SCYLLA_VERSION_RE = re.compile(r"\d+(\.\d+)?\.[\d\w]+([.~][\d\w]+)?")
 SSTABLE_FORMAT_VERSION_REGEX = re.compile(r'Feature (.*)_SSTABLE_FORMAT is enabled')
 PRIMARY_XML_GZ_REGEX = re.compile(r'="(.*?primary.xml.gz)"')
+PRIMARY_XML_VERSION_TAG = "{http://linux.duke.edu/metadata/common}version"
 
 # Example of output for `systemctl --version' command:
 #   $ systemctl --version
@@ -90,13 +91,9 @@ FILE_REGEX_DICT = {
 RepositoryDetails = namedtuple("RepositoryDetails", ["type", "urls"])
 
 
-@lru_cache(maxsize=1024)
 @retrying(n=10, sleep_time=0.1)
 def get_url_content(url, return_url_data=True):
-    response = requests.get(url=url)
-    if response.status_code != 200:
-        raise ValueError(f"The following repository URL '{url}' is incorrect")
-    response_data = response.text
+    response_data = get_http_cache().get(url).decode(errors="replace")
     if not response_data:
         raise ValueError(f"The repository URL '{url}' not contains any content")
     if return_url_data:
@@ -134,6 +131,7 @@ def get_scylla_urls_from_repository(repo_details):
                 urls.add(Template(full_url).substitute(basearch=basearch, releasever='7'))
             # We found the correct regex and we can continue to next URL
 
+    # Check that all URLs are valid, the content is cached for later parsing.
     ParallelObject(objects=urls, timeout=SCYLLA_URL_RESPONSE_TIMEOUT).run(func=lambda _url: get_url_content(
         url=_url, return_url_data=False))
     return urls
@@ -159,8 +157,9 @@ def get_branch_version_from_centos_repository(urls):
         primary_path = PRIMARY_XML_GZ_REGEX.search(data).groups()[0]
         xml_url = url.replace(REPOMD_XML_PATH, primary_path)
 
-        parser = Parser(url=xml_url)
-        major_versions = [package['version'][1]['ver'] for package in parser.getList()]
+        primary_xml = gzip.decompress(get_http_cache().get(xml_url))
+        major_versions = [element.get('ver') for element in ElementTree.fromstring(primary_xml).iter(
+            PRIMARY_XML_VERSION_TAG)]
         return max(set(major_versions), key=major_versions.count)
 
     threads = ParallelObject(objects=urls, timeout=SCYLLA_URL_RESPONSE_TIMEOUT).run(func=get_version)
@@ -15,7 +15,11 @@
 Wait functions appropriate for tests that have high timing variance.
 """
 import time
+import random
 import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Tuple, Type
 
 import tenacity
 from tenacity.retry import retry_if_result, retry_if_exception_type
@@ -40,28 +44,32 @@ def wait_for(func, step=1, text=None, timeout=None, throw_exc=True, **kwargs):
         return forever_wait_for(func, step, text, **kwargs)
 
     res = None
+    name = text or getattr(func, "__name__", str(func))
+    start_time = time.monotonic()
+    succeeded = False
 
     def retry_logger(retry_state):
         # pylint: disable=protected-access
         LOGGER.debug(
             'wait_for: Retrying %s: attempt %s ended with: %s',
-            text if text else retry_state.fn.__name__,
+            name,
             retry_state.attempt_number,
             str(retry_state.outcome._exception) if retry_state.outcome._exception else retry_state.outcome._result
         )
 
+    retry = tenacity.Retrying(
+        reraise=throw_exc,
+        stop=tenacity.stop_after_delay(timeout),
+        wait=tenacity.wait_fixed(step),
+        before_sleep=retry_logger,
+        retry=(retry_if_result(lambda value: not value) | retry_if_exception_type())
+    )
     try:
-        retry = tenacity.Retrying(
-            reraise=throw_exc,
-            stop=tenacity.stop_after_delay(timeout),
-            wait=tenacity.wait_fixed(step),
-            before_sleep=retry_logger,
-            retry=(retry_if_result(lambda value: not value) | retry_if_exception_type())
-        )
         res = retry.call(func, **kwargs)
+        succeeded = True
 
     except Exception as ex:  # pylint: disable=broad-except
-        err = 'Wait for: {}: timeout - {} seconds - expired'.format(text if text else func.__name__, timeout)
+        err = 'Wait for: {}: timeout - {} seconds - expired'.format(name, timeout)
         LOGGER.error(err)
         if hasattr(ex, 'last_attempt') and ex.last_attempt.exception() is not None:  # pylint: disable=no-member
             LOGGER.error("last error: %s", repr(ex.last_attempt.exception()))  # pylint: disable=no-member
@@ -72,6 +80,10 @@ def wait_for(func, step=1, text=None, timeout=None, throw_exc=True, **kwargs):
                 raise RetryError(err) from ex
             raise
 
+    finally:
+        WAIT_STATS.add(WaitRecord(name=name, duration=time.monotonic() - start_time,
+                                  polls=retry.statistics.get("attempt_number", 0), succeeded=succeeded))
+
     return res
 
 
@@ -97,3 +109,126 @@ def forever_wait_for(func, step=1, text=None, **kwargs):
         if text is not None:
             LOGGER.debug('%s (%s s)', text, time_elapsed)
     return ok
+
+
+class WaitTimeoutError(TimeoutError):
+    pass
+
+
+class Clock:
+    """Source of time for waiters, replaced by a fake one in unit tests."""
+
+    @staticmethod
+    def monotonic() -> float:
+        return time.monotonic()
+
+    @staticmethod
+    def sleep(seconds: float) -> None:
+        time.sleep(seconds)
+
+
+@dataclass
+class WaitRecord:
+    name: str
+    duration: float
+    polls: int
+    succeeded: bool
+
+    def __str__(self):
+        return f"{self.name}: {self.duration:.1f}s, {self.polls} polls{'' if self.succeeded else ' (timeout)'}"
+
+
+class WaitStats:
+    """Durations and numbers of polls of all waits of the process."""
+
+    max_records = 10000
+
+    def __init__(self):
+        self._records: List[WaitRecord] = []
+        self._lock = threading.Lock()
+
+    def add(self, record: WaitRecord) -> None:
+        with self._lock:
+            self._records.append(record)
+            if len(self._records) > self.max_records:
+                self._records.sort(key=lambda rec: rec.duration, reverse=True)
+                del self._records[self.max_records // 2:]
+
+    @property
+    def records(self) -> List[WaitRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def slowest(self, count: int = 10) -> List[WaitRecord]:
+        return sorted(self.records, key=lambda rec: rec.duration, reverse=True)[:count]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+
+WAIT_STATS = WaitStats()
+
+
+class Waiter:  # pylint: disable=too-many-instance-attributes
+    """Poll a function until it returns a true value or the deadline passes.
+
+    The first check is done immediately.  Delays between checks grow exponentially from `initial_delay' by `factor'
+    up to `max_delay', each one is randomized by +/-`jitter' share, and the last one is cut to the deadline.  Exceptions
+    listed in `allowed_exceptions' are treated as a not ready result.  Every wait is recorded in `stats'.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, timeout: float, text: Optional[str] = None, initial_delay: float = 1, max_delay: float = 30,
+                 factor: float = 2, jitter: float = 0.1,
+                 allowed_exceptions: Tuple[Type[Exception], ...] = (Exception, ), clock: Clock = Clock,
+                 stats: WaitStats = WAIT_STATS):
+        self.timeout = timeout
+        self.text = text
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.jitter = jitter
+        self.allowed_exceptions = allowed_exceptions
+        self.clock = clock
+        self.stats = stats
+
+    def delays(self):
+        """Generate delays between checks (without the deadline cut.)"""
+        delay = self.initial_delay
+        while True:
+            yield min(delay * random.uniform(1 - self.jitter, 1 + self.jitter), self.max_delay)
+            delay = min(delay * self.factor, self.max_delay)
+
+    def wait(self, func: Callable, *args, **kwargs) -> Any:
+        name = self.text or getattr(func, "__name__", str(func))
+        start_time = self.clock.monotonic()
+        deadline = start_time + self.timeout
+        polls = 0
+        last_error = None
+        for delay in self.delays():
+            polls += 1
+            try:
+                result = func(*args, **kwargs)
+                if result:
+                    self.stats.add(WaitRecord(name=name, duration=self.clock.monotonic() - start_time, polls=polls,
+                                              succeeded=True))
+                    return result
+                last_error = None
+            except self.allowed_exceptions as exc:  # pylint: disable=catching-non-exception
+                last_error = exc
+            now = self.clock.monotonic()
+            if now >= deadline:
+                break
+            LOGGER.debug("%s: not ready after %s polls (%s), next check in %.1fs",
+                         name, polls, last_error or "false result", min(delay, deadline - now))
+            self.clock.sleep(min(delay, deadline - now))
+        duration = self.clock.monotonic() - start_time
+        self.stats.add(WaitRecord(name=name, duration=duration, polls=polls, succeeded=False))
+        raise WaitTimeoutError(f"Wait for: {name}: timeout - {self.timeout} seconds - expired after {polls} polls"
+                               + (f", last error: {last_error!r}" if last_error else "")) from last_error
+
+
+def wait_until(func: Callable, timeout: float, text: Optional[str] = None, **kwargs) -> Any:
+    """Shortcut for `Waiter(timeout, text, ...).wait(func)', `kwargs' are passed to the Waiter."""
+    return Waiter(timeout=timeout, text=text, **kwargs).wait(func)
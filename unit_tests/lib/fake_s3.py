@@ -0,0 +1,125 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import io
+import uuid
+import hashlib
+import threading
+
+from botocore.exceptions import ClientError
+from botocore.response import StreamingBody
+
+
+class FakeS3Client:
+    """In-memory S3 client with the calls used by SCT: objects, ranged GETs, listing and multipart uploads."""
+
+    def __init__(self):
+        self.buckets = {}
+        self.uploads = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _error(code, operation):
+        return ClientError({"Error": {"Code": code, "Message": code}}, operation)
+
+    def _bucket(self, name, operation):
+        if name not in self.buckets:
+            raise self._error("NoSuchBucket", operation)
+        return self.buckets[name]
+
+    def _object(self, bucket, key, operation):
+        if key not in (objects := self._bucket(bucket, operation)):
+            raise self._error("NoSuchKey", operation)
+        return objects[key]
+
+    def create_bucket(self, Bucket, **_):  # pylint: disable=invalid-name
+        self.buckets.setdefault(Bucket, {})
+
+    def put_object(self, Bucket, Key, Body=b"", **_):  # pylint: disable=invalid-name
+        body = Body.encode() if isinstance(Body, str) else bytes(Body)
+        with self._lock:
+            self._bucket(Bucket, "PutObject")[Key] = (body, f'"{hashlib.md5(body).hexdigest()}"')
+
+    def head_object(self, Bucket, Key):  # pylint: disable=invalid-name
+        body, etag = self._object(Bucket, Key, "HeadObject")
+        return {"ContentLength": len(body), "ETag": etag}
+
+    def get_object(self, Bucket, Key, Range=None):  # pylint: disable=invalid-name
+        body, etag = self._object(Bucket, Key, "GetObject")
+        if Range:
+            start, end = Range[len("bytes="):].split("-")
+            body = body[int(start):int(end) + 1]
+        return {"Body": StreamingBody(io.BytesIO(body), len(body)), "ContentLength": len(body), "ETag": etag}
+
+    def list_objects_v2(self, Bucket, Prefix="", MaxKeys=1000, ContinuationToken=None):  # pylint: disable=invalid-name
+        keys = sorted(key for key in self._bucket(Bucket, "ListObjectsV2") if key.startswith(Prefix))
+        start = int(ContinuationToken or 0)
+        page = {"KeyCount": len(keys[start:start + MaxKeys]), "IsTruncated": start + MaxKeys < len(keys)}
+        if page["KeyCount"]:
+            page["Contents"] = [{"Key": key, "Size": len(self.buckets[Bucket][key][0]),
+                                 "ETag": self.buckets[Bucket][key][1]} for key in keys[start:start + MaxKeys]]
+        if page["IsTruncated"]:
+            page["NextContinuationToken"] = str(start + MaxKeys)
+        return page
+
+    def get_paginator(self, operation):
+        assert operation == "list_objects_v2", f"{operation} isn't supported"
+        client = self
+
+        class Paginator:  # pylint: disable=too-few-public-methods
+            @staticmethod
+            def paginate(Bucket, Prefix="", PaginationConfig=None):  # pylint: disable=invalid-name
+                page_size = (PaginationConfig or {}).get("PageSize", 1000)
+                token = None
+                while True:
+                    page = client.list_objects_v2(Bucket=Bucket, Prefix=Prefix, MaxKeys=page_size,
+                                                  ContinuationToken=token)
+                    yield page
+                    if not (token := page.get("NextContinuationToken")):
+                        return
+        return Paginator()
+
+    def create_multipart_upload(self, Bucket, Key, **_):  # pylint: disable=invalid-name
+        self._bucket(Bucket, "CreateMultipartUpload")
+        upload_id = uuid.uuid4().hex
+        with self._lock:
+            self.uploads[upload_id] = {"Bucket": Bucket, "Key": Key, "Parts": {}}
+        return {"Bucket": Bucket, "Key": Key, "UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):  # pylint: disable=invalid-name,unused-argument
+        if UploadId not in self.uploads:
+            raise self._error("NoSuchUpload", "UploadPart")
+        etag = f'"{hashlib.md5(Body).hexdigest()}"'
+        with self._lock:
+            self.uploads[UploadId]["Parts"][PartNumber] = (bytes(Body), etag)
+        return {"ETag": etag}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):  # pylint: disable=invalid-name
+        with self._lock:
+            if (upload := self.uploads.pop(UploadId, None)) is None:
+                raise self._error("NoSuchUpload", "CompleteMultipartUpload")
+            parts = [upload["Parts"][part["PartNumber"]] for part in MultipartUpload["Parts"]]
+            if [etag for _, etag in parts] != [part["ETag"] for part in MultipartUpload["Parts"]]:
+                raise self._error("InvalidPart", "CompleteMultipartUpload")
+            digest = hashlib.md5(b"".join(bytes.fromhex(etag.strip('"')) for _, etag in parts)).hexdigest()
+            self.buckets[Bucket][Key] = (b"".join(body for body, _ in parts), f'"{digest}-{len(parts)}"')
+        return {"Bucket": Bucket, "Key": Key}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):  # pylint: disable=invalid-name,unused-argument
+        with self._lock:
+            self.uploads.pop(UploadId, None)
+
+    def list_multipart_uploads(self, Bucket):  # pylint: disable=invalid-name
+        uploads = [{"Key": upload["Key"], "UploadId": upload_id}
+                   for upload_id, upload in self.uploads.items() if upload["Bucket"] == Bucket]
+        return {"Bucket": Bucket, "Uploads": uploads} if uploads else {"Bucket": Bucket}
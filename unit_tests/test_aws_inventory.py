@@ -0,0 +1,173 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import itertools
+import unittest
+from collections import Counter
+from unittest.mock import patch
+
+from botocore.exceptions import ClientError
+
+from sdcm.utils.aws_inventory import AwsInventory, AdaptiveBackoff
+
+REGIONS = ("eu-west-1", "us-east-1")
+
+
+class FakeEC2:
+    """EC2 API of one region: instances, one per reservation, and elastic IPs."""
+
+    ids = itertools.count(0x10000000)
+
+    def __init__(self):
+        self.instances = {}
+        self.addresses = {}
+
+    def add_instance(self, tags=None):
+        instance_id = f"i-{next(self.ids):08x}"
+        self.instances[instance_id] = {"InstanceId": instance_id, "State": {"Name": "running"},
+                                       "Tags": [{"Key": key, "Value": value} for key, value in (tags or {}).items()]}
+        return instance_id
+
+    @staticmethod
+    def _match(resource, filters):
+        tags = {tag["Key"]: tag["Value"] for tag in resource.get("Tags", [])}
+        return all(tags.get(item["Name"][len("tag:"):]) in item["Values"] for item in filters or [])
+
+    def describe_instances(self, Filters=None, MaxResults=1000, NextToken=None):  # pylint: disable=invalid-name
+        ids = sorted(instance_id for instance_id, instance in self.instances.items() if self._match(instance, Filters))
+        start = int(NextToken or 0)
+        page = {"Reservations": [{"Instances": [dict(self.instances[instance_id])]}
+                                 for instance_id in ids[start:start + MaxResults]]}
+        if start + MaxResults < len(ids):
+            page["NextToken"] = str(start + MaxResults)
+        return page
+
+    def terminate_instances(self, InstanceIds):  # pylint: disable=invalid-name
+        if missing := [instance_id for instance_id in InstanceIds if instance_id not in self.instances]:
+            raise ClientError({"Error": {"Code": "InvalidInstanceID.NotFound",
+                                         "Message": f"The instance IDs {missing} do not exist"}}, "TerminateInstances")
+        changes = []
+        for instance_id in InstanceIds:
+            changes.append({"InstanceId": instance_id, "PreviousState": self.instances[instance_id]["State"],
+                            "CurrentState": {"Name": "shutting-down"}})
+            self.instances[instance_id]["State"] = {"Name": "shutting-down"}
+        return {"TerminatingInstances": changes}
+
+    def allocate_address(self, Domain):  # pylint: disable=invalid-name
+        allocation_id = f"eipalloc-{next(self.ids):08x}"
+        self.addresses[allocation_id] = {"AllocationId": allocation_id, "Domain": Domain, "Tags": []}
+        return {"AllocationId": allocation_id}
+
+    def create_tags(self, Resources, Tags):  # pylint: disable=invalid-name
+        for resource_id in Resources:
+            (self.addresses.get(resource_id) or self.instances[resource_id])["Tags"].extend(Tags)
+
+    def describe_addresses(self, Filters=None):  # pylint: disable=invalid-name
+        return {"Addresses": [address for address in self.addresses.values() if self._match(address, Filters)]}
+
+    def release_address(self, AllocationId):  # pylint: disable=invalid-name
+        del self.addresses[AllocationId]
+
+
+class CountingEC2Client:
+    """Wrap EC2 client to count API calls and to throttle first calls of some operations."""
+
+    def __init__(self, client, throttle=None):
+        self.client = client
+        self.calls = Counter()
+        self.throttle = Counter(throttle or {})
+
+    def __getattr__(self, operation):
+        method = getattr(self.client, operation)
+
+        def call(**kwargs):
+            self.calls[operation] += 1
+            if self.throttle[operation]:
+                self.throttle[operation] -= 1
+                raise ClientError({"Error": {"Code": "RequestLimitExceeded", "Message": "slow down"}}, operation)
+            return method(**kwargs)
+        return call
+
+
+class AwsInventoryTest(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(AdaptiveBackoff, "initial_delay", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.clients = {}
+        self.ec2 = {}
+        self.instances = {}
+        for region in REGIONS:
+            self.ec2[region] = FakeEC2()
+            self.instances[region] = sorted(self.ec2[region].add_instance(tags={"TestId": "1111"}) for _ in range(7))
+            self.ec2[region].add_instance()  # an instance of other test
+
+    def make_inventory(self, throttle=None):
+        def client_factory(region):
+            self.clients[region] = CountingEC2Client(self.ec2[region], throttle=throttle)
+            return self.clients[region]
+        return AwsInventory(regions=REGIONS, client_factory=client_factory)
+
+    def test_list_all_pages(self):
+        inventory = self.make_inventory()
+        inventory.page_size = 5
+        instances = inventory.list_instances(tags_dict={"TestId": "1111"})
+        for region in REGIONS:
+            self.assertEqual(sorted(instance["InstanceId"] for instance in instances[region]), self.instances[region])
+            self.assertEqual(self.clients[region].calls["describe_instances"], 2)
+        self.assertIn("describe_instances", inventory.timing_report())
+
+    def test_terminate_in_batches(self):
+        inventory = self.make_inventory()
+        with patch("sdcm.utils.aws_inventory.TERMINATE_INSTANCES_BATCH_SIZE", 3):
+            terminated = inventory.terminate_instances(self.instances)
+        for region in REGIONS:
+            self.assertEqual(sorted(instance["InstanceId"] for instance in terminated[region]), self.instances[region])
+            self.assertEqual(self.clients[region].calls["terminate_instances"], 3)
+            states = {instance["State"]["Name"] for instance in inventory.list_instances({"TestId": "1111"})[region]}
+            self.assertNotIn("running", states)
+
+    def test_failed_batch_is_split(self):
+        inventory = self.make_inventory()
+        gone = self.instances[REGIONS[0]][4]
+        del self.ec2[REGIONS[0]].instances[gone]
+        terminated = inventory.terminate_instances(self.instances)
+        self.assertEqual(sorted(instance["InstanceId"] for instance in terminated[REGIONS[0]]),
+                         [instance_id for instance_id in self.instances[REGIONS[0]] if instance_id != gone])
+        self.assertEqual(len(terminated[REGIONS[1]]), 7)
+        # 7 -> 3 + 4 -> 4 fails -> 2 + 2 -> 2 fails -> 1 + 1
+        self.assertEqual(self.clients[REGIONS[0]].calls["terminate_instances"], 7)
+        self.assertEqual(self.clients[REGIONS[1]].calls["terminate_instances"], 1)
+
+    def test_throttled_calls_are_retried(self):
+        inventory = self.make_inventory(throttle={"describe_instances": 2})
+        instances = inventory.list_instances(tags_dict={"TestId": "1111"})
+        for region in REGIONS:
+            self.assertEqual(len(instances[region]), 7)
+            self.assertEqual(self.clients[region].calls["describe_instances"], 3)
+
+    def test_failed_region_is_skipped(self):
+        inventory = self.make_inventory(throttle={"describe_instances": AwsInventory.max_attempts})
+        instances = inventory.list_instances(tags_dict={"TestId": "1111"})
+        self.assertEqual(instances, {})
+
+    def test_release_elastic_ips(self):
+        ec2 = self.ec2[REGIONS[0]]
+        allocation_id = ec2.allocate_address(Domain="vpc")["AllocationId"]
+        ec2.create_tags(Resources=[allocation_id], Tags=[{"Key": "TestId", "Value": "1111"}])
+        inventory = self.make_inventory()
+        elastic_ips = inventory.list_elastic_ips(tags_dict={"TestId": "1111"})
+        self.assertEqual([eip["AllocationId"] for eip in elastic_ips[REGIONS[0]]], [allocation_id])
+        self.assertEqual(elastic_ips[REGIONS[1]], [])
+        inventory.release_elastic_ips(elastic_ips)
+        self.assertEqual(ec2.describe_addresses()["Addresses"], [])
@@ -0,0 +1,127 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import os
+import queue
+import tempfile
+import threading
+import unittest
+from collections import namedtuple
+
+from sdcm.utils.backtrace_decoder import BacktraceDecoder, BacktraceSymbolsCache, split_addr2line_output
+
+Output = namedtuple("Output", "stdout")
+
+
+class FakeEvent:  # pylint: disable=too-few-public-methods
+    published = []
+
+    def __init__(self, node, raw_backtrace):
+        self.node = node
+        self.raw_backtrace = raw_backtrace
+        self.backtrace = None
+
+    def publish(self):
+        self.published.append(self)
+
+
+class FakeMonitorNode:
+    def __init__(self):
+        self.addr2line_calls = []
+        self.copy_calls = 0
+        self.debug_files = []
+
+    def copy_scylla_debug_info(self, node, debug_file, build_id=None):  # pylint: disable=unused-argument
+        self.copy_calls += 1
+        return f"/tmp/{build_id or node}-scylla.debug"
+
+    def decode_raw_backtrace(self, scylla_debug_file, raw_backtrace):
+        self.addr2line_calls.append(raw_backtrace.split())
+        self.debug_files.append(scylla_debug_file)
+        return Output("\n".join(f"func_{address} at file.cc:1\n (inlined by) caller at file.cc:2"
+                                for address in raw_backtrace.split()))
+
+
+class TestBacktraceDecoder(unittest.TestCase):
+    def setUp(self):
+        FakeEvent.published = []
+        self.cache_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.monitor = FakeMonitorNode()
+        self.queue = queue.Queue()
+        self.decoder = BacktraceDecoder(monitor_node=self.monitor, decoding_queue=self.queue,
+                                        termination_event=threading.Event(),
+                                        cache=BacktraceSymbolsCache(cache_dir=self.cache_dir.name))
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def put_events(self, *events, build_id="abcd"):
+        for event in events:
+            self.queue.put({"node": event.node, "debug_file": "/usr/lib/debug/scylla.debug",
+                            "build_id": build_id(event) if callable(build_id) else build_id, "event": event})
+        self.queue.put(None)
+
+    def test_split_addr2line_output(self):
+        self.assertEqual(split_addr2line_output("a at x:1\n (inlined by) b at y:2\nc at z:3\n"),
+                         ["a at x:1\n (inlined by) b at y:2", "c at z:3"])
+
+    def test_batch_is_decoded_once_and_published_in_order(self):
+        events = [FakeEvent("node1", "0x1\n0x2"), FakeEvent("node2", "0x2\n0x3"), FakeEvent("node1", "0x1\n0x2")]
+        self.put_events(*events)
+        self.decoder.run()
+
+        self.assertEqual(FakeEvent.published, events)
+        self.assertEqual(self.monitor.addr2line_calls, [["0x1", "0x2", "0x3"]])
+        self.assertEqual(self.monitor.copy_calls, 1)
+        self.assertEqual(events[1].backtrace, "func_0x2 at file.cc:1\n (inlined by) caller at file.cc:2\n"
+                                              "func_0x3 at file.cc:1\n (inlined by) caller at file.cc:2")
+
+    def test_symbols_cache_is_persistent(self):
+        self.put_events(FakeEvent("node1", "0x1\n0x2"))
+        self.decoder.run()
+
+        monitor = FakeMonitorNode()
+        decoder = BacktraceDecoder(monitor_node=monitor, decoding_queue=self.queue,
+                                   termination_event=threading.Event(),
+                                   cache=BacktraceSymbolsCache(cache_dir=self.cache_dir.name))
+        event = FakeEvent("node1", "0x2\n0x1")
+        self.put_events(event)
+        decoder.run()
+
+        self.assertEqual(monitor.addr2line_calls, [])
+        self.assertTrue(event.backtrace.startswith("func_0x2 at file.cc:1"))
+
+    def test_debug_file_of_each_build(self):
+        events = [FakeEvent("node1", "0x1"), FakeEvent("node2", "0x1")]
+        self.put_events(*events, build_id=lambda event: {"node1": "abcd", "node2": "ef01"}[event.node])
+        self.decoder.run()
+
+        self.assertEqual(self.monitor.copy_calls, 2)
+        self.assertEqual(sorted(self.monitor.debug_files), ["/tmp/abcd-scylla.debug", "/tmp/ef01-scylla.debug"])
+        self.assertEqual(sorted(os.listdir(self.cache_dir.name)), ["abcd.json", "ef01.json"])
+
+    def test_unknown_build_id_is_not_persisted(self):
+        self.put_events(FakeEvent("node1", "0x1"), FakeEvent("node2", "0x1"), build_id=None)
+        self.decoder.run()
+
+        self.assertEqual(sorted(self.monitor.debug_files), ["/tmp/node1-scylla.debug", "/tmp/node2-scylla.debug"])
+        self.assertEqual(os.listdir(self.cache_dir.name), [])
+
+    def test_event_published_if_decoding_failed(self):
+        self.monitor.decode_raw_backtrace = lambda *_: Output("garbage")
+        event = FakeEvent("node1", "0x1\n0x2")
+        self.put_events(event)
+        self.decoder.run()
+
+        self.assertEqual(FakeEvent.published, [event])
+        self.assertIsNone(event.backtrace)
@@ -0,0 +1,100 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import os
+import shutil
+import tempfile
+import unittest
+from collections import Counter
+
+from sdcm.utils.cloud_download import S3Downloader, RemoteObject
+
+from unit_tests.lib.fake_s3 import FakeS3Client
+
+BUCKET = "sct-test-bucket"
+
+
+class CountingS3Downloader(S3Downloader):
+    multipart_threshold = 100
+    part_size = 64
+    page_size = 2
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reads = Counter()
+
+    def read(self, obj, start=None, end=None):
+        self.reads[obj.key] += 1
+        return super().read(obj, start, end)
+
+
+class S3DownloaderTest(unittest.TestCase):
+    def setUp(self):
+        self.target = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.target)
+        self.client = FakeS3Client()
+        self.client.create_bucket(Bucket=BUCKET)
+        self.files = {
+            "snapshot/a.txt": b"a" * 10,
+            "snapshot/sub/b.bin": bytes(range(256)) * 2,  # 512 bytes, downloaded by 8 ranged GETs
+            "snapshot/sub/c.txt": b"",
+            "snapshot/d.txt": b"d" * 99,
+            "snapshot/dir/": b"",
+            "other/e.txt": b"e",
+        }
+        for key, body in self.files.items():
+            self.client.put_object(Bucket=BUCKET, Key=key, Body=body)
+
+    def read_target(self):
+        files = {}
+        for root, _, names in os.walk(self.target):
+            for name in names:
+                with open(os.path.join(root, name), "rb") as local_file:
+                    files[os.path.relpath(os.path.join(root, name), self.target)] = local_file.read()
+        return files
+
+    def test_download_dir(self):
+        downloader = CountingS3Downloader(BUCKET, client=self.client)
+        stats = downloader.download_dir("/snapshot", self.target)
+        self.assertEqual(self.read_target(), {"a.txt": self.files["snapshot/a.txt"],
+                                              "sub/b.bin": self.files["snapshot/sub/b.bin"],
+                                              "sub/c.txt": b"",
+                                              "d.txt": self.files["snapshot/d.txt"]})
+        self.assertEqual((stats.files, stats.parts, stats.skipped, stats.size), (4, 11, 0, 10 + 512 + 99))
+        self.assertEqual(downloader.reads["snapshot/sub/b.bin"], 8)
+        self.assertIn("MB/s", str(stats))
+
+    def test_up_to_date_files_are_skipped(self):
+        CountingS3Downloader(BUCKET, client=self.client).download_dir("snapshot/", self.target)
+        self.client.put_object(Bucket=BUCKET, Key="snapshot/a.txt", Body=b"A" * 10)
+
+        downloader = CountingS3Downloader(BUCKET, client=self.client)
+        stats = downloader.download_dir("snapshot/", self.target)
+        self.assertEqual((stats.files, stats.skipped), (1, 3))
+        self.assertEqual(list(downloader.reads), ["snapshot/a.txt"])
+        self.assertEqual(self.read_target()["a.txt"], b"A" * 10)
+
+    def test_corrupted_download(self):
+        downloader = CountingS3Downloader(BUCKET, client=self.client)
+        obj = downloader.get_object("snapshot/a.txt")
+        corrupted = RemoteObject(key=obj.key, size=obj.size, etag="0" * 32)
+        path = os.path.join(self.target, "a.txt")
+        with self.assertRaisesRegex(IOError, "doesn't match ETag"):
+            downloader.download([(corrupted, path)])
+        self.assertEqual(os.listdir(self.target), [])
+
+    def test_download_file(self):
+        path = os.path.join(self.target, "b.bin")
+        stats = CountingS3Downloader(BUCKET, client=self.client).download_file("snapshot/sub/b.bin", path)
+        self.assertEqual(stats.parts, 8)
+        self.assertEqual(self.read_target(), {"b.bin": self.files["snapshot/sub/b.bin"]})
@@ -0,0 +1,135 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+from sdcm.utils.cloud_monitor.common import InstanceLifecycle
+from sdcm.utils.cloud_monitor.resources.instances import CloudTrailOwners, aws_instance_creation_time
+from sdcm.utils.pricing import AWSPricing, PriceCache
+
+
+class FakePaginator:
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def paginate(self, **kwargs):
+        self.calls.append(kwargs)
+        return iter(self.pages)
+
+
+class PriceCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        self.cache_file = os.path.join(self.cache_dir, "prices.json")
+
+    def test_prices_are_shared_by_runs(self):
+        PriceCache(self.cache_file).set("aws:on_demand:us-east-1:i3.large", 0.156)
+        self.assertEqual(PriceCache(self.cache_file).get("aws:on_demand:us-east-1:i3.large", ttl=60), 0.156)
+        self.assertIsNone(PriceCache(self.cache_file).get("aws:on_demand:us-east-1:i3.xlarge", ttl=60))
+
+    def test_expired_price(self):
+        cache = PriceCache(self.cache_file)
+        with patch("time.time", return_value=1000):
+            cache.set("aws:spot:us-east-1:i3.large", 0.05)
+        with patch("time.time", return_value=1059):
+            self.assertEqual(cache.get("aws:spot:us-east-1:i3.large", ttl=60), 0.05)
+        with patch("time.time", return_value=1061):
+            self.assertIsNone(cache.get("aws:spot:us-east-1:i3.large", ttl=60))
+
+    def test_on_demand_price_is_requested_once(self):
+        with patch.object(AWSPricing, "_get_on_demand_instance_price", return_value=0.156) as get_price:
+            self.assertEqual(AWSPricing(PriceCache(self.cache_file)).get_on_demand_instance_price(
+                "us-east-1", "i3.large"), 0.156)
+            self.assertEqual(AWSPricing(PriceCache(self.cache_file)).get_on_demand_instance_price(
+                "us-east-1", "i3.large"), 0.156)
+        get_price.assert_called_once_with("us-east-1", "i3.large")
+
+    def test_spot_prices_of_region_are_requested_together(self):
+        paginator = FakePaginator([
+            {"SpotPriceHistory": [{"InstanceType": "i3.large", "SpotPrice": "0.04"},
+                                  {"InstanceType": "i3.large", "SpotPrice": "0.06"}]},
+            {"SpotPriceHistory": [{"InstanceType": "i3.xlarge", "SpotPrice": "0.1"}]},
+        ])
+        ec2_client = MagicMock()
+        ec2_client.get_paginator.return_value = paginator
+        pricing = AWSPricing(PriceCache(self.cache_file))
+        with patch("sdcm.utils.pricing.boto3.client", return_value=ec2_client):
+            pricing.prefetch([("us-east-1", "i3.large", InstanceLifecycle.SPOT),
+                              ("us-east-1", "i3.xlarge", InstanceLifecycle.SPOT),
+                              ("us-east-1", "i3.4xlarge", InstanceLifecycle.SPOT)])
+            self.assertAlmostEqual(pricing.get_spot_instance_price("us-east-1", "i3.large"), 0.05)
+            self.assertAlmostEqual(pricing.get_spot_instance_price("us-east-1", "i3.xlarge"), 0.1)
+            self.assertEqual(pricing.get_spot_instance_price("us-east-1", "i3.4xlarge"), 0)
+        self.assertEqual(len(paginator.calls), 1)
+        self.assertEqual(paginator.calls[0]["InstanceTypes"], ["i3.4xlarge", "i3.large", "i3.xlarge"])
+
+
+class CloudTrailOwnersTest(unittest.TestCase):
+    @staticmethod
+    def instance(instance_id, region_az):
+        return {"InstanceId": instance_id, "Placement": {"AvailabilityZone": region_az},
+                "LaunchTime": datetime.now(timezone.utc)}
+
+    @staticmethod
+    def event(username, *instance_ids):
+        return {"EventName": "RunInstances", "Username": username,
+                "Resources": [{"ResourceType": "AWS::EC2::Instance", "ResourceName": instance_id}
+                              for instance_id in instance_ids]}
+
+    def test_owners_joined_by_region(self):
+        paginators = {
+            "us-east-1": FakePaginator([{"Events": [self.event("alice", "i-1", "i-2")]},
+                                        {"Events": [self.event("bob", "i-3"), self.event("eve", "i-9")]}]),
+            "eu-west-1": FakePaginator([{"Events": [self.event("carol", "i-4")]}]),
+        }
+
+        def cloudtrail_client(_, region_name):
+            client = MagicMock()
+            client.get_paginator.return_value = paginators[region_name]
+            return client
+
+        with patch("sdcm.utils.cloud_monitor.resources.instances.boto3_client", side_effect=cloudtrail_client):
+            owners = CloudTrailOwners([self.instance("i-1", "us-east-1a"), self.instance("i-2", "us-east-1b"),
+                                       self.instance("i-3", "us-east-1a"), self.instance("i-4", "eu-west-1c"),
+                                       self.instance("i-5", "eu-west-1a")])
+        self.assertEqual([owners.get(f"i-{idx}") for idx in range(1, 6)], ["alice", "alice", "bob", "carol", None])
+        self.assertIsNone(owners.get("i-9"))
+        for paginator in paginators.values():
+            self.assertEqual(len(paginator.calls), 1)
+            self.assertEqual(paginator.calls[0]["LookupAttributes"],
+                             [{"AttributeKey": "EventName", "AttributeValue": "RunInstances"}])
+
+    def test_lookup_starts_before_creation_of_restarted_instance(self):
+        created = datetime.now(timezone.utc) - timedelta(days=30)
+        restarted = self.instance("i-1", "us-east-1a")
+        restarted.update(RootDeviceName="/dev/sda1",
+                         BlockDeviceMappings=[{"DeviceName": "/dev/sdb", "Ebs": {"AttachTime": restarted["LaunchTime"]}},
+                                              {"DeviceName": "/dev/sda1", "Ebs": {"AttachTime": created}}],
+                         NetworkInterfaces=[{"Attachment": {"DeviceIndex": 0, "AttachTime": created}}])
+        self.assertEqual(aws_instance_creation_time(restarted), created)
+        not_attached = self.instance("i-2", "us-east-1a")
+        self.assertEqual(aws_instance_creation_time(not_attached), not_attached["LaunchTime"])
+
+        paginator = FakePaginator([{"Events": [self.event("alice", "i-1")]}])
+        with patch("sdcm.utils.cloud_monitor.resources.instances.boto3_client",
+                   return_value=MagicMock(**{"get_paginator.return_value": paginator})):
+            owners = CloudTrailOwners([restarted])
+        self.assertEqual(owners.get("i-1"), "alice")
+        self.assertLess(paginator.calls[0]["StartTime"], created)
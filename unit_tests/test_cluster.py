@@ -30,6 +30,7 @@ from sdcm.sct_events.group_common_events import ignore_upgrade_schema_errors
 from sdcm.sct_events.filters import DbEventsFilter
 from sdcm.sct_events.database import DatabaseLogEvent
 from sdcm.utils.distro import Distro
+from sdcm.utils.log_watcher import LogWatcher
 
 from unit_tests.dummy_remote import DummyRemote
 from unit_tests.lib.events_utils import EventsUtilsMixin
@@ -184,6 +185,25 @@ class TestBaseNode(unittest.TestCase, EventsUtilsMixin):
             assert event_backtrace2["type"] == "DATABASE_ERROR"
             assert event_backtrace2["raw_backtrace"]
 
+    def test_read_new_db_log_lines_without_trailing_newline(self):
+        with tempfile.TemporaryDirectory() as logdir:
+            self.node.system_log = os.path.join(logdir, 'system.log')
+            with open(self.node.system_log, 'w') as log_file:
+                log_file.write('INFO  started\nINFO  serving\nINFO  still being writ')
+            self.node.last_log_position, self.node.last_line_no = 0, 0
+
+            self.assertTrue(self.node._read_new_db_log_lines(max_lines=1))
+            self.assertTrue(self.node._read_new_db_log_lines(max_lines=1))
+            self.assertFalse(self.node._read_new_db_log_lines(max_lines=1))
+            self.assertEqual(self.node.last_line_no, 2)
+
+            watcher = LogWatcher(use_inotify=False)
+            watcher.start()
+            self.addCleanup(watcher.stop, 5)
+            watcher.watch(self.node.name, self.node.system_log, self.node._read_new_db_log_lines)
+            self.assertIsNotNone(watcher.unwatch(self.node.name))
+            self.assertEqual(self.node.last_line_no, 2)
+
 
 class VersionDummyRemote:
     def __init__(self, test, results):
@@ -12,8 +12,10 @@
 # Copyright (c) 2020 ScyllaDB
 
 import os
+import shutil
 import logging
 import itertools
+import tempfile
 import unittest
 
 from sdcm import sct_config
@@ -44,6 +46,15 @@ class ConfigurationTests(unittest.TestCase):  # pylint: disable=too-many-public-
         # and so we can run those tests specificly
         os.environ['SCT_CONFIG_FILES'] = 'internal_test_data/minimal_test_case.yaml'
 
+    def setUp(self):
+        # don't share results of lookups (some of them are mocked) between tests and with other runs
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        patcher = unittest.mock.patch("sdcm.utils.resolution_cache.CONFIG_RESOLUTION_CACHE_FILE",
+                                      os.path.join(cache_dir, "config_resolution.json"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     def tearDown(self):
         for k, _ in os.environ.items():
             if k.startswith('SCT_'):
@@ -346,12 +357,28 @@ class ConfigurationTests(unittest.TestCase):  # pylint: disable=too-many-public-
         os.environ['SCT_NEW_SCYLLA_REPO'] = centos_repo
         os.environ['SCT_USER_PREFIX'] = 'testing'
 
-        with unittest.mock.patch.object(sct_config, 'get_branch_version', return_value='2019.1.1', clear=True):
+        with unittest.mock.patch('sdcm.utils.version_utils.get_branch_version', return_value='2019.1.1', clear=True):
             conf = sct_config.SCTConfiguration()
             conf.verify_configuration()
             conf._get_target_upgrade_version()  # pylint: disable=protected-access
         self.assertEqual(conf.get('target_upgrade_version'), '2019.1.1')
 
+    def test_15b_explicit_scylla_repo_offline(self):
+        centos_repo = 'https://s3.amazonaws.com/downloads.scylladb.com/enterprise/rpm/unstable/centos/' \
+                      '9f724fedb93b4734fcfaec1156806921ff46e956-2bdfa9f7ef592edaf15e028faf3b7f695f39ebc1/71/scylla.repo'
+
+        os.environ['SCT_CLUSTER_BACKEND'] = 'gce'
+        os.environ['SCT_SCYLLA_REPO'] = centos_repo
+        os.environ['SCT_NEW_SCYLLA_REPO'] = centos_repo
+        os.environ['SCT_USER_PREFIX'] = 'testing'
+        os.environ['SCT_OFFLINE_CONFIG_RESOLUTION'] = 'true'
+
+        with unittest.mock.patch('sdcm.utils.version_utils.resolve_latest_repo_symlink',
+                                 side_effect=AssertionError("shouldn't be looked up")):
+            conf = sct_config.SCTConfiguration()
+        self.assertEqual(conf.get('scylla_repo'), centos_repo)
+        self.assertEqual(conf.get('new_scylla_repo'), centos_repo)
+
     def test_15a_new_scylla_repo_by_scylla_version(self):
         os.environ['SCT_CLUSTER_BACKEND'] = 'gce'
         os.environ['SCT_SCYLLA_VERSION'] = 'master:latest'
@@ -361,8 +388,9 @@ class ConfigurationTests(unittest.TestCase):  # pylint: disable=too-many-public-
         resolved_repo_link = 'https://s3.amazonaws.com/downloads.scylladb.com/unstable/scylla/master/rpm\
             /centos/2021-06-09T13:12:44Z/scylla.repo'
 
-        with unittest.mock.patch.object(sct_config, 'get_branch_version', return_value='666.development', clear=True), \
-                unittest.mock.patch.object(sct_config, 'find_scylla_repo', return_value=resolved_repo_link, clear=True):
+        with unittest.mock.patch('sdcm.utils.version_utils.get_branch_version', return_value='666.development',
+                                 clear=True), \
+                unittest.mock.patch('sdcm.utils.common.find_scylla_repo', return_value=resolved_repo_link, clear=True):
             conf = sct_config.SCTConfiguration()
             conf.verify_configuration()
             conf._get_target_upgrade_version()  # pylint: disable=protected-access
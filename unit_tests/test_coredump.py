@@ -195,3 +195,21 @@ class CoredumpExportFileTest(CoredumpExportTestBase):
 
     def test_fail_get_list_test(self):
         self._run_coredump_with_fake_remoter('fail_get_list_test')
+
+
+class CoredumpStreamedFileNameTest(unittest.TestCase):
+    # pylint: disable=protected-access
+    def test_compressed_cores_are_uploaded_as_is(self):
+        for extension in ('.lz4', '.xz', '.zst', '.zip', '.gz', '.gzip'):
+            core_info = CoreDumpInfo(pid='1', corefile=f'/var/lib/scylla/coredump/core.scylla.1000.1{extension}')
+            self.assertEqual(CoredumpExportFileThread._get_streamed_file_name(core_info),
+                             f'core.scylla.1000.1{extension}')
+        core_info = CoreDumpInfo(pid='1', corefile='/var/lib/scylla/coredump/core.scylla.1000.1')
+        self.assertEqual(CoredumpExportFileThread._get_streamed_file_name(core_info),
+                         'core.scylla.1000.1.gz')
+
+    def test_cores_decompressed_by_coredumpctl_are_gzipped(self):
+        for extension in ('.lz4', '.xz', '.zst', ''):
+            core_info = CoreDumpInfo(pid='1', corefile=f'/var/lib/systemd/coredump/core.scylla.1000.1{extension}')
+            self.assertEqual(CoredumpExportSystemdThread._get_streamed_file_name(core_info),
+                             'core.scylla.1000.1.gz')
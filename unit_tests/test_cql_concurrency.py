@@ -0,0 +1,65 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import itertools
+import unittest
+
+from sdcm.utils.cql_concurrency import iter_concurrent
+
+
+class FakeFuture:
+    def __init__(self, session, params):
+        self.session = session
+        self.params = params
+
+    def result(self):
+        self.session.in_flight -= 1
+        if self.params[0] % 7 == 0:
+            raise ValueError(f"failed {self.params}")
+        return self.params[0] * 10
+
+
+class FakeSession:
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.sent = 0
+
+    def execute_async(self, statement, params, timeout=None):  # pylint: disable=unused-argument
+        self.in_flight += 1
+        self.sent += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        return FakeFuture(self, params)
+
+
+class IterConcurrentTest(unittest.TestCase):
+    def test_results_in_order(self):
+        session = FakeSession()
+        results = list(iter_concurrent(session, "statement", ((i, ) for i in range(1, 101)), concurrency=8))
+        self.assertEqual([params for params, _ in results], [(i, ) for i in range(1, 101)])
+        self.assertEqual(results[0], ((1, ), 10))
+        self.assertIsInstance(results[6][1], ValueError)
+        self.assertEqual(session.max_in_flight, 8)
+        self.assertEqual(session.in_flight, 0)
+
+    def test_early_stopping(self):
+        session = FakeSession()
+        found = []
+        for params, result in iter_concurrent(session, "statement", ((i, ) for i in itertools.count(1)),
+                                              concurrency=16):
+            if not isinstance(result, Exception):
+                found.append(params[0])
+            if len(found) == 10:
+                break
+        self.assertEqual(found, [1, 2, 3, 4, 5, 6, 8, 9, 10, 11])
+        self.assertLessEqual(session.sent, 11 + 16)
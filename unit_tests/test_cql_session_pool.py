@@ -0,0 +1,170 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import unittest
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+
+from cassandra import ConsistencyLevel
+from cassandra.cluster import NoHostAvailable
+from cassandra.cqltypes import Int32Type
+from cassandra.protocol import ColumnMetadata
+from cassandra.query import PreparedStatement, SimpleStatement
+
+from sdcm.utils.cql_session_pool import CqlSessionKey, CqlSessionPool
+
+
+class FakeSession:
+    def __init__(self, keyspace=None):
+        self.keyspace = keyspace
+        self.is_shutdown = False
+        self.default_fetch_size = 5000
+        self.executed = []
+        self.parameters = None
+        self.error = None
+
+    def execute(self, statement, parameters=None, timeout=None):
+        if self.error:
+            raise self.error
+        self.executed.append((statement, timeout))
+        self.parameters = parameters
+        return [getattr(statement, "query_string", None)]
+
+    def set_keyspace(self, keyspace):
+        self.keyspace = keyspace
+
+
+class FakeCluster:
+    def __init__(self, keyspace=None):
+        self.session = FakeSession(keyspace=keyspace)
+        self.is_shutdown = False
+        self.hosts = [SimpleNamespace(is_up=True)]
+        self.metadata = SimpleNamespace(all_hosts=lambda: self.hosts)
+
+    def shutdown(self):
+        self.is_shutdown = self.session.is_shutdown = True
+
+
+class CqlSessionPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.pool = CqlSessionPool()
+        self.clusters = []
+        self.key = CqlSessionKey.build(node_ips=["10.0.0.2", "10.0.0.1"], credentials=("cassandra", "cassandra"))
+
+    def connect(self, key):
+        cluster = FakeCluster(keyspace=key.keyspace)
+        self.clusters.append(cluster)
+        return cluster, cluster.session
+
+    def lease(self, key=None):
+        return self.pool.lease(key=key or self.key, connect=self.connect, verbose=False)
+
+    def test_sessions_are_shared(self):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: self.lease().__enter__().execute("SELECT 1"), range(16)))
+        self.assertEqual(len(self.clusters), 1)
+        self.assertEqual((self.pool.stats.connects, self.pool.stats.reuses), (1, 15))
+
+        other_key = CqlSessionKey.build(node_ips=["10.0.0.1", "10.0.0.2"], credentials=("cassandra", "cassandra"),
+                                        ssl_opts={"ca_certs": "ca.pem"})
+        with self.lease(other_key):
+            pass
+        self.assertEqual(len(self.clusters), 2)
+        self.assertNotIn("password", repr(other_key))
+
+    def test_scoped_settings(self):
+        with self.lease() as first, self.lease() as second:
+            first.default_consistency_level = ConsistencyLevel.QUORUM
+            first.default_fetch_size = 0
+            first.default_timeout = 300
+            first.execute("SELECT * FROM ks.cf")
+            second.execute(SimpleStatement("SELECT * FROM ks.cf", consistency_level=ConsistencyLevel.ALL))
+        (statement_1, timeout_1), (statement_2, timeout_2) = self.clusters[0].session.executed
+        self.assertEqual((statement_1.consistency_level, statement_1.fetch_size, timeout_1),
+                         (ConsistencyLevel.QUORUM, 0, 300))
+        self.assertEqual((statement_2.consistency_level, statement_2.fetch_size, timeout_2),
+                         (ConsistencyLevel.ALL, 5000, 60.0))
+
+    def test_scoped_settings_of_prepared_statement(self):
+        prepared = PreparedStatement(column_metadata=[ColumnMetadata("ks", "cf", "pk", Int32Type)], query_id=b"1",
+                                     routing_key_indexes=[0], query="INSERT INTO ks.cf (pk) VALUES (?)",
+                                     keyspace="ks", protocol_version=4, result_metadata=[], result_metadata_id=None)
+        with self.lease() as session:
+            session.default_consistency_level = ConsistencyLevel.QUORUM
+            session.default_serial_consistency_level = ConsistencyLevel.LOCAL_SERIAL
+            session.execute(prepared, (1, ))
+            prepared.consistency_level = ConsistencyLevel.ALL
+            session.execute(prepared, (2, ))
+        (statement_1, _), (statement_2, _) = self.clusters[0].session.executed
+        self.assertEqual((statement_1.consistency_level, statement_1.serial_consistency_level, statement_1.fetch_size),
+                         (ConsistencyLevel.QUORUM, ConsistencyLevel.LOCAL_SERIAL, 5000))
+        self.assertEqual(statement_1.values, [b"\x00\x00\x00\x01"])
+        self.assertEqual(statement_2.consistency_level, ConsistencyLevel.ALL)
+        self.assertIsNone(self.clusters[0].session.parameters)
+
+    def test_keyspace_switch(self):
+        with self.lease() as session:
+            session.execute("USE keyspace1")
+            self.assertEqual(session.keyspace, "keyspace1")
+            with self.lease() as other_session:
+                self.assertIsNone(other_session.keyspace)
+            session.set_keyspace("keyspace2")
+            self.assertEqual(session.keyspace, "keyspace2")
+        self.assertEqual([cluster.session.keyspace for cluster in self.clusters], [None, "keyspace1", "keyspace2"])
+        self.assertFalse(any(cluster.is_shutdown for cluster in self.clusters))
+
+    def test_broken_and_invalidated_sessions_are_replaced(self):
+        with self.lease():
+            pass
+        self.clusters[0].hosts[0].is_up = False
+        with self.lease():
+            pass
+        self.assertEqual(len(self.clusters), 2)
+        self.assertTrue(self.clusters[0].is_shutdown)
+
+        self.clusters[1].session.error = NoHostAvailable("no hosts", {})
+        with self.lease() as session:
+            with self.assertRaises(NoHostAvailable):
+                session.execute("SELECT 1")
+            self.assertFalse(self.clusters[1].is_shutdown)
+        self.assertTrue(self.clusters[1].is_shutdown)
+
+        with self.lease():
+            self.pool.invalidate(["10.0.0.3"])
+            self.pool.invalidate(["10.0.0.2"])
+            self.assertFalse(self.clusters[2].is_shutdown)
+        self.assertTrue(self.clusters[2].is_shutdown)
+        self.assertEqual(self.pool.sessions, [])
+
+    def test_private_session(self):
+        lease = self.lease()
+        self.assertIs(lease.session, self.clusters[0].session)
+        with self.lease():
+            pass
+        self.assertEqual(len(self.clusters), 2)
+        lease.cluster.shutdown()
+        with self.lease():
+            pass
+        self.assertEqual(self.pool.stats.reuses, 1)
+
+    def test_unscoped_setting_doesnt_change_shared_session(self):
+        with self.lease() as other, self.lease() as session:
+            session.row_factory = dict
+            self.assertIs(session.row_factory, dict)
+            self.assertFalse(hasattr(other, "row_factory"))
+            self.assertEqual(len(self.clusters), 2)
+            self.assertFalse(self.clusters[0].is_shutdown)
+        self.assertTrue(self.clusters[1].is_shutdown)
+        with self.lease():
+            pass
+        self.assertEqual(self.pool.stats.reuses, 2)
@@ -18,7 +18,7 @@ import unittest
 
 from sdcm.cluster import TestConfig
 
-from unit_tests.dummy_remote import DummyRemote
+from unit_tests.dummy_remote import DummyRemote, DummyOutput
 from unit_tests.test_cluster import DummyNode
 from unit_tests.lib.events_utils import EventsUtilsMixin
 
@@ -31,6 +31,16 @@ class DecodeDummyNode(DummyNode):  # pylint: disable=abstract-method
     def get_scylla_debuginfo_file(self):
         return "scylla_debug_info_file"
 
+    def get_scylla_build_id(self):
+        return None
+
+    def decode_raw_backtrace(self, scylla_debug_file, raw_backtrace):
+        return DummyOutput("\n".join(decoded_address(address) for address in raw_backtrace.split()))
+
+
+def decoded_address(address):
+    return f"{address} at scylla_debug_info_file:1"
+
 
 class TestDecodeBactraces(unittest.TestCase, EventsUtilsMixin):
     @classmethod
@@ -90,8 +100,8 @@ class TestDecodeBactraces(unittest.TestCase, EventsUtilsMixin):
 
         for event in events:
             if event.get('backtrace') and event.get('raw_backtrace'):
-                self.assertEqual(event['backtrace'].strip(),
-                                 "addr2line -Cpife scylla_debug_info_file {}".format(' '.join(event['raw_backtrace'].split("\n"))))
+                self.assertEqual(event['backtrace'],
+                                 "\n".join(decoded_address(address) for address in event['raw_backtrace'].split()))
 
     def test_03_decode_interlace_reactor_stall(self):  # pylint: disable=invalid-name
 
@@ -114,8 +124,8 @@ class TestDecodeBactraces(unittest.TestCase, EventsUtilsMixin):
 
         for event in events:
             if event.get('backtrace') and event.get('raw_backtrace'):
-                self.assertEqual(event['backtrace'].strip(),
-                                 "addr2line -Cpife scylla_debug_info_file {}".format(' '.join(event['raw_backtrace'].split("\n"))))
+                self.assertEqual(event['backtrace'],
+                                 "\n".join(decoded_address(address) for address in event['raw_backtrace'].split()))
 
     def test_04_decode_backtraces_core(self):
 
@@ -138,5 +148,5 @@ class TestDecodeBactraces(unittest.TestCase, EventsUtilsMixin):
 
         for event in events:
             if event.get('backtrace') and event.get('raw_backtrace'):
-                self.assertEqual(event['backtrace'].strip(),
-                                 "addr2line -Cpife scylla_debug_info_file {}".format(' '.join(event['raw_backtrace'].split("\n"))))
+                self.assertEqual(event['backtrace'],
+                                 "\n".join(decoded_address(address) for address in event['raw_backtrace'].split()))
@@ -0,0 +1,149 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import unittest
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from botocore.exceptions import ClientError
+
+from sdcm import ec2_client
+from sdcm.ec2_client import (EC2ClientWarpper, SpotRequestTracker, SPOT_CAPACITY_NOT_AVAILABLE_ERROR,
+                             SPOT_STATUS_UNEXPECTED_ERROR, STATUS_FULFILLED)
+
+
+class FakeEC2Client:
+    """Spot requests which are fulfilled after `pending_checks' describe calls."""
+
+    def __init__(self, pending_checks=2, status_code=STATUS_FULFILLED, fleet_status=STATUS_FULFILLED):
+        self.pending_checks = pending_checks
+        self.status_code = status_code
+        self.fleet_status = fleet_status
+        self.calls = Counter()
+        self.cancelled = []
+
+    def cancel_spot_instance_requests(self, SpotInstanceRequestIds):  # pylint: disable=invalid-name
+        self.cancelled.extend(SpotInstanceRequestIds)
+
+    def describe_spot_instance_requests(self, Filters):  # pylint: disable=invalid-name
+        self.calls["describe_spot_instance_requests"] += 1
+        pending = self.calls["describe_spot_instance_requests"] <= self.pending_checks
+        return {"SpotInstanceRequests": [{
+            "SpotInstanceRequestId": request_id,
+            "State": "open" if pending else "active",
+            "Status": {"Code": "pending-fulfillment" if pending else self.status_code},
+            "InstanceId": request_id.replace("sir-", "i-"),
+        } for request_id in Filters[0]["Values"]]}
+
+    def describe_spot_fleet_requests(self, SpotFleetRequestIds):  # pylint: disable=invalid-name
+        self.calls["describe_spot_fleet_requests"] += 1
+        pending = self.calls["describe_spot_fleet_requests"] <= self.pending_checks
+        return {"SpotFleetRequestConfigs": [{
+            "SpotFleetRequestId": request_id,
+            "SpotFleetRequestState": "active",
+            "ActivityStatus": "pending_fulfillment" if pending else self.fleet_status,
+        } for request_id in SpotFleetRequestIds]}
+
+    def describe_spot_fleet_request_history(self, **_):
+        raise ClientError({"Error": {"Code": "InternalError", "Message": "try again"}},
+                          "DescribeSpotFleetRequestHistory")
+
+
+class SpotRequestTrackerTest(unittest.TestCase):
+    def setUp(self):
+        for attr, value in (("min_interval", 0.01), ("max_interval", 0.05)):
+            patcher = patch.object(SpotRequestTracker, attr, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def make_tracker(self, client):
+        tracker = SpotRequestTracker(client=client, region_name="eu-west-1")
+        tracker.start()
+        return tracker
+
+    def test_requests_of_many_threads_are_described_together(self):
+        client = FakeEC2Client(pending_checks=3)
+        tracker = self.make_tracker(client)
+
+        def wait(idx):
+            request_ids = [f"sir-{idx}-{node}" for node in range(5)]
+            return tracker.wait_for_spot_requests(request_ids, timeout=10).result(timeout=10)
+
+        with ThreadPoolExecutor(max_workers=20) as executor:
+            results = list(executor.map(wait, range(20)))
+        for idx, (status, resp) in enumerate(results):
+            self.assertTrue(status)
+            self.assertEqual([req["InstanceId"] for req in resp["SpotInstanceRequests"]],
+                             [f"i-{idx}-{node}" for node in range(5)])
+        self.assertLess(client.calls["describe_spot_instance_requests"], 20)
+        self.assertEqual(tracker.api_calls["describe_spot_instance_requests"],
+                         client.calls["describe_spot_instance_requests"])
+
+    def test_capacity_error_fails_fast(self):
+        tracker = self.make_tracker(FakeEC2Client(pending_checks=0, status_code=SPOT_CAPACITY_NOT_AVAILABLE_ERROR))
+        self.assertEqual(tracker.wait_for_spot_requests(["sir-1"], timeout=60).result(timeout=5),
+                         (False, SPOT_CAPACITY_NOT_AVAILABLE_ERROR))
+
+    def test_timeout(self):
+        tracker = self.make_tracker(FakeEC2Client(pending_checks=1000))
+        status, resp = tracker.wait_for_spot_requests(["sir-1"], timeout=0.2).result(timeout=5)
+        self.assertFalse(status)
+        self.assertEqual(resp["SpotInstanceRequests"][0]["State"], "open")
+
+    def test_failed_check_doesnt_stall_other_requests(self):
+        tracker = self.make_tracker(FakeEC2Client(pending_checks=0, fleet_status=SPOT_STATUS_UNEXPECTED_ERROR))
+        fleet_result = tracker.wait_for_fleet_request("sfr-1", timeout=0.3)
+        self.assertTrue(tracker.wait_for_spot_requests(["sir-1"], timeout=10).result(timeout=5)[0])
+        self.assertEqual(fleet_result.result(timeout=5), (False, None))
+
+    def test_fleet_request(self):
+        tracker = self.make_tracker(FakeEC2Client(pending_checks=2))
+        status, resp = tracker.wait_for_fleet_request("sfr-1", timeout=10).result(timeout=5)
+        self.assertTrue(status)
+        self.assertEqual(resp["SpotFleetRequestConfigs"][0]["ActivityStatus"], STATUS_FULFILLED)
+
+
+class EC2ClientWarpperSpotTest(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.dict(ec2_client._SPOT_REQUEST_TRACKERS, clear=True)  # pylint: disable=protected-access
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(SpotRequestTracker, "min_interval", 0.01)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_ec2(self, client, timeout=10):
+        ec2 = EC2ClientWarpper(region_name="us-east-1", timeout=timeout)
+        ec2._client = client  # pylint: disable=protected-access
+        return ec2
+
+    def test_wait_for_request_done(self):
+        ec2 = self.make_ec2(FakeEC2Client(pending_checks=1))
+        instance_ids, _ = ec2._wait_for_request_done(["sir-1", "sir-2", "sir-3"])  # pylint: disable=protected-access
+        self.assertEqual(instance_ids, ["i-1", "i-2", "i-3"])
+
+    def test_tracker_doesnt_report(self):
+        client = FakeEC2Client(pending_checks=0)
+        with patch.object(ec2_client, "SPOT_REQUEST_TRACKER_MARGIN", 0), patch.object(SpotRequestTracker, "start"):
+            ec2 = self.make_ec2(client, timeout=0.1)
+            instance_ids, resp = ec2._wait_for_request_done(["sir-1"])  # pylint: disable=protected-access
+        self.assertEqual((instance_ids, resp), ([], None))
+        self.assertEqual(client.cancelled, ["sir-1"])
+
+    def test_timed_out_requests_are_cancelled(self):
+        client = FakeEC2Client(pending_checks=1000)
+        instance_ids, _ = self.make_ec2(client, timeout=0.1)._wait_for_request_done(  # pylint: disable=protected-access
+            ["sir-1"])
+        self.assertEqual(instance_ids, [])
+        self.assertEqual(client.cancelled, ["sir-1"])
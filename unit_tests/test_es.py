@@ -0,0 +1,124 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import os
+import json
+import tempfile
+import unittest
+
+import elasticsearch
+
+from sdcm.es import ESBulkWriter
+
+
+class FakeES:  # pylint: disable=too-few-public-methods
+    def __init__(self):
+        self.available = True
+        self.status_code = None
+        self.bulks = []
+
+    def bulk(self, body):
+        if not self.available:
+            raise elasticsearch.ConnectionError("N/A", "connection refused", None)
+        if self.status_code:
+            raise elasticsearch.TransportError(self.status_code, "error", {})
+        self.bulks.append(body)
+        return {"errors": False, "items": []}
+
+
+class TestESBulkWriter(unittest.TestCase):
+    def setUp(self):
+        self.es = FakeES()
+        self.tmpdir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.retry_file = os.path.join(self.tmpdir.name, "retry.jsonl")
+        self.writer = ESBulkWriter(es_client=self.es, retry_file=self.retry_file, flush_interval=0.1)
+
+    def tearDown(self):
+        self.writer.stop(timeout=5)
+        self.tmpdir.cleanup()
+
+    def test_append_sends_only_new_item(self):
+        data = {"start": 1, "error": ValueError("boom")}
+        self.writer.append(index="idx", doc_type="test_stats", doc_id="1",
+                           path=["nemesis", "disrupt_x", "runs"], item=data, counter="cnt")
+        data["start"] = 2  # changes after the call shouldn't affect the queued action
+        self.assertTrue(self.writer.flush(timeout=5))
+        meta, source = self.es.bulks[0]
+        self.assertEqual(meta["update"]["_id"], "1")
+        self.assertEqual(source["script"]["params"],
+                         {"path": ["nemesis", "disrupt_x", "runs"], "item": {"start": 1, "error": "boom"},
+                          "counter": "cnt"})
+
+    def test_actions_kept_while_es_is_down(self):
+        self.es.available = False
+        self.writer.update(index="idx", doc_type="test_stats", doc_id="1", body={"a": 1})
+        self.writer.index(index="nemesis_data", doc_type="nemesis", body={"b": 2})
+        self.assertTrue(self.writer.flush(timeout=5))
+        self.assertEqual(self.es.bulks, [])
+        with open(self.retry_file, encoding="utf-8") as retry_file:
+            self.assertEqual(len(retry_file.readlines()), 2)
+
+        self.es.available = True
+        self.writer.update(index="idx", doc_type="test_stats", doc_id="1", body={"c": 3})
+        self.assertTrue(self.writer.flush(timeout=5))
+        self.assertEqual(len(self.es.bulks), 1)
+        self.assertEqual([json.dumps(line) for line in self.es.bulks[0][1::2]],
+                         ['{"doc": {"a": 1}, "doc_as_upsert": false}', '{"b": 2}',
+                          '{"doc": {"c": 3}, "doc_as_upsert": false}'])
+        self.assertFalse(os.path.exists(self.retry_file))
+
+    def stored_actions(self):
+        if not os.path.exists(self.retry_file):
+            return 0
+        with open(self.retry_file, encoding="utf-8") as retry_file:
+            return len(retry_file.readlines())
+
+    def test_transient_errors_are_retried(self):
+        for status_code in (429, 503):
+            self.es.status_code = status_code
+            self.writer.index(index="nemesis_data", doc_type="nemesis", body={"status": status_code})
+            self.assertTrue(self.writer.flush(timeout=5))
+        self.assertEqual(self.stored_actions(), 2)
+
+        self.es.status_code = None
+        self.writer.index(index="nemesis_data", doc_type="nemesis", body={"status": 200})
+        self.assertTrue(self.writer.flush(timeout=5))
+        self.assertEqual([line["status"] for line in self.es.bulks[0][1::2]], [429, 503, 200])
+
+    def test_rejected_actions_are_dropped(self):
+        self.es.status_code = 400
+        self.writer.index(index="nemesis_data", doc_type="nemesis", body={"b": 2})
+        self.assertTrue(self.writer.flush(timeout=5))
+        self.assertEqual(self.stored_actions(), 0)
+        self.es.status_code = None
+        self.writer.index(index="nemesis_data", doc_type="nemesis", body={"c": 3})
+        self.assertTrue(self.writer.flush(timeout=5))
+        self.assertEqual([line for bulk in self.es.bulks for line in bulk[1::2]], [{"c": 3}])
+
+    def test_retry_file_is_replayed_in_batches_and_capped(self):
+        self.writer.stop(timeout=5)
+        self.writer = ESBulkWriter(es_client=self.es, retry_file=self.retry_file, flush_interval=0.1,
+                                   max_batch_size=2, max_retry_file_size=1000)
+        self.es.available = False
+        for idx in range(50):
+            self.writer.index(index="nemesis_data", doc_type="nemesis", body={"idx": idx})
+        self.assertTrue(self.writer.flush(timeout=5))
+        self.assertLessEqual(os.path.getsize(self.retry_file), 1000)
+        stored = self.stored_actions()
+        self.assertTrue(0 < stored < 50)
+
+        self.es.available = True
+        self.writer.index(index="nemesis_data", doc_type="nemesis", body={"idx": 50})
+        self.assertTrue(self.writer.flush(timeout=5))
+        self.assertTrue(all(len(bulk) <= 4 for bulk in self.es.bulks))
+        self.assertEqual([line["idx"] for bulk in self.es.bulks for line in bulk[1::2]], [*range(stored), 50])
@@ -0,0 +1,163 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import os
+import gzip
+import time
+import shutil
+import logging
+import tempfile
+import threading
+import unittest
+from collections import Counter
+from functools import partial
+from unittest.mock import patch
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+from sdcm.utils.http_cache import HttpMetadataCache
+from sdcm.utils.version_utils import get_branch_version_from_centos_repository
+
+LOGGER = logging.getLogger(__name__)
+
+PRIMARY_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<metadata xmlns="http://linux.duke.edu/metadata/common" xmlns:rpm="http://linux.duke.edu/metadata/rpm" packages="3">
+<package type="rpm"><name>scylla</name><version epoch="0" ver="4.4.3" rel="0.20210621.1"/>
+  <format><rpm:provides><rpm:entry name="scylla" ver="9.9.9"/></rpm:provides></format></package>
+<package type="rpm"><name>scylla-server</name><version epoch="0" ver="4.4.3" rel="0.20210621.1"/></package>
+<package type="rpm"><name>scylla-jmx</name><version epoch="0" ver="4.4.2" rel="0.20210601.1"/></package>
+</metadata>
+"""
+REPOMD_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<repomd xmlns="http://linux.duke.edu/metadata/repo">
+  <data type="primary">
+    <location href="repodata/abc-primary.xml.gz"/>
+  </data>
+</repomd>
+"""
+
+
+class RepoRequestHandler(SimpleHTTPRequestHandler):
+    """Serve files of a directory with some latency, send ETag, count responses by status."""
+
+    latency = 0.0
+    statuses = Counter()
+    lock = threading.Lock()
+
+    def send_head(self):
+        time.sleep(self.latency)
+        path = self.translate_path(self.path)
+        if os.path.isfile(path):
+            etag = f'"{os.stat(path).st_mtime_ns}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                return None
+        return super().send_head()
+
+    def send_response(self, code, message=None):
+        with self.lock:
+            self.statuses[code] += 1
+        super().send_response(code, message)
+
+    def end_headers(self):
+        path = self.translate_path(self.path)
+        if os.path.isfile(path):
+            self.send_header("ETag", f'"{os.stat(path).st_mtime_ns}"')
+        super().end_headers()
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class HttpMetadataCacheTest(unittest.TestCase):
+    files_count = 16
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.cache_dir = os.path.join(self.root, "cache")
+        self.www_dir = os.path.join(self.root, "www")
+        os.makedirs(os.path.join(self.www_dir, "repodata"))
+        for idx in range(self.files_count):
+            with open(os.path.join(self.www_dir, f"Packages.{idx}"), "wb") as packages_file:
+                packages_file.write(f"Package: scylla\nVersion: 4.4.{idx}-0.20210621\n".encode() * 1000)
+        with open(os.path.join(self.www_dir, "repodata", "repomd.xml"), "wb") as repomd_file:
+            repomd_file.write(REPOMD_XML)
+        with open(os.path.join(self.www_dir, "repodata", "abc-primary.xml.gz"), "wb") as primary_file:
+            primary_file.write(gzip.compress(PRIMARY_XML))
+
+        RepoRequestHandler.statuses = Counter()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), partial(RepoRequestHandler, directory=self.www_dir))
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def url(self, idx):
+        return f"{self.base_url}/Packages.{idx}"
+
+    def test_fresh_cache_is_shared(self):
+        content = HttpMetadataCache(self.cache_dir).get(self.url(0))
+        self.assertTrue(content.startswith(b"Package: scylla\nVersion: 4.4.0"))
+        cache = HttpMetadataCache(self.cache_dir)
+        self.assertEqual(cache.get(self.url(0)), content)
+        self.assertEqual(RepoRequestHandler.statuses, {200: 1})
+        self.assertEqual(cache.stats, {"hits": 1})
+
+    def test_revalidation(self):
+        HttpMetadataCache(self.cache_dir).get(self.url(0))
+        cache = HttpMetadataCache(self.cache_dir)
+        cache.max_age = 0
+        cache.get(self.url(0))
+        self.assertEqual(cache.stats, {"revalidated": 1})
+
+        with open(os.path.join(self.www_dir, "Packages.0"), "wb") as packages_file:
+            packages_file.write(b"Package: scylla\nVersion: 5.0.0-0.20220101\n")
+        os.utime(os.path.join(self.www_dir, "Packages.0"), (time.time() + 10, time.time() + 10))
+        self.assertEqual(cache.get(self.url(0)), b"Package: scylla\nVersion: 5.0.0-0.20220101\n")
+        self.assertEqual(cache.stats, {"revalidated": 1, "downloads": 1})
+        self.assertEqual(RepoRequestHandler.statuses, {200: 2, 304: 1})
+
+    def test_missing_url(self):
+        with self.assertRaisesRegex(ValueError, "is incorrect"):
+            HttpMetadataCache(self.cache_dir).get(f"{self.base_url}/no-such-file.repo")
+
+    def test_centos_repository_version(self):
+        with patch("sdcm.utils.version_utils.get_http_cache", return_value=HttpMetadataCache(self.cache_dir)):
+            self.assertEqual(get_branch_version_from_centos_repository([f"{self.base_url}/repodata/repomd.xml"]),
+                             "4.4.3")
+
+    def test_benchmark(self):
+        """Fetch repo metadata with 200ms latency: cold (concurrent), warm, and revalidated after expiration."""
+        RepoRequestHandler.latency = 0.2
+        self.addCleanup(setattr, RepoRequestHandler, "latency", 0.0)
+        urls = [self.url(idx) for idx in range(self.files_count)]
+
+        def timed(cache):
+            start_time = time.perf_counter()
+            contents = cache.get_many(urls)
+            self.assertEqual(len(contents), self.files_count)
+            return time.perf_counter() - start_time
+
+        cold = timed(HttpMetadataCache(self.cache_dir))
+        warm = timed(HttpMetadataCache(self.cache_dir))
+        expired_cache = HttpMetadataCache(self.cache_dir)
+        expired_cache.max_age = 0
+        revalidated = timed(expired_cache)
+        LOGGER.info("%s URLs: cold %.2fs, warm %.3fs, revalidated %.2fs (sequential cold fetch would take %.1fs)",
+                    self.files_count, cold, warm, revalidated, self.files_count * RepoRequestHandler.latency)
+
+        self.assertLess(cold, self.files_count * RepoRequestHandler.latency / 2)
+        self.assertLess(warm, RepoRequestHandler.latency)
+        self.assertEqual(RepoRequestHandler.statuses, {200: self.files_count, 304: self.files_count})
+        self.assertEqual(expired_cache.stats, {"revalidated": self.files_count})
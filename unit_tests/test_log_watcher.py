@@ -0,0 +1,147 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import os
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+
+from sdcm.utils.log_watcher import LogWatcher
+
+
+class LogReader:
+    """Read complete lines of a log file in batches, like `BaseNode._read_new_db_log_lines' does."""
+
+    def __init__(self, path):
+        self.path = path
+        self.position = 0
+        self.lines = []
+        self.batches = []
+        self.got_lines = threading.Event()
+
+    def __call__(self, max_lines):
+        if not os.path.exists(self.path):
+            return False
+        batch = []
+        with open(self.path) as log_file:
+            log_file.seek(self.position)
+            for line in iter(log_file.readline, ''):
+                if not line.endswith('\n'):
+                    break
+                batch.append(line.rstrip('\n'))
+                self.position = log_file.tell()
+                if len(batch) == max_lines:
+                    break
+        if batch:
+            self.batches.append(batch)
+            self.lines.extend(batch)
+            self.got_lines.set()
+        return self.position < os.path.getsize(self.path) and len(batch) == max_lines
+
+
+class LogWatcherTestBase(unittest.TestCase):
+    use_inotify = True
+
+    def setUp(self):
+        self.logdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.logdir)
+        self.watcher = LogWatcher(use_inotify=self.use_inotify, poll_interval=0.2, batch_lines=3, coalesce_delay=0)
+        self.watcher.start()
+        self.addCleanup(self.watcher.stop, 5)
+
+    def make_log(self, name, lines=()):
+        path = os.path.join(self.logdir, name, "system.log")
+        os.makedirs(os.path.dirname(path))
+        with open(path, "w") as log_file:
+            log_file.writelines(f"{line}\n" for line in lines)
+        return path
+
+    @staticmethod
+    def append(path, data):
+        with open(path, "a") as log_file:
+            log_file.write(data)
+
+    def wait_for_lines(self, reader, count, timeout=5):
+        end_time = time.perf_counter() + timeout
+        while len(reader.lines) < count and time.perf_counter() < end_time:
+            reader.got_lines.wait(0.05)
+            reader.got_lines.clear()
+        self.assertEqual(len(reader.lines), count)
+
+    def test_existing_lines_read_in_bounded_batches(self):
+        path = self.make_log("node1", [f"line {i}" for i in range(8)])
+        reader = LogReader(path)
+        self.watcher.watch("node1", path, reader)
+        self.wait_for_lines(reader, 8)
+        self.assertEqual([len(batch) for batch in reader.batches], [3, 3, 2])
+        self.assertEqual(reader.lines, [f"line {i}" for i in range(8)])
+
+    def test_appended_lines_of_many_logs(self):
+        readers = {}
+        for name in ("node1", "node2"):
+            readers[name] = LogReader(self.make_log(name))
+            self.watcher.watch(name, readers[name].path, readers[name])
+        self.append(readers["node2"].path, "abort\n")
+        self.wait_for_lines(readers["node2"], 1)
+        self.assertEqual(readers["node1"].lines, [])
+
+        self.append(readers["node1"].path, "segfault\nbad_alloc")
+        self.wait_for_lines(readers["node1"], 1)
+        self.append(readers["node1"].path, " happened\n")
+        self.wait_for_lines(readers["node1"], 2)
+        self.assertEqual(readers["node1"].lines, ["segfault", "bad_alloc happened"])
+
+        stats = self.watcher.stats()
+        self.assertGreater(stats["node1"].catch_ups, 0)
+        self.assertLess(stats["node1"].max_lag, 5)
+
+    def test_unwatch_reads_rest_of_log(self):
+        path = self.make_log("node1")
+        reader = LogReader(path)
+        self.watcher.watch("node1", path, reader)
+        self.append(path, "".join(f"line {i}\n" for i in range(10)))
+        stats = self.watcher.unwatch("node1")
+        self.assertEqual(len(reader.lines), 10)
+        self.assertGreater(stats.batches, 0)
+        self.assertNotIn("node1", self.watcher.stats())
+
+    def test_unwatch_log_without_trailing_newline(self):
+        path = self.make_log("node1", ["line 0", "line 1"])
+        self.append(path, "line 2 is still being wri")
+        reader = LogReader(path)
+        self.watcher.watch("node1", path, reader)
+        self.wait_for_lines(reader, 2)
+        self.watcher.unwatch("node1")
+        self.assertEqual(reader.lines, ["line 0", "line 1"])
+
+    def test_log_created_after_watch(self):
+        path = os.path.join(self.logdir, "node1", "system.log")
+        reader = LogReader(path)
+        self.watcher.watch("node1", path, reader)
+        time.sleep(0.5)
+        self.make_log("node1", ["started"])
+        self.wait_for_lines(reader, 1)
+
+
+class LogWatcherInotifyTest(LogWatcherTestBase):
+    def test_uses_inotify(self):
+        self.assertTrue(self.watcher.uses_inotify)
+
+
+class LogWatcherPollingTest(LogWatcherTestBase):
+    use_inotify = False
+
+    def test_uses_polling(self):
+        self.assertFalse(self.watcher.uses_inotify)
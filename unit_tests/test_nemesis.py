@@ -1,6 +1,12 @@
+import json
+import time
+import logging
+import threading
 from collections import namedtuple
+from unittest.mock import MagicMock
 import sdcm.utils.cloud_monitor  # pylint: disable=unused-import # import only to avoid cyclic dependency
-from sdcm.nemesis import Nemesis, CategoricalMonkey
+from sdcm.nemesis import Nemesis, CategoricalMonkey, get_disrupt_methods_registry, reset_disrupt_methods_registry
+from sdcm.cluster import BaseScyllaCluster
 from sdcm.cluster_k8s.mini_k8s import LocalMinimalScyllaPodCluster
 from sdcm.cluster_k8s.mini_k8s import RemoteMinimalScyllaPodCluster
 from sdcm.cluster_k8s.gke import GkeScyllaPodCluster
@@ -129,3 +135,157 @@ def test_categorical_monkey():
     nemesis._random_disrupt()
 
     assert nemesis.runs in ([1, 2, 1], [1, 2, 2])
+
+
+class FakeHealthCheckCluster:
+    def __init__(self, params, health_check_time=0.0):
+        self.params = params
+        self.health_check_time = health_check_time
+        self.checks = []
+        self.running = 0
+        self.max_running = 0
+
+    def check_cluster_health(self, budget=None, first_nodes=()):
+        self.checks.append((budget, list(first_nodes)))
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        time.sleep(self.health_check_time)
+        self.running -= 1
+
+
+def test_disruption_checks():
+    params = dict(PARAMS, cluster_health_check_budget=0, cluster_health_check_min_interval=600)
+    cluster = FakeHealthCheckCluster(params=params)
+    nemesis = FakeNemesis(FakeTester(params=params, db_cluster=cluster), None)
+    nemesis.target_node = "node-2"
+
+    timing = nemesis.run_disruption_checks(phase="pre")
+    assert set(timing) == {"health_check", "data_validation", "duration"}
+    assert cluster.checks == [(None, ["node-2"])]
+    assert "skipped" in nemesis.run_disruption_checks(phase="pre")
+    assert "skipped" not in nemesis.run_disruption_checks(phase="post")
+    assert len(cluster.checks) == 2
+
+
+def test_disruption_checks_budget():
+    params = dict(PARAMS, cluster_health_check_budget=1, cluster_health_check_min_interval=0)
+    cluster = FakeHealthCheckCluster(params=params, health_check_time=3)
+    nemesis = FakeNemesis(FakeTester(params=params, db_cluster=cluster), None)
+
+    start_time = time.perf_counter()
+    timing = nemesis.run_disruption_checks(phase="pre")
+    assert time.perf_counter() - start_time < 2
+    assert timing["over_budget"] == ["health_check"]
+    assert cluster.checks == [(1, [None])]
+
+
+def test_disruption_checks_dont_overlap():
+    params = dict(PARAMS, cluster_health_check_budget=1, cluster_health_check_min_interval=0)
+    cluster = FakeHealthCheckCluster(params=params, health_check_time=1.5)
+    nemesis = FakeNemesis(FakeTester(params=params, db_cluster=cluster), None)
+
+    assert nemesis.run_disruption_checks(phase="post")["over_budget"] == ["health_check"]
+    nemesis.run_disruption_checks(phase="pre")  # waits for the health check of the previous disruption
+    assert cluster.max_running == 1
+    assert len(cluster.checks) == 2
+
+    executor = nemesis._checks_executor
+    nemesis.stop_disruption_checks()
+    assert executor._shutdown and nemesis._checks_executor is None
+
+
+def test_check_nodes_health():
+    class FakeNode:  # pylint: disable=too-few-public-methods
+        def __init__(self, name):
+            self.name = name
+
+        def check_node_health(self):
+            checked.append(self.name)
+
+    checked = []
+    cluster = BaseScyllaCluster.__new__(BaseScyllaCluster)
+    BaseScyllaCluster.__init__(cluster)
+    cluster.nodes = [FakeNode(f"node-{idx}") for idx in range(4)]
+    cluster.health_check_max_workers = 1
+    cluster._node_health_checked_at = {"node-0": 2, "node-1": 1}
+
+    assert not cluster.check_nodes_health(first_nodes=[cluster.nodes[3]])
+    assert checked == ["node-3", "node-2", "node-1", "node-0"]
+
+
+def test_check_nodes_health_skips_running_checks(events):  # pylint: disable=redefined-outer-name,unused-argument
+    class FakeNode:  # pylint: disable=too-few-public-methods
+        def __init__(self, name):
+            self.name = name
+
+        def check_node_health(self):
+            if self.name == "node-0":
+                release.wait(10)
+            checked.append(self.name)
+
+    checked = []
+    release = threading.Event()
+    cluster = BaseScyllaCluster.__new__(BaseScyllaCluster)
+    BaseScyllaCluster.__init__(cluster)
+    cluster.nodes = [FakeNode(f"node-{idx}") for idx in range(3)]
+    cluster.health_check_max_workers = 2
+    cluster.log = logging.getLogger(__name__)
+    executor_threads = set(threading.enumerate())
+
+    assert [node.name for node in cluster.check_nodes_health(budget=0.5)] == ["node-0"]
+    assert [node.name for node in cluster.check_nodes_health(budget=0.5)] == ["node-0"]
+    assert sorted(checked) == ["node-1", "node-1", "node-2", "node-2"]
+    assert len(set(threading.enumerate()) - executor_threads) <= cluster.health_check_max_workers
+
+    release.set()
+    cluster._node_health_checks["node-0"].result(timeout=5)
+    cluster.stop_nemesis()
+    assert not cluster.check_nodes_health(budget=5)
+    assert checked.count("node-0") == 2
+
+
+def test_stop_nemesis_stops_traffic_baseline(events):  # pylint: disable=redefined-outer-name,unused-argument
+    traffic_baseline = MagicMock()
+    cluster = BaseScyllaCluster.__new__(BaseScyllaCluster)
+    BaseScyllaCluster.__init__(cluster)
+    cluster.log = logging.getLogger(__name__)
+    cluster.traffic_baseline = traffic_baseline
+
+    cluster.stop_nemesis()
+    traffic_baseline.stop.assert_called_once_with()
+    assert cluster.traffic_baseline is None
+
+
+def test_disrupt_methods_registry():
+    start_time = time.perf_counter()
+    reset_disrupt_methods_registry()
+    registry = get_disrupt_methods_registry()
+    assert time.perf_counter() - start_time < 2, "building of the disrupt methods registry is too slow"
+    assert get_disrupt_methods_registry() is registry
+
+    assert 'disrupt_add_remove_dc' in registry.get_methods_by_flags(disruptive=False)
+    limited = registry.get_methods_by_flags(limited=True)
+    assert limited and set(limited) < {method.name for method in registry.methods}
+    assert all(method["limited"] for method in json.loads(registry.to_json(limited=True)))
+    assert 'disrupt_add_remove_dc' in registry.get_disrupt_method_names(AddRemoveDCMonkey)
+
+    class NewMonkey(FakeNemesis):  # pylint: disable=unused-variable
+        def disrupt(self):
+            self.disrupt_new_monkey()
+
+        def disrupt_new_monkey(self):
+            pass
+
+    assert 'disrupt_new_monkey' in get_disrupt_methods_registry().get_methods_by_flags()
+
+
+def test_disrupt_methods_are_wrapped_once():
+    class WrappedMonkey(Nemesis):
+        def disrupt_wrapped(self):
+            pass
+
+    Nemesis.__new__(WrappedMonkey, None, None)
+    wrapped = WrappedMonkey.disrupt_wrapped
+    Nemesis.__new__(WrappedMonkey, None, None)
+    assert WrappedMonkey.disrupt_wrapped is wrapped
+    assert not getattr(wrapped.__wrapped__, "is_disrupt_method_wrapper", False)
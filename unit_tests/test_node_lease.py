@@ -0,0 +1,88 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import threading
+import unittest
+
+from sdcm.utils.node_lease import LeaseClass, NodeLeaseManager, NodeLeaseTimeout
+
+
+class FakeNode:  # pylint: disable=too-few-public-methods
+    def __init__(self, name, dc_idx=0, rack=0):
+        self.name = name
+        self.dc_idx = dc_idx
+        self.rack = rack
+        self.running_nemesis = None
+
+
+class NodeLeaseManagerTest(unittest.TestCase):
+    def setUp(self):
+        self.nodes = [FakeNode("node-1", rack=0), FakeNode("node-2", rack=0), FakeNode("node-3", rack=1)]
+        self.manager = NodeLeaseManager()
+        self.manager.poll_interval = 0.05
+
+    def candidates(self):
+        return [node for node in self.nodes if not node.running_nemesis]
+
+    def acquire(self, owner, lease_class=LeaseClass.LOCAL_RESTART, **kwargs):
+        return self.manager.acquire(owner=owner, candidates=self.candidates, lease_class=lease_class,
+                                    choose=lambda nodes: nodes[0], **kwargs)
+
+    def test_node_is_leased_once(self):
+        leases = [self.acquire(f"nemesis-{idx}", lease_class=LeaseClass.SCHEMA_ONLY) for idx in range(3)]
+        self.assertEqual([lease.node for lease in leases], self.nodes)
+        self.assertEqual(self.nodes[0].running_nemesis, "nemesis-0")
+        with self.assertRaises(NodeLeaseTimeout):
+            self.acquire("nemesis-3", lease_class=LeaseClass.SCHEMA_ONLY)
+        self.manager.release(leases[0])
+        self.assertIsNone(self.nodes[0].running_nemesis)
+        self.assertIs(self.acquire("nemesis-3", lease_class=LeaseClass.SCHEMA_ONLY).node, self.nodes[0])
+
+    def test_conflict_scopes(self):
+        self.acquire("restart")
+        # Other node in the same rack can't be restarted, the other rack can.
+        self.assertIs(self.acquire("restart-2").node, self.nodes[2])
+        self.assertIsNotNone(self.manager.conflicting_lease(self.nodes[1], LeaseClass.LOCAL_RESTART))
+        self.assertIsNone(self.manager.conflicting_lease(self.nodes[1], LeaseClass.SCHEMA_ONLY))
+        self.assertIsNotNone(self.manager.conflicting_lease(self.nodes[1], LeaseClass.TOPOLOGY_CHANGE))
+
+        manager = NodeLeaseManager()
+        manager.acquire(owner="decommission", candidates=lambda: self.nodes[2:], lease_class=LeaseClass.TOPOLOGY_CHANGE)
+        for lease_class in (LeaseClass.TOPOLOGY_CHANGE, LeaseClass.LOCAL_RESTART):
+            self.assertIsNotNone(manager.conflicting_lease(self.nodes[0], lease_class))
+        self.assertIsNone(manager.conflicting_lease(self.nodes[0], LeaseClass.SCHEMA_ONLY))
+
+    def test_single_rack_restarts_in_parallel(self):
+        self.nodes = [FakeNode(f"node-{idx}") for idx in range(4)]
+        leases = [self.acquire(f"restart-{idx}") for idx in range(4)]
+        self.assertEqual([lease.node for lease in leases], self.nodes)
+        # Topology changes still exclude restarts in the whole cluster.
+        self.manager.release(leases[0])
+        self.assertIsNotNone(self.manager.conflicting_lease(self.nodes[0], LeaseClass.TOPOLOGY_CHANGE))
+
+    def test_wait_for_release(self):
+        lease = self.acquire("decommission", lease_class=LeaseClass.TOPOLOGY_CHANGE)
+        threading.Timer(0.2, self.manager.release, args=(lease, )).start()
+        second = self.acquire("restart", timeout=10)
+        self.assertIs(second.node, self.nodes[0])
+        self.assertGreater(second.wait_time, 0.1)
+        self.assertEqual(len(self.manager.wait_times[LeaseClass.LOCAL_RESTART]), 1)
+        self.assertIn("local_restart: 1 leases", self.manager.summary())
+
+    def test_stop_event(self):
+        self.acquire("decommission", lease_class=LeaseClass.TOPOLOGY_CHANGE)
+        stop_event = threading.Event()
+        threading.Timer(0.1, stop_event.set).start()
+        with self.assertRaisesRegex(NodeLeaseTimeout, "decommission on node-1"):
+            self.acquire("restart", timeout=60, stop_event=stop_event)
+        self.assertEqual(len(self.manager.wait_times[LeaseClass.LOCAL_RESTART]), 1)
@@ -0,0 +1,190 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from functools import partial
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
+
+from sdcm.utils import prepare_region
+from sdcm.utils.prepare_region import (AwsRegion, RegionStep, RegionPreparationError, RegionPreparationLog,
+                                       plan_aws_regions, prepare_aws_regions)
+
+REGION = "eu-west-1"
+STEP_NAMES = ("vpc", "subnet", "igw", "rt", "sg")
+
+
+class InMemoryRegion(AwsRegion):
+    """Region with the same dependencies between the steps as AwsRegion, but resources are kept in a dict."""
+
+    def __init__(self, region_name=REGION, existing=None, failing=()):
+        super().__init__(region_name)
+        self.existing = {} if existing is None else existing
+        self.failing = set(failing)
+        self.applied = []
+
+    def _apply(self, name):
+        self.applied.append(name)
+        if name in self.failing:
+            raise RuntimeError("API is down")
+        return self.existing.setdefault(name, f"{name}-{self.region_name}")
+
+    def steps(self):
+        depends_on = {"subnet": ("vpc", ), "igw": ("vpc", ), "rt": ("igw", "subnet"), "sg": ("vpc", )}
+        return [RegionStep(name=name, find=partial(self.existing.get, name), apply=partial(self._apply, name),
+                           depends_on=depends_on.get(name, ())) for name in STEP_NAMES]
+
+
+class FakeRouteTable:
+    def __init__(self, route_table_id="rtb-1"):
+        self.route_table_id = route_table_id
+        self.tags = []
+        self.routes_attribute = [{"DestinationCidrBlock": "10.0.0.0/16", "GatewayId": "local"}]
+        self.associations_attribute = [{"Main": True, "RouteTableId": route_table_id}]
+
+    def create_tags(self, Tags):  # pylint: disable=invalid-name
+        self.tags.extend(Tags)
+
+    def create_route(self, GatewayId, **destination):  # pylint: disable=invalid-name
+        self.routes_attribute.append(dict(destination, GatewayId=GatewayId))
+
+    def associate_with_subnet(self, SubnetId):  # pylint: disable=invalid-name
+        self.associations_attribute.append({"Main": False, "RouteTableId": self.route_table_id, "SubnetId": SubnetId})
+
+
+class FakeNetworkRegion(AwsRegion):
+    availability_zones = ["eu-west-1a", "eu-west-1b"]
+
+    def __init__(self, route_table):
+        super().__init__(REGION)
+        self.main_route_table = route_table
+
+    @property
+    def sct_vpc(self):
+        return SimpleNamespace(route_tables=SimpleNamespace(all=lambda: [self.main_route_table]))
+
+    @property
+    def sct_internet_gateway(self):
+        return SimpleNamespace(internet_gateway_id="igw-1")
+
+    @property
+    def sct_route_table(self):
+        if {"Key": "Name", "Value": self.ROUTE_TABLE_NAME} in self.main_route_table.tags:
+            return self.main_route_table
+        return None
+
+    def sct_subnet_id(self, region_az):
+        return f"subnet-{region_az}"
+
+
+class PrepareRegionTestBase(unittest.TestCase):
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.log_dir)
+        for target, value in (("PREPARE_REGION_LOG_DIR", self.log_dir), ("boto3", MagicMock())):
+            patcher = patch.object(prepare_region, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class AwsRegionTest(PrepareRegionTestBase):
+    def test_plan_and_configure(self):
+        aws_region = InMemoryRegion()
+        self.assertEqual(aws_region.plan(), [(name, None) for name in STEP_NAMES])
+
+        aws_region.configure()
+
+        plan = dict(InMemoryRegion(existing=aws_region.existing).plan())
+        self.assertEqual(plan, {name: f"{name}-{REGION}" for name in STEP_NAMES})
+        with open(os.path.join(self.log_dir, f"aws-{REGION}.json"), encoding="utf-8") as log_file:
+            execution_log = json.load(log_file)
+        self.assertEqual(execution_log["status"], "completed")
+        self.assertEqual({name: step["resource_id"] for name, step in execution_log["steps"].items()}, plan)
+
+    def test_resume_after_failure(self):
+        existing = {}
+        with self.assertRaisesRegex(RegionPreparationError, "resume from the failed step: API is down"):
+            InMemoryRegion(existing=existing, failing={"sg"}).configure()
+        execution_log = RegionPreparationLog(REGION)
+        self.assertEqual(execution_log.status, "failed")
+        self.assertIn("rt", execution_log.done_steps())
+        self.assertNotIn("sg", execution_log.done_steps())
+
+        aws_region = InMemoryRegion(existing=existing)
+        aws_region.configure()
+        self.assertEqual(aws_region.applied, ["sg"])
+        self.assertEqual(RegionPreparationLog(REGION).done_steps(), {})  # completed, the next run starts from scratch
+
+    def test_resume_redoes_steps_of_deleted_resources(self):
+        existing = {}
+        with self.assertRaises(RegionPreparationError):
+            InMemoryRegion(existing=existing, failing={"sg"}).configure()
+        del existing["igw"]
+
+        aws_region = InMemoryRegion(existing=existing)
+        aws_region.configure()
+        self.assertEqual(sorted(aws_region.applied), ["igw", "sg"])
+        self.assertEqual(set(existing), set(STEP_NAMES))
+
+    def test_dependent_steps_are_not_done(self):
+        aws_region = InMemoryRegion(failing={"igw"})
+        with self.assertRaises(RegionPreparationError):
+            aws_region.configure()
+        self.assertNotIn("rt", aws_region.applied)
+        self.assertEqual(set(RegionPreparationLog(REGION).done_steps()), {"vpc", "subnet", "sg"})
+
+    def test_all_regions(self):
+        regions = ["eu-west-1", "eu-north-1"]
+        stores = {region_name: {} for region_name in regions}
+        with patch.object(prepare_region, "AwsRegion",
+                          lambda region_name: InMemoryRegion(region_name, existing=stores[region_name])):
+            prepare_aws_regions(regions)
+            prepare_aws_regions(regions, fresh=True)  # idempotent
+            for region_name, plan in plan_aws_regions(regions).items():
+                self.assertTrue(all(resource_id for _, resource_id in plan), region_name)
+
+
+class RouteTableTest(PrepareRegionTestBase):
+    def assert_configured(self, route_table):
+        self.assertIn({"DestinationCidrBlock": "0.0.0.0/0", "GatewayId": "igw-1"}, route_table.routes_attribute)
+        self.assertIn({"DestinationIpv6CidrBlock": "::/0", "GatewayId": "igw-1"}, route_table.routes_attribute)
+        self.assertEqual(len(route_table.routes_attribute), 3)
+        self.assertEqual([assoc["SubnetId"] for assoc in route_table.associations_attribute if "SubnetId" in assoc],
+                         ["subnet-eu-west-1a", "subnet-eu-west-1b"])
+
+    def test_configure_route_table(self):
+        aws_region = FakeNetworkRegion(FakeRouteTable())
+        self.assertIsNone(aws_region.sct_route_table_id())
+
+        self.assertEqual(aws_region.configure_route_table(), "rtb-1")
+        self.assert_configured(aws_region.main_route_table)
+        self.assertEqual(aws_region.sct_route_table_id(), "rtb-1")
+
+        aws_region.configure_route_table()  # idempotent
+        self.assert_configured(aws_region.main_route_table)
+
+    def test_configure_partially_configured_route_table(self):
+        route_table = FakeRouteTable()
+        route_table.create_tags(Tags=[{"Key": "Name", "Value": AwsRegion.ROUTE_TABLE_NAME}])
+        route_table.create_route(DestinationCidrBlock="0.0.0.0/0", GatewayId="igw-1")
+        route_table.associate_with_subnet(SubnetId="subnet-eu-west-1a")
+        aws_region = FakeNetworkRegion(route_table)
+        self.assertIsNone(aws_region.sct_route_table_id())
+
+        aws_region.configure_route_table()
+        self.assert_configured(route_table)
+        self.assertEqual(aws_region.sct_route_table_id(), "rtb-1")
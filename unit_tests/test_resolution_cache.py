@@ -0,0 +1,127 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import os
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+import multiprocessing
+from unittest.mock import MagicMock, patch
+
+from sdcm.sct_config import RESOLUTION_TTL, resolution_ttl
+from sdcm.utils.resolution_cache import ResolutionCache, OfflineResolutionError
+
+
+def resolve_versions(cache_file, versions):
+    cache = ResolutionCache(cache_file)
+    for version in versions:
+        cache.resolve("ami", lambda version: f"ami-{version}", version, ttl=60)
+
+
+class ResolutionCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        self.cache_file = os.path.join(self.cache_dir, "sct", "config_resolution.json")
+
+    def test_result_is_shared_by_runs(self):
+        find_ami = MagicMock(return_value="ami-1234")
+        self.assertEqual(ResolutionCache(self.cache_file).resolve("ami", find_ami, "4.4.1", "us-east-1", ttl=60),
+                         "ami-1234")
+        cache = ResolutionCache(self.cache_file)
+        self.assertEqual(cache.resolve("ami", find_ami, "4.4.1", "us-east-1", ttl=60), "ami-1234")
+        find_ami.assert_called_once_with("4.4.1", "us-east-1")
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+
+        cache.resolve("ami", find_ami, "4.4.1", "eu-west-1", ttl=60)
+        find_ami.assert_called_with("4.4.1", "eu-west-1")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_expired_result(self):
+        cache = ResolutionCache(self.cache_file)
+        with patch("time.time", return_value=1000):
+            cache.resolve("repo", lambda url: url + "/1", "http://repo/latest", ttl=60)
+        with patch("time.time", return_value=1059):
+            self.assertEqual(cache.resolve("repo", lambda url: url + "/2", "http://repo/latest", ttl=60),
+                             "http://repo/latest/1")
+        with patch("time.time", return_value=1061):
+            self.assertEqual(cache.resolve("repo", lambda url: url + "/3", "http://repo/latest", ttl=60),
+                             "http://repo/latest/3")
+
+    def test_failed_lookup_is_not_cached(self):
+        cache = ResolutionCache(self.cache_file)
+        with self.assertRaises(ValueError):
+            cache.resolve("ami", MagicMock(side_effect=ValueError("AMI wasn't found")), "99.0.3", ttl=60)
+        self.assertEqual(cache.resolve("ami", lambda version: "ami-1234", "99.0.3", ttl=60), "ami-1234")
+
+    def test_offline(self):
+        with patch("time.time", return_value=1000):
+            ResolutionCache(self.cache_file).resolve("ami", lambda version: "ami-1234", "4.4.1", ttl=60)
+        offline_cache = ResolutionCache(self.cache_file, offline=True)
+        find_ami = MagicMock(return_value="ami-5678")
+        self.assertEqual(offline_cache.resolve("ami", find_ami, "4.4.1", ttl=60), "ami-1234")
+        with self.assertRaises(OfflineResolutionError):
+            offline_cache.resolve("ami", find_ami, "4.4.2", ttl=60)
+        find_ami.assert_not_called()
+
+    def test_resolve_many_concurrently(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def find_ami(version, region):
+            barrier.wait()  # fails unless all lookups run at the same time
+            return f"ami-{version}-{region}"
+
+        regions = ("us-east-1", "eu-west-1", "eu-north-1")
+        cache = ResolutionCache(self.cache_file)
+        self.assertEqual(cache.resolve_many("ami", find_ami, (("4.4.1", region) for region in regions), ttl=60),
+                         [f"ami-4.4.1-{region}" for region in regions])
+
+        start_time = time.perf_counter()
+        self.assertEqual(ResolutionCache(self.cache_file).resolve_many(
+            "ami", MagicMock(side_effect=AssertionError), (("4.4.1", region) for region in regions), ttl=60),
+            [f"ami-4.4.1-{region}" for region in regions])
+        self.assertLess(time.perf_counter() - start_time, 1)
+
+    def test_entries_of_other_processes_are_kept(self):
+        first, second = ResolutionCache(self.cache_file), ResolutionCache(self.cache_file)
+        first.resolve("ami", lambda version: "ami-1", "1", ttl=60)
+        second.resolve("ami", lambda version: "ami-2", "2", ttl=60)
+        cache = ResolutionCache(self.cache_file, offline=True)
+        self.assertEqual([cache.resolve("ami", None, version, ttl=60) for version in "12"], ["ami-1", "ami-2"])
+
+    def test_concurrent_processes(self):
+        processes = [multiprocessing.Process(target=resolve_versions,
+                                             args=(self.cache_file, [f"{idx}.{minor}" for minor in range(20)]))
+                     for idx in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=60)
+        cache = ResolutionCache(self.cache_file, offline=True)
+        for idx in range(4):
+            self.assertEqual([cache.resolve("ami", None, f"{idx}.{minor}", ttl=60) for minor in range(20)],
+                             [f"ami-{idx}.{minor}" for minor in range(20)])
+
+    def test_moving_targets_are_always_looked_up(self):
+        self.assertEqual(resolution_ttl("4.4.1"), RESOLUTION_TTL)
+        for version in ("master:latest", "branch-4.5:all", "latest"):
+            self.assertEqual(resolution_ttl(version), 0)
+
+        ResolutionCache(self.cache_file).resolve("repo", lambda version: "repo-1", "master:latest", ttl=0)
+        self.assertEqual(ResolutionCache(self.cache_file).resolve(
+            "repo", lambda version: "repo-2", "master:latest", ttl=0), "repo-2")
+        # but the last result is still used in offline mode
+        self.assertEqual(ResolutionCache(self.cache_file, offline=True).resolve(
+            "repo", None, "master:latest", ttl=0), "repo-2")
@@ -0,0 +1,115 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import time
+import threading
+import unittest
+
+from sdcm.utils.rolling import RollingExecutor, RollingOperationFailed
+
+
+class FakeNode:  # pylint: disable=too-few-public-methods
+    def __init__(self, name, rack):
+        self.name = name
+        self.rack = rack
+        self.dc_idx = 0
+        self.up = True
+
+
+class FakeClock:
+    @staticmethod
+    def monotonic():
+        return time.monotonic()
+
+    @staticmethod
+    def sleep(seconds):  # pylint: disable=unused-argument
+        time.sleep(0.01)
+
+
+class FakeCluster:
+    def __init__(self, racks=3, nodes_per_rack=4):
+        self.nodes = [FakeNode(f"node-{rack}-{idx}", rack) for rack in range(racks) for idx in range(nodes_per_rack)]
+        self.lock = threading.Lock()
+        self.down = set()
+        self.max_down = 0
+        self.racks_down_together = False
+        self.order = []
+
+    def restart(self, node):
+        with self.lock:
+            self.down.add(node)
+            self.max_down = max(self.max_down, len(self.down))
+            self.racks_down_together |= len({down_node.rack for down_node in self.down}) > 1
+            self.order.append(node.name)
+        time.sleep(0.05)
+        with self.lock:
+            self.down.discard(node)
+
+    def healthy(self, busy_nodes):
+        with self.lock:
+            return not self.down - set(busy_nodes)
+
+
+class RollingExecutorTest(unittest.TestCase):
+    def setUp(self):
+        self.cluster = FakeCluster()
+
+    def run_rolling(self, **kwargs):
+        kwargs.setdefault("operation", self.cluster.restart)
+        return RollingExecutor(name="restart", nodes=self.cluster.nodes, health_check=self.cluster.healthy,
+                               readiness_check=lambda node: node not in self.cluster.down, clock=FakeClock,
+                               **kwargs).run()
+
+    def test_one_node_at_a_time(self):
+        steps = self.run_rolling()
+        self.assertEqual(self.cluster.max_down, 1)
+        self.assertEqual(self.cluster.order, [node.name for node in self.cluster.nodes])
+        self.assertEqual(len(steps), 12)
+        self.assertTrue(all(step.operation >= 0.05 and step.error is None for step in steps))
+
+    def test_concurrency_within_rack(self):
+        start_time = time.perf_counter()
+        self.run_rolling(concurrency=2)
+        self.assertEqual(self.cluster.max_down, 2)
+        self.assertFalse(self.cluster.racks_down_together)
+        self.assertLess(time.perf_counter() - start_time, 12 * 0.05)
+
+        self.cluster.max_down = 0
+        self.run_rolling(concurrency=0)
+        self.assertEqual(self.cluster.max_down, 4)
+        self.assertFalse(self.cluster.racks_down_together)
+
+    def test_single_rack_one_node_at_a_time(self):
+        self.cluster = FakeCluster(racks=1)
+        with self.assertLogs("sdcm.utils.rolling", level="WARNING") as logs:
+            self.run_rolling(concurrency=2)
+        self.assertEqual(self.cluster.max_down, 1)
+        self.assertIn("all nodes of dc 0 are in one rack", logs.output[0])
+
+    def test_abort_on_first_failure(self):
+        def restart(node):
+            self.cluster.restart(node)
+            if node.name == "node-0-1":
+                raise RuntimeError("failed to start")
+
+        with self.assertRaisesRegex(RollingOperationFailed, "node-0-1: RuntimeError: failed to start") as context:
+            self.run_rolling(operation=restart, concurrency=2)
+        self.assertNotIn("node-1-0", self.cluster.order)
+        self.assertLessEqual(len(self.cluster.order), 3)
+        self.assertEqual([step.node for step in context.exception.steps if step.error], ["node-0-1"])
+
+    def test_health_check_timeout(self):
+        self.cluster.down.add(self.cluster.nodes[5])
+        with self.assertRaisesRegex(RollingOperationFailed, "cluster is healthy before node-0-0"):
+            self.run_rolling(health_check_timeout=0.1)
+        self.assertEqual(self.cluster.order, [])
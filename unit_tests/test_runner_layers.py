@@ -0,0 +1,85 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from sdcm.remote import LocalCmdRunner
+from sdcm.utils.runner_layers import RunnerLayer, LayerStack, get_sct_runner_layers
+
+
+class LayerStackTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.state_dir = os.path.join(self.root, "state")
+        self.runner = LocalCmdRunner()
+
+    def layers(self, second_script="echo two >> {root}/log"):
+        return [
+            RunnerLayer(name="first", script="echo one >> {root}/log", check=f"test -f {self.root}/log"),
+            RunnerLayer(name="second", script=second_script, check=f"grep -q two {self.root}/log"),
+            RunnerLayer(name="third", script="echo three >> {root}/log", check=f"grep -q three {self.root}/log"),
+        ]
+
+    def stack(self, **kwargs):
+        return LayerStack(self.layers(**kwargs), state_dir=self.state_dir, sudo=False, root=self.root)
+
+    def read_log(self):
+        with open(os.path.join(self.root, "log"), encoding="utf-8") as log_file:
+            return log_file.read().split()
+
+    def statuses(self, results):
+        return [(result.name, result.status) for result in results]
+
+    def test_only_changed_layers_are_installed(self):
+        self.assertEqual(self.statuses(self.stack().apply(self.runner)),
+                         [("first", "installed"), ("second", "installed"), ("third", "installed")])
+        self.assertEqual(self.statuses(self.stack().apply(self.runner)),
+                         [("first", "cached"), ("second", "cached"), ("third", "cached")])
+        self.assertEqual(self.read_log(), ["one", "two", "three"])
+
+        changed_stack = self.stack(second_script="echo two-v2 >> {root}/log")
+        self.assertNotEqual(changed_stack.digest, self.stack().digest)
+        self.assertEqual(changed_stack.digests[0], self.stack().digests[0])
+        self.assertEqual(self.statuses(changed_stack.apply(self.runner)),
+                         [("first", "cached"), ("second", "installed"), ("third", "installed")])
+        self.assertEqual(self.read_log(), ["one", "two", "three", "two-v2", "three"])
+
+    def test_failed_layer_is_retried(self):
+        results = self.stack(second_script="echo broken >&2; false").apply(self.runner)
+        self.assertEqual(self.statuses(results), [("first", "installed"), ("second", "failed")])
+        self.assertIn("broken", results[-1].output)
+        self.assertEqual(self.statuses(self.stack().apply(self.runner)),
+                         [("first", "cached"), ("second", "installed"), ("third", "installed")])
+
+    def test_validate(self):
+        self.assertEqual(self.statuses(self.stack().validate(self.runner)),
+                         [("first", "failed"), ("second", "failed"), ("third", "failed")])
+        self.stack().apply(self.runner)
+        self.assertEqual(self.statuses(self.stack().validate(self.runner)),
+                         [("first", "ok"), ("second", "ok"), ("third", "ok")])
+        self.assertEqual(self.statuses(self.stack(second_script="echo two-v2 >> {root}/log").validate(self.runner)),
+                         [("first", "ok"), ("second", "stale"), ("third", "stale")])
+        self.assertEqual(self.read_log(), ["one", "two", "three"])
+
+    def test_sct_runner_layers(self):
+        aws_layers = get_sct_runner_layers(login_user="ubuntu", public_key="ssh-rsa AAAA aws")
+        gce_layers = get_sct_runner_layers(login_user="scylla-test", public_key="ssh-rsa AAAA gce")
+        self.assertEqual(aws_layers.digests[0], gce_layers.digests[0])
+        self.assertNotEqual(aws_layers.digest, gce_layers.digest)
+        self.assertIn("usermod -aG docker scylla-test", gce_layers.layers[3].script)
+        self.assertEqual(aws_layers.digest,
+                         get_sct_runner_layers(login_user="ubuntu", public_key="ssh-rsa AAAA aws").digest)
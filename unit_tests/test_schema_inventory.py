@@ -0,0 +1,142 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import unittest
+from collections import Counter
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from sdcm.utils.schema_inventory import SchemaInventory
+
+
+class FakeResult(list):
+    @property
+    def current_rows(self):
+        return list(self)
+
+    def one(self):
+        return self[0] if self else None
+
+    def result(self):
+        return self
+
+
+class FailedFuture:  # pylint: disable=too-few-public-methods
+    @staticmethod
+    def result():
+        raise RuntimeError("read failure")
+
+
+class FakeSession:
+    """Session which answers the queries of SchemaInventory from a dict of tables."""
+
+    def __init__(self, tables, views=(), rows=None):
+        self.tables = tables  # {"ks.cf": ["column type", ...]}
+        self.views = views
+        self.rows = rows or {}
+        self.schema_version = "v1"
+        self.queries = Counter()
+
+    def execute(self, query):
+        query = getattr(query, "query_string", query)
+        self.queries[query.split(" FROM ")[1]] += 1
+        if query.endswith("FROM system.local"):
+            return FakeResult([SimpleNamespace(schema_version=self.schema_version)])
+        if query.endswith("FROM system_schema.tables"):
+            return FakeResult(SimpleNamespace(keyspace_name=name.split(".")[0], table_name=name.split(".")[1])
+                              for name in self.tables)
+        if query.endswith("FROM system_schema.views"):
+            return FakeResult(SimpleNamespace(keyspace_name=name.split(".")[0], view_name=name.split(".")[1])
+                              for name in self.views)
+        if query.endswith("FROM system_schema.columns"):
+            return FakeResult(SimpleNamespace(keyspace_name=name.split(".")[0], table_name=name.split(".")[1],
+                                              type=column_type)
+                              for name, column_types in self.tables.items() for column_type in column_types)
+        raise ValueError(query)
+
+    def execute_async(self, query):
+        table = query.split(" FROM ")[1].split(" LIMIT")[0].replace('"', "")
+        self.queries[table] += 1
+        if table == "ks.broken":
+            return FailedFuture()
+        return FakeResult([object()] * self.rows.get(table, 1))
+
+
+class SchemaInventoryTest(unittest.TestCase):
+    def setUp(self):
+        wide_columns = ["int"] * 200
+        self.session = FakeSession(
+            tables={"ks.wide": wide_columns, "ks.empty": ["int"], "ks.counters": ["int", "counter"],
+                    "ks.t_scylla_cdc_log": ["int"], "system.peers": ["text"], "system_schema.dropped_columns": []},
+            views=["ks.wide_mv"],
+            rows={"ks.empty": 0})
+        self.inventory = SchemaInventory()
+
+    def test_each_table_is_probed_once(self):
+        self.assertEqual(self.inventory.get_ks_cf_list(self.session),
+                         ["ks.counters", "ks.t_scylla_cdc_log", "ks.wide", "ks.wide_mv", "system.peers"])
+        self.assertEqual(self.session.queries["ks.wide"], 1)
+        self.assertEqual(self.session.queries["system_schema.tables"], 1)
+        self.assertEqual(self.session.queries["system_schema.columns"], 0)
+        self.assertEqual(self.session.queries["system_schema.dropped_columns"], 0)
+
+        self.assertEqual(self.inventory.get_ks_cf_list(self.session, filter_out_mv=True, filter_out_system=True,
+                                                       filter_out_cdc_log_tables=True,
+                                                       filter_out_table_with_counter=True),
+                         ["ks.wide"])
+        self.assertEqual(self.session.queries["ks.wide"], 1)
+        self.assertEqual(self.session.queries["ks.empty"], 2)  # empty tables are probed again
+        self.assertEqual(self.session.queries["system_schema.tables"], 1)
+        self.assertEqual(self.session.queries["system_schema.columns"], 1)
+        self.assertEqual(self.session.queries["system.local"], 2)
+
+    def test_schema_change(self):
+        self.inventory.get_ks_cf_list(self.session, filter_empty_tables=False)
+        self.session.tables["ks.new"] = ["int"]
+        self.assertNotIn("ks.new", self.inventory.get_ks_cf_list(self.session, filter_empty_tables=False))
+        self.session.schema_version = "v2"
+        self.assertIn("ks.new", self.inventory.get_ks_cf_list(self.session, filter_empty_tables=False))
+        self.assertEqual(self.session.queries["system_schema.tables"], 2)
+
+    def test_invalidate_data(self):
+        self.inventory.get_ks_cf_list(self.session)
+        self.session.rows["ks.wide"] = 0
+        self.assertIn("ks.wide", self.inventory.get_ks_cf_list(self.session))
+        self.inventory.invalidate(schema=False)
+        self.assertNotIn("ks.wide", self.inventory.get_ks_cf_list(self.session))
+        self.assertEqual(self.session.queries["system_schema.tables"], 1)
+
+    def test_invalidate_deleted_table(self):
+        self.inventory.get_ks_cf_list(self.session)
+        self.session.rows["ks.wide"] = 0
+        self.session.rows["system.peers"] = 0
+        self.inventory.invalidate(schema=False, tables=["ks.wide"])
+        self.assertEqual(self.inventory.get_ks_cf_list(self.session, filter_out_mv=True, filter_out_cdc_log_tables=True,
+                                                       filter_out_table_with_counter=True),
+                         ["system.peers"])
+        self.assertEqual(self.session.queries["system.peers"], 1)
+
+    def test_non_empty_tables_expire(self):
+        with patch("time.monotonic", return_value=1000):
+            self.inventory.get_ks_cf_list(self.session)
+        self.session.rows["ks.wide"] = 0
+        with patch("time.monotonic", return_value=1000 + SchemaInventory.non_empty_ttl - 1):
+            self.assertIn("ks.wide", self.inventory.get_ks_cf_list(self.session))
+        with patch("time.monotonic", return_value=1000 + SchemaInventory.non_empty_ttl + 1):
+            self.assertNotIn("ks.wide", self.inventory.get_ks_cf_list(self.session))
+        self.assertEqual(self.session.queries["ks.wide"], 2)
+
+    def test_failed_probe(self):
+        self.session.tables["ks.broken"] = ["int"]
+        with self.assertLogs("sdcm.utils.schema_inventory", level="WARNING"):
+            self.assertNotIn("ks.broken", self.inventory.get_ks_cf_list(self.session))
@@ -0,0 +1,41 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import sys
+import time
+import subprocess
+import unittest
+
+from sct import CLI_COLD_START_BUDGET
+from sdcm import sct_abs_path
+
+SCT_PY = sct_abs_path("sct.py")
+HEAVY_MODULES = ("sdcm.cluster", "sdcm.utils.common", "sdcm.sct_runner", "sdcm.results_analyze",
+                 "boto3", "libcloud", "kubernetes", "docker", "pytest", )
+
+
+class TestSctCliColdStart(unittest.TestCase):
+    def test_help_does_not_import_heavy_modules(self):
+        result = subprocess.run([sys.executable, "-X", "importtime", SCT_PY, "--help"],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+        imported = {line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines()}
+        self.assertFalse([module for module in imported if module.startswith(HEAVY_MODULES)])
+
+    def test_help_cold_start_budget(self):
+        timings = []
+        for _ in range(3):
+            start_time = time.perf_counter()
+            subprocess.run([sys.executable, SCT_PY, "--help"], stdout=subprocess.DEVNULL, check=True)
+            timings.append(time.perf_counter() - start_time)
+        self.assertLess(min(timings), CLI_COLD_START_BUDGET,
+                        f"`sct.py --help' took {min(timings):.2f}s, run `sct.py profile-imports' to find out why")
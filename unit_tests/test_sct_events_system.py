@@ -16,8 +16,8 @@ import unittest
 from textwrap import dedent
 
 from sdcm.sct_events.system import \
-    StartupTestEvent, TestFrameworkEvent, ElasticsearchEvent, SpotTerminationEvent, ScyllaRepoEvent, InfoEvent, \
-    ThreadFailedEvent, CoreDumpEvent, TestResultEvent
+    StartupTestEvent, TestFrameworkEvent, ElasticsearchEvent, SpotTerminationEvent, SpotRebalanceRecommendationEvent, \
+    ScyllaRepoEvent, InfoEvent, ThreadFailedEvent, CoreDumpEvent, TestResultEvent
 
 
 class TestSystemEvents(unittest.TestCase):
@@ -62,6 +62,14 @@ class TestSystemEvents(unittest.TestCase):
                          "event_id=aff29bce-d75c-4f86-9890-c6d9c1c25d3e: node=node1 message=m1")
         self.assertEqual(event, pickle.loads(pickle.dumps(event)))
 
+    def test_spot_rebalance_recommendation_event(self):
+        event = SpotRebalanceRecommendationEvent(node="node1", message="m1")
+        event.event_id = "aff29bce-d75c-4f86-9890-c6d9c1c25d3e"
+        self.assertEqual(str(event),
+                         "(SpotRebalanceRecommendationEvent Severity.WARNING) period_type=one-time "
+                         "event_id=aff29bce-d75c-4f86-9890-c6d9c1c25d3e: node=node1 message=m1")
+        self.assertEqual(event, pickle.loads(pickle.dumps(event)))
+
     def test_scylla_repo_event(self):
         event = ScyllaRepoEvent(url="u1", error="e1")
         event.event_id = "aff29bce-d75c-4f86-9890-c6d9c1c25d3e"
@@ -0,0 +1,86 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import os
+import json
+import tempfile
+import threading
+import unittest
+
+from sdcm.utils.spans import SpanRecorder, get_span_recorder, span, traced
+
+
+class FakeNode:  # pylint: disable=too-few-public-methods
+    name = "node-1"
+
+    @traced(category="node")
+    def wait_db_up(self):
+        with span("inner", category="node"):
+            pass
+
+
+class SpanRecorderTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.temp_dir.cleanup)
+        self.recorder = SpanRecorder(path=os.path.join(self.temp_dir.name, "spans.jsonl"))
+
+    def test_spans_are_appended(self):
+        with self.recorder.span("disrupt_foo", category="nemesis", node="node-1"):
+            with self.recorder.span("nodetool repair", category="node"):
+                pass
+        with self.assertRaises(ValueError):
+            with self.recorder.span("disrupt_bar", category="nemesis"):
+                raise ValueError()
+        spans = self.recorder.load()
+        self.assertEqual([span_.name for span_ in spans], ["nodetool repair", "disrupt_foo", "disrupt_bar"])
+        self.assertEqual(spans[1].args, {"node": "node-1"})
+        self.assertLessEqual(spans[1].start, spans[0].start)
+        self.assertGreaterEqual(spans[1].duration, spans[0].duration)
+        self.assertEqual(spans[2].status, "failed: ValueError")
+
+    def test_chrome_trace_export(self):
+        def nemesis_thread():
+            with self.recorder.span("disrupt_foo", category="nemesis"):
+                pass
+        thread = threading.Thread(target=nemesis_thread, name="NemesisThread")
+        thread.start()
+        thread.join()
+        with self.recorder.span("wait_for_init"):
+            pass
+        with open(self.recorder.path, "a", encoding="utf-8") as spans_file:
+            spans_file.write('{"name": "trunc')  # a line cut by a killed test
+
+        trace_path = os.path.join(self.temp_dir.name, "trace.json")
+        self.assertEqual(self.recorder.export_chrome_trace(trace_path), 2)
+        with open(trace_path, encoding="utf-8") as trace_file:
+            events = json.load(trace_file)["traceEvents"]
+        self.assertIn("NemesisThread", [event["args"]["name"] for event in events if event["ph"] == "M"])
+        complete_events = [event for event in events if event["ph"] == "X"]
+        self.assertEqual([event["name"] for event in complete_events], ["disrupt_foo", "wait_for_init"])
+        self.assertNotEqual(complete_events[0]["tid"], complete_events[1]["tid"])
+
+    def test_traced(self):
+        recorder = get_span_recorder()
+        self.addCleanup(recorder.set_path, recorder.path)
+        recorder.set_path(self.recorder.path)
+        FakeNode().wait_db_up()
+        spans = self.recorder.load()
+        self.assertEqual([span_.name for span_ in spans], ["inner", "FakeNode.wait_db_up"])
+        self.assertEqual(spans[1].args, {"target": "node-1"})
+
+    def test_no_path(self):
+        recorder = SpanRecorder()
+        with recorder.span("foo"):
+            pass
+        self.assertEqual(recorder.load(), [])
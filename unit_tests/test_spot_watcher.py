@@ -0,0 +1,136 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import json
+import time
+import queue
+import threading
+import unittest
+from collections import Counter
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from sdcm.remote import LocalCmdRunner
+from sdcm.cluster_aws import AWSNode
+from sdcm.utils.spot_watcher import (INSTANCE_ACTION, REBALANCE_RECOMMENDATION, METADATA_TIME_FORMAT,
+                                     SpotInterruptionWatcher, SpotNotice, parse_notice_line)
+
+TOKEN = "sct-test-token"
+
+
+class MetadataHandler(BaseHTTPRequestHandler):
+    """Stub of the instance metadata endpoint which requires IMDSv2 token."""
+
+    documents = {}
+    requests = Counter()
+
+    def do_PUT(self):  # pylint: disable=invalid-name
+        self.requests["token"] += 1
+        self._reply(200, TOKEN)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self.requests["get"] += 1
+        if self.headers.get("X-aws-ec2-metadata-token") != TOKEN:
+            self._reply(401, "")
+        elif (document := self.documents.get(self.path)) is None:
+            self._reply(404, "404 - Not Found")
+        else:
+            self._reply(200, json.dumps(document))
+
+    def _reply(self, code, body):
+        self.send_response(code)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class SpotInterruptionWatcherTest(unittest.TestCase):
+    def setUp(self):
+        MetadataHandler.documents = {}
+        MetadataHandler.requests = Counter()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), MetadataHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.notices = queue.Queue()
+        self.watcher = SpotInterruptionWatcher(callback=self.notices.put,
+                                               metadata_url=f"http://127.0.0.1:{self.server.server_port}")
+        self.watcher.session_duration = 4
+        self.watcher.interval = 0.1
+
+    def run_session(self):
+        thread = threading.Thread(target=self.watcher.watch, args=(LocalCmdRunner(), ), daemon=True)
+        thread.start()
+        return thread
+
+    def test_notices_are_pushed_immediately(self):
+        session = self.run_session()
+        time.sleep(1)
+        action_time = time.strftime(METADATA_TIME_FORMAT, time.gmtime(time.time() + 120))
+        MetadataHandler.documents["/latest/meta-data/spot/instance-action"] = {"action": "terminate",
+                                                                                "time": action_time}
+        published_at = time.perf_counter()
+        notice = self.notices.get(timeout=3)
+        latency = time.perf_counter() - published_at
+        self.assertLess(latency, 1)
+        self.assertEqual(notice.kind, INSTANCE_ACTION)
+        self.assertEqual(notice.detail["action"], "terminate")
+        self.assertAlmostEqual(notice.time_left, 120, delta=5)
+
+        MetadataHandler.documents["/latest/meta-data/events/recommendations/rebalance"] = {
+            "noticeTime": "2021-07-01T10:00:00Z"}
+        notice = self.notices.get(timeout=3)
+        self.assertEqual(notice.kind, REBALANCE_RECOMMENDATION)
+        self.assertIsNone(notice.time_left)
+        session.join(timeout=10)
+        self.assertEqual(MetadataHandler.requests["token"], 1)
+
+        # The next session sees the same notices, but they are not reported again.
+        self.run_session().join(timeout=10)
+        self.assertTrue(self.notices.empty())
+
+    def test_parse_notice_line(self):
+        self.assertIsNone(parse_notice_line("SCT-SPOT-WATCHER started"))
+        self.assertIsNone(parse_notice_line("SCT-SPOT-NOTICE unknown {}"))
+        notice = parse_notice_line('SCT-SPOT-NOTICE instance-action {"action": "stop", "time": "2021-07-01T10:02:00Z"}')
+        self.assertEqual(notice.detail, {"action": "stop", "time": "2021-07-01T10:02:00Z"})
+        self.assertEqual(parse_notice_line("SCT-SPOT-NOTICE instance-action <html>").detail, {"raw": "<html>"})
+
+    def test_eventbridge_events(self):
+        notice = SpotNotice(kind=REBALANCE_RECOMMENDATION, detail={"noticeTime": "2021-07-01T10:00:00Z"})
+        event = notice.to_eventbridge(instance_id="i-1234", region_name="eu-west-1")
+        self.assertEqual(event["detail-type"], "EC2 Instance Rebalance Recommendation")
+        self.assertEqual(event["time"], "2021-07-01T10:00:00Z")
+        self.assertEqual(SpotNotice.from_eventbridge(event).detail, notice.detail)
+
+        notice = SpotNotice(kind=INSTANCE_ACTION, detail={"action": "terminate", "time": "2021-07-01T10:02:00Z"})
+        self.assertEqual(SpotNotice.from_eventbridge(notice.to_eventbridge("i-1234", "eu-west-1")).detail,
+                         notice.detail)
+        self.assertIsNone(SpotNotice.from_eventbridge({"detail-type": "EC2 Instance State-change Notification"}))
+
+    def test_check_spot_termination(self):
+        node = AWSNode.__new__(AWSNode)
+        node.log = MagicMock()
+        node.remoter = MagicMock()
+        notice_time = time.strftime(METADATA_TIME_FORMAT, time.gmtime(time.time() + 600))
+        with patch.object(AWSNode, "handle_spot_notice") as handle_spot_notice:
+            node.remoter.run.return_value = SimpleNamespace(stdout=json.dumps({"action": "stop", "time": notice_time}))
+            self.assertGreater(node.check_spot_termination(), 0)
+            node.remoter.run.return_value = SimpleNamespace(stdout="<html>Service Unavailable</html>")
+            self.assertEqual(node.check_spot_termination(), 0)
+            self.assertEqual(handle_spot_notice.call_args.args[0].detail, {"raw": "<html>Service Unavailable</html>"})
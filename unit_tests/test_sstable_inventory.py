@@ -0,0 +1,79 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import unittest
+from types import SimpleNamespace
+
+from sdcm.utils.sstable_inventory import SstableInventory, parse_sstable_files
+
+TABLE_DIR = "/var/lib/scylla/data/keyspace1/standard1-f60e4f30c98f11e98d46000000000002"
+OTHER_TABLE_DIR = "/var/lib/scylla/data/keyspace1/standard10-a60e4f30c98f11e98d46000000000002"
+COMPONENTS = ("CompressionInfo.db", "Data.db", "Digest.crc32", "Filter.db", "Index.db", "Scylla.db",
+              "Statistics.db", "Summary.db", "TOC.txt")
+
+
+class FakeRemoter:
+    def __init__(self, files):
+        self.files = files
+        self.commands = []
+
+    def sudo(self, cmd, **kwargs):  # pylint: disable=unused-argument
+        self.commands.append(cmd)
+        if cmd.startswith("find"):
+            return SimpleNamespace(stdout="\n".join(self.files), stderr="")
+        return SimpleNamespace(stdout="", stderr="")
+
+
+class SstableInventoryTest(unittest.TestCase):
+    def setUp(self):
+        files = [f"{TABLE_DIR}/mc-{generation}-big-{component}"
+                 for generation in (220, 7, 31) for component in COMPONENTS]
+        files += [f"{TABLE_DIR}/manifest.json", f"{OTHER_TABLE_DIR}/md-1-big-Data.db"]
+        self.remoter = FakeRemoter(files)
+        self.inventory = SstableInventory(SimpleNamespace(remoter=self.remoter))
+
+    def test_parse_sstable_files(self):
+        sstables = parse_sstable_files("system.truncated", [
+            "/var/lib/scylla/data/system/truncated-1/system-truncated-ka-7-Data.db",
+            "/var/lib/scylla/data/system/truncated-1/system-truncated-ka-7-Index.db",
+            "/var/lib/scylla/data/system/truncated-1/md-12-big-TOC.txt",
+        ])
+        self.assertEqual([(sstable.prefix, sstable.version, sstable.generation) for sstable in sstables],
+                         [("system-truncated-ka-7", "ka", 7), ("md-12", "md", 12)])
+        self.assertEqual(sstables[0].data_files,
+                         ["/var/lib/scylla/data/system/truncated-1/system-truncated-ka-7-Data.db"])
+        self.assertEqual(sstables[1].data_files, [])
+
+    def test_one_listing_for_all_tables(self):
+        sstables = self.inventory.load(["keyspace1.standard1", "keyspace1.standard10", "keyspace1.missing"])
+        self.assertEqual(len(self.remoter.commands), 1)
+        self.assertIn("/var/lib/scylla/data/keyspace1/missing-*", self.remoter.commands[0])
+        self.assertEqual([sstable.generation for sstable in sstables["keyspace1.standard1"]], [7, 31, 220])
+        self.assertEqual(sstables["keyspace1.standard1"][0].components,
+                         tuple(f"big-{component}" for component in COMPONENTS))
+        self.assertEqual(len(sstables["keyspace1.standard10"]), 1)
+        self.assertEqual(sstables["keyspace1.missing"], [])
+
+    def test_batched_remove_and_corrupt(self):
+        self.inventory.load(["keyspace1.standard1"])
+        chosen = self.inventory.choose(count=5)
+        self.assertEqual(len(chosen), 3)
+        self.inventory.remove(chosen)
+        self.assertEqual(len(self.remoter.commands), 2)
+        self.assertEqual(self.remoter.commands[1].count(TABLE_DIR), 3 * len(COMPONENTS))
+        self.assertNotIn("*", self.remoter.commands[1])
+
+        self.inventory.corrupt(chosen[:2])
+        self.assertEqual(len(self.remoter.commands), 3)
+        self.assertEqual(self.remoter.commands[2].count("Data.db"), 2)
+        self.assertTrue(self.remoter.commands[2].startswith("bash -c "))
@@ -0,0 +1,100 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import io
+import os
+import unittest
+from unittest.mock import patch
+
+from sdcm.utils.stream_upload import S3StreamUploader, MB
+
+from unit_tests.lib.fake_s3 import FakeS3Client
+
+BUCKET = "coredumps-test-bucket"
+
+
+class FlakyS3Client:
+    """Wrap S3 client to fail upload of some parts a few times."""
+
+    def __init__(self, s3_client, failures: dict):
+        self.s3_client = s3_client
+        self.failures = failures
+
+    def upload_part(self, **kwargs):
+        if self.failures.get(kwargs["PartNumber"]):
+            self.failures[kwargs["PartNumber"]] -= 1
+            raise ConnectionError(f"part #{kwargs['PartNumber']} failed")
+        return self.s3_client.upload_part(**kwargs)
+
+    def __getattr__(self, item):
+        return getattr(self.s3_client, item)
+
+
+class S3StreamUploaderTest(unittest.TestCase):
+    def setUp(self):
+        self.s3_client = FakeS3Client()
+        self.s3_client.create_bucket(Bucket=BUCKET)
+        patcher = patch.object(S3StreamUploader, "retry_sleep", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_object(self, key):
+        return self.s3_client.get_object(Bucket=BUCKET, Key=key)["Body"].read()
+
+    def test_upload_stream_by_parts(self):
+        data = os.urandom(11 * MB)
+        uploader = S3StreamUploader(self.s3_client, bucket=BUCKET, key="core.1.gz", part_size=5 * MB)
+        stats = uploader.upload_stream(io.BytesIO(data))
+        self.assertEqual(stats.parts, 3)
+        self.assertEqual(stats.size, len(data))
+        self.assertEqual(self.get_object("core.1.gz"), data)
+
+    def test_small_chunks_are_joined_to_parts(self):
+        data = os.urandom(6 * MB)
+        uploader = S3StreamUploader(self.s3_client, bucket=BUCKET, key="core.2.gz", part_size=5 * MB)
+        stats = uploader.upload(data[idx:idx + 64 * 1024] for idx in range(0, len(data), 64 * 1024))
+        self.assertEqual(stats.parts, 2)
+        self.assertEqual(self.get_object("core.2.gz"), data)
+
+    def test_failed_part_is_uploaded_again(self):
+        data = os.urandom(11 * MB)
+        client = FlakyS3Client(self.s3_client, failures={2: 2})
+        uploader = S3StreamUploader(client, bucket=BUCKET, key="core.3.gz", part_size=5 * MB)
+        stats = uploader.upload_stream(io.BytesIO(data))
+        self.assertEqual(stats.retries, 2)
+        self.assertEqual(self.get_object("core.3.gz"), data)
+
+    def test_upload_aborted_if_part_keeps_failing(self):
+        client = FlakyS3Client(self.s3_client, failures={1: S3StreamUploader.part_retries})
+        uploader = S3StreamUploader(client, bucket=BUCKET, key="core.4.gz", part_size=5 * MB)
+        with self.assertRaises(ConnectionError):
+            uploader.upload_stream(io.BytesIO(os.urandom(MB)))
+        self.assertNotIn("Uploads", self.s3_client.list_multipart_uploads(Bucket=BUCKET))
+        self.assertNotIn("Contents", self.s3_client.list_objects_v2(Bucket=BUCKET))
+
+    def test_upload_aborted_if_source_fails(self):
+        def chunks():
+            yield os.urandom(6 * MB)
+            raise RuntimeError("coredumpctl failed")
+
+        uploader = S3StreamUploader(self.s3_client, bucket=BUCKET, key="core.5.gz", part_size=5 * MB)
+        with self.assertRaisesRegex(RuntimeError, "coredumpctl failed"):
+            uploader.upload(chunks())
+        self.assertNotIn("Uploads", self.s3_client.list_multipart_uploads(Bucket=BUCKET))
+        self.assertNotIn("Contents", self.s3_client.list_objects_v2(Bucket=BUCKET))
+
+    def test_empty_stream(self):
+        uploader = S3StreamUploader(self.s3_client, bucket=BUCKET, key="core.6.gz")
+        stats = uploader.upload_stream(io.BytesIO())
+        self.assertEqual(stats.size, 0)
+        self.assertEqual(self.get_object("core.6.gz"), b"")
@@ -0,0 +1,110 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import unittest
+from sdcm.utils.traffic_baseline import TrafficBaseline, instance_host
+
+
+class FakePrometheus:
+    def __init__(self, series):
+        self.series = series
+        self.queries = []
+
+    def query(self, query, start, end, scrap_metrics_step=None):  # pylint: disable=unused-argument
+        self.queries.append((start, end))
+        return [{"metric": {"instance": instance},
+                 "values": [[timestamp, str(value)] for timestamp, value in values if start <= timestamp <= end]}
+                for instance, values in self.series.items()]
+
+
+class FakeNode:  # pylint: disable=too-few-public-methods
+    def __init__(self, ip_address):
+        self.ip_address = ip_address
+
+
+class FakeClock:  # pylint: disable=too-few-public-methods
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TrafficBaselineTest(unittest.TestCase):
+    def setUp(self):
+        self.nodes = [FakeNode("10.0.0.1"), FakeNode("10.0.0.2")]
+        self.prometheus = FakePrometheus({
+            "10.0.0.1:9100": [(400, 10.0), (700, 50.0), (1000, 20.0)],
+            "10.0.0.2:9100": [(1000, 5.0)],
+            "10.0.0.3:9100": [(1000, 99.0)],
+        })
+        self.clock = FakeClock(1000)
+        self.prepared = []
+        self.baseline = TrafficBaseline(prometheus=self.prometheus, nodes=lambda: self.nodes,
+                                        prepare_node=self.prepared.append, clock=self.clock)
+
+    def test_instance_host(self):
+        self.assertEqual(instance_host("10.0.0.1:9100"), "10.0.0.1")
+        self.assertEqual(instance_host("[fe80::1]:9100"), "fe80::1")
+        self.assertEqual(instance_host("fe80::1"), "fe80::1")
+        self.assertEqual(instance_host("10.0.0.1"), "10.0.0.1")
+
+    def test_one_query_for_all_nodes(self):
+        self.baseline.refresh()
+        self.assertEqual(self.prometheus.queries, [(400, 1000)])
+        self.assertEqual(self.baseline.bandwidth(self.nodes[0]), 50.0)
+        self.assertEqual(self.baseline.bandwidth(self.nodes[1]), 5.0)
+        self.assertIsNone(self.baseline.bandwidth(FakeNode("10.0.0.3")))
+
+    def test_incremental_refresh_and_window(self):
+        self.baseline.refresh()
+        self.prometheus.series["10.0.0.1:9100"].append((1060, 30.0))
+        self.clock.now = 1060
+        self.baseline.refresh()
+        self.assertEqual(self.prometheus.queries[1], (1000, 1060))
+        self.assertEqual(self.baseline.bandwidth(self.nodes[0]), 50.0)
+
+        self.clock.now = 1400  # the peak at 700 is out of the window now
+        self.assertEqual(self.baseline.bandwidth(self.nodes[0]), 30.0)
+        self.clock.now = 2000
+        self.assertIsNone(self.baseline.bandwidth(self.nodes[0]))
+
+    def test_whole_window_for_nodes_without_samples(self):
+        self.baseline.refresh()
+        self.nodes.append(FakeNode("10.0.0.3"))
+        self.prometheus.series["10.0.0.3:9100"] = [(800, 99.0), (1000, 1.0)]
+        self.clock.now = 1060
+        self.baseline.refresh()
+        self.assertEqual(self.prometheus.queries[1], (460, 1060))
+        self.assertEqual(self.baseline.bandwidth(self.nodes[2]), 99.0)
+        # known samples aren't added again, the one at 400 is out of the window
+        self.assertEqual(len(self.baseline._samples["10.0.0.1"]), 2)  # pylint: disable=protected-access
+
+        self.clock.now = 1120
+        self.baseline.refresh()
+        self.assertEqual(self.prometheus.queries[2], (1060, 1120))
+
+    def test_refresh_drops_old_samples(self):
+        self.baseline.refresh()
+        self.nodes.pop()
+        self.clock.now = 1500
+        self.baseline.refresh()
+        samples = self.baseline._samples  # pylint: disable=protected-access
+        self.assertEqual(list(samples), ["10.0.0.1"])
+        self.assertEqual(list(samples["10.0.0.1"]), [(1000, 20.0)])
+
+    def test_prepare_nodes_once(self):
+        self.baseline.prepare_nodes()
+        self.nodes.append(FakeNode("10.0.0.3"))
+        self.baseline.prepare_nodes()
+        self.assertEqual([node.ip_address for node in self.prepared], ["10.0.0.1", "10.0.0.2", "10.0.0.3"])
@@ -22,6 +22,8 @@ from pathlib import Path
 from sdcm.utils.common import tag_ami, convert_metric_to_ms
 from sdcm.utils.common import download_dir_from_cloud
 
+from unit_tests.lib.fake_s3 import FakeS3Client
+
 logging.basicConfig(level=logging.DEBUG)
 
 
@@ -49,16 +51,16 @@ class TestDownloadDir(unittest.TestCase):
 
     def test_update_db_packages_s3(self):
         sct_update_db_packages = 's3://downloads.scylladb.com/rpm/centos/scylladb-nightly/scylla/7/x86_64/repodata/'
+        s3_client = FakeS3Client()
+        s3_client.create_bucket(Bucket="downloads.scylladb.com")
+        s3_client.put_object(Bucket="downloads.scylladb.com",
+                             Key="rpm/centos/scylladb-nightly/scylla/7/x86_64/repodata/repomd.xml", Body=b"<repomd/>")
 
         self.clear_cloud_downloaded_path(sct_update_db_packages)
-
-        def touch_file(client, bucket, key, local_file_path):  # pylint: disable=unused-argument
-            Path(local_file_path).touch()
-
-        with unittest.mock.patch("sdcm.utils.common._s3_download_file", new=touch_file):
+        with unittest.mock.patch("sdcm.utils.cloud_download.boto3.client", return_value=s3_client):
             update_db_packages = download_dir_from_cloud(sct_update_db_packages)
 
-        assert os.path.exists(os.path.join(update_db_packages, "repomd.xml"))
+        assert Path(update_db_packages, "repomd.xml").read_bytes() == b"<repomd/>"
 
     def test_update_db_packages_gce(self):
         sct_update_db_packages = 'gs://scratch.scylladb.com/sct_test/'
@@ -66,15 +68,16 @@ class TestDownloadDir(unittest.TestCase):
         class FakeObject:  # pylint: disable=too-few-public-methods
             def __init__(self, name):
                 self.name = name
-
-            @staticmethod
-            def download(destination_path, overwrite_existing, *_, **__):
-                Path(destination_path).touch(exist_ok=overwrite_existing)
+                self.size = 0
+                self.hash = hashlib.md5().hexdigest()
 
         self.clear_cloud_downloaded_path(sct_update_db_packages)
         test_file_names = ["sct_test/bentsi.txt", "sct_test/charybdis.fs"]
         with unittest.mock.patch("libcloud.storage.drivers.google_storage.GoogleStorageDriver.list_container_objects",
-                                 return_value=[FakeObject(name=fname) for fname in test_file_names]):
+                                 return_value=[FakeObject(name=fname) for fname in test_file_names]), \
+                unittest.mock.patch(
+                    "libcloud.storage.drivers.google_storage.GoogleStorageDriver.download_object_as_stream",
+                    return_value=iter([])):
             update_db_packages = download_dir_from_cloud(sct_update_db_packages)
         for fname in test_file_names:
             assert (Path(update_db_packages) / os.path.basename(fname)).exists()
@@ -1,8 +1,9 @@
 from __future__ import absolute_import
 import logging
 import unittest
+from functools import partial
 
-from sdcm.wait import wait_for
+from sdcm.wait import wait_for, WAIT_STATS
 
 logging.basicConfig(level=logging.DEBUG)
 
@@ -59,3 +60,15 @@ class TestSdcmWait(unittest.TestCase):
 
         self.assertEqual(wait_for(callback, timeout=2, step=0.5, arg1=1, arg2=3, throw_exc=False), 'what ever')
         self.assertEqual(len(calls), 1)
+
+    def test_04_partial(self):
+        calls = []
+
+        def callback(arg1, arg2):
+            calls.append((arg1, arg2))
+            return False
+
+        WAIT_STATS.clear()
+        self.assertIsNone(wait_for(partial(callback, 1), timeout=1, step=0.5, arg2=3, throw_exc=False))
+        self.assertIn("callback", WAIT_STATS.records[-1].name)
+        self.assertFalse(WAIT_STATS.records[-1].succeeded)
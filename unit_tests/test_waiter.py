@@ -0,0 +1,110 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright (c) 2021 ScyllaDB
+
+import unittest
+from itertools import islice
+
+from sdcm.wait import Waiter, WaitStats, WaitTimeoutError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class Probe:
+    """Return true value starting from `ready_at' fake time, raise `error' before it if set."""
+
+    def __init__(self, clock, ready_at, error=None):
+        self.clock = clock
+        self.ready_at = ready_at
+        self.error = error
+        self.calls = []
+
+    def __call__(self):
+        self.calls.append(self.clock.now)
+        if self.clock.now >= self.ready_at:
+            return "ready"
+        if self.error:
+            raise self.error
+        return None
+
+
+class WaiterTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.stats = WaitStats()
+
+    def waiter(self, timeout, **kwargs):
+        kwargs.setdefault("jitter", 0)
+        kwargs.setdefault("text", "probe")
+        return Waiter(timeout=timeout, clock=self.clock, stats=self.stats, **kwargs)
+
+    def test_first_check_is_immediate(self):
+        probe = Probe(self.clock, ready_at=0)
+        self.assertEqual(self.waiter(timeout=60).wait(probe), "ready")
+        self.assertEqual(probe.calls, [1000.0])
+        self.assertEqual(self.clock.sleeps, [])
+        record, = self.stats.records
+        self.assertEqual((record.name, record.duration, record.polls, record.succeeded), ("probe", 0, 1, True))
+
+    def test_backoff_is_capped(self):
+        probe = Probe(self.clock, ready_at=1000 + 60)
+        self.waiter(timeout=120, initial_delay=1, max_delay=10).wait(probe)
+        self.assertEqual(self.clock.sleeps, [1, 2, 4, 8, 10, 10, 10, 10, 10])
+        self.assertEqual(self.stats.records[0].polls, 10)
+
+    def test_jitter_bounds(self):
+        waiter = self.waiter(timeout=120, initial_delay=2, max_delay=16, jitter=0.25)
+        for _ in range(50):
+            for expected, delay in zip((2, 4, 8, 16, 16), islice(waiter.delays(), 5)):
+                self.assertGreaterEqual(delay, expected * 0.75)
+                self.assertLessEqual(delay, min(expected * 1.25, 16))
+
+    def test_deadline_cuts_last_delay(self):
+        probe = Probe(self.clock, ready_at=float("inf"))
+        with self.assertRaisesRegex(WaitTimeoutError, "timeout - 20 seconds - expired after 6 polls"):
+            self.waiter(timeout=20, initial_delay=1, max_delay=8).wait(probe)
+        self.assertEqual(self.clock.sleeps, [1, 2, 4, 8, 5])
+        self.assertEqual(self.clock.now, 1020)
+        self.assertEqual(probe.calls[-1], 1020)
+        record, = self.stats.records
+        self.assertEqual((record.duration, record.polls, record.succeeded), (20, 6, False))
+
+    def test_allowed_exceptions(self):
+        probe = Probe(self.clock, ready_at=1000 + 3, error=ConnectionError("not yet"))
+        self.assertEqual(self.waiter(timeout=10, allowed_exceptions=(ConnectionError, )).wait(probe), "ready")
+
+        probe = Probe(self.clock, ready_at=float("inf"), error=ConnectionError("not yet"))
+        with self.assertRaises(WaitTimeoutError) as context:
+            self.waiter(timeout=10, allowed_exceptions=(ConnectionError, )).wait(probe)
+        self.assertIsInstance(context.exception.__cause__, ConnectionError)
+
+        probe = Probe(self.clock, ready_at=float("inf"), error=ValueError("broken"))
+        with self.assertRaises(ValueError):
+            self.waiter(timeout=10, allowed_exceptions=(ConnectionError, )).wait(probe)
+        self.assertEqual(len(probe.calls), 1)
+
+    def test_slowest_waits(self):
+        for ready_in in (5, 30, 1, 12):
+            self.waiter(timeout=60, text=f"wait-{ready_in}").wait(Probe(self.clock, ready_at=self.clock.now + ready_in))
+        self.assertEqual([record.name for record in self.stats.slowest(count=2)], ["wait-30", "wait-12"])
+        self.assertIn("wait-30: 31.0s, 6 polls", str(self.stats.slowest()[0]))